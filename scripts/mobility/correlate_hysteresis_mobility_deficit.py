@@ -34,7 +34,9 @@ import numpy as np
 import polars as pl
 from scipy import stats
 
-METRICS = Path("data/03_derived/_metrics/metrics.parquet")
+from src.derived.metrics_store import scan_metrics
+
+METRICS_DIR = Path("data/03_derived/_metrics")
 OUTDIR = Path("figs/cross_chip/mobility_deficit_vs_hysteresis")
 N_MIN = 5  # min looped IVgs per chip to draw a per-chip plot or fit a slope
 
@@ -54,8 +56,7 @@ NEEDED_METRICS = [
 def load_wide() -> pl.DataFrame:
     """One row per (run_id, chip) with the six required metrics pivoted
     into columns plus hysteresis_v and per-branch ratios."""
-    raw = pl.read_parquet(METRICS)
-    sub = raw.filter(pl.col("metric_name").is_in(NEEDED_METRICS))
+    sub = scan_metrics(METRICS_DIR, metric_names=NEEDED_METRICS).collect()
     wide = sub.pivot(
         on="metric_name",
         index=["run_id", "chip_number", "chip_group", "seq_num"],
@@ -82,7 +83,7 @@ def load_wide() -> pl.DataFrame:
 
 def chip_responsivity() -> dict[int, float]:
     """Median |delta_i_corrected| per chip — photoresponsivity proxy."""
-    raw = pl.read_parquet(METRICS).filter(pl.col("metric_name") == "delta_i_corrected")
+    raw = scan_metrics(METRICS_DIR, metric_names="delta_i_corrected").collect()
     if raw.height == 0:
         return {}
     agg = raw.group_by("chip_number").agg(
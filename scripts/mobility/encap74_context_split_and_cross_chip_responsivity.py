@@ -31,7 +31,9 @@ import numpy as np
 import polars as pl
 from scipy import stats
 
-METRICS = Path("data/03_derived/_metrics/metrics.parquet")
+from src.derived.metrics_store import scan_metrics
+
+METRICS_DIR = Path("data/03_derived/_metrics")
 HIST_DIR = Path("data/03_derived/chip_histories_enriched")
 OUTDIR = Path("figs/cross_chip/mobility_deficit_vs_hysteresis")
 
@@ -50,7 +52,7 @@ NEEDED_METRICS = [
 
 def load_wide_with_context() -> pl.DataFrame:
     """Wide metrics joined with per-IVg history context (date, has_light, etc.)."""
-    raw = pl.read_parquet(METRICS).filter(pl.col("metric_name").is_in(NEEDED_METRICS))
+    raw = scan_metrics(METRICS_DIR, metric_names=NEEDED_METRICS).collect()
     wide = raw.pivot(
         on="metric_name",
         index=["run_id", "chip_number", "chip_group", "seq_num"],
@@ -97,7 +99,7 @@ def load_wide_with_context() -> pl.DataFrame:
 
 
 def chip_responsivity() -> dict[int, float]:
-    raw = pl.read_parquet(METRICS).filter(pl.col("metric_name") == "delta_i_corrected")
+    raw = scan_metrics(METRICS_DIR, metric_names="delta_i_corrected").collect()
     if raw.height == 0:
         return {}
     agg = raw.group_by("chip_number").agg(
@@ -1,7 +1,7 @@
 """Per-chip distribution of field-effect mobility across all IVg sweeps.
 
 Pulls every `mobility_fe_holes` / `mobility_fe_electrons` row from
-`data/03_derived/_metrics/metrics.parquet`, filters out low-confidence rows
+the metrics store (`data/03_derived/_metrics`), filters out low-confidence rows
 (heavily saturated sweeps), and plots the spread per chip so you can see
 how much μ moves around for the same device across its measurement history.
 
@@ -20,9 +20,10 @@ from matplotlib.patches import Patch
 from rich.console import Console
 from rich.table import Table
 
+from src.derived.metrics_store import scan_metrics
 from src.plotting.shared.styles import set_plot_style
 
-METRICS_PARQUET = Path("data/03_derived/_metrics/metrics.parquet")
+METRICS_DIR = Path("data/03_derived/_metrics")
 OUTPUT_DIR = Path("figs/mobility")
 
 # Drop rows whose extractor confidence is not strictly above this — that
@@ -44,8 +45,11 @@ def load_mobility_rows() -> pl.DataFrame:
     Columns: chip_number, branch, mu_central, mu_min, mu_max, has_light,
              saturation_fraction, bottom_material, confidence, flags, seq_num.
     """
-    df = pl.read_parquet(METRICS_PARQUET)
-    mob = df.filter(pl.col("metric_name").str.starts_with("mobility_fe_"))
+    mob = (
+        scan_metrics(METRICS_DIR)
+        .filter(pl.col("metric_name").str.starts_with("mobility_fe_"))
+        .collect()
+    )
     if mob.height == 0:
         raise SystemExit("No mobility metrics found — run `biotite derive-all-metrics` first.")
 
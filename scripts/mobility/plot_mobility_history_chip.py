@@ -21,9 +21,10 @@ import matplotlib.pyplot as plt
 import numpy as np
 import polars as pl
 
+from src.derived.metrics_store import scan_metrics
 from src.plotting.shared.styles import set_plot_style
 
-METRICS_PARQUET = Path("data/03_derived/_metrics/metrics.parquet")
+METRICS_DIR = Path("data/03_derived/_metrics")
 MANIFEST_PARQUET = Path("data/02_stage/raw_measurements/_manifest/manifest.parquet")
 OUTPUT_DIR = Path("figs/mobility/history")
 
@@ -35,7 +36,7 @@ def load_chip(chip: int) -> pl.DataFrame:
              has_light, branch, mu_central, mu_min, mu_max, confidence, flags,
              quality_flags.
     """
-    mdf = pl.read_parquet(METRICS_PARQUET)
+    mdf = scan_metrics(METRICS_DIR, chip_number=chip).collect()
     man = pl.read_parquet(MANIFEST_PARQUET)
 
     mob = (
@@ -160,14 +161,15 @@ def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--chip", type=int, default=79)
     ap.add_argument("--all", action="store_true",
-                    help="Generate one figure per chip in metrics.parquet")
+                    help="Generate one figure per chip with mobility metrics")
     args = ap.parse_args()
 
     if args.all:
-        mdf = pl.read_parquet(METRICS_PARQUET)
         chips = sorted(
-            mdf.filter(pl.col("metric_name").str.starts_with("mobility_fe_"))
-            ["chip_number"].unique().to_list()
+            scan_metrics(METRICS_DIR)
+            .filter(pl.col("metric_name").str.starts_with("mobility_fe_"))
+            .select(pl.col("chip_number").unique())
+            .collect()["chip_number"].to_list()
         )
         print(f"Generating history figures for {len(chips)} chips...")
         for chip in chips:
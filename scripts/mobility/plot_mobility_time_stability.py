@@ -32,9 +32,10 @@ from matplotlib.patches import Patch
 from rich.console import Console
 from rich.table import Table
 
+from src.derived.metrics_store import scan_metrics
 from src.plotting.shared.styles import set_plot_style
 
-METRICS_PARQUET = Path("data/03_derived/_metrics/metrics.parquet")
+METRICS_DIR = Path("data/03_derived/_metrics")
 MANIFEST_PARQUET = Path("data/02_stage/raw_measurements/_manifest/manifest.parquet")
 ENCAP_YAML = Path("config/encap_characteristics.yaml")
 OUTPUT_DIR = Path("figs/mobility")
@@ -64,7 +65,7 @@ def load_rows() -> tuple[pl.DataFrame, dict[int, str]]:
         encap = yaml.safe_load(f)
     material = {int(k): (v or {}).get("material") for k, v in encap.items() if isinstance(k, int)}
 
-    mdf = pl.read_parquet(METRICS_PARQUET)
+    mdf = scan_metrics(METRICS_DIR).collect()
     man = pl.read_parquet(MANIFEST_PARQUET).with_columns(
         pl.col("start_time_utc").str.to_datetime(
             format="%Y-%m-%d %H:%M:%S%.f%z", strict=False, time_zone="UTC"
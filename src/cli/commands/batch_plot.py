@@ -75,6 +75,8 @@ def batch_plot_command(
       - Parallel mode is fastest for >10 plots with 4+ core CPU
       - Use --parallel 2-4 on typical laptop/desktop
       - Avoid --parallel > CPU cores (diminishing returns)
+      - Parallel mode keeps plots that read the same measurements on the same
+        worker; --dry-run --parallel N shows that plan and the reads it saves
 
     Examples:
         # Sequential execution (best for small batches)
@@ -95,8 +97,7 @@ def batch_plot_command(
     from rich.console import Console
     from rich.panel import Panel
 
-    # Enable parquet caching before src.plotting.shared.batch binds
-    # read_measurement_parquet (it imports plotting modules at import time).
+    # Route measurement reads through the shared data cache
     from src.core.data_cache import enable_parquet_caching
     enable_parquet_caching()
 
@@ -104,7 +105,9 @@ def batch_plot_command(
         load_batch_config,
         execute_sequential,
         execute_parallel,
+        display_plan,
         display_summary,
+        plan_parallel,
     )
 
     console = Console()
@@ -126,12 +129,23 @@ def batch_plot_command(
 
     console.print(f"[green]✓[/green] Loaded {len(plot_specs)} plot specifications for {chip_group}{chip}\n")
 
+    # Group specs that read the same measurements onto the same worker
+    plan = None
+    if parallel and parallel > 1:
+        try:
+            plan = plan_parallel(plot_specs, chip_group, parallel)
+        except Exception as e:
+            console.print(f"[red]Error planning batch:[/red] {e}")
+            raise typer.Exit(1)
+
     # Dry run mode
     if dry_run:
         console.print("[yellow]DRY RUN - Plots that would be generated:[/yellow]\n")
         for i, spec in enumerate(plot_specs, 1):
             console.print(f"{i:3d}. {spec}")
-        console.print(f"\n[dim]Total: {len(plot_specs)} plots[/dim]")
+        console.print(f"\n[dim]Total: {len(plot_specs)} plots[/dim]\n")
+        if plan is not None:
+            display_plan(plan)
         return
 
     # Display execution mode
@@ -139,13 +153,19 @@ def batch_plot_command(
     if parallel:
         console.print(f"[cyan]Workers:[/cyan] {parallel}")
     console.print()
+    if plan is not None:
+        display_plan(plan)
 
     # Execute plots
     start_time = time.time()
 
     try:
         if parallel and parallel > 1:
-            results = execute_parallel(plot_specs, chip_group, parallel)
+            from src.cli.main import get_config
+            results = execute_parallel(
+                plot_specs, chip_group, parallel, plan=plan,
+                cache_mb=get_config().cache_max_size_mb,
+            )
         else:
             results = execute_sequential(plot_specs, chip_group)
     except Exception as e:
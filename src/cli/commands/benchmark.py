@@ -0,0 +1,248 @@
+"""
+Synthetic data and end-to-end benchmark commands.
+
+Provides generate-synthetic-data (raw CSV trees without the DVC data) and
+benchmark-pipeline (timed stage → history → metrics → enrich → plot runs
+with JSON results and baseline regression checks).
+"""
+
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+from src.cli.plugin_system import cli_command
+
+
+@cli_command(
+    name="generate-synthetic-data",
+    group="utilities",
+    description="Write a synthetic raw CSV tree (IVg/VVg/It/Vt/LaserCalibration)"
+)
+def generate_synthetic_data_command(
+    output: Path = typer.Option(
+        Path("data/synthetic/01_raw"),
+        "--output",
+        "-o",
+        help="Raw tree root to write (date folders are created inside)"
+    ),
+    chips: int = typer.Option(2, "--chips", "-c", help="Number of chips"),
+    days: int = typer.Option(2, "--days", "-d", help="Number of measurement days"),
+    chip_group: str = typer.Option("Synth", "--group", "-g", help="Chip group name"),
+    sweep_points: int = typer.Option(201, "--sweep-points", help="Samples per IVg/VVg sweep"),
+    time_points: int = typer.Option(600, "--time-points", help="Samples per It/Vt trace"),
+    noise: float = typer.Option(0.01, "--noise", help="Relative Gaussian noise"),
+    seed: int = typer.Option(0, "--seed", help="RNG seed (same seed, same files)"),
+):
+    """
+    Write a synthetic raw CSV tree in the lab header format.
+
+    Each day has one LaserCalibration per wavelength and, per chip, IVg
+    (dark and illuminated), It, VVg and Vt runs. The tree stages like real
+    data, so the full pipeline can run without the DVC-tracked measurements.
+
+    Examples:
+        # Small tree for a quick end-to-end run
+        python process_and_analyze.py generate-synthetic-data
+
+        # 10 chips over 2 weeks with long traces
+        python process_and_analyze.py generate-synthetic-data -c 10 -d 14 --time-points 5000
+
+        # Then stage it like lab data
+        python process_and_analyze.py stage-all --raw-root data/synthetic/01_raw \\
+            --stage-root data/synthetic/02_stage/raw_measurements
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.core.synthetic_raw import SyntheticSpec, generate_raw_tree
+
+    console = Console()
+    spec = SyntheticSpec(
+        n_chips=chips,
+        chip_group=chip_group,
+        n_days=days,
+        sweep_points=sweep_points,
+        time_points=time_points,
+        noise=noise,
+        seed=seed,
+    )
+
+    with console.status(f"[cyan]Writing {days * spec.files_per_day} files...[/cyan]"):
+        summary = generate_raw_tree(output, spec)
+
+    table = Table(title="Synthetic Raw Data")
+    table.add_column("Procedure", style="cyan")
+    table.add_column("Files", justify="right", style="green")
+    for proc, count in sorted(summary.per_procedure.items()):
+        table.add_row(proc, str(count))
+    console.print(table)
+    console.print(
+        f"\n[green]✓[/green] {summary.files} files, {summary.rows:,} rows "
+        f"({summary.bytes / 1e6:.1f} MB) in {output}"
+    )
+
+
+@cli_command(
+    name="benchmark-pipeline",
+    group="utilities",
+    description="Time staging, histories, metrics, enrichment and plotting on synthetic data"
+)
+def benchmark_pipeline_command(
+    scales: List[str] = typer.Option(
+        ["small"],
+        "--scale",
+        "-s",
+        help="Scale preset (small, medium, large) or <chips>x<days>; repeatable"
+    ),
+    stages: Optional[List[str]] = typer.Option(
+        None,
+        "--stage",
+        help="Only time these stages (staging, histories, metrics, enrichment, plotting); repeatable"
+    ),
+    workers: int = typer.Option(4, "--workers", "-w", help="Workers for staging and metric extraction"),
+    repeat: int = typer.Option(1, "--repeat", "-r", help="Runs per scale (best time is kept)"),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Write results as JSON"
+    ),
+    baseline: Optional[Path] = typer.Option(
+        None,
+        "--baseline",
+        "-b",
+        help="Compare against a results JSON; exit code 1 on regressions"
+    ),
+    save_baseline: Optional[Path] = typer.Option(
+        None,
+        "--save-baseline",
+        help="Also write the results to this baseline file"
+    ),
+    tolerance: float = typer.Option(
+        0.25,
+        "--tolerance",
+        help="Allowed slowdown vs. baseline (0.25 = 25%)"
+    ),
+    workdir: Optional[Path] = typer.Option(
+        None,
+        "--workdir",
+        help="Scratch directory for the workspaces (default: a temp dir)"
+    ),
+    keep: bool = typer.Option(False, "--keep", help="Keep the generated workspaces"),
+):
+    """
+    Benchmark the pipeline end to end on generated data.
+
+    For every scale a synthetic raw tree is generated in a scratch workspace,
+    then staging, history building, metric extraction, enrichment and batch
+    plotting are timed in order. Results are machine-readable JSON; with
+    --baseline, stages more than --tolerance slower than the baseline are
+    reported and the command exits with code 1.
+
+    Baselines are machine-specific: record them on the machine that will
+    run the comparison.
+
+    Examples:
+        # Quick run, print timings
+        python process_and_analyze.py benchmark-pipeline
+
+        # Record a baseline at two scales
+        python process_and_analyze.py benchmark-pipeline -s small -s medium \\
+            --save-baseline benchmarks/baseline.json
+
+        # Check a change against it
+        python process_and_analyze.py benchmark-pipeline -s small -s medium \\
+            --baseline benchmarks/baseline.json -o benchmarks/current.json
+
+        # Only metric extraction, best of 3
+        python process_and_analyze.py benchmark-pipeline --stage metrics -r 3
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.core.benchmark_suite import (
+        STAGES,
+        compare_to_baseline,
+        load_results,
+        run_benchmark,
+        save_results,
+    )
+
+    console = Console()
+
+    reference = None
+    if baseline is not None:
+        if not baseline.exists():
+            console.print(f"[red]Error:[/red] Baseline not found: {baseline}")
+            raise typer.Exit(1)
+        reference = load_results(baseline)
+
+    def report(result):
+        status = "[green]✓[/green]" if result.ok else "[red]✗[/red]"
+        console.print(f"{status} {result.scale:>8s} {result.stage:<11s} {result.seconds:8.2f}s")
+
+    try:
+        results = run_benchmark(
+            scales=scales,
+            workers=workers,
+            repeat=repeat,
+            stages=stages or STAGES,
+            workdir=workdir,
+            keep=keep,
+            progress=report,
+        )
+    except ValueError as e:
+        console.print(f"[red]Error:[/red] {e}")
+        raise typer.Exit(1)
+
+    regressions = compare_to_baseline(results, reference, tolerance) if reference else []
+    flagged = {(r.scale, r.stage): r for r in regressions}
+    base_times = {
+        (r["scale"], r["stage"]): r["seconds"] for r in (reference or {}).get("results", [])
+    }
+
+    table = Table(title="Pipeline Benchmark")
+    table.add_column("Scale", style="cyan")
+    table.add_column("Stage", style="cyan")
+    table.add_column("Items", justify="right")
+    table.add_column("Time (s)", justify="right", style="green")
+    if reference:
+        table.add_column("Baseline (s)", justify="right", style="dim")
+        table.add_column("Change", justify="right")
+
+    for r in results["results"]:
+        row = [r["scale"], r["stage"], str(r["items"]),
+               f"{r['seconds']:.2f}" if r["ok"] else "[red]failed[/red]"]
+        if reference:
+            base = base_times.get((r["scale"], r["stage"]))
+            if base is None or not r["ok"]:
+                row += ["-", "-"]
+            else:
+                change = f"{(r['seconds'] / base - 1) * 100:+.0f}%" if base > 0 else "-"
+                if (r["scale"], r["stage"]) in flagged:
+                    change = f"[red]{change}[/red]"
+                row += [f"{base:.2f}", change]
+        table.add_row(*row)
+    console.print()
+    console.print(table)
+
+    for r in results["results"]:
+        if not r["ok"]:
+            console.print(f"[red]✗[/red] {r['scale']}/{r['stage']}: {r['error']}")
+
+    for path in (output, save_baseline):
+        if path is not None:
+            save_results(results, path)
+            console.print(f"[green]✓[/green] Results written to {path}")
+
+    if regressions:
+        console.print(
+            f"\n[red]✗ {len(regressions)} stage(s) slower than baseline "
+            f"by more than {tolerance:.0%}[/red]"
+        )
+        raise typer.Exit(1)
+    if reference:
+        console.print("\n[green]✓ No regressions against baseline[/green]")
+    if any(not r["ok"] for r in results["results"]):
+        raise typer.Exit(1)
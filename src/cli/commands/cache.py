@@ -18,7 +18,12 @@ from src.cli.plugin_system import cli_command
     description="Display cache statistics and performance metrics"
 )
 def cache_stats_command():
-    """Display cache statistics and performance metrics"""
+    """
+    Display cache statistics and performance metrics.
+
+    Reports the process-wide data cache shared by CLI loads, batch
+    plotting and pairwise metric extraction.
+    """
     from rich.console import Console
     from rich.table import Table
 
@@ -43,6 +48,7 @@ def cache_stats_command():
     table.add_row("Cached Items", str(info['item_count']))
     table.add_row("Cache Size", f"{info['total_size_mb']:.1f} MB")
     table.add_row("Max Size", f"{info['max_size_mb']:.1f} MB")
+    table.add_row("Max Items", str(info['max_items'] or "unbounded"))
     table.add_row("Utilization", f"{info['utilization']:.1%}")
 
     console.print(table)
@@ -53,6 +59,11 @@ def cache_stats_command():
             "\n[yellow]💡 Tip:[/yellow] Low hit rate. Consider increasing "
             "cache_ttl in config for better performance."
         )
+    if stats.evictions:
+        console.print(
+            "\n[yellow]💡 Tip:[/yellow] Entries were evicted to stay within the "
+            "memory budget. Consider increasing cache_max_size_mb in config."
+        )
 
 
 @cli_command(
@@ -170,3 +181,70 @@ def cache_warmup_command(
 
     # Show stats
     cache_stats_command()
+
+
+@cli_command(
+    name="numba-warmup",
+    group="utilities",
+    description="Pre-compile all Numba kernels into the on-disk cache"
+)
+def numba_warmup_command(
+    clear: bool = typer.Option(
+        False,
+        "--clear",
+        help="Delete cached kernels first (measures a cold compile)"
+    ),
+):
+    """
+    Pre-compile every Numba kernel signature used by the extractors.
+
+    Compiled kernels are stored in .numba_cache/ (or $NUMBA_CACHE_DIR), so
+    later runs and spawned derive-all-metrics workers load them from disk
+    instead of re-compiling.
+
+    Examples:
+        # Warm the cache after installing or updating
+        python process_and_analyze.py numba-warmup
+
+        # Measure cold compile cost
+        python process_and_analyze.py numba-warmup --clear
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.derived.algorithms.numba_cache import clear_numba_cache, warmup
+
+    console = Console()
+
+    if clear:
+        removed = clear_numba_cache()
+        console.print(f"[yellow]Removed {removed} cached kernel files[/yellow]")
+
+    with console.status("[cyan]Compiling kernels...[/cyan]"):
+        report = warmup()
+
+    table = Table(title="Numba Kernel Warm-up")
+    table.add_column("Kernel", style="cyan")
+    table.add_column("Source", style="magenta")
+    table.add_column("JIT (ms)", justify="right", style="yellow")
+    table.add_column("Compute (ms)", justify="right", style="green")
+
+    for kernel in report.kernels:
+        if kernel.cache_hits:
+            source = "cache"
+        elif kernel.cache_misses:
+            source = "compiled"
+        else:
+            source = "in memory"
+        table.add_row(
+            kernel.name,
+            source,
+            f"{kernel.jit_s * 1000:.1f}",
+            f"{kernel.compute_s * 1000:.3f}",
+        )
+
+    console.print(table)
+    console.print(
+        f"\n[green]✓[/green] {len(report.kernels)} kernels ready in {report.cache_dir} "
+        f"(JIT {report.jit_seconds:.2f}s, compute {report.compute_seconds * 1000:.1f}ms)"
+    )
@@ -268,7 +268,7 @@ def full_pipeline_command(
     if not skip_metrics:
         derived_dir = config.stage_dir.parent / "03_derived"
         outputs_text += (
-            f"\n  • Metrics: {derived_dir / '_metrics' / 'metrics.parquet'}"
+            f"\n  • Metrics: {derived_dir / '_metrics'}"
         )
 
         if not skip_enrichment:
@@ -330,7 +330,7 @@ def full_pipeline_v2_command(
     if not skip_metrics:
         derived_dir = config.stage_dir.parent / "03_derived"
         outputs_text += (
-            f"\n  • Metrics: {derived_dir / '_metrics' / 'metrics.parquet'}\n"
+            f"\n  • Metrics: {derived_dir / '_metrics'}\n"
             f"  • Enriched histories (Stage 3): {derived_dir / 'chip_histories_enriched'}"
         )
 
@@ -378,6 +378,14 @@ def run_pipeline_yaml_command(
     yaml_file: Path = typer.Argument(..., help="YAML pipeline definition file"),
     enable_rollback: bool = typer.Option(False, "--rollback/--no-rollback"),
     resume: bool = typer.Option(False, "--resume"),
+    jobs: int = typer.Option(
+        1, "--jobs", "-j",
+        help="Run up to N independent steps at once (see depends_on in the YAML)"
+    ),
+    incremental: bool = typer.Option(
+        False, "--incremental",
+        help="Make-like mode: skip steps whose declared inputs and kwargs are unchanged since their last success"
+    ),
 ):
     """
     Load and execute a pipeline from YAML definition.
@@ -399,8 +407,17 @@ def run_pipeline_yaml_command(
               stage_root: data/02_stage/raw_measurements
               workers: 16
             retry_count: 1
+            inputs: [data/01_raw, config/procedures.yml]
+            outputs: [data/02_stage/raw_measurements/_manifest/manifest.parquet]
         ```
 
+    Steps may declare ``inputs``/``outputs`` (paths or globs) and
+    ``depends_on`` (step names). A step waits for its ``depends_on`` and for
+    earlier steps whose outputs it reads; without ``depends_on`` it waits for
+    the previous step. ``--jobs`` runs independent steps concurrently, and
+    ``--incremental`` skips steps whose inputs and kwargs match their last
+    successful run.
+
     Usage:
         # Create custom pipeline
         cat > pipelines/quick-staging.yml << EOF
@@ -416,6 +433,9 @@ def run_pipeline_yaml_command(
 
         # Execute it
         process_and_analyze run-pipeline-yaml pipelines/quick-staging.yml
+
+        # Re-run only what changed, two steps at a time
+        process_and_analyze run-pipeline-yaml config/pipelines/full-pipeline.yml --incremental -j 2
     """
     from src.cli.commands.stage import stage_all_command
     from src.cli.commands.history import build_all_histories_command
@@ -435,6 +455,8 @@ def run_pipeline_yaml_command(
         stop_on_error=True,
         enable_rollback=enable_rollback,
         resume_from="latest" if resume else None,
+        max_parallel=jobs,
+        incremental=incremental,
     )
 
     if not result.success:
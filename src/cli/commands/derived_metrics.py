@@ -15,22 +15,6 @@ def _parse_procedures(procedures: Optional[str]) -> Optional[List[str]]:
     return [p.strip() for p in procedures.split(',') if p.strip()]
 
 
-def _merge_with_existing_metrics(metrics_path: Path, existing_metrics: "Optional[pl.DataFrame]") -> None:
-    import polars as pl
-
-    if existing_metrics is None or existing_metrics.is_empty():
-        return
-
-    new_metrics = pl.read_parquet(metrics_path)
-    combined = pl.concat([new_metrics, existing_metrics], how="vertical")
-    combined = combined.unique(
-        subset=["run_id", "metric_name", "procedure", "seq_num"],
-        keep="first"
-    )
-    combined = combined.sort(["chip_group", "chip_number", "procedure", "seq_num"])
-    combined.write_parquet(metrics_path)
-
-
 def _run_metric_extraction(
     *,
     title: str,
@@ -41,6 +25,7 @@ def _run_metric_extraction(
     force: bool,
     dry_run: bool,
     pipeline,
+    plan: bool = False,
 ) -> Path:
     import polars as pl
     from rich.console import Console
@@ -122,6 +107,34 @@ def _run_metric_extraction(
                              .to_list())
         console.print(f"[dim]Found {len(chip_numbers_list)} chips in group '{chip_group}'[/dim]")
 
+    if plan:
+        plan_df = pipeline.plan_extraction(procedures=procedure_list, chip_numbers=chip_numbers_list)
+
+        table = Table(title="Incremental Extraction Plan")
+        table.add_column("Extractor", style="cyan")
+        table.add_column("Kind", style="dim")
+        table.add_column("Fingerprint", style="dim")
+        table.add_column("Up to date", justify="right", style="green")
+        table.add_column("Stale", justify="right", style="yellow")
+        table.add_column("Missing", justify="right", style="red")
+
+        for row in plan_df.iter_rows(named=True):
+            table.add_row(
+                row["extractor"], row["kind"], row["fingerprint"],
+                str(row["up_to_date"]), str(row["stale"]), str(row["missing"]),
+            )
+
+        console.print()
+        console.print(table)
+        todo = plan_df["stale"].sum() + plan_df["missing"].sum() if plan_df.height else 0
+        console.print()
+        console.print(
+            f"[green]✓[/green] --skip-existing would recompute {todo} cells "
+            f"(stale = extracted with other parameters or algorithm version)"
+        )
+        console.print("[dim]Run without --plan to extract metrics[/dim]")
+        raise typer.Exit(0)
+
     console.print()
     console.print("[cyan]Extracting metrics...[/cyan]")
 
@@ -142,7 +155,9 @@ def _run_metric_extraction(
 
         progress.update(task, completed=True)
 
-    metrics_df = pl.read_parquet(metrics_path)
+    from src.derived.metrics_store import load_metrics
+
+    metrics_df = load_metrics(metrics_path)
 
     console.print()
     console.print(Panel(
@@ -204,8 +219,14 @@ def derive_all_metrics_command(
     skip_existing: bool = typer.Option(
         False,
         "--skip-existing",
-        help="Skip measurements whose run_id already has metrics (incremental). "
-             "Default: re-extract everything so adding/changing extractors updates all rows."
+        help="Incremental: only run extractors and consecutive pairs missing from the extraction ledger "
+             "or recorded with another extractor fingerprint (changed parameters/algorithm version). "
+             "Default: re-extract everything."
+    ),
+    plan: bool = typer.Option(
+        False,
+        "--plan",
+        help="Show per extractor how many cells are up to date, stale or missing, then exit"
     ),
     include_calibrations: bool = typer.Option(
         True,
@@ -248,10 +269,15 @@ def derive_all_metrics_command(
 
         # Preview without processing
         python process_and_analyze.py derive-all-metrics --dry-run
+
+        # Show which extractors an incremental run would recompute
+        python process_and_analyze.py derive-all-metrics --plan
+
+        # Recompute only new and stale cells
+        python process_and_analyze.py derive-all-metrics --skip-existing
     """
     from rich.console import Console
     from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn
 
     from src.cli.main import get_config
 
@@ -275,7 +301,8 @@ def derive_all_metrics_command(
             workers=workers,
             force=not skip_existing,
             dry_run=dry_run,
-            pipeline=pipeline
+            pipeline=pipeline,
+            plan=plan,
         )
 
         # ══════════════════════════════════════════════════════════════════
@@ -326,31 +353,18 @@ def derive_all_metrics_command(
                     total_matched = 0
                     total_missing = 0
 
-                    with Progress(
-                        SpinnerColumn(),
-                        TextColumn("[progress.description]{task.description}"),
-                        console=console,
-                    ) as progress:
-                        task = progress.add_task("[cyan]Enriching histories...", total=len(history_files))
-
-                        for history_path in history_files:
-                            chip_name = history_path.stem.replace("_history", "")
-                            progress.update(task, description=f"[cyan]Processing {chip_name}...")
-
-                            try:
-                                report = matcher.enrich_chip_history(
-                                    history_path,
-                                    output_dir=output_dir,
-                                    force=not skip_existing,
-                                    stale_threshold_hours=stale_threshold
-                                )
-                                all_reports.append(report)
-                                total_matched += report.matched_perfect + report.matched_future + report.matched_stale
-                                total_missing += report.missing
-                            except Exception as e:
-                                console.print(f"\n[red]✗[/red] Error processing {chip_name}: {str(e)}")
-
-                            progress.advance(task)
+                    with console.status("[cyan]Enriching histories...[/cyan]"):
+                        all_reports = matcher.enrich_chip_histories(
+                            history_files,
+                            output_dir=output_dir,
+                            force=not skip_existing,
+                            stale_threshold_hours=stale_threshold
+                        )
+                    for report in all_reports:
+                        total_matched += report.matched_perfect + report.matched_future + report.matched_stale
+                        total_missing += report.missing
+                        for error in report.errors:
+                            console.print(f"[red]✗[/red] Error processing {report.chip_name}: {error}")
 
                     # Display summary
                     console.print()
@@ -383,6 +397,8 @@ def derive_all_metrics_command(
         console.print(f"[red]Error:[/red] {e}")
         console.print("[yellow]Hint:[/yellow] Run [cyan]stage-all[/cyan] first to create manifest.parquet")
         raise typer.Exit(1)
+    except typer.Exit:
+        raise
     except Exception as e:
         console.print(f"[red]Error:[/red] {e}")
         import traceback
@@ -450,7 +466,6 @@ def derive_fitting_metrics_command(
         # Limit to ITS only
         python process_and_analyze.py derive-fitting-metrics --procedures ITS
     """
-    import polars as pl
     from rich.console import Console
 
     from src.derived.metric_pipeline import MetricPipeline
@@ -481,11 +496,6 @@ def derive_fitting_metrics_command(
         extraction_version=None
     )
 
-    existing_metrics = None
-    metrics_path = pipeline.derived_dir / "_metrics" / "metrics.parquet"
-    if metrics_path.exists():
-        existing_metrics = pl.read_parquet(metrics_path)
-
     metrics_path = _run_metric_extraction(
         title="[bold green]Fitting Metrics Extraction[/bold green]",
         procedures=procedures,
@@ -497,9 +507,7 @@ def derive_fitting_metrics_command(
         pipeline=pipeline
     )
 
-    _merge_with_existing_metrics(metrics_path, existing_metrics)
-    if existing_metrics is not None and not existing_metrics.is_empty():
-        console.print(f"[dim]Merged with existing metrics: {metrics_path}[/dim]")
+    console.print(f"[dim]Appended to metrics dataset: {metrics_path}[/dim]")
 
     console.print()
 
@@ -556,7 +564,6 @@ def derive_consecutive_sweeps_command(
         # Limit to a single chip
         python process_and_analyze.py derive-consecutive-sweeps --chip 75
     """
-    import polars as pl
     from rich.console import Console
 
     from src.derived.metric_pipeline import MetricPipeline
@@ -578,11 +585,6 @@ def derive_consecutive_sweeps_command(
         extraction_version=None
     )
 
-    existing_metrics = None
-    metrics_path = pipeline.derived_dir / "_metrics" / "metrics.parquet"
-    if metrics_path.exists():
-        existing_metrics = pl.read_parquet(metrics_path)
-
     metrics_path = _run_metric_extraction(
         title="[bold green]Consecutive Sweep Metrics Extraction[/bold green]",
         procedures=procedures,
@@ -594,9 +596,7 @@ def derive_consecutive_sweeps_command(
         pipeline=pipeline
     )
 
-    _merge_with_existing_metrics(metrics_path, existing_metrics)
-    if existing_metrics is not None and not existing_metrics.is_empty():
-        console.print(f"[dim]Merged with existing metrics: {metrics_path}[/dim]")
+    console.print(f"[dim]Appended to metrics dataset: {metrics_path}[/dim]")
 
     console.print()
 
@@ -760,3 +760,60 @@ def enrich_history_command(
         raise typer.Exit(1)
 
     console.print()
+
+
+@cli_command(
+    name="compact-metrics",
+    group="pipeline",
+    description="Compact the partitioned metrics dataset"
+)
+def compact_metrics_command(
+    min_files: int = typer.Option(
+        2,
+        "--min-files",
+        help="Only compact partitions with at least this many part files"
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Report what would be compacted without writing anything"
+    ),
+):
+    """
+    Fold each metrics partition into a single file, dropping superseded rows.
+
+    Every derive-* run appends new part files under
+    data/03_derived/_metrics/dataset/metric_name=/chip_group=/chip_number=/.
+    Compaction keeps the newest row per (run_id, metric_name) and rewrites
+    each partition as one file. A legacy metrics.parquet is migrated into
+    the dataset on the first run.
+
+    Examples:
+        # Compact everything
+        python process_and_analyze.py compact-metrics
+
+        # Preview only
+        python process_and_analyze.py compact-metrics --dry-run
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.derived.metrics_store import compact_metrics
+
+    console = Console()
+    metrics_dir = Path("data/03_derived/_metrics")
+
+    report = compact_metrics(metrics_dir, min_files=min_files, dry_run=dry_run)
+
+    table = Table(title="Metrics Compaction" + (" (dry run)" if dry_run else ""))
+    table.add_column("Item", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    table.add_row("Partitions", str(report.partitions))
+    table.add_row("Partitions compacted", str(report.partitions_compacted))
+    table.add_row("Part files replaced", str(report.files_removed))
+    table.add_row("Rows", f"{report.rows_before} → {report.rows_after}")
+    table.add_row("Legacy metrics.parquet migrated", "yes" if report.legacy_migrated else "no")
+
+    console.print()
+    console.print(table)
+    console.print()
@@ -82,6 +82,7 @@ def enrich_all_histories_command(
     from rich.progress import Progress, SpinnerColumn, TextColumn
 
     from src.cli.main import get_config
+    from src.derived.metrics_store import metrics_exist, scan_metrics
 
     console = Console()
 
@@ -109,16 +110,17 @@ def enrich_all_histories_command(
     config = get_config()
 
     # Check if metrics exist
-    metrics_path = Path("data/03_derived/_metrics/metrics.parquet")
+    metrics_path = Path("data/03_derived/_metrics")
+    have_metrics = metrics_exist(metrics_path)
 
-    if not metrics_path.exists() and skip_derive:
+    if not have_metrics and skip_derive:
         console.print(f"[red]Error:[/red] No metrics found at {metrics_path}")
         console.print("[yellow]Hint:[/yellow] Remove --skip-derive to automatically extract metrics first")
         raise typer.Exit(1)
 
     # Step 1: Extract metrics if needed
     if not skip_derive:
-        if not metrics_path.exists():
+        if not have_metrics:
             console.print("[yellow]⚠[/yellow] No metrics found - extracting metrics first...")
             console.print()
         elif force_derive:
@@ -129,7 +131,7 @@ def enrich_all_histories_command(
             console.print(f"[dim]Use --force-derive to re-extract metrics[/dim]")
             console.print()
 
-        if not metrics_path.exists() or force_derive:
+        if not have_metrics or force_derive:
             # Run derive-all-metrics
             from src.derived.metric_pipeline import MetricPipeline
 
@@ -199,15 +201,14 @@ def enrich_all_histories_command(
 
         console.print(f"[dim]Adding power data to {len(history_files)} histories...[/dim]")
 
-        for history_path in history_files:
-            try:
-                matcher.enrich_chip_history(
-                    history_path,
-                    output_dir=output_dir,
-                    force=True  # Always update
-                )
-            except Exception as e:
-                console.print(f"[yellow]⚠[/yellow] Calibration enrichment warning for {history_path.stem}: {e}")
+        reports = matcher.enrich_chip_histories(
+            history_files,
+            output_dir=output_dir,
+            force=True  # Always update
+        )
+        for report in reports:
+            for error in report.errors:
+                console.print(f"[yellow]⚠[/yellow] Calibration enrichment warning for {report.chip_name}: {error}")
 
         console.print(f"[green]✓[/green] Calibration enrichment complete")
         console.print()
@@ -221,12 +222,9 @@ def enrich_all_histories_command(
     # Step 3: Metric enrichment (add metric columns to calibration-enriched histories)
     console.print("[cyan]Adding metric columns to enriched histories...[/cyan]")
     try:
-        # Load metrics
-        metrics_path = Path("data/03_derived/_metrics/metrics.parquet")
-        if not metrics_path.exists():
+        if not metrics_exist(metrics_path):
             console.print("[yellow]⚠[/yellow] No metrics found, skipping metric enrichment")
         else:
-            metrics = pl.read_parquet(metrics_path)
             enriched_dir = config.stage_dir.parent / "03_derived" / "chip_histories_enriched"
             enriched_files = sorted(enriched_dir.glob("*_history.parquet"))
 
@@ -274,11 +272,12 @@ def enrich_all_histories_command(
                             # Read enriched history (already has power column from step 2)
                             history = pl.read_parquet(enriched_path)
 
-                            # Filter metrics for this chip
-                            chip_metrics = metrics.filter(
-                                (pl.col("chip_number") == extracted_number) &
-                                (pl.col("chip_group") == extracted_group)
-                            )
+                            # Load metrics for this chip (only its partitions are read)
+                            chip_metrics = scan_metrics(
+                                metrics_path,
+                                chip_group=extracted_group,
+                                chip_number=extracted_number,
+                            ).collect()
 
                             # Get unique metric names and add them as columns
                             unique_metrics = chip_metrics["metric_name"].unique().to_list()
@@ -5,10 +5,13 @@ from __future__ import annotations
 import re
 import typer
 from pathlib import Path
-from typing import Optional, List
+from typing import TYPE_CHECKING, Dict, Optional, List
 
 from src.cli.plugin_system import cli_command
 
+if TYPE_CHECKING:
+    from src.derived.extractors.calibration_matcher import EnrichmentReport
+
 
 @cli_command(
     name="enrich-history",
@@ -57,7 +60,7 @@ def enrich_history_unified_command(
     skip_derive: bool = typer.Option(
         False,
         "--skip-derive",
-        help="Skip metric extraction (use existing metrics.parquet)"
+        help="Skip metric extraction (use existing metrics)"
     ),
     derive_first: bool = typer.Option(
         False,
@@ -216,8 +219,9 @@ def enrich_history_unified_command(
 
     # Step 6: Check prerequisites
     if do_metrics and not skip_derive:
-        metrics_path = Path("data/03_derived/_metrics/metrics.parquet")
-        if not metrics_path.exists() or derive_first:
+        from src.derived.metrics_store import metrics_exist
+
+        if not metrics_exist(Path("data/03_derived/_metrics")) or derive_first:
             if derive_first:
                 console.print("[yellow]⚠[/yellow] --derive-first specified: Running metric extraction...")
             else:
@@ -230,6 +234,23 @@ def enrich_history_unified_command(
             console.print()
 
     # Step 7: Run enrichment pipeline
+    # Calibrations for all selected chips are matched in one pass up front
+    calibration_reports = {}
+    if do_calibrations:
+        history_files = [
+            history_dir / f"{chip_group or 'Alisson'}{chip_num}_history.parquet"
+            for chip_num in chip_numbers
+        ]
+        calibration_reports = _enrich_calibrations(
+            [f for f in history_files if f.exists()],
+            output_dir,
+            stale_threshold,
+            force,
+            dry_run,
+            console,
+            verbose
+        )
+
     success_count = 0
     error_count = 0
     skipped_count = 0
@@ -259,18 +280,16 @@ def enrich_history_unified_command(
                     progress.advance(task)
                     continue
 
-                # Run calibrations enrichment
-                if do_calibrations:
-                    _enrich_calibrations(
-                        chip_name,
-                        history_file,
-                        output_dir,
-                        stale_threshold,
-                        force,
-                        dry_run,
-                        console,
-                        verbose
-                    )
+                # Report calibrations enrichment (done for all chips above)
+                report = calibration_reports.get(chip_name)
+                if verbose and report is not None:
+                    if report.errors:
+                        console.print(f"  [yellow]⚠[/yellow] Calibration enrichment warning for {chip_name}: "
+                                      f"{'; '.join(report.errors)}")
+                    else:
+                        console.print(f"  [dim]{chip_name}: {report.matched_perfect} perfect, "
+                                      f"{report.matched_future} future, {report.matched_stale} stale, "
+                                      f"{report.missing} missing[/dim]")
 
                 # Run metrics enrichment
                 if do_metrics:
@@ -416,41 +435,40 @@ def _run_derive_all_metrics(
 
 
 def _enrich_calibrations(
-    chip_name: str,
-    history_file: Path,
+    history_files: List[Path],
     output_dir: Path,
     stale_threshold: float,
     force: bool,
     dry_run: bool,
     console: "Console",
     verbose: bool
-):
-    """Add calibration power columns using CalibrationMatcher."""
+) -> Dict[str, "EnrichmentReport"]:
+    """Add calibration power columns to all histories using CalibrationMatcher."""
     from src.derived.extractors import CalibrationMatcher
 
     manifest_path = Path("data/02_stage/raw_measurements/_manifest/manifest.parquet")
     if not manifest_path.exists():
-        console.print(f"[yellow]⚠[/yellow] Manifest not found, skipping calibration enrichment for {chip_name}")
-        return
+        console.print("[yellow]⚠[/yellow] Manifest not found, skipping calibration enrichment")
+        return {}
+
+    if dry_run or not history_files:
+        return {}
 
     try:
         matcher = CalibrationMatcher(manifest_path)
-
-        if not dry_run:
-            report = matcher.enrich_chip_history(
-                history_file,
+        with console.status("[cyan]Matching calibrations...[/cyan]"):
+            reports = matcher.enrich_chip_histories(
+                history_files,
                 output_dir=output_dir,
                 force=force,
                 stale_threshold_hours=stale_threshold
             )
-
-            if verbose and report:
-                console.print(f"  [dim]{chip_name}: {report.matched_perfect} perfect, "
-                            f"{report.matched_future} future, {report.matched_stale} stale, "
-                            f"{report.missing} missing[/dim]")
     except Exception as e:
         if verbose:
-            console.print(f"  [yellow]⚠[/yellow] Calibration enrichment warning for {chip_name}: {e}")
+            console.print(f"  [yellow]⚠[/yellow] Calibration enrichment warning: {e}")
+        return {}
+
+    return {report.chip_name: report for report in reports}
 
 
 def _enrich_metrics(
@@ -464,12 +482,13 @@ def _enrich_metrics(
     console: "Console",
     verbose: bool
 ):
-    """Add derived metric columns by joining with metrics.parquet."""
+    """Add derived metric columns by joining with the metrics dataset."""
     import polars as pl
+    from src.derived.metrics_store import metrics_exist, scan_metrics
 
-    metrics_path = Path("data/03_derived/_metrics/metrics.parquet")
+    metrics_dir = Path("data/03_derived/_metrics")
 
-    if not metrics_path.exists():
+    if not metrics_exist(metrics_dir):
         console.print(f"[yellow]⚠[/yellow] Metrics not found, skipping metric enrichment for {chip_name}")
         console.print("[dim]  Run 'derive-all-metrics' first or use --derive-first[/dim]")
         return
@@ -479,20 +498,13 @@ def _enrich_metrics(
         return
 
     try:
-        # Load metrics
-        all_metrics = pl.read_parquet(metrics_path)
-
-        # Filter by chip if needed
-        chip_metrics = all_metrics.filter(
-            (pl.col("chip_number") == chip_num) &
-            (pl.col("chip_group") == chip_group)
-        )
-
-        # Filter by metric type if not "all"
-        if metric_list != ["all"]:
-            chip_metrics = chip_metrics.filter(
-                pl.col("metric_name").is_in(metric_list)
-            )
+        # Load this chip's metrics (filtered by metric type if not "all")
+        chip_metrics = scan_metrics(
+            metrics_dir,
+            chip_group=chip_group,
+            chip_number=chip_num,
+            metric_names=None if metric_list == ["all"] else metric_list,
+        ).collect()
 
         if chip_metrics.height == 0:
             if verbose:
@@ -361,6 +361,7 @@ def export_latex_command(
     from rich.panel import Panel
 
     from src.cli.context import get_context
+    from src.derived.metrics_store import metrics_exist, scan_metrics
 
     ctx = get_context()
 
@@ -377,7 +378,7 @@ def export_latex_command(
     chip_name = f"{chip_group}{chip_number}"
     enriched_dir = Path("data/03_derived/chip_histories_enriched")
     enriched_file = enriched_dir / f"{chip_name}_history.parquet"
-    metrics_file = Path("data/03_derived/_metrics/metrics.parquet")
+    metrics_dir = Path("data/03_derived/_metrics")
 
     if enriched_file.exists():
         console.print(f"[green]✓[/green] Loading enriched history from: {enriched_file}")
@@ -385,14 +386,14 @@ def export_latex_command(
         history_type = "enriched"
 
         # Join with metrics for CNP, delta_current, delta_voltage
-        if metrics_file.exists():
-            metrics = pl.read_parquet(metrics_file)
-
-            # Filter metrics for this chip
-            chip_metrics = metrics.filter(
-                (pl.col("chip_number") == chip_number) &
-                (pl.col("chip_group") == chip_group)
-            )
+        if metrics_exist(metrics_dir):
+            # Only this chip's partitions are read
+            chip_metrics = scan_metrics(
+                metrics_dir,
+                chip_group=chip_group,
+                chip_number=chip_number,
+                metric_names=["cnp_voltage", "delta_current", "delta_voltage"],
+            ).collect()
 
             # Join CNP voltage
             cnp_metrics = chip_metrics.filter(pl.col("metric_name") == "cnp_voltage")
@@ -109,6 +109,7 @@ def show_history_command(
     from rich import box
 
     from src.cli.context import get_context
+    from src.derived.metrics_store import metrics_exist, scan_metrics
     from src.cli.history_utils import (
         filter_history,
         summarize_history,
@@ -146,7 +147,7 @@ def show_history_command(
     # Try to load enriched history from Stage 3 first (has calibration data)
     # If not available, fall back to Stage 2 and try to join with metrics
     enriched_history_file = ctx.stage_dir.parent / "03_derived" / "chip_histories_enriched" / f"{chip_name}_history.parquet"
-    metrics_file = ctx.stage_dir.parent / "03_derived" / "_metrics" / "metrics.parquet"
+    metrics_dir = ctx.stage_dir.parent / "03_derived" / "_metrics"
 
     try:
         if enriched_history_file.exists():
@@ -154,14 +155,14 @@ def show_history_command(
             history = pl.read_parquet(enriched_history_file)
 
             # Try to join with metrics for CNP and photoresponse
-            if metrics_file.exists():
-                metrics = pl.read_parquet(metrics_file)
-
-                # Filter metrics for this chip
-                chip_metrics = metrics.filter(
-                    (pl.col("chip_number") == chip_number) &
-                    (pl.col("chip_group") == chip_group)
-                )
+            if metrics_exist(metrics_dir):
+                # Only this chip's partitions are read
+                chip_metrics = scan_metrics(
+                    metrics_dir,
+                    chip_group=chip_group,
+                    chip_number=chip_number,
+                    metric_names=["cnp_voltage", "delta_current", "delta_voltage"],
+                ).collect()
 
                 # Pivot metrics to wide format (one column per metric type)
                 # Join CNP voltage
@@ -797,6 +798,11 @@ def build_all_histories_command(
         "-n",
         help="Minimum experiments required to generate history"
     ),
+    only_changed: bool = typer.Option(
+        False,
+        "--only-changed",
+        help="Only rewrite history files whose content changed since the last build"
+    ),
 ):
     """
     Build histories for all chips found in staged manifest data.
@@ -810,6 +816,9 @@ def build_all_histories_command(
 
         # Build only for Alisson chips with at least 10 experiments
         process_and_analyze build-all-histories -g Alisson -n 10
+
+        # Rewrite only histories affected by newly staged data
+        process_and_analyze build-all-histories --only-changed
     """
     from rich.panel import Panel
     from rich.progress import Progress, SpinnerColumn, TextColumn
@@ -863,6 +872,7 @@ def build_all_histories_command(
                 output_dir,
                 min_experiments=min_experiments,
                 chip_group=chip_group,
+                only_changed=only_changed,
             )
 
             progress.update(task, completed=True)
@@ -1013,7 +1023,6 @@ def enrich_histories_command(
     """
     import polars as pl
     from rich.panel import Panel
-    from rich.progress import Progress, SpinnerColumn, TextColumn
 
     from src.cli.context import get_context
     from src.derived.extractors import CalibrationMatcher, print_enrichment_report
@@ -1101,54 +1110,47 @@ def enrich_histories_command(
     total_matched = 0
     total_missing = 0
 
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("[cyan]Enriching histories...", total=len(history_files))
+    if not dry_run:
+        # All chips are matched against the calibrations in a single pass
+        with ctx.console.status("[cyan]Enriching histories...[/cyan]"):
+            all_reports = matcher.enrich_chip_histories(
+                history_files,
+                output_dir=output_dir,
+                force=force,
+                stale_threshold_hours=stale_threshold
+            )
+        for report in all_reports:
+            for error in report.errors:
+                ctx.print(f"[red]✗[/red] Error processing {report.chip_name}: {error}")
+    else:
+        from src.derived.extractors import EnrichmentReport
 
         for history_path in history_files:
             chip_name = history_path.stem.replace("_history", "")
-            progress.update(task, description=f"[cyan]Processing {chip_name}...")
-
             try:
-                if not dry_run:
-                    report = matcher.enrich_chip_history(
-                        history_path,
-                        output_dir=output_dir,
-                        force=force,
-                        stale_threshold_hours=stale_threshold
-                    )
-                else:
-                    # Dry run: just analyze without writing
-                    history = pl.read_parquet(history_path)
-                    light_col = "has_light" if "has_light" in history.columns else "with_light"
-                    light_exps = history.filter(
-                        (pl.col(light_col) == True) &
-                        (pl.col("proc") != "LaserCalibration")
-                    )
-                    # Create dummy report
-                    from src.derived.extractors import EnrichmentReport
-                    report = EnrichmentReport(
-                        chip_name=chip_name,
-                        total_light_exps=light_exps.height,
-                        matched_perfect=0,
-                        matched_future=0,
-                        matched_stale=0,
-                        missing=0,
-                        warnings=["[DRY RUN] Analysis not performed"],
-                        errors=[]
-                    )
-
-                all_reports.append(report)
-                total_matched += report.matched_perfect + report.matched_future + report.matched_stale
-                total_missing += report.missing
-
+                # Dry run: just analyze without writing
+                history = pl.read_parquet(history_path)
+                light_col = "has_light" if "has_light" in history.columns else "with_light"
+                light_exps = history.filter(
+                    (pl.col(light_col) == True) &
+                    (pl.col("proc") != "LaserCalibration")
+                )
+                all_reports.append(EnrichmentReport(
+                    chip_name=chip_name,
+                    total_light_exps=light_exps.height,
+                    matched_perfect=0,
+                    matched_future=0,
+                    matched_stale=0,
+                    missing=0,
+                    warnings=["[DRY RUN] Analysis not performed"],
+                    errors=[]
+                ))
             except Exception as e:
                 ctx.print(f"\n[red]✗[/red] Error processing {chip_name}: {str(e)}")
 
-            progress.advance(task)
+    for report in all_reports:
+        total_matched += report.matched_perfect + report.matched_future + report.matched_stale
+        total_missing += report.missing
 
     # Display individual reports
     ctx.print()
@@ -1209,6 +1211,7 @@ def validate_calibration_links_command(
     from rich.panel import Panel
 
     from src.cli.context import get_context
+    from src.core.packed_store import measurement_exists
 
     ctx = get_context()
 
@@ -1257,7 +1260,7 @@ def validate_calibration_links_command(
         chip_broken = []
 
         for cal_path in cal_paths:
-            if not Path(cal_path).exists():
+            if not measurement_exists(Path(cal_path)):
                 broken_links += 1
                 chip_broken.append(cal_path)
             else:
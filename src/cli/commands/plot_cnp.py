@@ -84,6 +84,7 @@ def plot_cnp_time_command(
     from src.cli.context import get_context
     from src.cli.main import get_config, get_plot_config
     from src.plotting.cnp_time import plot_cnp_vs_time
+    from src.derived.metrics_store import metrics_exist, scan_metrics
 
     ctx = get_context()
     config = get_config()
@@ -104,7 +105,7 @@ def plot_cnp_time_command(
 
     # Try to load enriched history from Stage 3 (has CNP joined)
     enriched_history_file = config.stage_dir.parent / "03_derived" / "chip_histories_enriched" / f"{chip_name}_history.parquet"
-    metrics_file = config.stage_dir.parent / "03_derived" / "_metrics" / "metrics.parquet"
+    metrics_dir = config.stage_dir.parent / "03_derived" / "_metrics"
 
     # Load history with CNP data
     ctx.print("[cyan]Loading chip history and CNP metrics...[/cyan]")
@@ -130,19 +131,18 @@ def plot_cnp_time_command(
             # Drop the old string column
             history = history.drop("cnp_voltage")
 
-        if not metrics_file.exists():
+        if not metrics_exist(metrics_dir):
             ctx.print(f"[red]Error:[/red] No CNP metrics found")
             ctx.print("[yellow]Hint:[/yellow] Run [cyan]derive-all-metrics[/cyan] first to extract CNP values")
             raise typer.Exit(1)
 
-        metrics = pl.read_parquet(metrics_file)
-
-        # Filter metrics for this chip and CNP only
-        cnp_metrics = metrics.filter(
-            (pl.col("chip_number") == chip_number) &
-            (pl.col("chip_group") == chip_group) &
-            (pl.col("metric_name") == "cnp_voltage")
-        )
+        # Only this chip's cnp_voltage partition is read
+        cnp_metrics = scan_metrics(
+            metrics_dir,
+            chip_group=chip_group,
+            chip_number=chip_number,
+            metric_names="cnp_voltage",
+        ).collect()
 
         if cnp_metrics.height == 0:
             ctx.print(f"[red]Error:[/red] No CNP data found for {chip_name}")
@@ -147,25 +147,26 @@ def plot_its_relaxation_command(
         its_experiments = dark_its
 
     # Load metrics
-    metrics_path = base_dir / "data/03_derived/_metrics/metrics.parquet"
-    if not metrics_path.exists():
-        print_error(f"Metrics file not found: {metrics_path}")
+    from src.derived.metrics_store import metrics_exist, scan_metrics
+
+    metrics_path = base_dir / "data/03_derived/_metrics"
+    if not metrics_exist(metrics_path):
+        print_error(f"Metrics not found: {metrics_path}")
         ctx.print("[yellow]Run: [cyan]derive-all-metrics[/cyan] to extract relaxation times[/yellow]")
         raise typer.Exit(1)
 
+    # Load relaxation_time metrics (only this chip's partitions are read)
     try:
-        all_metrics = pl.read_parquet(metrics_path)
+        relaxation_metrics = scan_metrics(
+            metrics_path,
+            chip_group=chip_group,
+            chip_number=chip_number,
+            metric_names="relaxation_time",
+        ).collect()
     except Exception as e:
         print_error(f"Failed to load metrics: {e}")
         raise typer.Exit(1)
 
-    # Filter to relaxation_time metrics
-    relaxation_metrics = all_metrics.filter(
-        (pl.col("metric_name") == "relaxation_time") &
-        (pl.col("chip_number") == chip_number) &
-        (pl.col("chip_group") == chip_group)
-    )
-
     if relaxation_metrics.height == 0:
         print_error(f"No relaxation metrics found for chip {chip_name}")
         ctx.print("[yellow]Run: [cyan]derive-all-metrics[/cyan] to extract relaxation times[/yellow]")
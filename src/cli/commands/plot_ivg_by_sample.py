@@ -47,6 +47,7 @@ def plot_ivg_by_sample_command(
     """
     from rich.console import Console
 
+    from src.core.header_catalog import HEADER_CATALOG_FILENAME
     from src.plotting.ivg_by_sample import plot_ivg_by_sample
     from src.plotting.shared.config import PlotConfig
 
@@ -63,6 +64,8 @@ def plot_ivg_by_sample_command(
     if manifest_path is None:
         manifest_path = Path("data/02_stage/_manifest/manifest.parquet")
 
+    catalog_path = manifest_path.parent / HEADER_CATALOG_FILENAME
+
     if output_dir is None:
         output_dir = Path("figs")
 
@@ -80,6 +83,7 @@ def plot_ivg_by_sample_command(
             manifest_path=manifest_path if manifest_path.exists() else None,
             conductance=conductance,
             config=config,
+            catalog_path=catalog_path,
         )
 
         if output_path:
@@ -51,6 +51,7 @@ def plot_ivg_by_sample_group_command(
     from rich.console import Console
     from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 
+    from src.core.header_catalog import HEADER_CATALOG_FILENAME, HeaderCatalog
     from src.plotting.ivg_by_sample import plot_ivg_by_sample
     from src.plotting.shared.config import PlotConfig
 
@@ -67,6 +68,8 @@ def plot_ivg_by_sample_group_command(
     if manifest_path is None:
         manifest_path = Path("data/02_stage/_manifest/manifest.parquet")
 
+    catalog_path = manifest_path.parent / HEADER_CATALOG_FILENAME
+
     if output_dir is None:
         output_dir = Path("figs")
 
@@ -96,55 +99,12 @@ def plot_ivg_by_sample_group_command(
 
     # Fallback to raw CSV scan
     if not chip_numbers and raw_root and raw_root.exists():
-        console.print(f"  Scanning raw CSVs...")
-        from src.core.stage_raw_measurements import discover_csvs
-        import re
-
-        KV_PAT = re.compile(r"^#\s*([^:]+):\s*(.*)\s*$")
-        PROC_LINE_RE = re.compile(r"^#\s*Procedure\s*:\s*<.*\.([^.>]+)>.*$", re.I)
-
-        all_csvs = discover_csvs(raw_root)
-
-        for csv_path in all_csvs:
-            proc_type = None
-            found_chip_group = None
-            found_chip_number = None
-
-            try:
-                with open(csv_path, "r", encoding="utf-8", errors="replace") as f:
-                    for line in f:
-                        line = line.strip()
-
-                        # Stop at data section
-                        if line.startswith("#\tData:") or (line and not line.startswith("#")):
-                            break
-
-                        # Extract procedure type
-                        if proc_type is None:
-                            m = PROC_LINE_RE.match(line)
-                            if m:
-                                proc_type = m.group(1)
-
-                        # Parse key-value pairs
-                        m = KV_PAT.match(line)
-                        if m:
-                            key = m.group(1).strip()
-                            value = m.group(2).strip()
-
-                            if key.lower() in ["chip group name", "chip group"]:
-                                found_chip_group = value
-                            elif key.lower() in ["chip number", "chip"]:
-                                try:
-                                    found_chip_number = int(value)
-                                except ValueError:
-                                    pass
-
-            except Exception:
-                continue
-
-            # Check if this matches our target group
-            if proc_type == "IVg" and found_chip_group == chip_group and found_chip_number is not None:
-                chip_numbers.add(found_chip_number)
+        console.print(f"  Scanning raw CSV headers...")
+        catalog = HeaderCatalog.load(catalog_path)
+        catalog.refresh(raw_root)
+        catalog.save()
+        found = catalog.query(proc="IVg", chip_group=chip_group)["chip_number"]
+        chip_numbers = set(found.drop_nulls().unique().to_list())
 
         console.print(f"  ✓ Found {len(chip_numbers)} chips in raw data")
 
@@ -189,6 +149,7 @@ def plot_ivg_by_sample_group_command(
                     manifest_path=manifest_path if manifest_path.exists() else None,
                     conductance=conductance,
                     config=config,
+                    catalog_path=catalog_path,
                 )
 
                 if output_path:
@@ -134,6 +134,7 @@ def plot_photoresponse_command(
     from src.cli.context import get_context
     from src.cli.main import get_config, get_plot_config
     from src.plotting.photoresponse import plot_photoresponse
+    from src.derived.metrics_store import metrics_exist, scan_metrics
 
     ctx = get_context()
 
@@ -180,7 +181,7 @@ def plot_photoresponse_command(
 
     # Load enriched history from Stage 3
     enriched_history_file = config.stage_dir.parent / "03_derived" / "chip_histories_enriched" / f"{chip_name}_history.parquet"
-    metrics_file = config.stage_dir.parent / "03_derived" / "_metrics" / "metrics.parquet"
+    metrics_dir = config.stage_dir.parent / "03_derived" / "_metrics"
 
     ctx.print("[cyan]Loading chip history and metrics...[/cyan]")
 
@@ -194,19 +195,18 @@ def plot_photoresponse_command(
     # Join with photoresponse metrics if not already joined
     metric_col = metric  # Metrics use delta_current/delta_voltage names
     if metric_col not in history.columns:
-        if not metrics_file.exists():
+        if not metrics_exist(metrics_dir):
             ctx.print(f"[red]Error:[/red] No metrics found")
             ctx.print("[yellow]Hint:[/yellow] Run [cyan]derive-all-metrics[/cyan] first")
             raise typer.Exit(1)
 
-        metrics = pl.read_parquet(metrics_file)
-
-        # Filter metrics for this chip and photoresponse only
-        photo_metrics = metrics.filter(
-            (pl.col("chip_number") == chip_number) &
-            (pl.col("chip_group") == chip_group) &
-            (pl.col("metric_name") == metric_col)
-        )
+        # Only this chip's photoresponse partition is read
+        photo_metrics = scan_metrics(
+            metrics_dir,
+            chip_group=chip_group,
+            chip_number=chip_number,
+            metric_names=metric_col,
+        ).collect()
 
         if photo_metrics.height == 0:
             ctx.print(f"[red]Error:[/red] No photoresponse data found for {chip_name}")
@@ -1,4 +1,4 @@
-"""Staging pipeline commands: stage-all, stage-incremental, validate-manifest, inspect-manifest."""
+"""Staging pipeline commands: stage-all, stage-incremental, validate-manifest, inspect-manifest, migrate-run-ids, pack-staged."""
 
 import typer
 from pathlib import Path
@@ -39,7 +39,7 @@ def stage_all_command(
     events_dir: Optional[Path] = typer.Option(
         None,
         "--events-dir",
-        help="Directory for event JSONs (auto: {stage_root}/_manifest/events)"
+        help="Event log directory (auto: {stage_root}/_manifest/events)"
     ),
     manifest: Optional[Path] = typer.Option(
         None,
@@ -80,6 +80,16 @@ def stage_all_command(
         "--strict",
         help="Strict validation mode - fail on schema errors (missing required columns, etc.)"
     ),
+    full_scan: bool = typer.Option(
+        False,
+        "--full-scan",
+        help="Ignore the source index and hand every CSV to the workers"
+    ),
+    fingerprint: bool = typer.Option(
+        False,
+        "--fingerprint",
+        help="Fingerprint sources so files with a new mtime but identical content are still skipped"
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -94,6 +104,10 @@ def stage_all_command(
     parses headers and data, validates against the procedures schema,
     and writes partitioned Parquet files with a centralized manifest.
 
+    Files already staged and unchanged since the last run (same size and
+    mtime in _manifest/source_index.parquet) are skipped without being
+    opened. Use --full-scan or --force to bypass the index.
+
     By default, shows a clean spinner during processing. Use --verbose
     to see detailed file-by-file progress.
 
@@ -168,6 +182,7 @@ def stage_all_command(
     config_table.add_row("Force Overwrite", "✓ Yes" if force else "✗ No")
     config_table.add_row("Only YAML Columns", "✓ Yes" if only_yaml_data else "✗ No")
     config_table.add_row("Strict Validation", "✓ Yes" if strict else "✗ No")
+    config_table.add_row("Source Index", "✗ Off" if (full_scan or force) else ("✓ On (fingerprint)" if fingerprint else "✓ On"))
 
     console.print(config_table)
     console.print()
@@ -188,6 +203,8 @@ def stage_all_command(
             force=force,
             only_yaml_data=only_yaml_data,
             strict=strict,
+            use_source_index=not full_scan,
+            fingerprint_sources=fingerprint,
         )
 
         # Discover files
@@ -250,17 +267,32 @@ def stage_all_command(
                     )
 
                 # Run staging with progress callback (print statements disabled in core)
-                run_staging_pipeline(params, progress_callback=update_progress)
+                staging_summary = run_staging_pipeline(params, progress_callback=update_progress)
                 progress.update(task, status=f"✓ {len(csvs)}/{len(csvs)} files processed")
         else:
             console.print("[dim]Detailed file-by-file progress:[/dim]")
             console.print()
-            run_staging_pipeline(params)
+            staging_summary = run_staging_pipeline(params)
 
         elapsed = time.time() - start_time
 
         # Read manifest to show summary
         summary_text = f"[bold green]✓ Staging Complete[/bold green]\n\nTime: {elapsed:.1f}s\n"
+        if staging_summary is not None:
+            summary_text += (
+                f"Staged: {staging_summary.ok:,}  •  Already staged: {staging_summary.skipped:,}  •  "
+                f"Rejects: {staging_summary.rejects:,}\n"
+                f"Unchanged (skipped without opening): {staging_summary.unchanged:,}\n"
+            )
+            utilisation = staging_summary.utilisation()
+            if utilisation:
+                summary_text += (
+                    f"Workers: {len(utilisation)} busy "
+                    f"{min(utilisation.values()):.0%}-{max(utilisation.values()):.0%} of "
+                    f"{staging_summary.wall_s:.1f}s  •  Task p50/p95/max: "
+                    f"{staging_summary.task_p50_s:.2f}/{staging_summary.task_p95_s:.2f}/"
+                    f"{staging_summary.task_max_s:.2f}s  •  Tail: {staging_summary.tail_s:.1f}s\n"
+                )
 
         try:
             import polars as pl
@@ -795,10 +827,19 @@ def staging_stats_command(
             except:
                 size = "?"
 
-            # Count files
-            file_count = sum(1 for _ in path.rglob("*") if _.is_file())
+            if subdir == "raw_measurements":
+                # Loose run_id directories and the pack index, no full tree walk
+                from src.core.packed_store import get_pack_index, loose_measurements
+
+                loose = sum(len(parts) for parts in loose_measurements(path).values())
+                index = get_pack_index(path)
+                packed = len(index) if index is not None else 0
+                packs = index.frame["file"].n_unique() if index is not None else 0
+                counts = f"{loose:,} loose, {packed:,} packed in {packs:,} pack files"
+            else:
+                counts = f"{sum(1 for _ in path.rglob('*') if _.is_file()):,} files"
 
-            branch = tree.add(f"[cyan]{subdir}[/cyan] [dim]({size}, {file_count} files)[/dim]")
+            branch = tree.add(f"[cyan]{subdir}[/cyan] [dim]({size}, {counts})[/dim]")
 
             # Show partitions for raw_measurements
             if subdir == "raw_measurements":
@@ -839,3 +880,276 @@ def staging_stats_command(
 
     console.print("[dim]Tip: Use [cyan]validate-manifest[/cyan] for detailed validation[/dim]")
     console.print()
+
+
+@cli_command(
+    name="migrate-run-ids",
+    group="staging",
+    description="Map staged run_ids to the current run_id scheme"
+)
+def migrate_run_ids_command(
+    manifest: Optional[Path] = typer.Option(
+        None,
+        "--manifest",
+        "-m",
+        help="Path to manifest Parquet file"
+    ),
+    metrics_dir: Path = typer.Option(
+        Path("data/03_derived/_metrics"),
+        "--metrics-dir",
+        help="Derived metrics directory to re-link"
+    ),
+    workers: int = typer.Option(
+        6,
+        "--workers",
+        "-w",
+        help="Worker processes used to re-hash source CSVs"
+    ),
+    apply: bool = typer.Option(
+        False,
+        "--apply",
+        help="Rename run_ids (default: verify and write the mapping only)"
+    ),
+):
+    """
+    Verify and migrate run_ids to the current (v2) scheme.
+
+    Re-hashes every source CSV in the manifest, writes the old -> new
+    mapping to _manifest/run_id_map.parquet and reports how many runs
+    still carry v1 ids. With --apply, the staged Parquet files, source
+    index, derived metrics, extraction ledger and manifest are re-linked
+    to the new ids. Rebuild chip histories afterwards.
+
+    Examples:
+
+        # Verify only (writes run_id_map.parquet)
+        process_and_analyze migrate-run-ids
+
+        # Re-link everything to v2 run_ids
+        process_and_analyze migrate-run-ids --apply
+    """
+    import polars as pl
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.cli.main import get_config
+    from src.core.run_id_migration import apply_run_id_map, build_run_id_map, write_run_id_map
+
+    console = Console()
+    config = get_config()
+
+    if manifest is None:
+        manifest = config.stage_dir / "raw_measurements" / "_manifest" / "manifest.parquet"
+    if not manifest.exists():
+        console.print(f"[bold red]Error:[/bold red] Manifest not found: {manifest}")
+        raise typer.Exit(1)
+
+    console.print(f"[cyan]Re-hashing sources listed in[/cyan] {manifest}")
+    mapping = build_run_id_map(manifest, workers=workers)
+    map_path = write_run_id_map(mapping, manifest)
+
+    counts = dict(mapping.group_by("status").agg(pl.len()).iter_rows())
+    table = Table(title="run_id Verification")
+    table.add_column("Status", style="cyan")
+    table.add_column("Runs", justify="right", style="green")
+    for status in ("current", "migrate", "mismatch", "missing_source", "error"):
+        table.add_row(status, f"{counts.get(status, 0):,}")
+    console.print()
+    console.print(table)
+    console.print(f"[dim]Mapping written to {map_path}[/dim]")
+
+    if not apply:
+        if counts.get("migrate"):
+            console.print("[dim]Run again with [cyan]--apply[/cyan] to re-link these run_ids[/dim]")
+        console.print()
+        return
+
+    report = apply_run_id_map(mapping, manifest, metrics_dir=metrics_dir)
+    console.print()
+    console.print(f"[green]✓[/green] Migrated {report.runs_migrated:,} run_ids "
+                  f"({report.staged_files_moved:,} staged files, "
+                  f"{report.packed_runs_rekeyed:,} packed, "
+                  f"{report.metric_files_rewritten:,} metric files, "
+                  f"{report.ledger_rows_rewritten:,} ledger rows)")
+    console.print("[dim]Tip: run [cyan]build-all-histories[/cyan] to refresh chip histories[/dim]")
+    console.print()
+
+
+@cli_command(
+    name="catalog-headers",
+    group="staging",
+    description="Refresh the raw-CSV header catalog"
+)
+def catalog_headers_command(
+    raw_root: Optional[Path] = typer.Option(
+        None,
+        "--raw-root",
+        "-r",
+        help="Raw data directory to catalog"
+    ),
+    manifest: Optional[Path] = typer.Option(
+        None,
+        "--manifest",
+        "-m",
+        help="Manifest whose _manifest directory holds the catalog"
+    ),
+    workers: int = typer.Option(
+        6,
+        "--workers",
+        "-w",
+        help="Worker processes used to parse new headers"
+    ),
+):
+    """
+    Bring _manifest/header_catalog.parquet up to date with the raw tree.
+
+    Only CSVs that are new or changed since the last refresh are opened;
+    entries for deleted files are dropped. Staging and plot-ivg-by-sample
+    read headers from this catalog instead of re-parsing every CSV.
+
+    Examples:
+
+        # Catalog data/01_raw (e.g. after copying a new day folder)
+        process_and_analyze catalog-headers
+    """
+    import polars as pl
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.cli.main import get_config
+    from src.core.header_catalog import HeaderCatalog
+
+    console = Console()
+    config = get_config()
+
+    if raw_root is None:
+        raw_root = config.raw_data_dir
+    if manifest is None:
+        manifest = config.stage_dir / "raw_measurements" / "_manifest" / "manifest.parquet"
+    if not raw_root.exists():
+        console.print(f"[bold red]Error:[/bold red] Raw data directory not found: {raw_root}")
+        raise typer.Exit(1)
+
+    catalog = HeaderCatalog.for_manifest(manifest)
+    report = catalog.refresh(raw_root, workers=workers)
+    catalog.save()
+
+    console.print(f"[green]✓[/green] {len(catalog):,} headers catalogued in {catalog.path} "
+                  f"({report.parsed:,} parsed, {report.unchanged:,} unchanged, "
+                  f"{report.removed:,} removed, {report.failed:,} unreadable)")
+
+    summary = (
+        catalog.frame()
+        .group_by("proc", "chip_group")
+        .agg(pl.len().alias("files"), pl.col("chip_number").n_unique().alias("chips"))
+        .sort("proc", "chip_group", nulls_last=True)
+    )
+    table = Table(title="Catalogued Measurements")
+    table.add_column("Procedure", style="cyan")
+    table.add_column("Chip Group", style="yellow")
+    table.add_column("Chips", justify="right")
+    table.add_column("Files", justify="right", style="green")
+    for row in summary.iter_rows(named=True):
+        table.add_row(row["proc"] or "?", row["chip_group"] or "?", str(row["chips"]), f"{row['files']:,}")
+    console.print()
+    console.print(table)
+    console.print()
+
+
+@cli_command(
+    name="pack-staged",
+    group="staging",
+    description="Pack loose staged measurements into per-partition files"
+)
+def pack_staged_command(
+    stage_root: Optional[Path] = typer.Option(
+        None,
+        "--stage-root",
+        "-s",
+        help="Staged measurements root (default: <stage_dir>/raw_measurements)"
+    ),
+    max_pack_mb: float = typer.Option(
+        256.0,
+        "--max-pack-mb",
+        help="Loose megabytes per pack file before a new one is started"
+    ),
+    keep_loose: bool = typer.Option(
+        False,
+        "--keep-loose",
+        help="Keep the loose run_id directories after packing"
+    ),
+    prune: bool = typer.Option(
+        False,
+        "--prune",
+        help="Delete pack files the index no longer references"
+    ),
+    dry_run: bool = typer.Option(
+        False,
+        "--dry-run",
+        help="Report what would be packed without writing anything"
+    ),
+):
+    """
+    Fold loose proc=/date=/run_id= files into pack files with a run_id index.
+
+    Each proc=/date= partition gets pack-NNN.parquet files holding one row
+    group per measurement, and _manifest/pack_index.parquet maps run_id to
+    (pack file, row group). Measurement paths in the manifest and chip
+    histories are unchanged: readers fall back to the index when the loose
+    file is gone, so plotting and metric extraction work on either layout.
+    Measurements staged after a pack run stay loose until the next one;
+    loose copies kept with --keep-loose are not packed again unless they
+    were re-staged. --prune deletes packs whose measurements have all been
+    re-packed elsewhere.
+
+    Examples:
+
+        # Pack everything staged so far
+        process_and_analyze pack-staged
+
+        # Preview only
+        process_and_analyze pack-staged --dry-run
+
+        # Pack, then delete packs nothing points at any more
+        process_and_analyze pack-staged --prune
+    """
+    from rich.console import Console
+    from rich.table import Table
+
+    from src.cli.main import get_config
+    from src.core.packed_store import pack_measurements, prune_packs
+
+    console = Console()
+    if stage_root is None:
+        stage_root = get_config().stage_dir / "raw_measurements"
+    if not stage_root.exists():
+        console.print(f"[bold red]Error:[/bold red] Staging root not found: {stage_root}")
+        raise typer.Exit(1)
+
+    report = pack_measurements(
+        stage_root,
+        max_pack_bytes=int(max_pack_mb * 1024 * 1024),
+        keep_loose=keep_loose,
+        dry_run=dry_run,
+    )
+    if prune:
+        packs_removed, bytes_freed = prune_packs(stage_root, dry_run=dry_run)
+
+    table = Table(title="Staged Measurement Packing" + (" (dry run)" if dry_run else ""))
+    table.add_column("Item", style="cyan")
+    table.add_column("Value", justify="right", style="green")
+    table.add_row("Partitions", f"{report.partitions:,}")
+    table.add_row("Measurements packed", f"{report.packed:,}")
+    table.add_row("Pack files written", f"{report.packs_written:,}")
+    table.add_row("Loose directories removed", f"{report.loose_removed:,}")
+    table.add_row("Re-packed (superseded)", f"{report.superseded:,}")
+    table.add_row("Already packed", f"{report.already_packed:,}")
+    table.add_row("Skipped (empty/unreadable)", f"{report.skipped:,}")
+    if not dry_run and report.packed:
+        table.add_row("Size", f"{report.bytes_before / 1e6:.1f} MB → {report.bytes_after / 1e6:.1f} MB")
+    if prune:
+        table.add_row("Unreferenced packs removed", f"{packs_removed:,} ({bytes_freed / 1e6:.1f} MB)")
+
+    console.print()
+    console.print(table)
+    console.print()
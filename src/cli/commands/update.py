@@ -38,8 +38,10 @@ def update_command(
 
     Pipeline:
       1. stage-all (skips CSVs already staged unless --force)
-      2. build-all-histories (only if new measurements were staged, or --force)
-      3. CalibrationMatcher.enrich_chip_history per chip (adds irradiated_power_w)
+      2. build-all-histories (only if new measurements were staged, or --force;
+         only chips whose history changed are rewritten unless --force)
+      3. CalibrationMatcher.enrich_chip_histories over all chips in one pass
+         (adds irradiated_power_w)
 
     The CNP / Photoresponse / CorrectedDeltaI extractors and the metric-column
     join performed by `enrich-all-histories` are deliberately skipped — this
@@ -150,6 +152,7 @@ def update_command(
         output_dir=history_dir,
         stage_root=stage_root,
         chip_group=chip_group,
+        only_changed=not force,
     )
     console.print(f"[green]✓[/green] Built {len(histories)} chip histor{'y' if len(histories) == 1 else 'ies'}.")
     console.print()
@@ -171,23 +174,17 @@ def update_command(
         console.print("[yellow]⚠[/yellow] No matching history files found to enrich.")
         return
 
+    with console.status("[cyan]Enriching with power...[/cyan]"):
+        reports = matcher.enrich_chip_histories(history_files, output_dir=enriched_dir, force=True)
+
     enriched_count = 0
     warned_count = 0
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-    ) as progress:
-        task = progress.add_task("Enriching with power", total=len(history_files))
-        for history_path in history_files:
-            progress.update(task, description=f"[cyan]{history_path.stem}")
-            try:
-                matcher.enrich_chip_history(history_path, output_dir=enriched_dir, force=True)
-                enriched_count += 1
-            except Exception as e:
-                warned_count += 1
-                console.print(f"[yellow]⚠[/yellow] {history_path.stem}: {e}")
-            progress.advance(task)
+    for report in reports:
+        if report.errors:
+            warned_count += 1
+            console.print(f"[yellow]⚠[/yellow] {report.chip_name}_history: {'; '.join(report.errors)}")
+        else:
+            enriched_count += 1
 
     console.print()
     console.print(
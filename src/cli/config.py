@@ -75,11 +75,11 @@ class CLIConfig(BaseModel):
         ge=0,
         description="Cache time-to-live in seconds"
     )
-    cache_max_items: int = Field(
-        default=50,
+    cache_max_items: Optional[int] = Field(
+        default=None,
         ge=1,
         le=500,
-        description="Maximum number of items in cache"
+        description="Maximum number of items in the shared cache (None: bounded by size only)"
     )
     cache_max_size_mb: int = Field(
         default=500,
@@ -132,6 +132,10 @@ class CLIConfig(BaseModel):
         default=None, ge=0.0, le=1.0,
         description="Override PlotConfig.legend_framealpha",
     )
+    plot_decimate: Optional[bool] = Field(
+        default=None,
+        description="Override PlotConfig.decimate_traces (False draws every sample)",
+    )
 
     # Config metadata (not user-configurable)
     config_version: str = Field(
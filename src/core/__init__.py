@@ -10,6 +10,10 @@ Key Functions
 - run_staging_pipeline: Main pipeline orchestrator
 - discover_csvs: Find all CSV files in a directory tree
 - merge_events_to_manifest: Consolidate staging events into manifest
+- SourceIndex: Persistent source-file index used to skip unchanged CSVs
+- EventLog: Append-only staging event log merged into the manifest by watermark
+- HeaderCatalog: Persistent raw-CSV header catalog (procedure, chip, sample, start time)
+- pack_measurements: Fold loose staged files into per-partition packs with a run_id index
 
 Usage
 -----
@@ -46,9 +50,10 @@ Features
 - Parallel processing with ProcessPoolExecutor
 - Atomic writes (temp file + rename)
 - Idempotent (deterministic run_id from SHA-1)
+- Incremental (unchanged CSVs skipped via _manifest/source_index.parquet)
 - Type validation via YAML schema
 - Timezone-aware timestamp handling
-- Reject/event logging for observability
+- Reject logging and an append-only event log for observability
 
 See Also
 --------
@@ -64,7 +69,12 @@ from .stage_raw_measurements import (
     load_procedures_yaml,
     get_procs_cached,
     ingest_file_task,
+    StagingSummary,
 )
+from .source_index import SourceIndex
+from .event_log import EventLog
+from .header_catalog import HeaderCatalog
+from .packed_store import pack_measurements
 
 __all__ = [
     "run_staging_pipeline",
@@ -73,4 +83,9 @@ __all__ = [
     "load_procedures_yaml",
     "get_procs_cached",
     "ingest_file_task",
+    "StagingSummary",
+    "SourceIndex",
+    "EventLog",
+    "HeaderCatalog",
+    "pack_measurements",
 ]
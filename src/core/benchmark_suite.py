@@ -0,0 +1,508 @@
+"""
+End-to-end performance benchmark on synthetic raw data.
+
+Generates a raw tree with :mod:`src.core.synthetic_raw` in a scratch
+workspace and times each pipeline stage the way ``full-pipeline`` and
+``batch-plot`` run it:
+
+1. ``staging``    — raw CSV → Parquet + manifest
+2. ``histories``  — per-chip histories from the manifest
+3. ``metrics``    — ``MetricPipeline.derive_all_metrics``
+4. ``enrichment`` — calibration power + metric columns (``enrich-history -a``)
+5. ``plotting``   — one batch-plot spec per chip and procedure
+
+Results are a JSON-serializable document (one record per scale and stage)
+that can be saved as a baseline; :func:`compare_to_baseline` flags stages
+that got slower than the baseline by more than a tolerance.
+
+Example:
+    >>> results = run_benchmark(["small", "medium"], workers=4)
+    >>> save_results(results, Path("bench.json"))
+    >>> regressions = compare_to_baseline(results, load_results(Path("baseline.json")))
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, replace
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import polars as pl
+
+from src.core.synthetic_raw import SyntheticSpec, generate_raw_tree
+
+logger = logging.getLogger(__name__)
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+PROCEDURES_YAML = REPO_ROOT / "config" / "procedures.yml"
+
+RESULTS_FORMAT_VERSION = 1
+
+STAGES = ("staging", "histories", "metrics", "enrichment", "plotting")
+
+# Preset sizes; "large" is roughly a month of measurements of a busy chip group
+SCALES: Dict[str, SyntheticSpec] = {
+    "small": SyntheticSpec(n_chips=2, n_days=2),
+    "medium": SyntheticSpec(n_chips=6, n_days=5, sweep_points=401, time_points=1500),
+    "large": SyntheticSpec(
+        n_chips=12, n_days=20, ivg_per_day=4, it_per_day=4,
+        sweep_points=801, time_points=3000,
+    ),
+}
+
+# Batch-plot type per procedure for the plotting stage
+PLOT_TYPES = {
+    "IVg": "plot-ivg",
+    "It": "plot-its",
+    "VVg": "plot-vvg",
+    "Vt": "plot-vt",
+}
+
+
+@dataclass
+class StageResult:
+    """
+    Timing of one pipeline stage at one scale.
+
+    Attributes:
+        scale: Scale name
+        stage: Stage name (one of ``STAGES``)
+        seconds: Wall time (best of the repeats)
+        items: Units of work done (files, histories, metrics, plots)
+        ok: False if the stage raised
+        error: Exception message when ``ok`` is False
+    """
+    scale: str
+    stage: str
+    seconds: float
+    items: int = 0
+    ok: bool = True
+    error: Optional[str] = None
+
+
+@dataclass
+class Regression:
+    """
+    A stage slower than its baseline.
+
+    Attributes:
+        scale: Scale name
+        stage: Stage name
+        baseline_s: Baseline wall time
+        current_s: Current wall time
+        ratio: ``current_s / baseline_s``
+    """
+    scale: str
+    stage: str
+    baseline_s: float
+    current_s: float
+    ratio: float
+
+
+# ── workspace ───────────────────────────────────────────────────────────
+
+
+@contextmanager
+def _workspace(root: Path) -> Iterator[Path]:
+    """
+    Point the CLI config and the process-wide caches at ``root``.
+
+    Enrichment and batch plotting read their directories from the CLI
+    config; the previous config is restored afterwards.
+    """
+    from src.cli import main as cli_main
+    from src.cli.config import CLIConfig
+    from src.derived.metric_lookup import clear_metric_lookup_cache
+    from src.plotting.shared import batch
+
+    previous_config = cli_main._config
+    root.mkdir(parents=True, exist_ok=True)
+    try:
+        cli_main.set_config(CLIConfig(
+            raw_data_dir=root / "data" / "01_raw",
+            stage_dir=root / "data" / "02_stage",
+            history_dir=root / "data" / "02_stage" / "chip_histories",
+            output_dir=root / "figs",
+        ))
+        batch._cached_histories.clear()
+        yield root
+    finally:
+        clear_metric_lookup_cache()
+        batch._cached_histories.clear()
+        cli_main.set_config(previous_config)
+
+
+@contextmanager
+def _chdir(root: Path) -> Iterator[Path]:
+    """
+    Run with ``root`` as the working directory.
+
+    Only for the in-process stages that resolve ``data/...`` relative to
+    the working directory (enrichment, batch plotting): spawned pool
+    workers re-import the entry script, which expects the repo root.
+    """
+    previous = Path.cwd()
+    os.chdir(root)
+    try:
+        yield root
+    finally:
+        os.chdir(previous)
+
+
+def _paths(root: Path) -> Dict[str, Path]:
+    stage_root = root / "data" / "02_stage" / "raw_measurements"
+    return {
+        "raw": root / "data" / "01_raw",
+        "stage_root": stage_root,
+        "manifest": stage_root / "_manifest" / "manifest.parquet",
+        "histories": root / "data" / "02_stage" / "chip_histories",
+        "enriched": root / "data" / "03_derived" / "chip_histories_enriched",
+    }
+
+
+# ── stages ──────────────────────────────────────────────────────────────
+
+
+def _stage_staging(root: Path, spec: SyntheticSpec, workers: int) -> int:
+    from src.core.stage_raw_measurements import run_staging_pipeline
+    from src.models.parameters import StagingParameters
+
+    p = _paths(root)
+    summary = run_staging_pipeline(StagingParameters(
+        raw_root=p["raw"],
+        stage_root=p["stage_root"],
+        procedures_yaml=PROCEDURES_YAML,
+        workers=workers,
+    ))
+    if summary.rejects:
+        raise RuntimeError(f"{summary.rejects} synthetic files were rejected during staging")
+    return summary.ok
+
+
+def _stage_histories(root: Path, spec: SyntheticSpec, workers: int) -> int:
+    from src.core.history_builder import generate_all_chip_histories
+
+    p = _paths(root)
+    histories = generate_all_chip_histories(
+        p["manifest"], p["histories"], stage_root=p["stage_root"], min_experiments=1,
+    )
+    return len(histories)
+
+
+def _stage_metrics(root: Path, spec: SyntheticSpec, workers: int) -> int:
+    from src.derived.metric_pipeline import MetricPipeline
+    from src.derived.metrics_store import scan_metrics
+
+    pipeline = MetricPipeline(base_dir=root, extraction_version="benchmark")
+    metrics_dir = pipeline.derive_all_metrics(parallel=workers > 1, workers=workers)
+    return scan_metrics(metrics_dir).select(pl.len()).collect().item()
+
+
+def _stage_enrichment(root: Path, spec: SyntheticSpec, workers: int) -> int:
+    from src.cli.commands.enrich_unified import enrich_history_unified_command
+    from src.plotting.shared.batch import suppress_output
+
+    # The command reports through rich panels; only the files matter here
+    with _chdir(root), suppress_output(allow_errors=False):
+        enrich_history_unified_command(
+            chip_number=None,
+            all_chips=True,
+            chip_group=spec.chip_group,
+            calibrations_only=False,
+            metrics_only=False,
+            metrics="all",
+            force=True,
+            skip_derive=True,
+            derive_first=False,
+            workers=workers,
+            dry_run=False,
+            output_dir=None,
+            stale_threshold=24.0,
+            verbose=False,
+        )
+    return len(list(_paths(root)["enriched"].glob("*_history.parquet")))
+
+
+def _stage_plotting(root: Path, spec: SyntheticSpec, workers: int) -> int:
+    from src.core.data_cache import clear_cache, enable_parquet_caching
+    from src.plotting.shared.batch import PlotSpec, execute_plot
+
+    enable_parquet_caching()
+    clear_cache()
+    manifest = pl.read_parquet(_paths(root)["manifest"])
+    chips = sorted(manifest["chip_number"].drop_nulls().unique().to_list())
+
+    # Batch plots select by seq, which the history builder assigns
+    specs = []
+    for chip in chips:
+        history_file = _paths(root)["histories"] / f"{spec.chip_group}{chip}_history.parquet"
+        history = pl.read_parquet(history_file)
+        for proc, plot_type in PLOT_TYPES.items():
+            seqs = history.filter(pl.col("proc") == proc)["seq"].to_list()
+            if seqs:
+                specs.append(PlotSpec(type=plot_type, chip=chip, seq=seqs, tag=f"bench_{proc}"))
+
+    plots = 0
+    with _chdir(root):
+        for plot_spec in specs:
+            result = execute_plot(plot_spec, spec.chip_group, quiet=True)
+            if not result.success:
+                raise RuntimeError(
+                    f"{plot_spec.type} for chip {plot_spec.chip} failed: {result.error}"
+                )
+            plots += result.plots_generated
+    return plots
+
+
+STAGE_RUNNERS: Dict[str, Callable[[Path, SyntheticSpec, int], int]] = {
+    "staging": _stage_staging,
+    "histories": _stage_histories,
+    "metrics": _stage_metrics,
+    "enrichment": _stage_enrichment,
+    "plotting": _stage_plotting,
+}
+
+
+# ── runner ──────────────────────────────────────────────────────────────
+
+
+def resolve_scale(scale: str) -> SyntheticSpec:
+    """
+    Spec for a preset name, or ``"<chips>x<days>"`` for a custom size.
+
+    Raises:
+        ValueError: If ``scale`` is neither a preset nor ``<chips>x<days>``
+    """
+    if scale in SCALES:
+        return SCALES[scale]
+    chips, sep, days = scale.partition("x")
+    if sep and chips.isdigit() and days.isdigit():
+        return replace(SCALES["small"], n_chips=int(chips), n_days=int(days))
+    raise ValueError(
+        f"Unknown scale '{scale}': use one of {', '.join(SCALES)} or <chips>x<days> (e.g. 8x10)"
+    )
+
+
+def run_scale(
+    scale: str,
+    spec: SyntheticSpec,
+    workdir: Path,
+    workers: int = 4,
+    stages: Sequence[str] = STAGES,
+    progress: Optional[Callable[[StageResult], None]] = None,
+) -> List[StageResult]:
+    """
+    Generate one synthetic tree and time the pipeline stages on it.
+
+    Stages run in pipeline order on the same workspace; a failed stage is
+    recorded and the stages after it are skipped (they need its output).
+
+    Args:
+        scale: Name recorded in the results
+        spec: Synthetic tree to generate
+        workdir: Scratch workspace (created; must not hold other data)
+        workers: Worker processes for staging and metric extraction
+        stages: Stages to time; earlier stages always run, untimed ones too
+        progress: Called with each StageResult as it completes
+
+    Returns:
+        One StageResult per requested stage
+    """
+    results: List[StageResult] = []
+    last = max(STAGES.index(s) for s in stages)
+    generate_raw_tree(_paths(workdir)["raw"], spec)
+
+    with _workspace(workdir):
+        for stage in STAGES[: last + 1]:
+            start = time.perf_counter()
+            try:
+                items = STAGE_RUNNERS[stage](workdir, spec, workers)
+                result = StageResult(scale, stage, time.perf_counter() - start, items)
+            except Exception as e:
+                logger.exception(f"Benchmark stage {stage} failed at scale {scale}")
+                result = StageResult(scale, stage, time.perf_counter() - start, ok=False, error=str(e))
+            if stage in stages:
+                results.append(result)
+                if progress is not None:
+                    progress(result)
+            if not result.ok:
+                break
+    return results
+
+
+def run_benchmark(
+    scales: Sequence[str] = ("small",),
+    workers: int = 4,
+    repeat: int = 1,
+    stages: Sequence[str] = STAGES,
+    workdir: Optional[Path] = None,
+    keep: bool = False,
+    progress: Optional[Callable[[StageResult], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Run the benchmark at several scales.
+
+    Each repeat uses a fresh workspace (staging and extraction are
+    incremental, so reusing one would time the no-op path); the best time
+    per stage is kept.
+
+    Args:
+        scales: Preset names or ``<chips>x<days>``
+        workers: Worker processes for staging and metric extraction
+        repeat: Runs per scale
+        stages: Stages to time (subset of ``STAGES``)
+        workdir: Parent of the scratch workspaces (default: a temp dir)
+        keep: Keep the workspaces instead of deleting them
+        progress: Called with each StageResult as it completes
+
+    Returns:
+        Results document (see :func:`save_results`)
+
+    Raises:
+        ValueError: On an unknown scale or stage
+    """
+    unknown = [s for s in stages if s not in STAGES]
+    if unknown:
+        raise ValueError(f"Unknown stage(s) {unknown}: choose from {', '.join(STAGES)}")
+    specs = {scale: resolve_scale(scale) for scale in scales}
+
+    parent = Path(workdir) if workdir else Path(tempfile.mkdtemp(prefix="optothermal_bench_"))
+    records: List[Dict[str, Any]] = []
+    try:
+        for scale, spec in specs.items():
+            best: Dict[str, StageResult] = {}
+            for run in range(max(1, repeat)):
+                ws = parent / f"{scale}_{run}"
+                if ws.exists():
+                    shutil.rmtree(ws)
+                for result in run_scale(scale, spec, ws, workers, stages, progress):
+                    kept = best.get(result.stage)
+                    if kept is None or (result.ok and (not kept.ok or result.seconds < kept.seconds)):
+                        best[result.stage] = result
+                if not keep:
+                    shutil.rmtree(ws, ignore_errors=True)
+            for stage in STAGES:
+                if stage in best:
+                    records.append(asdict(best[stage]))
+    finally:
+        if not keep and workdir is None:
+            shutil.rmtree(parent, ignore_errors=True)
+
+    return {
+        "format_version": RESULTS_FORMAT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "environment": _environment(),
+        "settings": {
+            "workers": workers,
+            "repeat": repeat,
+            "scales": {scale: _spec_dict(spec) for scale, spec in specs.items()},
+        },
+        "results": records,
+    }
+
+
+def _spec_dict(spec: SyntheticSpec) -> Dict[str, Any]:
+    d = asdict(spec)
+    d["wavelengths_nm"] = list(spec.wavelengths_nm)
+    d["start"] = spec.start.isoformat()
+    return d
+
+
+def _environment() -> Dict[str, Any]:
+    commit = "unknown"
+    try:
+        out = subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=REPO_ROOT, capture_output=True, text=True, timeout=5,
+        )
+        if out.returncode == 0:
+            commit = out.stdout.strip()
+    except Exception:
+        pass
+    return {
+        "git": commit,
+        "python": platform.python_version(),
+        "polars": pl.__version__,
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+# ── results & baselines ─────────────────────────────────────────────────
+
+
+def save_results(results: Dict[str, Any], path: Path) -> Path:
+    """Write a results document as indented JSON."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+    return path
+
+
+def load_results(path: Path) -> Dict[str, Any]:
+    """
+    Read a results document written by :func:`save_results`.
+
+    Raises:
+        ValueError: If the file is not a benchmark results document
+    """
+    data = json.loads(Path(path).read_text())
+    if not isinstance(data, dict) or "results" not in data:
+        raise ValueError(f"{path} is not a benchmark results file")
+    return data
+
+
+def compare_to_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.25,
+    min_delta_s: float = 0.05,
+) -> List[Regression]:
+    """
+    Stages slower than the baseline.
+
+    A stage regresses when it is more than ``tolerance`` (relative) *and*
+    more than ``min_delta_s`` (absolute) slower than the baseline run of the
+    same scale and stage; the absolute floor keeps sub-second stages from
+    flagging on timer noise. Failed stages, and stages or scales missing
+    from either side, are not compared.
+
+    Args:
+        results: Current results document
+        baseline: Baseline results document
+        tolerance: Allowed relative slowdown (0.25 = 25%)
+        min_delta_s: Slowdowns below this many seconds are ignored
+
+    Returns:
+        Regressions, in the order of ``results``
+    """
+    reference = {
+        (r["scale"], r["stage"]): r["seconds"]
+        for r in baseline.get("results", [])
+        if r.get("ok", True)
+    }
+    regressions = []
+    for r in results.get("results", []):
+        base = reference.get((r["scale"], r["stage"]))
+        if base is None or not r.get("ok", True):
+            continue
+        current = r["seconds"]
+        if current > base * (1.0 + tolerance) and current - base > min_delta_s:
+            regressions.append(Regression(
+                scale=r["scale"],
+                stage=r["stage"],
+                baseline_s=base,
+                current_s=current,
+                ratio=current / base if base > 0 else float("inf"),
+            ))
+    return regressions
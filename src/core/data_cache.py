@@ -1,14 +1,25 @@
 """
-Data caching layer for batch plotting operations.
+Process-wide data cache shared by the CLI, plotting and metric extraction.
 
-This module provides caching for frequently accessed data to reduce
-I/O overhead when generating multiple plots.
+One byte-bounded LRU store holds loaded DataFrames (measurement Parquet files,
+chip histories, ...). Every consumer goes through it:
+
+- ``src.core.utils.read_measurement_parquet`` once ``enable_parquet_caching()``
+  has been called (batch plotting)
+- ``read_measurement_cached`` (explicitly cached measurement reads)
+- ``src.cli.cache.DataCache`` (CLI history loads, adds a TTL)
+- ``src.plotting.shared.plot_utils.ParquetCache`` (overlay plots)
+
+so hit/miss/eviction statistics are reported in one place (``cache-stats``).
 
 Key Features:
-- LRU eviction policy
-- File modification time tracking (prevents stale cache)
-- Hit/miss statistics
-- Memory-efficient storage
+- O(1) LRU: entries live in an ``OrderedDict``; a hit is ``move_to_end``,
+  an eviction is ``popitem(last=False)``
+- Memory budget in bytes (``DataFrame.estimated_size()``), with an optional
+  item limit; the running total is maintained incrementally
+- Source validation: entries tied to a file are dropped when its
+  ``(mtime_ns, size)`` changes or it disappears
+- Thread-safe (loads run outside the lock)
 
 Performance Impact:
 - 2-5x speedup for batch plotting (eliminates redundant parquet reads)
@@ -16,82 +27,174 @@ Performance Impact:
 """
 
 from __future__ import annotations
-from dataclasses import dataclass
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from functools import wraps
 from pathlib import Path
-from typing import Any, Callable
-import logging
-import polars as pl
+from typing import Any, Callable, Optional, Sequence, Tuple
 import hashlib
+import logging
 import pickle
+import sys
+import threading
+import time
+
+import numpy as np
+import polars as pl
 
 
 logger = logging.getLogger(__name__)
 
+MiB = 1024 * 1024
+DEFAULT_MAX_BYTES = 512 * MiB
+
+_MISSING = object()
+
+
+def estimate_size(value: Any) -> int:
+    """
+    Approximate in-memory size of a cached value in bytes.
+
+    Parameters
+    ----------
+    value : Any
+        DataFrame, Series, NumPy array or any other Python object
+
+    Returns
+    -------
+    int
+        ``estimated_size()`` for Polars objects, ``nbytes`` for arrays,
+        ``sys.getsizeof`` otherwise
+    """
+    if isinstance(value, (pl.DataFrame, pl.Series)):
+        return int(value.estimated_size())
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(estimate_size(v) for v in value)
+    return sys.getsizeof(value)
+
+
+def _file_signature(file_path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = file_path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+@dataclass
+class CacheStats:
+    """Cumulative cache counters."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        total = self.hits + self.misses
+        return self.hits / total if total > 0 else 0.0
+
+    def __str__(self) -> str:
+        return f"Hits: {self.hits}, Misses: {self.misses}, Hit Rate: {self.hit_rate():.1%}"
+
 
 @dataclass
 class CachedItem:
     """Cache entry with metadata for invalidation."""
     value: Any
-    file_mtime: float | None  # File modification time (for invalidation)
+    size_bytes: int
+    source: Optional[str] = None  # Resolved source file path (for invalidation)
+    file_signature: Optional[Tuple[int, int]] = None  # (mtime_ns, size) when cached
+    created_at: float = field(default_factory=time.monotonic)
 
 
 class DataCache:
-    """Simple in-memory cache for measurement data and metadata."""
+    """
+    Byte-bounded, thread-safe LRU cache.
 
-    def __init__(self, maxsize: int = 100):
-        self.maxsize = maxsize
-        self._cache: dict[str, CachedItem] = {}
-        self._access_order: list[str] = []
-        self._hits: int = 0
-        self._misses: int = 0
+    Parameters
+    ----------
+    maxsize : int, optional
+        Maximum number of entries (None: bounded by bytes only)
+    max_bytes : int, optional
+        Memory budget; least recently used entries are evicted beyond it
+
+    Examples
+    --------
+    >>> cache = DataCache(max_bytes=256 * MiB)
+    >>> df = cache.get_or_load("parquet:/x.parquet", lambda: pl.read_parquet(p), file_path=p)
+    """
 
-    def get(self, key: str, file_path: Path | None = None) -> Any | None:
+    def __init__(self, maxsize: Optional[int] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.maxsize = maxsize
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, CachedItem]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+        self._stats = CacheStats()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    @property
+    def total_bytes(self) -> int:
+        """Bytes currently held."""
+        return self._bytes
+
+    def get(
+        self,
+        key: str,
+        file_path: Path | None = None,
+        default: Any = None,
+        max_age: float | None = None,
+    ) -> Any:
         """
-        Get cached value with optional file modification check.
+        Get cached value with optional source and age validation.
 
         Parameters
         ----------
         key : str
             Cache key
         file_path : Path, optional
-            If provided, checks if file has been modified since caching
+            If provided, the entry is dropped when the file's mtime or size
+            differs from when it was cached (or the file is gone)
+        default : Any
+            Returned on a miss (default: None)
+        max_age : float, optional
+            Entries older than this many seconds are dropped
 
         Returns
         -------
-        Any or None
-            Cached value if valid, None if not found or invalidated
+        Any
+            Cached value if valid, ``default`` if not found or invalidated
         """
-        if key in self._cache:
-            item = self._cache[key]
-
-            # Check if file has been modified (invalidation)
-            if file_path is not None and item.file_mtime is not None:
-                if file_path.exists():
-                    current_mtime = file_path.stat().st_mtime
-                    if current_mtime > item.file_mtime:
-                        # File modified - invalidate cache
-                        self._invalidate(key)
-                        self._misses += 1
-                        return None
-                else:
-                    # File deleted - invalidate cache
-                    self._invalidate(key)
-                    self._misses += 1
-                    return None
-
-            # Cache hit - update access order
-            self._access_order.remove(key)
-            self._access_order.append(key)
-            self._hits += 1
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                self._stats.misses += 1
+                return default
+
+            stale = max_age is not None and time.monotonic() - item.created_at > max_age
+            if not stale and file_path is not None and item.file_signature is not None:
+                stale = _file_signature(Path(file_path)) != item.file_signature
+            if stale:
+                self._remove(key)
+                self._stats.invalidations += 1
+                self._stats.misses += 1
+                return default
+
+            self._entries.move_to_end(key)
+            self._stats.hits += 1
             return item.value
 
-        self._misses += 1
-        return None
-
     def put(self, key: str, value: Any, file_path: Path | None = None) -> None:
         """
-        Cache a value with LRU eviction.
+        Cache a value, evicting least recently used entries over budget.
 
         Parameters
         ----------
@@ -102,34 +205,107 @@ class DataCache:
         file_path : Path, optional
             Source file path (for modification tracking)
         """
-        # Get file modification time if provided
-        file_mtime = None
-        if file_path is not None and file_path.exists():
-            file_mtime = file_path.stat().st_mtime
-
-        if key in self._cache:
-            # Update existing
-            self._access_order.remove(key)
-        elif len(self._cache) >= self.maxsize:
-            # Evict oldest (LRU)
-            oldest = self._access_order.pop(0)
-            del self._cache[oldest]
-
-        self._cache[key] = CachedItem(value=value, file_mtime=file_mtime)
-        self._access_order.append(key)
-
-    def _invalidate(self, key: str) -> None:
-        """Remove item from cache."""
-        if key in self._cache:
-            del self._cache[key]
-            self._access_order.remove(key)
+        size = estimate_size(value)
+        source = signature = None
+        if file_path is not None:
+            signature = _file_signature(Path(file_path))
+            source = str(Path(file_path).resolve())
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if size > self.max_bytes:
+                # Would evict everything else and still not fit
+                return
+            self._entries[key] = CachedItem(value, size, source, signature)
+            self._bytes += size
+            self._evict()
+
+    def get_or_load(
+        self,
+        key: str,
+        loader: Callable[[], Any],
+        file_path: Path | None = None,
+        max_age: float | None = None,
+        keep: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """
+        Return the cached value for ``key`` or load, cache and return it.
+
+        Parameters
+        ----------
+        key : str
+            Cache key
+        loader : Callable
+            Called without arguments on a miss (outside the lock)
+        file_path : Path, optional
+            Source file used for validation
+        max_age : float, optional
+            Maximum entry age in seconds
+        keep : Callable, optional
+            Predicate deciding whether a loaded value is cached
+            (e.g. skip empty DataFrames from failed reads)
+        """
+        value = self.get(key, file_path=file_path, default=_MISSING, max_age=max_age)
+        if value is not _MISSING:
+            return value
+        value = loader()
+        if keep is None or keep(value):
+            self.put(key, value, file_path=file_path)
+        return value
+
+    def invalidate(self, key: str) -> bool:
+        """Drop ``key``; returns whether it was cached."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            self._stats.invalidations += 1
+            return True
+
+    def invalidate_path(self, file_path: Path) -> int:
+        """Drop every entry loaded from ``file_path``; returns the count."""
+        source = str(Path(file_path).resolve())
+        with self._lock:
+            keys = [k for k, item in self._entries.items() if item.source == source]
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def evict_older_than(self, max_age: float) -> int:
+        """Drop entries older than ``max_age`` seconds; returns the count."""
+        cutoff = time.monotonic() - max_age
+        with self._lock:
+            keys = [k for k, item in self._entries.items() if item.created_at < cutoff]
+            for key in keys:
+                self._remove(key)
+            self._stats.invalidations += len(keys)
+            return len(keys)
+
+    def resize(self, maxsize: Optional[int] = None, max_bytes: Optional[int] = None) -> None:
+        """Change the limits, evicting immediately if now over budget."""
+        with self._lock:
+            self.maxsize = maxsize
+            if max_bytes is not None:
+                self.max_bytes = max_bytes
+            self._evict()
 
     def clear(self) -> None:
-        """Clear all cached data."""
-        self._cache.clear()
-        self._access_order.clear()
-        self._hits = 0
-        self._misses = 0
+        """Drop all cached data (counted as invalidations)."""
+        with self._lock:
+            self._stats.invalidations += len(self._entries)
+            self._entries.clear()
+            self._bytes = 0
+
+    def reset_stats(self) -> None:
+        """Zero the hit/miss/eviction counters."""
+        with self._lock:
+            self._stats = CacheStats()
+
+    def counters(self) -> CacheStats:
+        """Live counters object."""
+        return self._stats
 
     def stats(self) -> dict[str, Any]:
         """
@@ -138,27 +314,70 @@ class DataCache:
         Returns
         -------
         dict
-            Statistics including size, hits, misses, and hit rate
+            Statistics including size, bytes, hits, misses, evictions and hit rate
         """
-        total_requests = self._hits + self._misses
-        hit_rate = self._hits / total_requests if total_requests > 0 else 0.0
-
-        return {
-            "size": len(self._cache),
-            "maxsize": self.maxsize,
-            "hits": self._hits,
-            "misses": self._misses,
-            "total_requests": total_requests,
-            "hit_rate": hit_rate,
-            "hit_rate_pct": f"{hit_rate * 100:.1f}%",
-        }
-
+        with self._lock:
+            s = self._stats
+            total_requests = s.hits + s.misses
+            hit_rate = s.hit_rate()
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "utilization": self._bytes / self.max_bytes if self.max_bytes > 0 else 0.0,
+                "hits": s.hits,
+                "misses": s.misses,
+                "evictions": s.evictions,
+                "invalidations": s.invalidations,
+                "total_requests": total_requests,
+                "hit_rate": hit_rate,
+                "hit_rate_pct": f"{hit_rate * 100:.1f}%",
+            }
+
+    def _remove(self, key: str) -> None:
+        item = self._entries.pop(key)
+        self._bytes -= item.size_bytes
+
+    def _evict(self) -> None:
+        while self._entries and (
+            self._bytes > self.max_bytes
+            or (self.maxsize is not None and len(self._entries) > self.maxsize)
+        ):
+            _, item = self._entries.popitem(last=False)
+            self._bytes -= item.size_bytes
+            self._stats.evictions += 1
+
+
+# Global cache instance (process-local: spawned/forked workers build their own)
+_global_cache = DataCache(max_bytes=DEFAULT_MAX_BYTES)
+_parquet_caching = False
+
+
+def shared_cache() -> DataCache:
+    """The process-wide cache instance."""
+    return _global_cache
+
+
+def configure_cache(max_items: Optional[int] = None, max_size_mb: Optional[float] = None) -> DataCache:
+    """
+    Set the limits of the process-wide cache.
 
-# Global cache instance
-_global_cache = DataCache(maxsize=100)
+    Parameters
+    ----------
+    max_items : int, optional
+        Maximum number of entries (None: bytes only)
+    max_size_mb : float, optional
+        Memory budget in MiB (None: keep the current budget)
+    """
+    _global_cache.resize(
+        maxsize=max_items,
+        max_bytes=None if max_size_mb is None else int(max_size_mb * MiB),
+    )
+    return _global_cache
 
 
-def cached_read_parquet(path: Path) -> pl.DataFrame:
+def cached_read_parquet(path: Path, **kwargs) -> pl.DataFrame:
     """
     Read parquet file with caching and modification tracking.
 
@@ -166,40 +385,74 @@ def cached_read_parquet(path: Path) -> pl.DataFrame:
     ----------
     path : Path
         Path to parquet file
+    **kwargs
+        Passed to ``pl.read_parquet`` (part of the cache key, so partial
+        reads do not poison full reads of the same file)
 
     Returns
     -------
     pl.DataFrame
         Cached or freshly read dataframe
-
-    Notes
-    -----
-    - Automatically invalidates cache if file is modified
-    - Uses file path as cache key
-    - Tracks file modification time for safety
     """
-    # Ensure path is absolute for consistent caching
     path = Path(path).resolve()
-    cache_key = f"parquet:{path}"
+    kwargs_key = repr(sorted(kwargs.items())) if kwargs else ""
+    return _global_cache.get_or_load(
+        f"parquet:{path}|{kwargs_key}",
+        lambda: pl.read_parquet(path, **kwargs),
+        file_path=path,
+    )
+
+
+def measurement_key(
+    path: Path,
+    manifest_path: Optional[Path] = None,
+    columns: Optional[Sequence[str]] = None,
+    with_metadata: bool = True,
+) -> str:
+    """Cache key of a measurement read (``path`` must be resolved)."""
+    key = f"measurement:{path}|{manifest_path or ''}"
+    if columns is not None:
+        key += "|cols=" + ",".join(sorted(columns))
+    if not with_metadata:
+        key += "|nometa"
+    return key
+
+
+def read_measurement_cached(
+    path: Path,
+    manifest_path: Optional[Path] = None,
+    columns: Optional[Sequence[str]] = None,
+    with_metadata: bool = True,
+) -> pl.DataFrame:
+    """
+    ``read_measurement_parquet`` through the shared cache.
 
-    # Check cache (with file modification check)
-    cached = _global_cache.get(cache_key, file_path=path)
-    if cached is not None:
-        return cached
+    Projected reads (``columns``) are cached under their own key. Failed
+    reads (empty DataFrames) are not cached.
+    """
+    from src.core.packed_store import measurement_source
+    from src.core.utils import _read_measurement_parquet
 
-    # Read and cache
-    df = pl.read_parquet(path)
-    _global_cache.put(cache_key, df, file_path=path)
+    path = Path(path).resolve()
+    return _global_cache.get_or_load(
+        measurement_key(path, manifest_path, columns, with_metadata),
+        lambda: _read_measurement_parquet(path, manifest_path, columns, with_metadata),
+        file_path=measurement_source(path),
+        keep=lambda df: df.height > 0,
+    )
 
-    return df
 
+def caching_enabled() -> bool:
+    """Whether ``read_measurement_parquet`` goes through the shared cache."""
+    return _parquet_caching
 
-def enable_parquet_caching():
+
+def enable_parquet_caching() -> bool:
     """
-    Enable caching for all parquet reads in the plotting pipeline.
+    Route ``src.core.utils.read_measurement_parquet`` through the shared cache.
 
-    This monkey-patches both `pl.read_parquet` AND `src.core.utils.read_measurement_parquet`
-    to ensure all reads go through the cache.
+    ``read_measurement_parquet`` checks this switch on every call, so it
+    takes effect regardless of import order (no function patching).
 
     Returns
     -------
@@ -208,89 +461,38 @@ def enable_parquet_caching():
 
     Examples
     --------
-    >>> from data_cache import enable_parquet_caching
+    >>> from src.core.data_cache import enable_parquet_caching
     >>> enable_parquet_caching()
-    [cache] Enabled caching for parquet reads
     True
     """
-    # Part 1: Patch pl.read_parquet (for direct uses)
-    original_pl_read_parquet = pl.read_parquet
-
-    def cached_pl_read_parquet_wrapper(source, **kwargs):
-        """Wrapper that uses cache for file paths."""
-        # Only cache file paths (not URLs, buffers, etc.)
-        if isinstance(source, (str, Path)):
-            path = Path(source).resolve()
-            # Include kwargs in the key so partial reads (columns=, n_rows=, etc.)
-            # don't poison the cache for full reads of the same path.
-            kwargs_key = repr(sorted(kwargs.items())) if kwargs else ""
-            cache_key = f"parquet:{path}|{kwargs_key}"
-
-            # Check cache
-            cached = _global_cache.get(cache_key, file_path=path)
-            if cached is not None:
-                return cached
-
-            # Read and cache
-            df = original_pl_read_parquet(source, **kwargs)
-            _global_cache.put(cache_key, df, file_path=path)
-            return df
-        else:
-            # Not a file path - don't cache
-            return original_pl_read_parquet(source, **kwargs)
-
-    pl.read_parquet = cached_pl_read_parquet_wrapper
-
-    # Part 2: Patch src.core.utils.read_measurement_parquet (used by plotting functions)
-    try:
-        from src.core import utils
-        original_read_measurement = utils.read_measurement_parquet
-
-        def cached_read_measurement_wrapper(path: Path) -> pl.DataFrame:
-            """Cached wrapper for read_measurement_parquet."""
-            path = Path(path).resolve()
-            cache_key = f"parquet:{path}"
-
-            # Check cache
-            cached = _global_cache.get(cache_key, file_path=path)
-            if cached is not None:
-                return cached
+    global _parquet_caching
+    _parquet_caching = True
+    logger.info("enabled caching for measurement parquet reads")
+    return True
 
-            # Read using original function
-            df = original_read_measurement(path)
 
-            # Only cache non-empty DataFrames
-            if df.height > 0:
-                _global_cache.put(cache_key, df, file_path=path)
-
-            return df
-
-        utils.read_measurement_parquet = cached_read_measurement_wrapper
-        logger.info("enabled caching for measurement parquet reads")
-        return True
-
-    except ImportError as e:
-        logger.warning("could not patch read_measurement_parquet: %s", e)
-        logger.warning("falling back to pl.read_parquet caching only")
-        return True
+def disable_parquet_caching() -> None:
+    """Stop routing measurement reads through the cache."""
+    global _parquet_caching
+    _parquet_caching = False
 
 
 def with_cache(cache_key_fn: Callable | None = None):
     """
     Decorator to cache function results.
-    
+
     Parameters
     ----------
     cache_key_fn : Callable, optional
         Function to generate cache key from args/kwargs.
         Default: use all args as key.
-    
+
     Examples
     --------
     >>> @with_cache()
     ... def expensive_calculation(x, y):
     ...     return x ** y
-    
+
     >>> @with_cache(cache_key_fn=lambda chip, seq: f"{chip}_{seq}")
     ... def load_sequences(chip, seq):
     ...     return load_data(chip, seq)
@@ -305,29 +507,21 @@ def with_cache(cache_key_fn: Callable | None = None):
                 # Default: hash all arguments
                 key_data = pickle.dumps((args, kwargs))
                 key = f"{func.__name__}:{hashlib.md5(key_data).hexdigest()}"
-            
-            # Check cache
-            cached = _global_cache.get(key)
-            if cached is not None:
-                return cached
-            
-            # Execute and cache
-            result = func(*args, **kwargs)
-            _global_cache.put(key, result)
-            
-            return result
-        
+
+            return _global_cache.get_or_load(key, lambda: func(*args, **kwargs))
+
         return wrapper
     return decorator
 
 
 def clear_cache() -> None:
     """
-    Clear global data cache.
+    Clear global data cache and its statistics.
 
     Useful for freeing memory or forcing fresh reads.
     """
     _global_cache.clear()
+    _global_cache.reset_stats()
 
 
 def cache_stats() -> dict[str, Any]:
@@ -337,7 +531,7 @@ def cache_stats() -> dict[str, Any]:
     Returns
     -------
     dict
-        Statistics including hits, misses, hit rate
+        Statistics including hits, misses, evictions, bytes and hit rate
     """
     return _global_cache.stats()
 
@@ -348,10 +542,12 @@ def print_cache_stats() -> None:
     print("\n" + "=" * 60)
     print("Data Cache Statistics")
     print("=" * 60)
-    print(f"Cache size:      {stats['size']}/{stats['maxsize']} items")
+    print(f"Cache size:      {stats['size']} items, "
+          f"{stats['bytes'] / MiB:.1f}/{stats['max_bytes'] / MiB:.0f} MB")
     print(f"Total requests:  {stats['total_requests']}")
     print(f"Cache hits:      {stats['hits']}")
     print(f"Cache misses:    {stats['misses']}")
+    print(f"Evictions:       {stats['evictions']}")
     print(f"Hit rate:        {stats['hit_rate_pct']}")
     print("=" * 60)
 
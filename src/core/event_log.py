@@ -0,0 +1,224 @@
+"""
+Append-only staging event log.
+
+Staging workers record one event per processed CSV. Instead of one JSON file
+per run (which every merge had to glob and parse again), each worker process
+appends NDJSON lines to its own segment:
+
+    02_stage/raw_measurements/_manifest/events/seg-<time_ns>-<pid>.ndjson
+
+``merge_events_to_manifest`` reads only the segments newer than the committed
+watermark (``_watermark.json``) with Polars' NDJSON reader, upserts them into
+the manifest and then commits: the watermark moves to the last consumed
+segment and the consumed segments are folded into one Parquet file under
+``archive/``.
+
+Legacy ``event-*.json`` files from older staging versions are consumed once
+by the first merge and archived the same way.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_GLOB = "seg-*.ndjson"
+LEGACY_EVENT_GLOB = "event-*.json"
+WATERMARK_FILENAME = "_watermark.json"
+ARCHIVE_DIRNAME = "archive"
+
+# Segment this process is appending to, per events directory
+_ACTIVE_SEGMENTS: Dict[str, Path] = {}
+
+
+def _new_segment_path(events_dir: Path) -> Path:
+    # Zero-padded wall-clock stamp: lexical order == creation order
+    return events_dir / f"seg-{time.time_ns():020d}-{os.getpid()}.ndjson"
+
+
+def append_event(events_dir: Path, event: dict) -> Path:
+    """
+    Append one event to this process's segment in ``events_dir``.
+
+    The segment is created on the first event of the process and reused for
+    all later events, so each worker writes a single file per staging run.
+
+    Args:
+        events_dir: Event log directory
+        event: Event record (non-JSON values are stringified)
+
+    Returns:
+        Path of the segment the event was written to
+    """
+    key = str(events_dir)
+    segment = _ACTIVE_SEGMENTS.get(key)
+    if segment is None:
+        events_dir.mkdir(parents=True, exist_ok=True)
+        segment = _new_segment_path(events_dir)
+        _ACTIVE_SEGMENTS[key] = segment
+    line = json.dumps(event, ensure_ascii=False, default=str)
+    with segment.open("a", encoding="utf-8") as f:
+        f.write(line + "\n")
+    return segment
+
+
+def rotate_segment(events_dir: Path) -> None:
+    """Start a new segment for the next event appended by this process."""
+    _ACTIVE_SEGMENTS.pop(str(events_dir), None)
+
+
+def _read_segment(path: Path) -> Optional[pl.DataFrame]:
+    """Read one NDJSON segment, skipping a torn last line from a crashed writer."""
+    try:
+        return pl.read_ndjson(path, infer_schema_length=None)
+    except Exception:
+        rows = []
+        for line in path.read_text(encoding="utf-8").splitlines():
+            try:
+                rows.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return _rows_to_frame(rows)
+
+
+def _rows_to_frame(rows: List[dict]) -> Optional[pl.DataFrame]:
+    if not rows:
+        return None
+    # Rows from different procedures carry different metadata keys
+    keys = sorted({k for row in rows for k in row})
+    return pl.DataFrame([{k: row.get(k) for k in keys} for row in rows], infer_schema_length=None)
+
+
+@dataclass
+class EventBatch:
+    """
+    Events not yet merged into the manifest.
+
+    Attributes:
+        events: All pending events (None if there are none)
+        segments: NDJSON segments the events came from, in order
+        legacy_files: Legacy ``event-*.json`` files included in ``events``
+    """
+    events: Optional[pl.DataFrame] = None
+    segments: List[Path] = field(default_factory=list)
+    legacy_files: List[Path] = field(default_factory=list)
+
+
+class EventLog:
+    """
+    Reader/committer for the segmented event log in ``events_dir``.
+
+    Example:
+        >>> log = EventLog(manifest_dir / "events")
+        >>> batch = log.read_pending()
+        >>> ...  # upsert batch.events into the manifest
+        >>> log.commit(batch)
+    """
+
+    def __init__(self, events_dir: Path):
+        self.events_dir = Path(events_dir)
+
+    @property
+    def watermark_path(self) -> Path:
+        return self.events_dir / WATERMARK_FILENAME
+
+    @property
+    def archive_dir(self) -> Path:
+        return self.events_dir / ARCHIVE_DIRNAME
+
+    def watermark(self) -> Optional[str]:
+        """Name of the last committed segment, or None before the first merge."""
+        if not self.watermark_path.exists():
+            return None
+        try:
+            return json.loads(self.watermark_path.read_text(encoding="utf-8")).get("last_segment")
+        except (OSError, json.JSONDecodeError):
+            logger.warning("Unreadable event watermark %s; re-reading all segments", self.watermark_path)
+            return None
+
+    def pending_segments(self) -> List[Path]:
+        """Segments newer than the watermark, oldest first."""
+        mark = self.watermark()
+        segments = sorted(self.events_dir.glob(SEGMENT_GLOB), key=lambda p: p.name)
+        if mark is not None:
+            segments = [p for p in segments if p.name > mark]
+        return segments
+
+    def read_pending(self) -> EventBatch:
+        """Load every event newer than the watermark (plus any legacy JSON files)."""
+        batch = EventBatch(
+            segments=self.pending_segments(),
+            legacy_files=sorted(self.events_dir.glob(LEGACY_EVENT_GLOB)),
+        )
+        frames = []
+        if batch.legacy_files:
+            rows = []
+            for path in batch.legacy_files:
+                try:
+                    rows.append(json.loads(path.read_text(encoding="utf-8")))
+                except Exception:
+                    continue
+            legacy = _rows_to_frame(rows)
+            if legacy is not None:
+                frames.append(legacy)
+        for path in batch.segments:
+            frame = _read_segment(path)
+            if frame is not None and frame.height:
+                frames.append(frame)
+        if frames:
+            batch.events = pl.concat(frames, how="diagonal_relaxed")
+        return batch
+
+    def commit(self, batch: EventBatch) -> None:
+        """
+        Mark ``batch`` as merged: advance the watermark, then archive.
+
+        The watermark is written first, so a crash during archiving only
+        leaves already-merged segments behind; ``pending_segments`` ignores
+        them and the next commit archives them.
+        """
+        if batch.segments:
+            self._write_watermark(batch.segments[-1].name)
+
+        mark = self.watermark()
+        leftover = [
+            p for p in sorted(self.events_dir.glob(SEGMENT_GLOB))
+            if mark is not None and p.name <= mark and p not in batch.segments
+        ]
+        frames = [batch.events] if batch.events is not None else []
+        frames += [f for f in map(_read_segment, leftover) if f is not None]
+        merged = batch.segments + leftover
+        if batch.events is not None:
+            merged += batch.legacy_files
+        if not merged:
+            return
+
+        if frames:
+            self.archive_dir.mkdir(parents=True, exist_ok=True)
+            stem = Path(mark).stem if mark is not None else "legacy"
+            pl.concat(frames, how="diagonal_relaxed").write_parquet(
+                self.archive_dir / f"events-{stem}.parquet"
+            )
+        for path in merged:
+            try:
+                path.unlink()
+            except OSError:
+                pass
+
+    def _write_watermark(self, last_segment: str) -> None:
+        self.events_dir.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", delete=False, dir=self.events_dir, suffix=".tmp", encoding="utf-8"
+        ) as tmp:
+            json.dump({"last_segment": last_segment}, tmp)
+        Path(tmp.name).replace(self.watermark_path)
@@ -0,0 +1,311 @@
+"""
+Persistent catalog of raw-CSV headers.
+
+Every raw measurement CSV starts with a ``# Procedure / # Parameters /
+# Metadata / # Data`` comment header. Staging, ``plot-ivg-by-sample`` and
+the other raw-data utilities all need the same few header fields (procedure,
+chip, sample, start time) and used to re-open and re-parse every file to get
+them. The catalog parses each header once and keeps the result, keyed by the
+file's absolute path and validated by its size and mtime:
+
+    02_stage/raw_measurements/_manifest/header_catalog.parquet
+
+``HeaderCatalog.refresh`` brings the catalog up to date with a raw tree using
+only ``stat()`` calls for known files: new files (e.g. a new day folder under
+``01_raw``) and modified files are parsed, deleted files are dropped.
+Queries (``query``) then run against the in-memory table without touching
+the CSVs.
+
+Like the source index, the catalog is an acceleration structure: deleting
+it is always safe and only makes the next refresh parse every header again.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import polars as pl
+
+from .source_index import source_key
+
+logger = logging.getLogger(__name__)
+
+HEADER_CATALOG_FILENAME = "header_catalog.parquet"
+
+_SCHEMA = {
+    "source_file": pl.Utf8,
+    "size_bytes": pl.Int64,
+    "mtime_ns": pl.Int64,
+    "proc": pl.Utf8,
+    "chip_group": pl.Utf8,
+    "chip_number": pl.Int64,
+    "sample": pl.Utf8,
+    "start_time": pl.Float64,
+    "data_header_line": pl.Int64,
+    "parameters": pl.Utf8,  # JSON object of raw header strings
+    "metadata": pl.Utf8,    # JSON object of raw header strings
+}
+
+# Header keys (case-insensitive) for the query columns
+_CHIP_GROUP_KEYS = ("chip group name", "chip group")
+_CHIP_NUMBER_KEYS = ("chip number", "chip")
+
+
+@dataclass
+class CatalogRefresh:
+    """
+    Outcome of ``HeaderCatalog.refresh``.
+
+    Attributes:
+        parsed: Headers parsed (new or modified files)
+        unchanged: Files validated by ``stat()`` only
+        removed: Entries dropped because the file is gone
+        failed: Files whose header could not be read
+    """
+    parsed: int = 0
+    unchanged: int = 0
+    removed: int = 0
+    failed: int = 0
+
+
+def _lookup(blocks: Iterable[Dict[str, str]], keys: Iterable[str]) -> Optional[str]:
+    keys = tuple(keys)
+    for block in blocks:
+        for k, v in block.items():
+            if k.strip().lower() in keys and v != "":
+                return v
+    return None
+
+
+def _to_int(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(float(value)) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _to_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def _row(key: str, hb, size_bytes: int, mtime_ns: int) -> dict:
+    """Catalog row for a parsed header (``HeaderBlocks``)."""
+    blocks = (hb.parameters, hb.metadata)
+    sample = _lookup(blocks, ("sample",))
+    return {
+        "source_file": key,
+        "size_bytes": size_bytes,
+        "mtime_ns": mtime_ns,
+        "proc": hb.proc,
+        "chip_group": _lookup(blocks, _CHIP_GROUP_KEYS),
+        "chip_number": _to_int(_lookup(blocks, _CHIP_NUMBER_KEYS)),
+        "sample": sample.strip().upper() if sample else None,
+        "start_time": _to_float(hb.metadata.get("Start time")),
+        "data_header_line": hb.data_header_line,
+        "parameters": json.dumps(hb.parameters, ensure_ascii=False),
+        "metadata": json.dumps(hb.metadata, ensure_ascii=False),
+    }
+
+
+def _entry(src_str: str) -> Optional[dict]:
+    """Parse one header into a catalog row (None if unreadable)."""
+    from .stage_raw_measurements import parse_header
+
+    src = Path(src_str)
+    try:
+        st = src.stat()
+        hb = parse_header(src)
+    except OSError:
+        return None
+    return _row(src_str, hb, st.st_size, st.st_mtime_ns)
+
+
+class HeaderCatalog:
+    """
+    In-memory view of ``header_catalog.parquet``.
+
+    Example:
+        >>> catalog = HeaderCatalog.for_manifest(manifest_path)
+        >>> catalog.refresh(Path("data/01_raw"))
+        >>> catalog.query(proc="IVg", chip_group="Alisson", chip_number=67)
+        >>> catalog.save()
+    """
+
+    def __init__(self, path: Optional[Path] = None, entries: Optional[Dict[str, dict]] = None):
+        self.path = path
+        self._entries: Dict[str, dict] = entries or {}
+        self._frame: Optional[pl.DataFrame] = None
+        self._dirty = False
+
+    @classmethod
+    def for_manifest(cls, manifest_path: Path) -> "HeaderCatalog":
+        """Load the catalog stored alongside ``manifest_path``."""
+        return cls.load(Path(manifest_path).parent / HEADER_CATALOG_FILENAME)
+
+    @classmethod
+    def load(cls, path: Path) -> "HeaderCatalog":
+        """Load a catalog from disk; a missing or unreadable file yields an empty catalog."""
+        entries: Dict[str, dict] = {}
+        if path.exists():
+            try:
+                df = pl.read_parquet(path)
+                entries = {row["source_file"]: row for row in df.iter_rows(named=True)}
+            except Exception as e:
+                logger.warning("ignoring unreadable header catalog %s: %s", path, e)
+                entries = {}
+        return cls(path, entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, src: Path) -> bool:
+        return source_key(src) in self._entries
+
+    def _fresh_entry(self, src: Path) -> Optional[dict]:
+        entry = self._entries.get(source_key(src))
+        if entry is None:
+            return None
+        try:
+            st = src.stat()
+        except OSError:
+            return None
+        if entry["size_bytes"] != st.st_size or entry["mtime_ns"] != st.st_mtime_ns:
+            return None
+        return entry
+
+    def header(self, src: Path):
+        """
+        Parsed header of ``src`` if the catalog entry is still valid.
+
+        Returns:
+            ``HeaderBlocks`` rebuilt from the catalog, or None if ``src`` is
+            unknown or changed since it was catalogued
+        """
+        from .stage_raw_measurements import HeaderBlocks
+
+        entry = self._fresh_entry(Path(src))
+        if entry is None:
+            return None
+        return HeaderBlocks(
+            proc=entry["proc"],
+            parameters=json.loads(entry["parameters"]),
+            metadata=json.loads(entry["metadata"]),
+            data_header_line=entry["data_header_line"],
+        )
+
+    def record(self, src: Path, hb, size_bytes: int, mtime_ns: int) -> None:
+        """Store a header parsed elsewhere (e.g. by a staging worker)."""
+        key = source_key(src)
+        self._entries[key] = _row(key, hb, size_bytes, mtime_ns)
+        self._frame = None
+        self._dirty = True
+
+    def refresh(
+        self,
+        raw_root: Optional[Path] = None,
+        csvs: Optional[List[Path]] = None,
+        workers: int = 1,
+    ) -> CatalogRefresh:
+        """
+        Bring the catalog up to date with the CSVs under ``raw_root``.
+
+        Known files are validated with ``stat()`` only; new or modified files
+        are parsed (in ``workers`` processes for large batches). Entries under
+        ``raw_root`` whose file no longer exists are removed.
+
+        Args:
+            raw_root: Raw data root to discover CSVs in
+            csvs: Already discovered CSVs (skips discovery)
+            workers: Processes used to parse new headers
+
+        Returns:
+            CatalogRefresh with counts
+        """
+        from .stage_raw_measurements import discover_csvs
+
+        if csvs is None:
+            csvs = discover_csvs(Path(raw_root)) if raw_root is not None else []
+        report = CatalogRefresh()
+
+        keys = {source_key(p): p for p in csvs}
+        if raw_root is not None:
+            prefix = source_key(Path(raw_root)).rstrip("/") + "/"
+            gone = [k for k in self._entries if k.startswith(prefix) and k not in keys]
+            for k in gone:
+                del self._entries[k]
+            report.removed = len(gone)
+
+        todo = [k for k, p in keys.items() if self._fresh_entry(p) is None]
+        report.unchanged = len(keys) - len(todo)
+
+        if workers > 1 and len(todo) > 64:
+            # 'spawn' rather than 'fork': the parent has already used Polars
+            # (catalog load), and forking a live Polars thread pool can deadlock
+            mp_context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as ex:
+                rows = list(ex.map(_entry, todo, chunksize=max(1, len(todo) // (workers * 4))))
+        else:
+            rows = [_entry(k) for k in todo]
+        for key, row in zip(todo, rows):
+            if row is None:
+                report.failed += 1
+                self._entries.pop(key, None)
+            else:
+                self._entries[key] = row
+                report.parsed += 1
+
+        if report.parsed or report.removed or report.failed:
+            self._frame = None
+            self._dirty = True
+        return report
+
+    def frame(self) -> pl.DataFrame:
+        """All catalog entries as a DataFrame."""
+        if self._frame is None:
+            self._frame = pl.DataFrame(list(self._entries.values()), schema=_SCHEMA)
+        return self._frame
+
+    def query(
+        self,
+        proc: Optional[str] = None,
+        chip_group: Optional[str] = None,
+        chip_number: Optional[int] = None,
+        sample: Optional[str] = None,
+    ) -> pl.DataFrame:
+        """
+        Catalog rows matching all given fields (None = any).
+
+        Example:
+            >>> catalog.query(proc="IVg", chip_group="Margarita", chip_number=1)
+        """
+        df = self.frame()
+        filters = {"proc": proc, "chip_group": chip_group, "chip_number": chip_number, "sample": sample}
+        for col, value in filters.items():
+            if value is not None:
+                df = df.filter(pl.col(col) == value)
+        return df
+
+    def save(self) -> None:
+        """Atomically write the catalog back to disk if it was modified."""
+        if not self._dirty or self.path is None:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", delete=False, dir=self.path.parent) as tmp:
+            tmp_path = Path(tmp.name)
+        try:
+            self.frame().write_parquet(tmp_path)
+            tmp_path.replace(self.path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._dirty = False
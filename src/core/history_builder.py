@@ -42,152 +42,149 @@ def compute_parquet_path(stage_root: Path, proc: str, date_local: str, run_id: s
     return str(stage_root / f"proc={proc}" / f"date={date_local}" / f"run_id={run_id}" / "part-000.parquet")
 
 
-def build_chip_history_from_manifest(
-    manifest_path: Path,
-    stage_root: Optional[Path] = None,
-    chip_number: Optional[int] = None,
-    chip_group: Optional[str] = None,
-    information: Optional[str] = None,
-    proc_filter: Optional[str] = None,
-) -> pl.DataFrame:
-    """
-    Build experiment history for a specific chip from manifest.parquet.
+# Manifest columns cast to Float64 in the history (first match wins per output)
+_FLOAT_COLUMNS = [
+    (("laser_voltage_V", "laser_voltage_v"), "laser_voltage_v"),
+    (("wavelength_nm",), "wavelength_nm"),
+    (("vds_v",), "vds_v"),
+    (("ids_a",), "ids_a"),
+    (("vg_fixed_v",), "vg_fixed_v"),
+    (("vg_start_v",), "vg_start_v"),
+    (("vg_end_v",), "vg_end_v"),
+    (("vg_step_v",), "vg_step_v"),
+    (("laser_period_s",), "laser_period_s"),
+]
+
+HISTORY_COLUMNS = [
+    "seq",
+    "date",
+    "time_hms",
+    "datetime_local",  # Combined date+time in local timezone
+    "proc",
+    "summary",
+    "has_light",
+    "laser_voltage_v",
+    "wavelength_nm",
+    "vds_v",
+    "ids_a",  # Drain-source current for VVg/Vt procedures
+    "vg_fixed_v",
+    "vg_start_v",
+    "vg_end_v",
+    "vg_step_v",
+    "laser_period_s",
+    "parquet_path",  # Path to staged Parquet measurement file
+    "source_file",
+    "chip_number",
+    "chip_group",
+    "chip_name",
+    "run_id",
+    "rows",
+    "file_idx",
+    "date_local",
+    "day_folder",
+    "start_time",
+    "start_time_utc",
+    "ingested_at_utc",
+    "date_origin",
+]
+
+# Written next to the history files; records a content hash per chip so
+# only_changed builds can skip chips whose history would be identical
+HISTORY_INDEX_FILENAME = "_history_index.parquet"
+
+_HISTORY_KEY = "__history"
+
+
+def _clean_information(information: str) -> str:
+    import re
+    cleaned = re.sub(r'[^\w\s-]', '', information)  # Remove special chars
+    cleaned = re.sub(r'[-\s]+', '_', cleaned)  # Replace spaces/hyphens with underscore
+    return cleaned or "UnknownChip"
 
-    Filters manifest by chip identifier and returns chronologically ordered
-    history with sequential experiment numbers and paths to staged Parquet files.
+
+def _load_staged_rows(manifest_path: Path) -> pl.LazyFrame:
+    """Manifest rows usable for histories ("ok" = freshly staged, "skipped" = already existed)."""
+    from src.core.manifest_index import read_manifest
+
+    return read_manifest(manifest_path).lazy().filter(pl.col("status").is_in(["ok", "skipped"]))
+
+
+def _derive_history_columns(
+    lf: pl.LazyFrame,
+    stage_root: Path,
+    chip_name: Optional[pl.Expr] = None,
+    partition_by: Optional[str] = None,
+) -> pl.LazyFrame:
+    """
+    Add seq, timeline fields, summary and parquet_path to manifest rows.
 
     Parameters
     ----------
-    manifest_path : Path
-        Path to manifest.parquet file
-    stage_root : Path, optional
-        Stage root directory for computing parquet paths
-        (e.g., data/02_stage/raw_measurements). If None, tries to infer from manifest_path.
-    chip_number : int, optional
-        Chip numeric ID (e.g., 67 for Alisson67)
-    chip_group : str, optional
-        Chip group prefix (e.g., "Alisson")
-    information : str, optional
-        Information field to filter by (used when chip_number/group are missing)
-    proc_filter : str, optional
-        Filter by procedure type (e.g., "It", "IVg")
+    lf : pl.LazyFrame
+        Filtered manifest rows
+    stage_root : Path
+        Stage root used to build parquet_path
+    chip_name : pl.Expr, optional
+        Value for the chip_name column when the manifest has none
+    partition_by : str, optional
+        Column identifying the history each row belongs to. If given, seq is
+        numbered per history (window over this column) and the column is kept
+        in the output; otherwise all rows form one history.
 
     Returns
     -------
-    pl.DataFrame
-        Chip history with columns: seq, date, time_hms, proc, summary, has_light, parquet_path, etc.
+    pl.LazyFrame
+        History rows with HISTORY_COLUMNS (those available) plus ``partition_by``
     """
-    if not manifest_path.exists():
-        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
-
-    # Infer stage_root from manifest_path if not provided
-    # manifest_path is typically: data/02_stage/raw_measurements/_manifest/manifest.parquet
-    if stage_root is None:
-        stage_root = manifest_path.parent.parent  # Go up from _manifest/ to raw_measurements/
-
-    # Load manifest rows
-    # Both "ok" (freshly staged) and "skipped" (already existed) are valid
-    df = (
-        pl.read_parquet(manifest_path)
-        .filter(pl.col("status").is_in(["ok", "skipped"]))
-    )
-
-    # Filter by chip identifier
-    if chip_number is not None:
-        df = df.filter(pl.col("chip_number") == chip_number)
-        if chip_group:
-            df = df.filter(pl.col("chip_group") == chip_group)
-    elif information:
-        # Use Information column for filtering
-        if "information" in df.columns:
-            df = df.filter(pl.col("information") == information)
-        else:
-            raise ValueError("Information column not found in manifest")
-    else:
-        raise ValueError("Must provide either (chip_number, chip_group) or information")
-
-    # Apply procedure filter if specified
-    if proc_filter:
-        df = df.filter(pl.col("proc") == proc_filter)
+    columns = set(lf.collect_schema().names())
 
     # Parse start_time_utc as datetime if it's a string
-    if "start_time_utc" in df.columns and df["start_time_utc"].dtype == pl.Utf8:
-        df = df.with_columns([
+    if "start_time_utc" in columns and lf.collect_schema()["start_time_utc"] == pl.Utf8:
+        lf = lf.with_columns([
             pl.col("start_time_utc").str.to_datetime(
                 format="%Y-%m-%d %H:%M:%S%.f%z",
                 time_zone="UTC"
             ).alias("start_time_utc")
         ])
 
-    # Sort by time
-    df = df.sort("start_time_utc")
-
-    # Add sequential experiment numbers
-    df = df.with_row_count("seq", offset=1)
+    # Sort by time and add sequential experiment numbers (per history)
+    keys = [partition_by] if partition_by else []
+    seq = pl.int_range(1, pl.len() + 1, dtype=pl.UInt32)
+    if partition_by:
+        seq = seq.over(partition_by)
+    lf = lf.sort(keys + ["start_time_utc"]).with_columns(seq.alias("seq"))
 
     # Extract date/time and derived timeline fields
+    source = pl.col("source_file").str.replace_all("\\", "/", literal=True)
     date_exprs = [
         pl.col("start_time_utc").dt.date().cast(pl.Utf8).alias("date"),
         pl.col("start_time_utc").dt.strftime("%H:%M:%S").alias("time_hms"),
         # Combined datetime label in local timezone (human-readable)
         pl.col("start_time_utc").dt.convert_time_zone("America/Santiago").dt.strftime("%Y-%m-%d %H:%M:%S").alias("datetime_local"),
         (pl.col("start_time_utc").dt.epoch(time_unit="us").cast(pl.Float64) / 1_000_000).alias("start_time"),
-        pl.col("source_file").map_elements(
-            lambda s: s.replace("\\", "/").split("/")[2] if len(s.replace("\\", "/").split("/")) > 2 else None,
-            return_dtype=pl.Utf8
-        ).alias("day_folder"),
+        # Third path component (raw/<root>/<day>/...) is the day folder
+        source.str.split("/").list.get(2, null_on_oob=True).alias("day_folder"),
     ]
+    columns.update({"date", "time_hms", "datetime_local", "start_time", "day_folder"})
 
-    if "laser_voltage_V" in df.columns:
-        date_exprs.append(pl.col("laser_voltage_V").cast(pl.Float64).alias("laser_voltage_v"))
-    elif "laser_voltage_v" in df.columns:
-        date_exprs.append(pl.col("laser_voltage_v").cast(pl.Float64).alias("laser_voltage_v"))
-
-    if "wavelength_nm" in df.columns:
-        date_exprs.append(pl.col("wavelength_nm").cast(pl.Float64).alias("wavelength_nm"))
-
-    if "vds_v" in df.columns:
-        date_exprs.append(pl.col("vds_v").cast(pl.Float64).alias("vds_v"))
-
-    if "ids_a" in df.columns:
-        date_exprs.append(pl.col("ids_a").cast(pl.Float64).alias("ids_a"))
-
-    if "vg_fixed_v" in df.columns:
-        date_exprs.append(pl.col("vg_fixed_v").cast(pl.Float64).alias("vg_fixed_v"))
-
-    if "vg_start_v" in df.columns:
-        date_exprs.append(pl.col("vg_start_v").cast(pl.Float64).alias("vg_start_v"))
-
-    if "vg_end_v" in df.columns:
-        date_exprs.append(pl.col("vg_end_v").cast(pl.Float64).alias("vg_end_v"))
-
-    if "vg_step_v" in df.columns:
-        date_exprs.append(pl.col("vg_step_v").cast(pl.Float64).alias("vg_step_v"))
-
-    if "laser_period_s" in df.columns:
-        date_exprs.append(pl.col("laser_period_s").cast(pl.Float64).alias("laser_period_s"))
-
-    df = df.with_columns(date_exprs)
+    for candidates, alias in _FLOAT_COLUMNS:
+        present = next((c for c in candidates if c in columns), None)
+        if present is not None:
+            date_exprs.append(pl.col(present).cast(pl.Float64).alias(alias))
+            columns.add(alias)
 
-    # Generate chip_name if it doesn't exist
-    if "chip_name" not in df.columns:
-        if chip_number is not None and chip_group:
-            df = df.with_columns([
-                pl.lit(f"{chip_group}{chip_number}").alias("chip_name")
-            ])
-        elif information:
-            import re
-            cleaned = re.sub(r'[^\w\s-]', '', information)
-            cleaned = re.sub(r'[-\s]+', '_', cleaned)
-            df = df.with_columns([
-                pl.lit(cleaned or "UnknownChip").alias("chip_name")
-            ])
+    if "chip_name" not in columns and chip_name is not None:
+        date_exprs.append(chip_name.alias("chip_name"))
+        columns.add("chip_name")
 
     # Extract file_idx from source_file if it doesn't exist
-    if "file_idx" not in df.columns:
-        df = df.with_columns([
+    if "file_idx" not in columns:
+        date_exprs.append(
             pl.col("source_file").str.extract(r'_(\d+)\.csv$', 1).cast(pl.Int64, strict=False).alias("file_idx")
-        ])
+        )
+        columns.add("file_idx")
+
+    lf = lf.with_columns(date_exprs)
 
     # Generate rich summary text
     chip_display = pl.when(
@@ -195,122 +192,64 @@ def build_chip_history_from_manifest(
     ).then(
         pl.col("chip_group") + pl.col("chip_number").cast(pl.Utf8)
     ).otherwise(
-        pl.col("chip_name").fill_null("")
+        pl.col("chip_name").fill_null("") if "chip_name" in columns else pl.lit("")
     )
 
-    df = df.with_columns([
+    light_glyph = (
         pl.when(pl.col("has_light") == True)
         .then(pl.lit("💡"))
         .when(pl.col("has_light") == False)
         .then(pl.lit("🌙"))
         .otherwise(pl.lit("❔"))
-        .alias("light_glyph"),
-        chip_display.alias("chip_display"),
-    ])
-
-    snippet_exprs = [
-        pl.when(pl.col("chip_display") != "")
-        .then(pl.lit(" ") + pl.col("chip_display"))
-        .otherwise(pl.lit(""))
-        .alias("chip_snippet"),
-    ]
+    )
 
-    if "vds_v" in df.columns:
-        snippet_exprs.append(
-            pl.when(pl.col("vds_v").is_not_null())
-            .then(pl.lit(" VDS=") + pl.col("vds_v").round(3).cast(pl.Utf8) + pl.lit(" V"))
+    def snippet(col: str, prefix: str, digits: int, suffix: str = "") -> pl.Expr:
+        if col not in columns:
+            return pl.lit("")
+        return (
+            pl.when(pl.col(col).is_not_null())
+            .then(pl.lit(prefix) + pl.col(col).round(digits).cast(pl.Utf8) + pl.lit(suffix))
             .otherwise(pl.lit(""))
-            .alias("vds_snippet")
         )
-    else:
-        snippet_exprs.append(pl.lit("").alias("vds_snippet"))
-
-    if "vg_start_v" in df.columns and "vg_end_v" in df.columns:
-        if "vg_step_v" in df.columns:
-            vg_step_suffix = (
-                pl.when(pl.col("vg_step_v").is_not_null())
-                .then(pl.lit(" (step ") + pl.col("vg_step_v").round(3).cast(pl.Utf8) + pl.lit(")"))
-                .otherwise(pl.lit(""))
-            )
-        else:
-            vg_step_suffix = pl.lit("")
 
-        snippet_exprs.append(
+    if "vg_start_v" in columns and "vg_end_v" in columns:
+        vg_range = (
             pl.when(pl.col("vg_start_v").is_not_null() & pl.col("vg_end_v").is_not_null())
             .then(
                 pl.lit(" VG=")
                 + pl.col("vg_start_v").round(2).cast(pl.Utf8)
                 + pl.lit("→")
                 + pl.col("vg_end_v").round(2).cast(pl.Utf8)
-                + vg_step_suffix
+                + snippet("vg_step_v", " (step ", 3, ")")
             )
             .otherwise(pl.lit(""))
-            .alias("vg_range_snippet")
-        )
-    else:
-        snippet_exprs.append(pl.lit("").alias("vg_range_snippet"))
-
-    if "vg_fixed_v" in df.columns:
-        snippet_exprs.append(
-            pl.when(pl.col("vg_fixed_v").is_not_null())
-            .then(pl.lit(" VG=") + pl.col("vg_fixed_v").round(3).cast(pl.Utf8) + pl.lit(" V"))
-            .otherwise(pl.lit(""))
-            .alias("vg_fixed_snippet")
-        )
-    else:
-        snippet_exprs.append(pl.lit("").alias("vg_fixed_snippet"))
-
-    if "laser_voltage_v" in df.columns:
-        snippet_exprs.append(
-            pl.when(pl.col("laser_voltage_v").is_not_null())
-            .then(pl.lit(" VL=") + pl.col("laser_voltage_v").round(3).cast(pl.Utf8) + pl.lit(" V"))
-            .otherwise(pl.lit(""))
-            .alias("laser_snippet")
         )
     else:
-        snippet_exprs.append(pl.lit("").alias("laser_snippet"))
+        vg_range = pl.lit("")
 
-    if "wavelength_nm" in df.columns:
-        snippet_exprs.append(
-            pl.when(pl.col("wavelength_nm").is_not_null())
-            .then(pl.lit(" λ=") + pl.col("wavelength_nm").round(1).cast(pl.Utf8) + pl.lit(" nm"))
-            .otherwise(pl.lit(""))
-            .alias("wavelength_snippet")
-        )
-    else:
-        snippet_exprs.append(pl.lit("").alias("wavelength_snippet"))
-
-    snippet_exprs.append(
-        pl.when(pl.col("file_idx").is_not_null())
-        .then(pl.lit(" #") + pl.col("file_idx").cast(pl.Utf8))
-        .otherwise(pl.lit(""))
-        .alias("file_idx_snippet")
+    summary = pl.concat_str(
+        [
+            light_glyph,
+            pl.lit(" "),
+            pl.col("proc"),
+            pl.when(chip_display != "").then(pl.lit(" ") + chip_display).otherwise(pl.lit("")),
+            snippet("vds_v", " VDS=", 3, " V"),
+            vg_range,
+            snippet("vg_fixed_v", " VG=", 3, " V"),
+            snippet("laser_voltage_v", " VL=", 3, " V"),
+            snippet("wavelength_nm", " λ=", 1, " nm"),
+            pl.when(pl.col("file_idx").is_not_null())
+            .then(pl.lit(" #") + pl.col("file_idx").cast(pl.Utf8))
+            .otherwise(pl.lit("")),
+        ],
+        separator=""
     )
-
-    df = df.with_columns(snippet_exprs)
-
-    df = df.with_columns([
-        pl.concat_str(
-            [
-                pl.col("light_glyph"),
-                pl.lit(" "),
-                pl.col("proc"),
-                pl.col("chip_snippet"),
-                pl.col("vds_snippet"),
-                pl.col("vg_range_snippet"),
-                pl.col("vg_fixed_snippet"),
-                pl.col("laser_snippet"),
-                pl.col("wavelength_snippet"),
-                pl.col("file_idx_snippet"),
-            ],
-            separator=""
-        ).alias("summary")
-    ])
+    derived = [summary.alias("summary")]
+    columns.add("summary")
 
     # Add parquet_path column pointing to staged measurement data
-    # Use Polars format string to construct the path
-    if all(col in df.columns for col in ["proc", "date_local", "run_id"]):
-        df = df.with_columns([
+    if {"proc", "date_local", "run_id"} <= columns:
+        derived.append(
             pl.format(
                 "{}/proc={}/date={}/run_id={}/part-000.parquet",
                 pl.lit(str(stage_root)),
@@ -318,66 +257,86 @@ def build_chip_history_from_manifest(
                 pl.col("date_local"),
                 pl.col("run_id"),
             ).alias("parquet_path")
-        ])
+        )
+        columns.add("parquet_path")
 
-    # Select relevant columns for history
-    history_cols = [
-        "seq",
-        "date",
-        "time_hms",
-        "datetime_local",  # Combined date+time in local timezone
-        "proc",
-        "summary",
-        "has_light",
-        "laser_voltage_v",
-        "wavelength_nm",
-        "vds_v",
-        "ids_a",  # Drain-source current for VVg/Vt procedures
-        "vg_fixed_v",
-        "vg_start_v",
-        "vg_end_v",
-        "vg_step_v",
-        "laser_period_s",
-        "parquet_path",  # Path to staged Parquet measurement file
-        "source_file",
-        "chip_number",
-        "chip_group",
-        "chip_name",
-        "run_id",
-        "rows",
-        "file_idx",
-        "date_local",
-        "day_folder",
-        "start_time",
-        "start_time_utc",
-        "ingested_at_utc",
-        "date_origin",
-    ]
+    lf = lf.with_columns(derived)
 
-    # Only select columns that exist in the dataframe
-    available_cols = [col for col in history_cols if col in df.columns]
-    history = df.select(available_cols)
+    # Select relevant columns for history (only those that exist)
+    selected = [col for col in HISTORY_COLUMNS if col in columns or col == "seq"]
+    if partition_by:
+        selected.append(partition_by)
+    return lf.select(selected)
 
-    # Drop helper columns that were only used for summary construction
-    history = history.drop(
-        [
-            col
-            for col in [
-                "light_glyph",
-                "chip_display",
-                "chip_snippet",
-                "vds_snippet",
-                "vg_range_snippet",
-                "vg_fixed_snippet",
-                "laser_snippet",
-                "wavelength_snippet",
-                "file_idx_snippet",
-            ]
-            if col in history.columns
-        ]
-    )
 
-    return history
+def build_chip_history_from_manifest(
+    manifest_path: Path,
+    stage_root: Optional[Path] = None,
+    chip_number: Optional[int] = None,
+    chip_group: Optional[str] = None,
+    information: Optional[str] = None,
+    proc_filter: Optional[str] = None,
+) -> pl.DataFrame:
+    """
+    Build experiment history for a specific chip from manifest.parquet.
+
+    Filters manifest by chip identifier and returns chronologically ordered
+    history with sequential experiment numbers and paths to staged Parquet files.
+    To build histories for every chip, use ``generate_all_chip_histories``,
+    which does all chips in a single pass over the manifest.
+
+    Parameters
+    ----------
+    manifest_path : Path
+        Path to manifest.parquet file
+    stage_root : Path, optional
+        Stage root directory for computing parquet paths
+        (e.g., data/02_stage/raw_measurements). If None, tries to infer from manifest_path.
+    chip_number : int, optional
+        Chip numeric ID (e.g., 67 for Alisson67)
+    chip_group : str, optional
+        Chip group prefix (e.g., "Alisson")
+    information : str, optional
+        Information field to filter by (used when chip_number/group are missing)
+    proc_filter : str, optional
+        Filter by procedure type (e.g., "It", "IVg")
+
+    Returns
+    -------
+    pl.DataFrame
+        Chip history with columns: seq, date, time_hms, proc, summary, has_light, parquet_path, etc.
+    """
+    if not manifest_path.exists():
+        raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+
+    # Infer stage_root from manifest_path if not provided
+    # manifest_path is typically: data/02_stage/raw_measurements/_manifest/manifest.parquet
+    if stage_root is None:
+        stage_root = manifest_path.parent.parent  # Go up from _manifest/ to raw_measurements/
+
+    lf = _load_staged_rows(manifest_path)
+
+    # Filter by chip identifier
+    chip_name = None
+    if chip_number is not None:
+        lf = lf.filter(pl.col("chip_number") == chip_number)
+        if chip_group:
+            lf = lf.filter(pl.col("chip_group") == chip_group)
+            chip_name = pl.lit(f"{chip_group}{chip_number}")
+    elif information:
+        # Use Information column for filtering
+        if "information" not in lf.collect_schema().names():
+            raise ValueError("Information column not found in manifest")
+        lf = lf.filter(pl.col("information") == information)
+        chip_name = pl.lit(_clean_information(information))
+    else:
+        raise ValueError("Must provide either (chip_number, chip_group) or information")
+
+    # Apply procedure filter if specified
+    if proc_filter:
+        lf = lf.filter(pl.col("proc") == proc_filter)
+
+    return _derive_history_columns(lf, stage_root, chip_name=chip_name).collect()
 
 
 def generate_chip_name(
@@ -406,10 +365,7 @@ def generate_chip_name(
         return f"{chip_group}{chip_number}"
     elif information:
         # Clean information string for filename
-        import re
-        cleaned = re.sub(r'[^\w\s-]', '', information)  # Remove special chars
-        cleaned = re.sub(r'[-\s]+', '_', cleaned)  # Replace spaces/hyphens with underscore
-        return cleaned or "UnknownChip"
+        return _clean_information(information)
     else:
         return "UnknownChip"
 
@@ -442,18 +398,93 @@ def save_chip_history(
     return output_path
 
 
+def _discover_chip_keys(df: pl.DataFrame, min_experiments: int) -> tuple[pl.DataFrame, list[str]]:
+    """
+    Find chips with at least ``min_experiments`` manifest rows.
+
+    Returns the (chip_number, chip_group) pairs and the Information values
+    that identify chips without a number/group.
+    """
+    numbered = pl.DataFrame(schema={"chip_number": pl.Int64, "chip_group": pl.Utf8})
+    if "chip_number" in df.columns and "chip_group" in df.columns:
+        numbered = (
+            df.filter(pl.col("chip_number").is_not_null())
+            .group_by(["chip_number", "chip_group"])
+            .agg(pl.len().alias("count"))
+            .filter(pl.col("count") >= min_experiments)
+            .select(["chip_number", "chip_group"])
+        )
+
+    # Also find chips identified by Information field.
+    # Exclude LaserCalibration rows: they have null chip_number/chip_group by
+    # design (calibrations belong to an LED/wavelength, not a chip) and would
+    # otherwise produce bogus chip histories named after calibration tags.
+    information: list[str] = []
+    if "information" in df.columns:
+        info_df = df.filter(pl.col("proc") != "LaserCalibration") if "proc" in df.columns else df
+        if "chip_number" in df.columns and "chip_group" in df.columns:
+            info_df = info_df.filter(
+                (pl.col("chip_number").is_null()) | (pl.col("chip_group").is_null())
+            )
+        information = (
+            info_df.filter(pl.col("information").is_not_null())
+            .group_by("information")
+            .agg(pl.len().alias("count"))
+            .filter(pl.col("count") >= min_experiments)
+            .get_column("information")
+            .to_list()
+        )
+
+    return numbered, information
+
+
+def _history_hash(history: pl.DataFrame) -> str:
+    """Content hash of a history frame (row order included)."""
+    import hashlib
+
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(",".join(f"{k}:{v}" for k, v in history.schema.items()).encode())
+    digest.update(history.hash_rows(seed=0).to_numpy().tobytes())
+    return digest.hexdigest()
+
+
+def _load_history_index(output_dir: Path) -> dict[str, str]:
+    path = output_dir / HISTORY_INDEX_FILENAME
+    if not path.exists():
+        return {}
+    try:
+        df = pl.read_parquet(path)
+    except Exception as e:
+        logger.warning("ignoring unreadable history index %s: %s", path, e)
+        return {}
+    return dict(zip(df["chip_name"].to_list(), df["content_hash"].to_list()))
+
+
+def _save_history_index(output_dir: Path, hashes: dict[str, str]) -> None:
+    from src.core.stage_raw_measurements import atomic_write_parquet
+
+    df = pl.DataFrame(
+        {"chip_name": list(hashes), "content_hash": list(hashes.values())},
+        schema={"chip_name": pl.Utf8, "content_hash": pl.Utf8},
+    )
+    atomic_write_parquet(df, output_dir / HISTORY_INDEX_FILENAME)
+
+
 def generate_all_chip_histories(
     manifest_path: Path,
     output_dir: Path,
     stage_root: Optional[Path] = None,
     min_experiments: int = 5,
     chip_group: Optional[str] = None,
+    only_changed: bool = False,
 ) -> dict[str, Path]:
     """
     Generate history files for all chips found in manifest.
 
     Automatically discovers all unique chips and creates individual
-    history Parquet files in the output directory.
+    history Parquet files in the output directory. The manifest is read
+    once and every history is derived in a single lazy query (seq is a
+    window over the chip), then split with ``partition_by``.
 
     Parameters
     ----------
@@ -468,6 +499,10 @@ def generate_all_chip_histories(
         Minimum number of experiments required to generate history
     chip_group : str, optional
         Filter by specific chip group
+    only_changed : bool
+        Only rewrite history files whose content changed since the last
+        build (tracked in ``_history_index.parquet`` in ``output_dir``).
+        Unchanged chips are still included in the returned mapping.
 
     Returns
     -------
@@ -481,86 +516,76 @@ def generate_all_chip_histories(
     if stage_root is None:
         stage_root = manifest_path.parent.parent
 
-    # Load manifest
-    df = pl.read_parquet(manifest_path)
+    from src.core.manifest_index import read_manifest
+
+    # Load manifest (once)
+    df = read_manifest(manifest_path)
 
     # Filter by chip group if specified
     if chip_group:
         df = df.filter(pl.col("chip_group") == chip_group)
 
-    # Discover unique chips
-    chip_identifiers = []
-
-    # Group by chip_number and chip_group (if available)
-    if "chip_number" in df.columns and "chip_group" in df.columns:
-        chip_groups = (
-            df.filter(pl.col("chip_number").is_not_null())
-            .group_by(["chip_number", "chip_group"])
-            .agg(pl.count().alias("count"))
-            .filter(pl.col("count") >= min_experiments)
+    # Discover unique chips (counts include all manifest rows, as before)
+    numbered, information = _discover_chip_keys(df, min_experiments)
+
+    # Tag each staged row with the history it belongs to. A row can belong to
+    # both a numbered chip and an Information chip, hence the concat.
+    staged = df.lazy().filter(pl.col("status").is_in(["ok", "skipped"]))
+    tagged = []
+    if numbered.height > 0:
+        tagged.append(
+            staged.join(numbered.lazy(), on=["chip_number", "chip_group"], how="semi")
+            .with_columns(
+                pl.format("{}{}", pl.col("chip_group"), pl.col("chip_number")).alias(_HISTORY_KEY)
+            )
         )
-
-        for row in chip_groups.iter_rows(named=True):
-            chip_identifiers.append({
-                "chip_number": row["chip_number"],
-                "chip_group": row["chip_group"],
-                "information": None,
-                "count": row["count"],
-            })
-
-    # Also find chips identified by Information field.
-    # Exclude LaserCalibration rows: they have null chip_number/chip_group by
-    # design (calibrations belong to an LED/wavelength, not a chip) and would
-    # otherwise produce bogus chip histories named after calibration tags.
-    if "information" in df.columns:
-        info_df = df.filter(pl.col("proc") != "LaserCalibration") if "proc" in df.columns else df
-        info_groups = (
-            info_df.filter(
-                (pl.col("chip_number").is_null()) | (pl.col("chip_group").is_null())
+    if information:
+        cleaned = {info: _clean_information(info) for info in information}
+        tagged.append(
+            staged.filter(pl.col("information").is_in(information))
+            .with_columns(
+                pl.col("information").replace_strict(cleaned, return_dtype=pl.Utf8).alias(_HISTORY_KEY)
             )
-            .filter(pl.col("information").is_not_null())
-            .group_by("information")
-            .agg(pl.count().alias("count"))
-            .filter(pl.col("count") >= min_experiments)
         )
 
-        for row in info_groups.iter_rows(named=True):
-            chip_identifiers.append({
-                "chip_number": None,
-                "chip_group": None,
-                "information": row["information"],
-                "count": row["count"],
-            })
+    if not tagged:
+        return {}
 
-    # Generate history for each chip
-    histories = {}
+    all_rows = pl.concat(tagged, how="vertical") if len(tagged) > 1 else tagged[0]
+    histories_df = _derive_history_columns(
+        all_rows, stage_root, chip_name=pl.col(_HISTORY_KEY), partition_by=_HISTORY_KEY
+    ).collect()
 
-    for chip_id in chip_identifiers:
-        try:
-            # Build history
-            history = build_chip_history_from_manifest(
-                manifest_path,
-                stage_root=stage_root,
-                chip_number=chip_id["chip_number"],
-                chip_group=chip_id["chip_group"],
-                information=chip_id["information"],
-            )
-
-            # Generate chip name
-            chip_name = generate_chip_name(
-                chip_id["chip_number"],
-                chip_id["chip_group"],
-                chip_id["information"],
-            )
-
-            # Save history
-            output_path = save_chip_history(history, output_dir, chip_name)
-            histories[chip_name] = output_path
+    previous = _load_history_index(output_dir) if only_changed else {}
+    hashes: dict[str, str] = {}
+    histories: dict[str, Path] = {}
+    written = 0
 
+    output_dir.mkdir(parents=True, exist_ok=True)
+    for (chip_name,), history in histories_df.partition_by(
+        _HISTORY_KEY, as_dict=True, include_key=False, maintain_order=True
+    ).items():
+        try:
+            output_path = output_dir / f"{chip_name}_history.parquet"
+            content_hash = _history_hash(history)
+            hashes[chip_name] = content_hash
+            if only_changed and previous.get(chip_name) == content_hash and output_path.exists():
+                histories[chip_name] = output_path
+                continue
+
+            histories[chip_name] = save_chip_history(history, output_dir, chip_name)
+            written += 1
         except Exception as e:
-            logger.warning("failed to generate history for %s: %s", chip_id, e)
+            logger.warning("failed to generate history for %s: %s", chip_name, e)
             continue
 
+    # Keep hashes of chips outside this build's filter (e.g. other groups)
+    _save_history_index(output_dir, {**_load_history_index(output_dir), **hashes})
+
+    logger.info(
+        "built %d chip histories (%d written, %d unchanged)",
+        len(histories), written, len(histories) - written,
+    )
     return histories
 
 
@@ -669,7 +694,7 @@ def get_chip_summary_stats(manifest_path: Path, chip_name: str) -> dict:
 
     # Count by procedure
     if "proc" in history.columns:
-        proc_counts = history.group_by("proc").agg(pl.count().alias("count"))
+        proc_counts = history.group_by("proc").agg(pl.len().alias("count"))
         stats["procedures"] = {
             row["proc"]: row["count"]
             for row in proc_counts.iter_rows(named=True)
@@ -0,0 +1,148 @@
+"""
+Process-wide, run_id-keyed index over the staging manifest.
+
+``read_measurement_parquet`` joins manifest metadata (chip, wavelength,
+laser voltage, ...) onto every measurement it loads. Reading and filtering
+``manifest.parquet`` per call makes N loads cost O(N x manifest size); this
+module loads the manifest once per process, keeps a ``run_id -> row``
+dictionary for O(1) lookups, and reloads only when the manifest's
+``(mtime, size)`` signature changes.
+
+Example:
+    >>> index = get_manifest_index(Path("data/02_stage/raw_measurements/_manifest/manifest.parquet"))
+    >>> index.metadata("a1b2c3d4e5f6a7b8")["wavelength_nm"]
+    455.0
+    >>> index.frame.filter(pl.col("proc") == "IVg").height
+    1234
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import polars as pl
+
+logger = logging.getLogger(__name__)
+
+# Manifest columns that are bookkeeping, not measurement metadata
+METADATA_EXCLUDE = frozenset({
+    "run_id", "proc", "path", "source_file", "rows", "status", "ingested_at_utc",
+    "validation_errors", "validation_warnings", "validation_messages",
+})
+
+
+class ManifestIndex:
+    """
+    Immutable snapshot of a manifest with O(1) run_id lookups.
+
+    Attributes:
+        path: Manifest path the snapshot was loaded from
+        signature: ``(st_mtime_ns, st_size)`` of the manifest at load time
+        frame: The full manifest DataFrame (shared, do not mutate)
+    """
+
+    def __init__(self, path: Path, frame: pl.DataFrame, signature: Tuple[int, int]):
+        self.path = path
+        self.frame = frame
+        self.signature = signature
+        self._positions: Dict[str, int] = {}
+        if "run_id" in frame.columns:
+            for i, rid in enumerate(frame["run_id"].to_list()):
+                # First occurrence wins (matches filter(...).row(0))
+                self._positions.setdefault(rid, i)
+        self._metadata: Dict[str, Dict[str, Any]] = {}
+
+    def __len__(self) -> int:
+        return len(self._positions)
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._positions
+
+    def row(self, run_id: str) -> Optional[Dict[str, Any]]:
+        """Full manifest row for ``run_id`` as a dict, or None."""
+        pos = self._positions.get(run_id)
+        if pos is None:
+            return None
+        return self.frame.row(pos, named=True)
+
+    def metadata(self, run_id: str) -> Dict[str, Any]:
+        """
+        Measurement metadata for ``run_id`` (non-null, non-bookkeeping columns).
+
+        Results are memoized per run_id; returns an empty dict for unknown ids.
+        """
+        cached = self._metadata.get(run_id)
+        if cached is not None:
+            return cached
+        row = self.row(run_id)
+        meta = {} if row is None else {
+            k: v for k, v in row.items()
+            if k not in METADATA_EXCLUDE and v is not None
+        }
+        self._metadata[run_id] = meta
+        return meta
+
+
+_INDEXES: Dict[Path, ManifestIndex] = {}
+_LOCK = threading.Lock()
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def get_manifest_index(manifest_path: Path) -> Optional[ManifestIndex]:
+    """
+    Return the cached index for ``manifest_path``, (re)loading if stale.
+
+    Costs one ``stat()`` per call once warm. Returns None if the manifest
+    does not exist or cannot be read.
+    """
+    path = Path(manifest_path).resolve()
+    sig = _signature(path)
+    if sig is None:
+        return None
+    with _LOCK:
+        index = _INDEXES.get(path)
+        if index is not None and index.signature == sig:
+            return index
+        try:
+            frame = pl.read_parquet(path)
+        except Exception as e:
+            logger.warning("failed to load manifest %s: %s", path, e)
+            return None
+        index = ManifestIndex(path, frame, sig)
+        _INDEXES[path] = index
+        logger.debug("loaded manifest index %s (%d runs)", path, len(index))
+        return index
+
+
+def read_manifest(manifest_path: Path) -> pl.DataFrame:
+    """
+    Manifest DataFrame served from the process-wide index.
+
+    Drop-in replacement for ``pl.read_parquet(manifest_path)`` that shares
+    one read across all callers in the process.
+
+    Raises:
+        FileNotFoundError: If the manifest does not exist
+    """
+    index = get_manifest_index(manifest_path)
+    if index is None:
+        if not Path(manifest_path).exists():
+            raise FileNotFoundError(f"Manifest not found: {manifest_path}")
+        return pl.read_parquet(manifest_path)
+    return index.frame
+
+
+def clear_manifest_index_cache() -> None:
+    """Drop all cached manifest indexes (mainly for tests)."""
+    with _LOCK:
+        _INDEXES.clear()
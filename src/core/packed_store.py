@@ -0,0 +1,609 @@
+"""
+Packed layout for staged measurements.
+
+Staging writes every measurement to its own directory:
+
+    raw_measurements/proc=It/date=2025-09-15/run_id=<id>/part-000.parquet
+
+A mature dataset becomes tens of thousands of tiny files, and opening,
+stat-ing and walking them dominates read time. ``pack_measurements`` folds
+the loose files of each ``proc=/date=`` partition into a few pack files,
+one row group per measurement:
+
+    raw_measurements/proc=It/date=2025-09-15/pack-000.parquet
+    raw_measurements/_manifest/pack_index.parquet
+
+The pack index maps ``run_id -> (pack file, row group)``. Measurement paths
+keep their loose form everywhere (manifest, chip histories, plot configs):
+``read_measurement_parquet`` reads the loose file when it exists and falls
+back to the pack index otherwise, so both layouts (and a mix of them, e.g.
+new measurements staged after the last pack) are read transparently.
+
+Measurements with differing column sets never share a pack, so a row group
+round-trips to exactly the DataFrame that was staged. Re-staging a packed
+measurement (``stage-all --force``) writes a loose file again, which takes
+precedence until the next pack run re-points the index at its new copy.
+Packs left without any indexed measurement are deleted by ``prune_packs``
+(``pack-staged --prune``).
+
+Example:
+    >>> report = pack_measurements(Path("data/02_stage/raw_measurements"))
+    >>> report.packed, report.packs_written
+    (18234, 212)
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import polars as pl
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+logger = logging.getLogger(__name__)
+
+PACK_INDEX_FILENAME = "pack_index.parquet"
+LOOSE_FILENAME = "part-000.parquet"
+
+# Loose bytes per pack file; a partition larger than this gets several packs
+DEFAULT_MAX_PACK_BYTES = 256 * 1024 * 1024
+
+_INDEX_SCHEMA = {
+    "run_id": pl.Utf8,
+    "proc": pl.Utf8,
+    "date_local": pl.Utf8,
+    "file": pl.Utf8,        # pack file, relative to the stage root
+    "row_group": pl.Int64,
+    "rows": pl.Int64,
+}
+
+
+@dataclass(frozen=True)
+class PackEntry:
+    """
+    Location of one measurement inside a pack file.
+
+    Attributes:
+        run_id: Measurement id
+        file: Absolute path of the pack file
+        row_group: Row group holding the measurement
+        rows: Number of rows of the measurement
+    """
+    run_id: str
+    file: Path
+    row_group: int
+    rows: int
+
+
+@dataclass
+class PackReport:
+    """
+    Outcome of ``pack_measurements``.
+
+    Attributes:
+        partitions: ``proc=/date=`` partitions with loose measurements
+        packed: Loose measurements folded into packs
+        packs_written: Pack files written
+        loose_removed: Loose run_id directories deleted after packing
+        superseded: Measurements that were already packed (their previous
+            row group is no longer referenced)
+        already_packed: Loose files not newer than the pack holding their
+            run_id (left out; their directory is removed unless keep_loose)
+        skipped: Empty or unreadable loose files left in place
+        bytes_before: Size of the packed loose files
+        bytes_after: Size of the pack files written
+    """
+    partitions: int = 0
+    packed: int = 0
+    packs_written: int = 0
+    loose_removed: int = 0
+    superseded: int = 0
+    already_packed: int = 0
+    skipped: int = 0
+    bytes_before: int = 0
+    bytes_after: int = 0
+
+
+def pack_index_path(stage_root: Path) -> Path:
+    """Path of the pack index of ``stage_root``."""
+    return Path(stage_root) / "_manifest" / PACK_INDEX_FILENAME
+
+
+def split_measurement_path(path: Path) -> Optional[Tuple[Path, str]]:
+    """
+    ``(stage_root, run_id)`` of a loose measurement path, or None.
+
+    ``stage_root/proc=X/date=Y/run_id=Z/part-000.parquet -> (stage_root, Z)``
+    """
+    path = Path(path)
+    run_dir = path.parent
+    if path.name != LOOSE_FILENAME or not run_dir.name.startswith("run_id="):
+        return None
+    return path.parents[3], run_dir.name[len("run_id="):]
+
+
+# ══════════════════════════════════════════════════════════════════════
+# Index (process-wide, reloaded when the index file changes)
+# ══════════════════════════════════════════════════════════════════════
+
+class PackIndex:
+    """
+    Immutable snapshot of a pack index with O(1) run_id lookups.
+
+    Attributes:
+        stage_root: Stage root the pack files are relative to
+        frame: The index DataFrame (shared, do not mutate)
+        signature: ``(st_mtime_ns, st_size)`` of the index at load time
+    """
+
+    def __init__(self, stage_root: Path, frame: pl.DataFrame, signature: Optional[Tuple[int, int]]):
+        self.stage_root = stage_root
+        self.frame = frame
+        self.signature = signature
+        self._entries: Dict[str, Tuple[str, int, int]] = {
+            rid: (f, rg, n)
+            for rid, f, rg, n in zip(
+                frame["run_id"].to_list(), frame["file"].to_list(),
+                frame["row_group"].to_list(), frame["rows"].to_list(),
+            )
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, run_id: str) -> bool:
+        return run_id in self._entries
+
+    def get(self, run_id: str) -> Optional[PackEntry]:
+        """Pack location of ``run_id``, or None if it is not packed."""
+        hit = self._entries.get(run_id)
+        if hit is None:
+            return None
+        rel, row_group, rows = hit
+        return PackEntry(run_id, self.stage_root / rel, row_group, rows)
+
+
+_INDEXES: Dict[Path, PackIndex] = {}
+# Parquet footers of pack files: path -> (signature, metadata)
+_FOOTERS: Dict[Path, Tuple[Tuple[int, int], pq.FileMetaData]] = {}
+_LOCK = threading.Lock()
+
+
+def _signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _read_index_frame(path: Path) -> pl.DataFrame:
+    if not path.exists():
+        return pl.DataFrame(schema=_INDEX_SCHEMA)
+    return pl.read_parquet(path)
+
+
+def get_pack_index(stage_root: Path) -> Optional[PackIndex]:
+    """
+    Cached pack index of ``stage_root``, or None if nothing is packed.
+
+    Costs one ``stat()`` per call once warm; reloads when the index changes.
+    """
+    stage_root = Path(os.path.abspath(stage_root))
+    path = pack_index_path(stage_root)
+    sig = _signature(path)
+    if sig is None:
+        return None
+    with _LOCK:
+        index = _INDEXES.get(stage_root)
+        if index is not None and index.signature == sig:
+            return index
+        try:
+            frame = _read_index_frame(path)
+        except Exception as e:
+            logger.warning("failed to load pack index %s: %s", path, e)
+            return None
+        index = PackIndex(stage_root, frame, sig)
+        _INDEXES[stage_root] = index
+        return index
+
+
+def clear_pack_index_cache() -> None:
+    """Drop cached pack indexes and footers (mainly for tests)."""
+    with _LOCK:
+        _INDEXES.clear()
+        _FOOTERS.clear()
+
+
+def locate(path: Path) -> Optional[PackEntry]:
+    """
+    Pack location of the measurement with loose path ``path``.
+
+    Only consults the index; callers prefer the loose file when it exists.
+    """
+    split = split_measurement_path(path)
+    if split is None:
+        return None
+    index = get_pack_index(split[0])
+    return index.get(split[1]) if index is not None else None
+
+
+def measurement_exists(path: Path) -> bool:
+    """Whether a measurement is staged at ``path``, loose or packed."""
+    return Path(path).exists() or locate(path) is not None
+
+
+def measurement_source(path: Path) -> Path:
+    """
+    File that holds the data of ``path``: the loose file, else its pack.
+
+    Used to validate cache entries (``path`` itself may not exist).
+    """
+    path = Path(path)
+    if path.exists():
+        return path
+    entry = locate(path)
+    return entry.file if entry is not None else path
+
+
+def _footer(file: Path) -> Optional[pq.FileMetaData]:
+    sig = _signature(file)
+    if sig is None:
+        return None
+    with _LOCK:
+        hit = _FOOTERS.get(file)
+        if hit is not None and hit[0] == sig:
+            return hit[1]
+    metadata = pq.read_metadata(file)
+    with _LOCK:
+        _FOOTERS[file] = (sig, metadata)
+    return metadata
+
+
+def measurement_size(path: Path) -> int:
+    """
+    Bytes on disk holding the data of ``path`` (0 if it does not exist).
+
+    A loose file counts whole; a packed measurement counts its own row
+    group's compressed column chunks, not the full pack file.
+    """
+    path = Path(path)
+    source = measurement_source(path)
+    try:
+        if source == path:
+            return path.stat().st_size
+        entry = locate(path)
+        metadata = _footer(entry.file) if entry is not None else None
+    except OSError:
+        return 0
+    if metadata is None:
+        return 0
+    row_group = metadata.row_group(entry.row_group)
+    return sum(row_group.column(i).total_compressed_size for i in range(row_group.num_columns))
+
+
+def read_packed(entry: PackEntry, columns: Optional[Sequence[str]] = None) -> pl.DataFrame:
+    """
+    Read one measurement from its pack.
+
+    Args:
+        entry: Pack location (``locate``)
+        columns: Columns to read; names missing from the pack are ignored
+            (same contract as the loose projected read)
+
+    Returns:
+        The measurement DataFrame
+
+    Raises:
+        FileNotFoundError: If the pack file is gone
+    """
+    metadata = _footer(entry.file)
+    if metadata is None:
+        raise FileNotFoundError(entry.file)
+    pf = pq.ParquetFile(entry.file, metadata=metadata)
+    if columns is not None:
+        wanted = set(columns)
+        columns = [name for name in pf.schema_arrow.names if name in wanted]
+    # Row groups are single measurements: threading costs more than it saves
+    return pl.from_arrow(pf.read_row_group(entry.row_group, columns=columns, use_threads=False))
+
+
+# ══════════════════════════════════════════════════════════════════════
+# Packing
+# ══════════════════════════════════════════════════════════════════════
+
+def _scan_dirs(root: Path, prefix: str) -> Iterator[os.DirEntry]:
+    try:
+        with os.scandir(root) as it:
+            for entry in it:
+                if entry.name.startswith(prefix) and entry.is_dir():
+                    yield entry
+    except FileNotFoundError:
+        return
+
+
+def loose_measurements(stage_root: Path) -> Dict[Tuple[str, str], List[Path]]:
+    """
+    Loose measurement files per ``(proc, date)`` partition.
+
+    Returns:
+        ``{(proc, date_local): [part-000.parquet, ...]}`` (sorted paths)
+    """
+    out: Dict[Tuple[str, str], List[Path]] = {}
+    for proc_dir in _scan_dirs(Path(stage_root), "proc="):
+        for date_dir in _scan_dirs(Path(proc_dir.path), "date="):
+            parts = [
+                Path(run_dir.path) / LOOSE_FILENAME
+                for run_dir in _scan_dirs(Path(date_dir.path), "run_id=")
+                if os.path.exists(os.path.join(run_dir.path, LOOSE_FILENAME))
+            ]
+            if parts:
+                key = (proc_dir.name[len("proc="):], date_dir.name[len("date="):])
+                out[key] = sorted(parts)
+    return out
+
+
+def _next_pack(partition_dir: Path) -> int:
+    numbers = [
+        int(p.stem.split("-")[1]) for p in partition_dir.glob("pack-*.parquet")
+        if p.stem.split("-")[1].isdigit()
+    ]
+    return max(numbers, default=-1) + 1
+
+
+def _buckets(
+    tables: List[Tuple[Path, pa.Table, int]],
+    max_pack_bytes: int,
+) -> List[List[Tuple[Path, pa.Table, int]]]:
+    """Split a partition into packs of one schema and at most ``max_pack_bytes``."""
+    by_schema: Dict[pa.Schema, List[Tuple[Path, pa.Table, int]]] = {}
+    for item in tables:
+        by_schema.setdefault(item[1].schema, []).append(item)
+    buckets = []
+    for items in by_schema.values():
+        current: List[Tuple[Path, pa.Table, int]] = []
+        size = 0
+        for item in items:
+            if current and size + item[2] > max_pack_bytes:
+                buckets.append(current)
+                current, size = [], 0
+            current.append(item)
+            size += item[2]
+        buckets.append(current)
+    return buckets
+
+
+def _write_pack(pack: Path, tables: List[pa.Table]) -> None:
+    """Write ``tables`` as consecutive row groups of ``pack`` (atomically)."""
+    tmp = pack.with_name(pack.name + ".tmp")
+    try:
+        with pq.ParquetWriter(tmp, tables[0].schema, compression="zstd") as writer:
+            for table in tables:
+                writer.write_table(table, row_group_size=table.num_rows)
+        tmp.replace(pack)
+    except Exception:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+def pack_measurements(
+    stage_root: Path,
+    max_pack_bytes: int = DEFAULT_MAX_PACK_BYTES,
+    keep_loose: bool = False,
+    dry_run: bool = False,
+) -> PackReport:
+    """
+    Fold loose staged measurements into per-partition pack files.
+
+    Each ``proc=/date=`` partition with loose files gets new pack files
+    (existing packs are never rewritten). The index is written after the
+    packs and before any loose file is deleted, so readers always find
+    every measurement in at least one layout.
+
+    Loose files whose run_id is already indexed are only re-packed when
+    they are newer than the pack holding it (a re-staged copy); otherwise
+    they are copies kept by ``keep_loose`` and packing them again would
+    just orphan the previous pack. Packs left without any indexed row
+    group are removed by ``prune_packs``.
+
+    Args:
+        stage_root: Staged measurements root (``.../raw_measurements``)
+        max_pack_bytes: Loose bytes per pack before a new one is started
+        keep_loose: Keep the loose files (loose copies win on read)
+        dry_run: Report what would be packed without writing anything
+
+    Returns:
+        PackReport with counts
+    """
+    stage_root = Path(stage_root)
+    report = PackReport()
+    index_path = pack_index_path(stage_root)
+    index = _read_index_frame(index_path)
+    known = dict(zip(index["run_id"].to_list(), index["file"].to_list()))
+    pack_mtimes: Dict[str, Optional[int]] = {}
+
+    def already_packed(part: Path, run_id: str) -> bool:
+        file = known.get(run_id)
+        if file is None:
+            return False
+        if file not in pack_mtimes:
+            try:
+                pack_mtimes[file] = (stage_root / file).stat().st_mtime_ns
+            except FileNotFoundError:
+                pack_mtimes[file] = None
+        packed_at = pack_mtimes[file]
+        return packed_at is not None and part.stat().st_mtime_ns <= packed_at
+
+    new_rows: List[dict] = []
+    packed_dirs: List[Path] = []
+    stale_dirs: List[Path] = []
+    for (proc, date), parts in sorted(loose_measurements(stage_root).items()):
+        report.partitions += 1
+        tables = []
+        for part in parts:
+            if already_packed(part, part.parent.name[len("run_id="):]):
+                report.already_packed += 1
+                stale_dirs.append(part.parent)
+                continue
+            try:
+                table = pq.read_table(part)
+            except Exception as e:
+                logger.warning("not packing unreadable %s: %s", part, e)
+                report.skipped += 1
+                continue
+            if table.num_rows == 0:
+                # A zero-row table does not produce a row group
+                report.skipped += 1
+                continue
+            tables.append((part, table, part.stat().st_size))
+
+        partition_dir = stage_root / f"proc={proc}" / f"date={date}"
+        number = _next_pack(partition_dir)
+        for bucket in _buckets(tables, max_pack_bytes):
+            pack = partition_dir / f"pack-{number:03d}.parquet"
+            number += 1
+            report.packs_written += 1
+            report.bytes_before += sum(size for _, _, size in bucket)
+            for row_group, (part, table, _) in enumerate(bucket):
+                run_id = part.parent.name[len("run_id="):]
+                report.packed += 1
+                if run_id in known:
+                    report.superseded += 1
+                new_rows.append({
+                    "run_id": run_id,
+                    "proc": proc,
+                    "date_local": date,
+                    "file": pack.relative_to(stage_root).as_posix(),
+                    "row_group": row_group,
+                    "rows": table.num_rows,
+                })
+                packed_dirs.append(part.parent)
+            if dry_run:
+                continue
+            _write_pack(pack, [table for _, table, _ in bucket])
+            report.bytes_after += pack.stat().st_size
+
+    if dry_run:
+        return report
+
+    if new_rows:
+        new = pl.DataFrame(new_rows, schema=_INDEX_SCHEMA)
+        merged = pl.concat(
+            [index.filter(~pl.col("run_id").is_in(new["run_id"].implode())), new],
+            how="vertical_relaxed",
+        ).sort("proc", "date_local", "file", "row_group")
+
+        from .stage_raw_measurements import atomic_write_parquet
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_parquet(merged, index_path)
+
+    if not keep_loose:
+        for run_dir in packed_dirs + stale_dirs:
+            shutil.rmtree(run_dir, ignore_errors=True)
+            report.loose_removed += 1
+    return report
+
+
+def unreferenced_packs(stage_root: Path) -> List[Path]:
+    """
+    Pack files without a single row group in the pack index.
+
+    Re-packing a re-staged measurement re-points its run_id at a new pack;
+    a pack all of whose measurements moved on this way is dead weight.
+
+    Returns:
+        Sorted pack file paths
+    """
+    stage_root = Path(stage_root)
+    referenced = set(_read_index_frame(pack_index_path(stage_root))["file"].to_list())
+    return sorted(
+        pack
+        for proc_dir in _scan_dirs(stage_root, "proc=")
+        for date_dir in _scan_dirs(Path(proc_dir.path), "date=")
+        for pack in Path(date_dir.path).glob("pack-*.parquet")
+        if pack.relative_to(stage_root).as_posix() not in referenced
+    )
+
+
+def prune_packs(stage_root: Path, dry_run: bool = False) -> Tuple[int, int]:
+    """
+    Delete pack files the pack index no longer references.
+
+    Args:
+        stage_root: Staged measurements root (``.../raw_measurements``)
+        dry_run: Only count what would be deleted
+
+    Returns:
+        ``(packs removed, bytes freed)``
+    """
+    removed = freed = 0
+    for pack in unreferenced_packs(stage_root):
+        size = pack.stat().st_size
+        if not dry_run:
+            pack.unlink(missing_ok=True)
+        removed += 1
+        freed += size
+    return removed, freed
+
+
+# ══════════════════════════════════════════════════════════════════════
+# run_id migration
+# ══════════════════════════════════════════════════════════════════════
+
+def rename_packed_runs(stage_root: Path, renames: Dict[str, str]) -> int:
+    """
+    Re-key packed measurements after a run_id scheme migration.
+
+    Rewrites the ``run_id`` column of every affected row group (each pack
+    is rewritten once, row groups keep their positions) and then re-keys
+    the pack index. Re-running after an interruption finishes the job:
+    row groups that already carry the new id are left alone.
+
+    Args:
+        stage_root: Staged measurements root
+        renames: ``old run_id -> new run_id``
+
+    Returns:
+        Number of pack index entries re-keyed
+    """
+    stage_root = Path(stage_root)
+    index_path = pack_index_path(stage_root)
+    if not renames or not index_path.exists():
+        return 0
+    index = _read_index_frame(index_path)
+    hits = index.filter(pl.col("run_id").is_in(list(renames)))
+    if hits.height == 0:
+        return 0
+
+    for (rel,), rows in hits.group_by("file"):
+        pack = stage_root / rel
+        if not pack.exists():
+            continue
+        wanted = dict(zip(rows["row_group"].to_list(), rows["run_id"].to_list()))
+        pf = pq.ParquetFile(pack)
+        tables, changed = [], False
+        for row_group in range(pf.num_row_groups):
+            table = pf.read_row_group(row_group)
+            old = wanted.get(row_group)
+            position = table.schema.get_field_index("run_id")
+            if old is not None and position >= 0:
+                new = renames[old]
+                column = table.column(position)
+                if column.to_pylist() != [new] * table.num_rows:
+                    field = table.schema.field(position)
+                    values = pa.array([new] * table.num_rows).cast(field.type)
+                    table = table.set_column(position, field, values)
+                    changed = True
+            tables.append(table)
+        if changed:
+            _write_pack(pack, tables)
+
+    from .stage_raw_measurements import atomic_write_parquet
+    atomic_write_parquet(index.with_columns(pl.col("run_id").replace(renames)), index_path)
+    return hits.height
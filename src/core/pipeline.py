@@ -4,13 +4,27 @@ Formal pipeline builder for chaining data processing commands.
 This module provides a declarative way to define, execute, and manage
 multi-step data processing pipelines with error handling, checkpointing,
 and rollback capabilities.
+
+Steps form a dependency graph. A step waits for the steps named in its
+``depends_on`` and for every earlier step whose declared ``outputs`` overlap
+its ``inputs``; a step without ``depends_on`` also waits for the step before
+it, so plain pipelines keep running in list order. Independent steps run
+concurrently with ``execute(max_parallel=N)``.
+
+With ``execute(incremental=True)`` (make-like mode) a step is fingerprinted
+from its command, kwargs and the size/mtime of its declared inputs. If the
+fingerprint matches the one recorded when the step last succeeded and its
+outputs exist, the step is marked up to date instead of re-run.
 """
 
 from __future__ import annotations
 
+import glob
+import hashlib
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from pathlib import Path
-from typing import Callable, Any, Optional, Dict, List
+from typing import Callable, Any, Optional, Dict, List, Set
 from dataclasses import dataclass, field
 from enum import Enum
 import json
@@ -31,6 +45,11 @@ class StepStatus(str, Enum):
     FAILED = "failed"
     SKIPPED = "skipped"
     ROLLED_BACK = "rolled_back"
+    UP_TO_DATE = "up_to_date"  # Not re-run: completed earlier, inputs unchanged
+
+
+# Statuses that satisfy dependents and count as "done" in a checkpoint
+_DONE = (StepStatus.SUCCESS, StepStatus.SKIPPED, StepStatus.UP_TO_DATE)
 
 
 @dataclass
@@ -44,6 +63,9 @@ class PipelineStep:
     retry_count: int = 0
     retry_delay: float = 1.0  # seconds
     checkpoint: bool = True  # Save checkpoint after this step
+    inputs: List[str] = field(default_factory=list)  # Paths/globs read by the step
+    outputs: List[str] = field(default_factory=list)  # Paths/globs written by the step
+    depends_on: Optional[List[str]] = None  # None = after the previous step
 
     # Runtime state
     status: StepStatus = StepStatus.PENDING
@@ -51,6 +73,7 @@ class PipelineStep:
     start_time: Optional[float] = None
     end_time: Optional[float] = None
     output: Any = None
+    fingerprint: Optional[str] = None
 
     @property
     def elapsed_time(self) -> Optional[float]:
@@ -66,9 +89,66 @@ class PipelineStep:
             "status": self.status.value,
             "elapsed_time": self.elapsed_time,
             "error": str(self.error) if self.error else None,
+            "fingerprint": self.fingerprint,
         }
 
 
+def _expand(pattern: str) -> List[Path]:
+    """Files matched by a path or glob; directories are walked recursively."""
+    matches = sorted(glob.glob(pattern, recursive=True))
+    files: List[Path] = []
+    for match in map(Path, matches):
+        if match.is_dir():
+            files.extend(sorted(p for p in match.rglob("*") if p.is_file()))
+        else:
+            files.append(match)
+    return files
+
+
+def step_fingerprint(step: PipelineStep) -> str:
+    """
+    Fingerprint of a step's command, kwargs and declared inputs.
+
+    Inputs are hashed by path, size and mtime (not content), so the check
+    costs one ``stat()`` per input file.
+
+    Returns:
+        Hex digest; changes whenever a kwarg changes or an input file is
+        added, removed or modified
+    """
+    h = hashlib.sha256()
+    command = getattr(step.command, "__name__", repr(step.command))
+    h.update(json.dumps([command, step.kwargs], sort_keys=True, default=str).encode())
+    for pattern in step.inputs:
+        h.update(f"\0{pattern}".encode())
+        for path in _expand(pattern):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            h.update(f"\n{path}:{st.st_size}:{st.st_mtime_ns}".encode())
+    return h.hexdigest()
+
+
+def _outputs_exist(step: PipelineStep) -> bool:
+    return all(glob.glob(pattern, recursive=True) for pattern in step.outputs)
+
+
+def _path_overlap(a: str, b: str) -> bool:
+    """Whether two path/glob patterns can refer to the same files."""
+    def fixed_parts(pattern: str) -> tuple:
+        parts = []
+        for part in Path(pattern).parts:
+            if glob.has_magic(part):
+                break
+            parts.append(part)
+        return tuple(parts)
+
+    pa, pb = fixed_parts(a), fixed_parts(b)
+    n = min(len(pa), len(pb))
+    return pa[:n] == pb[:n]
+
+
 class PipelineState:
     """Manages pipeline execution state and checkpointing."""
 
@@ -107,6 +187,27 @@ class PipelineState:
             return json.loads(checkpoints[-1].read_text())
         return None
 
+    def last_fingerprints(self) -> Dict[str, str]:
+        """
+        Fingerprint of each step's most recent successful run.
+
+        Checkpoints are replayed oldest first; a later failure of a step
+        forgets its fingerprint (its outputs may be partial).
+        """
+        fingerprints: Dict[str, str] = {}
+        for checkpoint in sorted(self.checkpoint_dir.glob(f"{self.name}_*.json")):
+            try:
+                steps = json.loads(checkpoint.read_text()).get("steps", [])
+            except (OSError, ValueError):
+                continue
+            for step in steps:
+                if step.get("status") in (StepStatus.SUCCESS.value, StepStatus.UP_TO_DATE.value):
+                    if step.get("fingerprint"):
+                        fingerprints[step["name"]] = step["fingerprint"]
+                elif step.get("status") in (StepStatus.FAILED.value, StepStatus.SKIPPED.value):
+                    fingerprints.pop(step["name"], None)
+        return fingerprints
+
     def clear_checkpoints(self):
         """Remove all checkpoints for this pipeline."""
         for checkpoint in self.checkpoint_dir.glob(f"{self.name}_*.json"):
@@ -167,6 +268,9 @@ class Pipeline:
         retry_count: int = 0,
         retry_delay: float = 1.0,
         checkpoint: bool = True,
+        inputs: Optional[List[str]] = None,
+        outputs: Optional[List[str]] = None,
+        depends_on: Optional[List[str]] = None,
         **kwargs,
     ) -> "Pipeline":
         """
@@ -180,6 +284,11 @@ class Pipeline:
             retry_count: Number of times to retry on failure (0 = no retry)
             retry_delay: Seconds to wait between retries
             checkpoint: Save checkpoint after this step completes
+            inputs: Paths/globs the step reads (fingerprinted in incremental mode)
+            outputs: Paths/globs the step writes; later steps reading them
+                depend on this step
+            depends_on: Names of steps that must finish first (None = the
+                previous step; [] = no dependency)
             **kwargs: Arguments to pass to the command function
 
         Returns:
@@ -194,45 +303,140 @@ class Pipeline:
             retry_count=retry_count,
             retry_delay=retry_delay,
             checkpoint=checkpoint,
+            inputs=[str(p) for p in inputs or []],
+            outputs=[str(p) for p in outputs or []],
+            depends_on=list(depends_on) if depends_on is not None else None,
         )
         self.steps.append(step)
         return self
 
+    def dependencies(self) -> Dict[str, Set[str]]:
+        """
+        Dependency graph: step name -> names of the steps it waits for.
+
+        Raises:
+            ValueError: Unknown step in ``depends_on``, duplicate step names
+                or a dependency cycle
+        """
+        return self._graph()[0]
+
+    def _graph(self) -> tuple:
+        """Dependency graph plus, per step, its order-only (implicit) dependencies."""
+        names = [step.name for step in self.steps]
+        if len(set(names)) != len(names):
+            raise ValueError(f"Duplicate step names in pipeline '{self.name}'")
+
+        graph: Dict[str, Set[str]] = {}
+        order_only: Dict[str, Set[str]] = {}
+        for i, step in enumerate(self.steps):
+            implicit: Set[str] = set()
+            if step.depends_on is None:
+                implicit = {names[i - 1]} if i > 0 else set()
+                deps = set(implicit)
+            else:
+                unknown = set(step.depends_on) - set(names)
+                if unknown:
+                    raise ValueError(f"Step '{step.name}' depends on unknown step(s): {sorted(unknown)}")
+                deps = set(step.depends_on)
+            for earlier in self.steps[:i]:
+                if any(_path_overlap(o, inp) for o in earlier.outputs for inp in step.inputs):
+                    deps.add(earlier.name)
+                    implicit.discard(earlier.name)
+            graph[step.name] = deps
+            order_only[step.name] = implicit
+
+        # Kahn's algorithm, only to reject cycles up front
+        indegree = {name: len(deps) for name, deps in graph.items()}
+        ready = [name for name, n in indegree.items() if n == 0]
+        seen = 0
+        while ready:
+            current = ready.pop()
+            seen += 1
+            for name, deps in graph.items():
+                if current in deps:
+                    indegree[name] -= 1
+                    if indegree[name] == 0:
+                        ready.append(name)
+        if seen != len(graph):
+            raise ValueError(f"Dependency cycle in pipeline '{self.name}'")
+        return graph, order_only
+
     def execute(
         self,
         stop_on_error: bool = True,
         enable_rollback: bool = False,
         resume_from: Optional[str] = None,
+        max_parallel: int = 1,
+        incremental: bool = False,
     ) -> PipelineResult:
         """
         Execute the pipeline.
 
+        Steps start as soon as their dependencies are done (success, skipped
+        or up to date). Dependents of a failed step never run.
+
         Args:
             stop_on_error: If True, stop pipeline on first error (unless step has skip_on_error=True)
             enable_rollback: If True, rollback completed steps on failure
-            resume_from: Resume from checkpoint (execution_id or "latest")
+            resume_from: Resume from checkpoint (execution_id or "latest");
+                steps that succeeded in it are not run again
+            max_parallel: Maximum number of steps running at once
+            incremental: Skip steps with declared inputs whose fingerprint
+                matches their last successful run (make-like mode)
 
         Returns:
             PipelineResult with execution details
         """
         start_time = time.time()
+        graph, order_only = self._graph()
+        by_name = {step.name: step for step in self.steps}
 
         # Handle resume
-        start_index = 0
+        completed: Set[str] = set()
         if resume_from:
             checkpoint = self.state.load_checkpoint(
                 None if resume_from == "latest" else resume_from
             )
             if checkpoint:
                 console.print(f"[cyan]Resuming from checkpoint: {checkpoint['execution_id']}[/cyan]")
-                # Skip already completed steps
-                completed_steps = {s["name"]: s for s in checkpoint["steps"] if s["status"] == "success"}
-                start_index = len(completed_steps)
+                done = {s.value for s in _DONE}
+                completed = {s["name"] for s in checkpoint["steps"] if s["status"] in done} & set(by_name)
+                if completed:
+                    console.print(f"[dim]Skipping completed steps: {', '.join(sorted(completed))}[/dim]")
+        for name in completed:
+            by_name[name].status = StepStatus.UP_TO_DATE
+
+        previous = self.state.last_fingerprints() if incremental else {}
 
         # Display pipeline header
         self._display_header()
 
-        # Execute steps
+        pending = [step for step in self.steps if step.name not in completed]
+        running: Dict[Future, PipelineStep] = {}
+        failed = False
+
+        def is_ready(step: PipelineStep) -> bool:
+            # A failed step blocks its dependents; an implicit "previous step"
+            # edge only orders execution (stop_on_error=False keeps going)
+            return all(
+                by_name[dep].status in _DONE
+                or (dep in order_only[step.name] and by_name[dep].status == StepStatus.FAILED)
+                for dep in graph[step.name]
+            )
+
+        def finish(step: PipelineStep, success: bool) -> None:
+            nonlocal failed
+            progress.advance(pipeline_task)
+            if not success:
+                failed = True
+            elif step.checkpoint:
+                checkpoint_file = self.state.save_checkpoint(
+                    self.steps,
+                    metadata={"last_completed_step": step.name}
+                )
+                if self.verbose:
+                    console.print(f"[dim]Checkpoint saved: {checkpoint_file}[/dim]")
+
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
@@ -243,29 +447,47 @@ class Pipeline:
             pipeline_task = progress.add_task(
                 f"[cyan]Pipeline: {self.name}", total=len(self.steps)
             )
-
-            for i, step in enumerate(self.steps[start_index:], start=start_index):
-                progress.update(pipeline_task, description=f"[cyan]Step {i+1}/{len(self.steps)}: {step.name}")
-
-                success = self._execute_step(step, progress)
-                progress.advance(pipeline_task)
-
-                if not success:
-                    if enable_rollback:
-                        console.print(f"\n[yellow]⚠ Rolling back completed steps...[/yellow]")
-                        self.rollback()
-
-                    if stop_on_error and not step.skip_on_error:
+            progress.advance(pipeline_task, len(completed))
+
+            limit = max(1, max_parallel)
+            with ThreadPoolExecutor(max_workers=limit) as pool:
+                while True:
+                    launched = False
+                    for step in [s for s in pending if is_ready(s)]:
+                        if (failed and stop_on_error) or len(running) >= limit:
+                            break
+                        launched = True
+                        pending.remove(step)
+                        i = self.steps.index(step)
+                        progress.update(pipeline_task, description=f"[cyan]Step {i+1}/{len(self.steps)}: {step.name}")
+
+                        if incremental and step.inputs:
+                            step.fingerprint = step_fingerprint(step)
+                            if previous.get(step.name) == step.fingerprint and _outputs_exist(step):
+                                step.status = StepStatus.UP_TO_DATE
+                                console.print(f"[dim]✓ {step.name} is up to date[/dim]")
+                                finish(step, True)
+                                continue
+
+                        if limit == 1:
+                            finish(step, self._execute_step(step, progress))
+                        else:
+                            running[pool.submit(self._execute_step, step, progress)] = step
+
+                    if running:
+                        done, _ = wait(running, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            finish(running.pop(future), future.result())
+                    elif not launched:
                         break
 
-                # Save checkpoint after successful step
-                if success and step.checkpoint:
-                    checkpoint_file = self.state.save_checkpoint(
-                        self.steps,
-                        metadata={"last_completed_step": step.name}
-                    )
-                    if self.verbose:
-                        console.print(f"[dim]Checkpoint saved: {checkpoint_file}[/dim]")
+        if failed and enable_rollback:
+            console.print(f"\n[yellow]⚠ Rolling back completed steps...[/yellow]")
+            self.rollback()
+
+        if incremental:
+            # Record fingerprints of up-to-date steps even without a new success
+            self.state.save_checkpoint(self.steps, metadata={"incremental": True})
 
         elapsed = time.time() - start_time
         result = self._build_result(elapsed)
@@ -362,6 +584,7 @@ class Pipeline:
         success_count = sum(1 for s in self.steps if s.status == StepStatus.SUCCESS)
         failed_count = sum(1 for s in self.steps if s.status == StepStatus.FAILED)
         skipped_count = sum(1 for s in self.steps if s.status == StepStatus.SKIPPED)
+        up_to_date_count = sum(1 for s in self.steps if s.status == StepStatus.UP_TO_DATE)
 
         return PipelineResult(
             pipeline_name=self.name,
@@ -371,6 +594,7 @@ class Pipeline:
             skipped_steps=skipped_count,
             total_time=elapsed,
             steps=self.steps,
+            up_to_date_steps=up_to_date_count,
         )
 
     def _display_summary(self, result: "PipelineResult"):
@@ -394,6 +618,8 @@ class Pipeline:
             summary += f", {result.failed_steps} failed"
         if result.skipped_steps > 0:
             summary += f", {result.skipped_steps} skipped"
+        if result.up_to_date_steps > 0:
+            summary += f", {result.up_to_date_steps} up to date"
 
         # Add failed step details
         if result.failed_steps > 0:
@@ -417,6 +643,9 @@ class Pipeline:
                     "kwargs": step.kwargs,
                     "skip_on_error": step.skip_on_error,
                     "retry_count": step.retry_count,
+                    **({"inputs": step.inputs} if step.inputs else {}),
+                    **({"outputs": step.outputs} if step.outputs else {}),
+                    **({"depends_on": step.depends_on} if step.depends_on is not None else {}),
                 }
                 for step in self.steps
             ]
@@ -447,6 +676,9 @@ class Pipeline:
                 command=command_registry[command_name],
                 skip_on_error=step_def.get("skip_on_error", False),
                 retry_count=step_def.get("retry_count", 0),
+                inputs=step_def.get("inputs"),
+                outputs=step_def.get("outputs"),
+                depends_on=step_def.get("depends_on"),
                 **step_def.get("kwargs", {})
             )
 
@@ -463,6 +695,7 @@ class PipelineResult:
     skipped_steps: int
     total_time: float
     steps: List[PipelineStep]
+    up_to_date_steps: int = 0
 
     @property
     def success(self) -> bool:
@@ -14,6 +14,7 @@ from typing import Callable, List, Optional, Protocol
 
 import polars as pl
 
+from src.core.manifest_index import read_manifest
 from src.plotting.shared.config import PlotConfig
 
 logger = logging.getLogger(__name__)
@@ -420,7 +421,7 @@ def _generate_laser_calibration(request, progress):
     if not manifest_path.exists():
         raise FileNotFoundError("Manifest not found. Run 'biotite stage-all' first.")
 
-    manifest = pl.read_parquet(manifest_path)
+    manifest = read_manifest(manifest_path)
     calibrations = manifest.filter(pl.col("proc") == "LaserCalibration")
 
     time_col = "start_time_utc" if "start_time_utc" in calibrations.columns else "start_dt"
@@ -475,6 +476,7 @@ def _generate_laser_calibration(request, progress):
 
 def _generate_its_relaxation(request, progress):
     """Generate ITS relaxation fits plot (requires derived metrics)."""
+    from src.derived.metrics_store import metrics_exist, scan_metrics
     from src.plotting.its_relaxation_fit import plot_its_relaxation_fits
 
     progress(20, "Loading chip history...")
@@ -487,14 +489,19 @@ def _generate_its_relaxation(request, progress):
     selected = history.filter(pl.col("seq").is_in(request.seq_numbers))
 
     progress(40, "Loading relaxation metrics...")
-    metrics_path = Path("data/03_derived/_metrics/metrics.parquet")
-    if not metrics_path.exists():
+    metrics_dir = Path("data/03_derived/_metrics")
+    if not metrics_exist(metrics_dir):
         raise FileNotFoundError("Metrics not found. Run 'biotite derive-all-metrics' first.")
 
-    all_metrics = pl.read_parquet(metrics_path)
-    selected_metrics = all_metrics.filter(
-        (pl.col("metric_name") == "relaxation_time") &
-        (pl.col("run_id").is_in(selected["run_id"]))
+    selected_metrics = (
+        scan_metrics(
+            metrics_dir,
+            chip_group=request.chip_group,
+            chip_number=request.chip_number,
+            metric_names="relaxation_time",
+        )
+        .filter(pl.col("run_id").is_in(selected["run_id"].to_list()))
+        .collect()
     )
 
     progress(60, "Generating relaxation plot...")
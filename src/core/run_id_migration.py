@@ -0,0 +1,274 @@
+"""
+Migration of staged run_ids between run_id scheme versions.
+
+run_id v1 hashed the parsed data table re-serialized to CSV; v2 streams the
+raw data-block bytes of the source CSV (see ``stage_utils.compute_run_id``).
+The same measurement therefore gets a different id under each scheme, and
+everything keyed by run_id has to be re-linked when a staged tree moves to
+v2.
+
+``build_run_id_map`` re-reads every source CSV referenced by the manifest,
+recomputes both ids and classifies each row:
+
+- ``current``: manifest run_id already equals the v2 id
+- ``migrate``: manifest run_id equals the recomputed v1 id (safe to rename)
+- ``mismatch``: neither matches (source changed since staging) - left alone
+- ``missing_source`` / ``error``: source file gone or unreadable - left alone
+
+``apply_run_id_map`` then renames the ``migrate`` rows everywhere: staged
+Parquet files (directory and ``run_id`` column), packed measurements (pack
+row groups and ``pack_index.parquet``), the source index, the
+derived metrics dataset (including partner run_ids inside ``value_json``)
+and the extraction ledger, and finally the manifest. Every step skips work
+that is already done, so an interrupted migration can simply be re-run.
+Chip histories are derived from the manifest and must be rebuilt afterwards.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import polars as pl
+
+from .packed_store import rename_packed_runs
+from .source_index import SOURCE_INDEX_FILENAME
+from .stage_raw_measurements import atomic_write_parquet, parse_header, read_numeric_table
+from .stage_utils import RUN_ID_VERSION, compute_run_id, content_hash, data_block_hash
+
+logger = logging.getLogger(__name__)
+
+RUN_ID_MAP_FILENAME = "run_id_map.parquet"
+
+MAP_SCHEMA = {
+    "old_run_id": pl.Utf8,
+    "new_run_id": pl.Utf8,
+    "source_file": pl.Utf8,
+    "path": pl.Utf8,
+    "status": pl.Utf8,
+    "error": pl.Utf8,
+}
+
+
+def _as_utc(value: Union[dt.datetime, str]) -> dt.datetime:
+    # Manifests merged from the NDJSON event log hold start_time_utc as the
+    # str() of the staged datetime, e.g. "2025-03-03 12:15:00+00:00"
+    if isinstance(value, str):
+        value = dt.datetime.fromisoformat(value)
+    return value.replace(tzinfo=dt.timezone.utc) if value.tzinfo is None else value
+
+
+def _classify(row: dict) -> dict:
+    """Recompute v1 and v2 ids for one manifest row."""
+    result = {
+        "old_run_id": row["run_id"],
+        "new_run_id": None,
+        "source_file": row.get("source_file"),
+        "path": row.get("path"),
+        "status": "missing_source",
+        "error": None,
+    }
+    src = Path(row["source_file"]) if row.get("source_file") else None
+    if src is None or not src.exists():
+        return result
+
+    try:
+        hb = parse_header(src)
+        key = (row["proc"], row.get("chip_group"), row.get("chip_number"), _as_utc(row["start_time_utc"]))
+        v2 = compute_run_id(*key, data_block_hash(src, hb.data_header_line), version=RUN_ID_VERSION)
+        if row["run_id"] == v2:
+            result.update(new_run_id=v2, status="current")
+            return result
+        v1 = compute_run_id(*key, content_hash(read_numeric_table(src, hb.data_header_line)), version=1)
+        if row["run_id"] == v1:
+            result.update(new_run_id=v2, status="migrate")
+        else:
+            result.update(status="mismatch")
+    except Exception as e:
+        result.update(status="error", error=str(e))
+    return result
+
+
+def build_run_id_map(manifest_path: Path, workers: int = 1) -> pl.DataFrame:
+    """
+    Map every manifest run_id to its current-scheme (v2) run_id.
+
+    Args:
+        manifest_path: Path to manifest.parquet
+        workers: Worker processes used to re-hash the source CSVs
+
+    Returns:
+        DataFrame with columns ``old_run_id``, ``new_run_id``, ``source_file``,
+        ``path``, ``status`` and ``error`` (one row per manifest row)
+    """
+    cols = ["run_id", "proc", "chip_group", "chip_number", "start_time_utc", "source_file", "path"]
+    manifest = pl.read_parquet(manifest_path)
+    rows = manifest.select([c for c in cols if c in manifest.columns]).to_dicts()
+
+    if workers > 1 and len(rows) > 1:
+        # 'spawn' rather than 'fork': the manifest was just read with Polars,
+        # and forking a live Polars thread pool can deadlock the children
+        mp_context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as ex:
+            results = list(ex.map(_classify, rows, chunksize=max(1, len(rows) // (workers * 4))))
+    else:
+        results = [_classify(row) for row in rows]
+    return pl.DataFrame(results, schema=MAP_SCHEMA)
+
+
+def write_run_id_map(mapping: pl.DataFrame, manifest_path: Path) -> Path:
+    """Save ``mapping`` next to the manifest as ``run_id_map.parquet``."""
+    out = manifest_path.parent / RUN_ID_MAP_FILENAME
+    atomic_write_parquet(mapping, out)
+    return out
+
+
+@dataclass
+class MigrationReport:
+    """
+    Outcome of ``apply_run_id_map``.
+
+    Attributes:
+        runs_migrated: run_ids renamed in the manifest
+        staged_files_moved: Staged Parquet files rewritten under the new run_id
+        packed_runs_rekeyed: Packed measurements re-keyed in the pack index
+        metric_files_rewritten: Metrics part files / legacy metrics.parquet rewritten
+        ledger_rows_rewritten: Extraction-ledger rows that referenced an old run_id
+    """
+    runs_migrated: int = 0
+    staged_files_moved: int = 0
+    packed_runs_rekeyed: int = 0
+    metric_files_rewritten: int = 0
+    ledger_rows_rewritten: int = 0
+
+
+def _renames(mapping: pl.DataFrame) -> Dict[str, str]:
+    migrate = mapping.filter(pl.col("status") == "migrate")
+    return dict(zip(migrate["old_run_id"].to_list(), migrate["new_run_id"].to_list()))
+
+
+def _new_path(path: str, old: str, new: str) -> str:
+    return path.replace(f"run_id={old}", f"run_id={new}")
+
+
+def _rename_path(path: Optional[str], renames: Dict[str, str]) -> Optional[str]:
+    if path is None or "run_id=" not in path:
+        return path
+    old = path.split("run_id=", 1)[1].split("/", 1)[0]
+    return _new_path(path, old, renames[old]) if old in renames else path
+
+
+def _move_staged_file(path: str, old: str, new: str) -> bool:
+    src = Path(path)
+    dst = Path(_new_path(path, old, new))
+    if not src.exists():
+        # Already moved by an interrupted run, packed, or never staged
+        return False
+    df = pl.read_parquet(src)
+    if "run_id" in df.columns:
+        df = df.with_columns(pl.lit(new).alias("run_id"))
+    atomic_write_parquet(df, dst)
+    src.unlink()
+    try:
+        src.parent.rmdir()
+    except OSError:
+        pass
+    return True
+
+
+def _rename_columns(df: pl.DataFrame, renames: Dict[str, str], columns: List[str]) -> Tuple[pl.DataFrame, int]:
+    """Replace old run_ids in ``columns`` (and inside ``value_json``); count touched rows."""
+    old_ids = list(renames)
+    touched = pl.lit(False)
+    exprs = []
+    for col in columns:
+        if col in df.columns:
+            touched = touched | pl.col(col).is_in(old_ids)
+            exprs.append(pl.col(col).replace(renames))
+    if "value_json" in df.columns:
+        touched = touched | pl.col("value_json").str.contains_any(old_ids)
+        exprs.append(pl.col("value_json").str.replace_many(old_ids, list(renames.values())))
+    n = df.select(touched.fill_null(False).sum()).item()
+    return (df.with_columns(exprs) if n else df), n
+
+
+def _rewrite_metrics(metrics_dir: Path, renames: Dict[str, str], report: MigrationReport) -> None:
+    from src.derived.metrics_store import LEDGER_FILENAME, METRICS_FILENAME, _part_files
+
+    files = _part_files(metrics_dir)
+    legacy = metrics_dir / METRICS_FILENAME
+    if legacy.exists():
+        files.append(legacy)
+    for path in files:
+        df, n = _rename_columns(pl.read_parquet(path), renames, ["run_id"])
+        if n:
+            atomic_write_parquet(df, path)
+            report.metric_files_rewritten += 1
+
+    ledger = metrics_dir / LEDGER_FILENAME
+    if ledger.exists():
+        df, n = _rename_columns(pl.read_parquet(ledger), renames, ["run_id", "partner_run_id"])
+        if n:
+            atomic_write_parquet(df, ledger)
+            report.ledger_rows_rewritten = n
+
+
+def apply_run_id_map(
+    mapping: pl.DataFrame,
+    manifest_path: Path,
+    metrics_dir: Optional[Path] = None,
+) -> MigrationReport:
+    """
+    Rename every ``migrate`` row of ``mapping`` across the staged tree.
+
+    The manifest is rewritten last: until then it still lists the old ids,
+    so re-running ``build_run_id_map`` + ``apply_run_id_map`` after a crash
+    resumes where the previous attempt stopped.
+
+    Args:
+        mapping: Output of ``build_run_id_map``
+        manifest_path: Path to manifest.parquet
+        metrics_dir: Derived ``_metrics`` directory to re-link (optional)
+
+    Returns:
+        MigrationReport with counts of rewritten items
+    """
+    report = MigrationReport()
+    renames = _renames(mapping)
+    if not renames:
+        return report
+
+    for row in mapping.filter(pl.col("status") == "migrate").iter_rows(named=True):
+        if row["path"] and _move_staged_file(row["path"], row["old_run_id"], row["new_run_id"]):
+            report.staged_files_moved += 1
+
+    # Packed measurements: the loose path is rewritten with the manifest below
+    report.packed_runs_rekeyed = rename_packed_runs(manifest_path.parent.parent, renames)
+
+    index_path = manifest_path.parent / SOURCE_INDEX_FILENAME
+    if index_path.exists():
+        index, n = _rename_columns(pl.read_parquet(index_path), renames, ["run_id"])
+        if n:
+            index = index.with_columns(
+                pl.col("staged_path").map_elements(lambda p: _rename_path(p, renames), return_dtype=pl.Utf8)
+            )
+            atomic_write_parquet(index, index_path)
+
+    if metrics_dir is not None and Path(metrics_dir).exists():
+        _rewrite_metrics(Path(metrics_dir), renames, report)
+
+    manifest = pl.read_parquet(manifest_path)
+    report.runs_migrated = manifest.filter(pl.col("run_id").is_in(list(renames))).height
+    manifest = manifest.with_columns(
+        pl.col("path").map_elements(lambda p: _rename_path(p, renames), return_dtype=pl.Utf8),
+        pl.col("run_id").replace(renames),
+    )
+    atomic_write_parquet(manifest, manifest_path)
+    logger.info(f"Migrated {report.runs_migrated} run_ids to v{RUN_ID_VERSION}")
+    return report
+
@@ -0,0 +1,253 @@
+"""
+Persistent index of staged source CSVs.
+
+Maps every raw CSV that staging has already ingested to the filesystem
+signature it had at the time (size, mtime and, optionally, a fast head/tail
+fingerprint) plus the run_id and staged Parquet path it produced. Staging
+consults the index *before* submitting work to the process pool, so files
+that have not changed since the last run are dropped without ever being
+opened, parsed or hashed.
+
+The index lives next to the manifest:
+
+    02_stage/raw_measurements/_manifest/source_index.parquet
+
+It is purely an acceleration structure: deleting it is always safe and
+simply makes the next run hand every CSV to the workers again (which then
+fall back to the per-file ``out_file.exists()`` check).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import polars as pl
+
+from .packed_store import measurement_exists
+
+logger = logging.getLogger(__name__)
+
+SOURCE_INDEX_FILENAME = "source_index.parquet"
+FINGERPRINT_BLOCK_BYTES = 64 * 1024
+
+_SCHEMA = {
+    "source_file": pl.Utf8,
+    "size_bytes": pl.Int64,
+    "mtime_ns": pl.Int64,
+    "fingerprint": pl.Utf8,
+    "run_id": pl.Utf8,
+    "staged_path": pl.Utf8,
+}
+
+
+@dataclass
+class SourceSignature:
+    """
+    Filesystem signature of a raw CSV.
+
+    Attributes:
+        size_bytes: File size from ``stat()``
+        mtime_ns: Modification time in nanoseconds from ``stat()``
+        fingerprint: Optional head/tail content digest (see ``fast_fingerprint``)
+    """
+    size_bytes: int
+    mtime_ns: int
+    fingerprint: Optional[str] = None
+
+
+def source_key(path: Path) -> str:
+    """Canonical index key for a source file (absolute POSIX path)."""
+    return path.resolve().as_posix()
+
+
+def stat_signature(path: Path) -> SourceSignature:
+    """Signature of ``path`` from a single ``stat()`` call (no file read)."""
+    st = path.stat()
+    return SourceSignature(size_bytes=st.st_size, mtime_ns=st.st_mtime_ns)
+
+
+def fast_fingerprint(path: Path, block_bytes: int = FINGERPRINT_BLOCK_BYTES) -> str:
+    """
+    Cheap content fingerprint: BLAKE2b of size + first and last block.
+
+    Reads at most ``2 * block_bytes`` regardless of file size. Instrument
+    CSVs are append-only (header first, data rows after), so any rewrite
+    that keeps the size identical still changes the header timestamp or the
+    tail rows. Used to recognise files whose mtime changed without their
+    content changing (copies, ``dvc checkout``, archive extraction).
+
+    Args:
+        path: File to fingerprint
+        block_bytes: Bytes read from each end of the file
+
+    Returns:
+        32-char hexadecimal digest
+    """
+    h = hashlib.blake2b(digest_size=16)
+    size = path.stat().st_size
+    h.update(str(size).encode())
+    with path.open("rb") as f:
+        h.update(f.read(block_bytes))
+        if size > block_bytes:
+            f.seek(max(block_bytes, size - block_bytes))
+            h.update(f.read(block_bytes))
+    return h.hexdigest()
+
+
+class SourceIndex:
+    """
+    In-memory view of ``source_index.parquet`` with lookup/record helpers.
+
+    Example:
+        >>> index = SourceIndex.load(manifest_dir / SOURCE_INDEX_FILENAME)
+        >>> pending, unchanged = index.partition(csvs)
+        >>> ...  # stage `pending`
+        >>> index.record(src, sig, run_id, staged_path)
+        >>> index.save()
+    """
+
+    def __init__(self, path: Path, entries: Optional[Dict[str, dict]] = None):
+        self.path = path
+        self._entries: Dict[str, dict] = entries or {}
+        self._dirty = False
+
+    @classmethod
+    def for_manifest(cls, manifest_path: Path) -> "SourceIndex":
+        """Load the index stored alongside ``manifest_path``."""
+        return cls.load(manifest_path.parent / SOURCE_INDEX_FILENAME)
+
+    @classmethod
+    def load(cls, path: Path) -> "SourceIndex":
+        """Load an index from disk; a missing or unreadable file yields an empty index."""
+        entries: Dict[str, dict] = {}
+        if path.exists():
+            try:
+                df = pl.read_parquet(path)
+                for row in df.iter_rows(named=True):
+                    entries[row["source_file"]] = row
+            except Exception as e:
+                logger.warning("ignoring unreadable source index %s: %s", path, e)
+                entries = {}
+        return cls(path, entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, src: Path) -> bool:
+        return source_key(src) in self._entries
+
+    def lookup(self, src: Path) -> Optional[dict]:
+        """Return the stored entry for ``src`` (or None)."""
+        return self._entries.get(source_key(src))
+
+    def is_unchanged(
+        self,
+        src: Path,
+        sig: SourceSignature,
+        use_fingerprint: bool = False,
+    ) -> bool:
+        """
+        Whether ``src`` still matches what was staged last time.
+
+        A file is unchanged when its size and mtime match the stored entry
+        and the staged measurement still exists (loose or packed). With ``use_fingerprint``, a file
+        whose size matches but whose mtime moved is re-checked with
+        ``fast_fingerprint`` and, if identical, its stored mtime is refreshed.
+        """
+        entry = self._entries.get(source_key(src))
+        if entry is None or entry["size_bytes"] != sig.size_bytes:
+            return False
+        staged = entry.get("staged_path")
+        if not staged or not measurement_exists(Path(staged)):
+            return False
+        if entry["mtime_ns"] == sig.mtime_ns:
+            return True
+        if use_fingerprint and entry.get("fingerprint"):
+            sig.fingerprint = fast_fingerprint(src)
+            if sig.fingerprint == entry["fingerprint"]:
+                entry["mtime_ns"] = sig.mtime_ns
+                self._dirty = True
+                return True
+        return False
+
+    def partition(
+        self,
+        csvs: Iterable[Path],
+        use_fingerprint: bool = False,
+    ) -> Tuple[List[Tuple[Path, SourceSignature]], List[Path]]:
+        """
+        Split discovered CSVs into files that need staging and unchanged files.
+
+        Args:
+            csvs: Discovered source files
+            use_fingerprint: Fall back to ``fast_fingerprint`` on mtime mismatch
+
+        Returns:
+            Tuple of (pending, unchanged) where ``pending`` pairs each file
+            with the signature taken now (to be recorded once staged).
+        """
+        pending: List[Tuple[Path, SourceSignature]] = []
+        unchanged: List[Path] = []
+        for src in csvs:
+            try:
+                sig = stat_signature(src)
+            except OSError:
+                pending.append((src, SourceSignature(-1, -1)))
+                continue
+            if self.is_unchanged(src, sig, use_fingerprint):
+                unchanged.append(src)
+            else:
+                pending.append((src, sig))
+        return pending, unchanged
+
+    def record(
+        self,
+        src: Path,
+        sig: SourceSignature,
+        run_id: str,
+        staged_path: str,
+        use_fingerprint: bool = False,
+    ) -> None:
+        """Store (or replace) the entry for a successfully staged file."""
+        if sig.size_bytes < 0:
+            return
+        if use_fingerprint and sig.fingerprint is None:
+            try:
+                sig.fingerprint = fast_fingerprint(src)
+            except OSError:
+                sig.fingerprint = None
+        self._entries[source_key(src)] = {
+            "source_file": source_key(src),
+            "size_bytes": sig.size_bytes,
+            "mtime_ns": sig.mtime_ns,
+            "fingerprint": sig.fingerprint,
+            "run_id": run_id,
+            "staged_path": Path(staged_path).resolve().as_posix(),
+        }
+        self._dirty = True
+
+    def forget(self, src: Path) -> None:
+        """Drop the entry for ``src`` (e.g. after a reject)."""
+        if self._entries.pop(source_key(src), None) is not None:
+            self._dirty = True
+
+    def save(self) -> None:
+        """Atomically write the index back to disk if it was modified."""
+        if not self._dirty:
+            return
+        df = pl.DataFrame(list(self._entries.values()), schema=_SCHEMA)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile("wb", delete=False, dir=self.path.parent) as tmp:
+            tmp_path = Path(tmp.name)
+        try:
+            df.write_parquet(tmp_path)
+            tmp_path.replace(self.path)
+        except Exception:
+            tmp_path.unlink(missing_ok=True)
+            raise
+        self._dirty = False
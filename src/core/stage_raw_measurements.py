@@ -5,16 +5,22 @@ import datetime as dt
 import hashlib
 import json
 import logging
+import multiprocessing
 import os
 import re
 import sys
 import tempfile
-from concurrent.futures import ProcessPoolExecutor
-from dataclasses import dataclass
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, Optional, Tuple, List
 from .stage_utils import *
 from .schema_validator import validate_measurement_schema, ValidationResult
+from .source_index import SourceIndex, stat_signature
+from .header_catalog import HeaderCatalog
+from .event_log import EventLog, append_event, rotate_segment
+from .packed_store import measurement_exists
 import polars as pl
 import yaml
 
@@ -34,6 +40,9 @@ except Exception:
 DEFAULT_LOCAL_TZ = "America/Santiago"
 DEFAULT_WORKERS = 6
 DEFAULT_POLARS_THREADS = 1
+# Tasks queued per worker: enough to keep every worker fed without holding a
+# future (and its arguments) for every file of a large raw tree
+IN_FLIGHT_PER_WORKER = 2
 
 PROC_LINE_RE   = re.compile(r"^#\s*Procedure\s*:\s*<([^>]+)>\s*$", re.I)
 PARAMS_LINE_RE = re.compile(r"^#\s*Parameters\s*:\s*$", re.I)
@@ -797,6 +806,7 @@ def ingest_file_task(
     rejects_dir_str: str,
     only_yaml_data: bool,
     strict: bool = False,
+    header: Optional[HeaderBlocks] = None,
 ) -> Dict[str, Any]:
     """
     Process a single CSV file into staged Parquet format.
@@ -811,9 +821,11 @@ def ingest_file_task(
         procedures_yaml_str: Path to procedures YAML schema file
         local_tz: IANA timezone name for date partitioning
         force: If True, overwrite existing Parquet files
-        events_dir_str: Directory for per-run event JSON files
+        events_dir_str: Event log directory (per-worker NDJSON segments)
         rejects_dir_str: Directory for reject records (failed files)
         only_yaml_data: If True, drop columns not in YAML schema
+        header: Header already parsed (from the header catalog); parsed
+            from the file when None
         
     Returns:
         Event dictionary with processing results:
@@ -825,6 +837,8 @@ def ingest_file_task(
         - source_file: Original CSV file path
         - date_origin: Source of date ("meta", "path", or "mtime")
         - error: Error message (only if status="reject")
+        - header: Parsed HeaderBlocks (returned for the header catalog only,
+          not written to the event log)
         
     Example output (success):
         {
@@ -849,7 +863,7 @@ def ingest_file_task(
         8. Derive computed flags (e.g., with_light)
         9. Add metadata columns (run_id, proc, timestamps, etc.)
         10. Write to Hive-partitioned Parquet structure
-        11. Write event JSON for tracking
+        11. Append the event to this worker's event log segment
 
     Note:
         - Function takes string paths (not Path objects) for pickle serialization
@@ -870,7 +884,7 @@ def ingest_file_task(
     procs_config = get_procs_cached(procedures_yaml)
 
     try:
-        hb = parse_header(src)
+        hb = header if header is not None else parse_header(src)
         if not hb.proc:
             raise RuntimeError("missing '# Procedure:'")
         proc = hb.proc
@@ -888,14 +902,14 @@ def ingest_file_task(
             raise RuntimeError("empty data table")
 
         # Intrinsic run_id: derived from the measurement itself (procedure,
-        # chip, start time, raw data-block contents), not the source path —
+        # chip, start time, raw data-block bytes), not the source path —
         # stable across machine/checkout moves, sensitive to data changes.
         rid = compute_run_id(
             proc,
             params.get("Chip group name"),
             params.get("Chip number"),
             start_dt,
-            df,
+            data_block_hash(src, hb.data_header_line),
         )
 
         # --- NEW: rename data columns to exact YAML "Data" names ---
@@ -1011,7 +1025,7 @@ def ingest_file_task(
             **manifest_cols,
         }
 
-        if out_file.exists() and not force:
+        if measurement_exists(out_file) and not force:
             event = {"status": "skipped", **event_common}
         else:
             extra_cols = {
@@ -1031,11 +1045,8 @@ def ingest_file_task(
 
             event = {"status": "ok", **event_common}
 
-        ev_path = events_dir / f"event-{rid}.json"
-        ensure_dir(ev_path.parent)
-        with ev_path.open("w", encoding="utf-8") as f:
-            json.dump(event, f, ensure_ascii=False, default=str)
-        return event
+        append_event(events_dir, event)
+        return {**event, "header": hb}
 
     except Exception as e:
         phash = sha1_short(src.as_posix(), 12)
@@ -1047,6 +1058,23 @@ def ingest_file_task(
         return {"status": "reject", "source_file": str(src), "error": str(e)}
 
 
+def _timed_ingest_task(*args) -> Tuple[Dict[str, Any], int, float, float]:
+    """Run ``ingest_file_task`` and report (result, worker pid, start, end)."""
+    started = time.time()
+    out = ingest_file_task(*args)
+    return out, os.getpid(), started, time.time()
+
+
+def _task_cost(src: Path, sig) -> int:
+    """Estimated staging cost of a file (its size in bytes)."""
+    if sig is not None and sig.size_bytes >= 0:
+        return sig.size_bytes
+    try:
+        return src.stat().st_size
+    except OSError:
+        return 0
+
+
 # ------------------------------- Orchestration ----------------------------------
 
 def discover_csvs(root: Path) -> list[Path]:
@@ -1090,14 +1118,16 @@ def discover_csvs(root: Path) -> list[Path]:
 
 def merge_events_to_manifest(events_dir: Path, manifest_path: Path) -> None:
     """
-    Consolidate individual event JSON files into a single Parquet manifest.
+    Upsert staging events newer than the event-log watermark into the manifest.
     
-    Reads all event-*.json files from the events directory, combines them
-    into a DataFrame, and merges with any existing manifest. Deduplicates
-    by (run_id, ingested_at_utc, status, path), keeping the latest occurrence.
+    Reads only the NDJSON segments appended since the last merge (see
+    ``src/core/event_log.py``), merges them with any existing manifest
+    (one row per run_id, the newest event wins), writes the manifest
+    atomically and then commits the event log: the watermark advances and
+    the consumed segments are archived.
     
     Args:
-        events_dir: Directory containing event-*.json files
+        events_dir: Event log directory
         manifest_path: Path to output manifest.parquet file
         
     Example:
@@ -1105,7 +1135,7 @@ def merge_events_to_manifest(events_dir: Path, manifest_path: Path) -> None:
         ...     Path("02_stage/_manifest/events"),
         ...     Path("02_stage/_manifest/manifest.parquet")
         ... )
-        # Creates/updates manifest.parquet with all processing events
+        # Creates/updates manifest.parquet with the new processing events
         
     Manifest schema:
         - ingested_at_utc: Timestamp when event occurred
@@ -1119,36 +1149,21 @@ def merge_events_to_manifest(events_dir: Path, manifest_path: Path) -> None:
         
     Note:
         - Creates parent directory if needed
-        - Handles missing event files gracefully
+        - Legacy event-*.json files are merged once, then archived
         - Uses vertical_relaxed concat to handle schema variations
-        - Deduplication ensures idempotent reruns
+        - A crash before the commit only causes the same events to be
+          upserted again (idempotent)
     """
-    ev_files = sorted(events_dir.glob("event-*.json"))
-    if not ev_files:
-        return
-    rows = []
-    for e in ev_files:
-        try:
-            rows.append(json.loads(e.read_text(encoding="utf-8")))
-        except Exception:
-            continue
-    if not rows:
+    # Events appended by this process after the merge go to a new segment
+    rotate_segment(events_dir)
+
+    log = EventLog(events_dir)
+    batch = log.read_pending()
+    if batch.events is None:
+        log.commit(batch)
         return
-    # Normalize rows to shared schema before creating DataFrame.
-    # Existing event files may have been written by older staging versions
-    # without the newer metadata columns (vds_v, vg_fixed_v, etc.).
-    # Polars requires consistent keys across rows, so fill missing ones.
-    all_keys = set()
-    for row in rows:
-        all_keys.update(row.keys())
-    ordered_keys = sorted(all_keys)
-
-    normalized_rows = []
-    for row in rows:
-        normalized = {k: row.get(k, None) for k in ordered_keys}
-        normalized_rows.append(normalized)
-
-    df = pl.DataFrame(normalized_rows, infer_schema_length=None)
+
+    df = batch.events
     ensure_dir(manifest_path.parent)
     if manifest_path.exists():
         prev = pl.read_parquet(manifest_path)
@@ -1173,22 +1188,86 @@ def merge_events_to_manifest(events_dir: Path, manifest_path: Path) -> None:
         df = df.select(common_cols)
 
         all_df = pl.concat([prev, df], how="vertical_relaxed")
-        # Deduplicate by run_id only (run_id is deterministic hash of path+timestamp)
-        # Keep "last" to update records when re-running with --force
-        all_df = all_df.unique(subset=["run_id"], keep="last")
-        all_df.write_parquet(manifest_path)
     else:
-        df.write_parquet(manifest_path)
+        all_df = df.select(sorted(df.columns))
+
+    # Deduplicate by run_id only (run_id is deterministic hash of path+timestamp)
+    # Keep "last" to update records when re-running with --force
+    all_df = all_df.unique(subset=["run_id"], keep="last", maintain_order=True)
+    atomic_write_parquet(all_df, manifest_path)
+    log.commit(batch)
+
 
+@dataclass
+class StagingSummary:
+    """
+    Counts reported by ``run_staging_pipeline``.
 
-def run_staging_pipeline(params: StagingParameters, progress_callback=None) -> None:
+    Attributes:
+        discovered: CSV files found under raw_root
+        unchanged: Files dropped by the source index without being opened
+        submitted: Files handed to the worker pool
+        ok: Files staged (Parquet written)
+        skipped: Files parsed but whose staged Parquet already existed
+        rejects: Files that failed
+        wall_s: Seconds from first submission to last completion
+        worker_busy_s: Seconds spent inside tasks, per worker process id
+        task_p50_s: Median task duration
+        task_p95_s: 95th-percentile task duration
+        task_max_s: Longest task duration
+        tail_s: Seconds between the first worker running out of work and
+            the end of the run (time with idle cores)
+    """
+    discovered: int = 0
+    unchanged: int = 0
+    submitted: int = 0
+    ok: int = 0
+    skipped: int = 0
+    rejects: int = 0
+    wall_s: float = 0.0
+    worker_busy_s: Dict[int, float] = field(default_factory=dict)
+    task_p50_s: float = 0.0
+    task_p95_s: float = 0.0
+    task_max_s: float = 0.0
+    tail_s: float = 0.0
+
+    def utilisation(self) -> Dict[int, float]:
+        """Busy fraction of the run's wall time, per worker process id."""
+        if self.wall_s <= 0:
+            return {}
+        return {pid: busy / self.wall_s for pid, busy in self.worker_busy_s.items()}
+
+    def record_task_times(self, durations: List[float]) -> None:
+        """Fill the task-duration percentiles from per-task durations."""
+        if not durations:
+            return
+        ordered = sorted(durations)
+
+        def pick(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+        self.task_p50_s = pick(0.50)
+        self.task_p95_s = pick(0.95)
+        self.task_max_s = ordered[-1]
+
+
+def run_staging_pipeline(params: StagingParameters, progress_callback=None) -> StagingSummary:
     """
     Run staging pipeline with Pydantic-validated parameters.
 
+    Unless ``params.force`` is set or ``params.use_source_index`` is False,
+    discovered CSVs are first checked against the persistent source index
+    (``_manifest/source_index.parquet``); files whose size and mtime match
+    the last successful staging are dropped before submission to the worker
+    pool, so re-runs over an already-staged tree never open them.
+
     Args:
         params: Validated StagingParameters instance
         progress_callback: Optional callback function(current, total, proc, status) for progress updates
 
+    Returns:
+        StagingSummary with discovered/unchanged/submitted/ok/skipped/reject counts
+
     Example:
         >>> from models.parameters import StagingParameters
         >>> params = StagingParameters(
@@ -1212,6 +1291,9 @@ def run_staging_pipeline(params: StagingParameters, progress_callback=None) -> N
     force = params.force
     only_yaml_data = params.only_yaml_data
     strict = params.strict
+    use_fingerprint = params.fingerprint_sources
+
+    summary = StagingSummary()
 
     # Create output directories
     ensure_dir(stage_root)
@@ -1227,24 +1309,65 @@ def run_staging_pipeline(params: StagingParameters, progress_callback=None) -> N
 
     # Discover CSV files
     csvs = discover_csvs(raw_root)
+    summary.discovered = len(csvs)
     if not progress_callback:
         logger.info("discovered %d CSV files under %s", len(csvs), raw_root)
     if not csvs:
         if not progress_callback:
             logger.info("nothing to do")
-        return
-
-    # Process files in parallel
-    from concurrent.futures import as_completed
+        return summary
 
-    submitted = 0
-    ok = skipped = reject = 0
-    with ProcessPoolExecutor(max_workers=workers) as ex:
-        # Submit all tasks and track futures with their source files
-        future_to_src = {}
-        for src in csvs:
+    # Drop unchanged files before they reach the pool (stat only, no reads)
+    source_index = SourceIndex.for_manifest(manifest_path)
+    if force or not params.use_source_index:
+        pending = [(src, None) for src in csvs]
+    else:
+        pending, unchanged = source_index.partition(csvs, use_fingerprint=use_fingerprint)
+        summary.unchanged = len(unchanged)
+        if not progress_callback and unchanged:
+            logger.info(
+                "source index: %d unchanged files skipped without opening",
+                len(unchanged),
+            )
+    if not pending:
+        source_index.save()
+        if not progress_callback:
+            logger.info("nothing to do (all %d files unchanged)", len(csvs))
+        return summary
+
+    # Headers catalogued by earlier runs (or raw-data utilities) are handed
+    # to the workers so they only read the data table
+    header_catalog = HeaderCatalog.for_manifest(manifest_path)
+
+    # Largest files first: the expensive It traces start while there is
+    # still plenty of small work to fill the other workers, instead of
+    # forming a single-core tail at the end of the run
+    pending.sort(key=lambda item: _task_cost(*item), reverse=True)
+    queue = iter(pending)
+
+    total = len(pending)
+    max_in_flight = max(1, workers) * IN_FLIGHT_PER_WORKER
+    durations: List[float] = []
+    tail_start: Optional[float] = None
+    run_start = time.time()
+
+    # 'spawn' rather than 'fork': the parent has already used Polars (source
+    # index read), and forking a process with a live Polars thread pool can
+    # deadlock the children.
+    mp_context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as ex:
+        # Only a bounded window of tasks is in flight; the next file is
+        # submitted whenever one completes
+        in_flight = {}
+
+        def submit_next() -> bool:
+            item = next(queue, None)
+            if item is None:
+                return False
+            src, sig = item
+            header = header_catalog.header(src)
             fut = ex.submit(
-                ingest_file_task,
+                _timed_ingest_task,
                 str(src),
                 str(stage_root),
                 str(params.procedures_yaml),
@@ -1254,58 +1377,104 @@ def run_staging_pipeline(params: StagingParameters, progress_callback=None) -> N
                 str(rejects_dir),
                 only_yaml_data,
                 strict,
+                header,
             )
-            future_to_src[fut] = src
-            submitted += 1
+            in_flight[fut] = (src, sig, header is not None)
+            summary.submitted += 1
+            return True
+
+        while len(in_flight) < max_in_flight and submit_next():
+            pass
 
         # Process futures as they complete (not in submission order)
         completed = 0
-        for fut in as_completed(future_to_src):
-            completed += 1
-            src = future_to_src[fut]
-
-            try:
-                out = fut.result()
-            except Exception as e:
-                reject += 1
-                if not progress_callback:
-                    logger.warning("[%04d] REJECT %s :: %s", completed, src, e)
-                if progress_callback:
-                    progress_callback(completed, len(csvs), "unknown", "reject")
-                continue
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                completed += 1
+                src, sig, header_cached = in_flight.pop(fut)
+                refilled = submit_next()
+                if not refilled and tail_start is None and len(in_flight) < workers:
+                    tail_start = time.time()
+
+                try:
+                    out, pid, started, finished = fut.result()
+                except Exception as e:
+                    summary.rejects += 1
+                    if not progress_callback:
+                        logger.warning("[%04d] REJECT %s :: %s", completed, src, e)
+                    if progress_callback:
+                        progress_callback(completed, total, "unknown", "reject")
+                    continue
+
+                durations.append(finished - started)
+                summary.worker_busy_s[pid] = summary.worker_busy_s.get(pid, 0.0) + (finished - started)
 
-            st = out.get("status")
-            proc = out.get("proc", "unknown")
+                st = out.get("status")
+                proc = out.get("proc", "unknown")
 
-            if st == "ok":
-                ok += 1
-            elif st == "skipped":
-                skipped += 1
-            elif st == "reject":
-                reject += 1
+                if st == "ok":
+                    summary.ok += 1
+                elif st == "skipped":
+                    summary.skipped += 1
+                elif st == "reject":
+                    summary.rejects += 1
 
-            if not progress_callback:
                 if st in {"ok", "skipped"}:
-                    logger.info(
-                        "[%04d] %7s %-8s rows=%-7s → %s  (%s)",
-                        completed, st.upper(), out["proc"], out["rows"],
-                        out["path"], out.get("date_origin", "meta"),
-                    )
+                    try:
+                        sig = sig or stat_signature(src)
+                        source_index.record(
+                            src,
+                            sig,
+                            out["run_id"],
+                            out["path"],
+                            use_fingerprint=use_fingerprint,
+                        )
+                        if not header_cached and sig.size_bytes >= 0:
+                            header_catalog.record(src, out["header"], sig.size_bytes, sig.mtime_ns)
+                    except OSError:
+                        pass
                 else:
-                    logger.warning("[%04d] REJECT %s :: %s", completed, src, out.get("error"))
+                    source_index.forget(src)
 
-            # Call progress callback if provided
-            if progress_callback:
-                progress_callback(completed, len(csvs), proc, st)
+                if not progress_callback:
+                    if st in {"ok", "skipped"}:
+                        logger.info(
+                            "[%04d] %7s %-8s rows=%-7s → %s  (%s)",
+                            completed, st.upper(), out["proc"], out["rows"],
+                            out["path"], out.get("date_origin", "meta"),
+                        )
+                    else:
+                        logger.warning("[%04d] REJECT %s :: %s", completed, src, out.get("error"))
+
+                # Call progress callback if provided
+                if progress_callback:
+                    progress_callback(completed, total, proc, st)
+
+    run_end = time.time()
+    summary.wall_s = run_end - run_start
+    summary.tail_s = run_end - tail_start if tail_start is not None else 0.0
+    summary.record_task_times(durations)
 
     # Merge events into manifest
     merge_events_to_manifest(events_dir, manifest_path)
+    source_index.save()
+    header_catalog.save()
 
     if not progress_callback:
         logger.info(
-            "staging complete  |  ok=%d  skipped=%d  rejects=%d  submitted=%d",
-            ok, skipped, reject, submitted,
+            "staging complete  |  ok=%d  skipped=%d  rejects=%d  submitted=%d  unchanged=%d",
+            summary.ok, summary.skipped, summary.rejects, summary.submitted, summary.unchanged,
         )
+        utilisation = summary.utilisation()
+        if utilisation:
+            logger.info(
+                "worker pool  |  wall=%.1fs  utilisation=%s  task p50=%.2fs p95=%.2fs max=%.2fs  tail=%.1fs",
+                summary.wall_s,
+                " ".join(f"{u:.0%}" for u in sorted(utilisation.values(), reverse=True)),
+                summary.task_p50_s, summary.task_p95_s, summary.task_max_s, summary.tail_s,
+            )
+    return summary
 
 
 def main() -> None:
@@ -1325,13 +1494,15 @@ def main() -> None:
         --stage-root: Output directory for Parquet files (required)
         --procedures-yaml: YAML schema file (required)
         --rejects-dir: Directory for reject records
-        --events-dir: Directory for event JSONs
+        --events-dir: Event log directory
         --manifest: Manifest file path
         --local-tz: Timezone for date partitions (default: America/Santiago)
         --workers: Number of parallel workers (default: 6)
         --polars-threads: Polars threads per worker (default: 1)
         --force: Overwrite existing Parquet files
         --only-yaml-data: Drop non-YAML columns from output
+        --no-source-index: Submit every CSV, ignoring the source index
+        --fingerprint: Fingerprint sources in the source index
     """
     ap = argparse.ArgumentParser(
         description="Stage raw CSVs → Parquet using YAML Data names (parallel & atomic).",
@@ -1357,7 +1528,7 @@ Examples:
     ap.add_argument("--stage-root", type=Path, help="Output root (02_stage/raw_measurements)")
     ap.add_argument("--procedures-yaml", type=Path, help="YAML schema of procedures and types")
     ap.add_argument("--rejects-dir", type=Path, help="Folder for reject records")
-    ap.add_argument("--events-dir", type=Path, help="Per-run event JSONs")
+    ap.add_argument("--events-dir", type=Path, help="Event log directory (NDJSON segments)")
     ap.add_argument("--manifest", type=Path, help="Merged manifest parquet")
     ap.add_argument("--local-tz", type=str, default=DEFAULT_LOCAL_TZ, help="Timezone for date partitioning")
     ap.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Process workers")
@@ -1365,6 +1536,8 @@ Examples:
     ap.add_argument("--force", action="store_true", help="Overwrite staged Parquet if exists")
     ap.add_argument("--only-yaml-data", action="store_true", help="Drop non-YAML data columns")
     ap.add_argument("--strict", action="store_true", help="Strict validation mode - fail on schema errors")
+    ap.add_argument("--no-source-index", action="store_true", help="Hand every CSV to the workers, ignoring the source index")
+    ap.add_argument("--fingerprint", action="store_true", help="Fingerprint sources so mtime-only changes are still skipped")
 
     args = ap.parse_args()
 
@@ -1391,6 +1564,8 @@ Examples:
                 force=args.force,
                 only_yaml_data=args.only_yaml_data,
                 strict=args.strict,
+                use_source_index=not args.no_source_index,
+                fingerprint_sources=args.fingerprint,
             )
 
         else:
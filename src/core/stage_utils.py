@@ -23,6 +23,11 @@ DEFAULT_LOCAL_TZ = "America/Santiago"
 DEFAULT_WORKERS = 6
 DEFAULT_POLARS_THREADS = 1
 
+# run_id scheme: 1 = SHA-1 of the parsed table re-serialized to CSV,
+# 2 = streamed digest of the raw CSV data block (see compute_run_id)
+RUN_ID_VERSION = 2
+DATA_HASH_CHUNK_BYTES = 1 << 20
+
 PROC_LINE_RE = re.compile(r"^#\s*Procedure\s*:\s*<([^>]+)>\s*$", re.I)
 PARAMS_LINE_RE = re.compile(r"^#\s*Parameters\s*:\s*$", re.I)
 META_LINE_RE = re.compile(r"^#\s*Metadata\s*:\s*$", re.I)
@@ -63,12 +68,12 @@ def sha1_short(s: str, n: int = 16) -> str:
 
 def content_hash(df: pl.DataFrame) -> str:
     """
-    Deterministic SHA-1 digest of a measurement's data block.
+    Legacy (run_id v1) SHA-1 digest of a parsed data table.
 
-    Hashes the raw numeric table (as read from the CSV, before YAML
-    rename/cast) so the digest depends only on the file's data contents,
-    not on `procedures.yml`. `DataFrame.write_csv()` with no path argument
-    returns a string and is deterministic for given data + column order.
+    Serializes the whole table back to CSV text in memory before hashing,
+    which doubles peak memory on long traces. Kept only so that v1 run_ids
+    can be reproduced and mapped to v2 (see `src.core.run_id_migration`);
+    new run_ids use `data_block_hash`.
 
     Args:
         df: The data table read from the source CSV.
@@ -79,6 +84,48 @@ def content_hash(df: pl.DataFrame) -> str:
     return hashlib.sha1(df.write_csv().encode()).hexdigest()
 
 
+def data_block_hash(
+    path: Path,
+    data_header_line: Optional[int] = None,
+    chunk_bytes: int = DATA_HASH_CHUNK_BYTES,
+) -> str:
+    """
+    Streaming digest of a CSV's raw data block (run_id v2).
+
+    Hashes the bytes after the `# Data:` marker line (column header row
+    included) in fixed-size chunks, so memory stays constant and nothing is
+    parsed or re-serialized. Carriage returns are dropped, making the digest
+    independent of CRLF/LF line endings. Header comments above the marker
+    are excluded: editing metadata does not change the data digest.
+
+    Args:
+        path: Source CSV file.
+        data_header_line: Number of lines before the data block (as returned
+            by `parse_header`). If None, leading `#` lines are skipped.
+        chunk_bytes: Read size per hash update.
+
+    Returns:
+        40-char hexadecimal BLAKE2b digest.
+    """
+    h = hashlib.blake2b(digest_size=20)
+    with Path(path).open("rb") as f:
+        if data_header_line is not None:
+            for _ in range(data_header_line):
+                if not f.readline():
+                    break
+        else:
+            line = f.readline()
+            while line.startswith(b"#"):
+                line = f.readline()
+            h.update(line.replace(b"\r", b""))
+        while True:
+            chunk = f.read(chunk_bytes)
+            if not chunk:
+                break
+            h.update(chunk.replace(b"\r", b""))
+    return h.hexdigest()
+
+
 def normalize_timestamp(start_dt: dt.datetime) -> str:
     """
     Canonical UTC string form of a measurement start time.
@@ -100,7 +147,8 @@ def compute_run_id(
     chip_group: Optional[Any],
     chip_number: Optional[Any],
     start_dt: dt.datetime,
-    data_df: pl.DataFrame,
+    data_digest: str,
+    version: int = RUN_ID_VERSION,
 ) -> str:
     """
     Compute a measurement's intrinsic `run_id`.
@@ -110,33 +158,38 @@ def compute_run_id(
     across machines/checkouts (no filesystem path involved) and changes
     when the underlying data changes.
 
-        run_id = sha1_short( proc | chip_group | chip_number
-                             | normalized_start_ts | content_hash(data) )
+        v1: sha1_short( proc | chip_group | chip_number
+                        | normalized_start_ts | content_hash(data_df) )
+        v2: sha1_short( "v2" | proc | chip_group | chip_number
+                        | normalized_start_ts | data_block_hash(csv) )
 
+    The version tag keeps v1 and v2 ids of the same measurement distinct.
     `chip_group` / `chip_number` may be None (e.g. LaserCalibration has no
     chip); they become empty strings. Uniqueness still holds because the
-    data-block content hash is part of the key.
+    data-block digest is part of the key.
 
     Args:
         proc: Procedure name (from the CSV header).
         chip_group: Chip group name, or None.
         chip_number: Chip number, or None.
         start_dt: Measurement start time.
-        data_df: Raw data table read from the source CSV.
+        data_digest: `data_block_hash` of the source CSV (v2), or
+            `content_hash` of the parsed table (v1).
+        version: run_id scheme version (default: `RUN_ID_VERSION`).
 
     Returns:
         16-char hexadecimal SHA-1 identifier.
     """
-    canonical = "|".join(
-        [
-            proc,
-            "" if chip_group is None else str(chip_group),
-            "" if chip_number is None else str(chip_number),
-            normalize_timestamp(start_dt),
-            content_hash(data_df),
-        ]
-    )
-    return sha1_short(canonical, 16)
+    fields = [
+        proc,
+        "" if chip_group is None else str(chip_group),
+        "" if chip_number is None else str(chip_number),
+        normalize_timestamp(start_dt),
+        data_digest,
+    ]
+    if version >= 2:
+        fields.insert(0, f"v{version}")
+    return sha1_short("|".join(fields), 16)
 
 
 def to_bool(s: Any) -> bool:
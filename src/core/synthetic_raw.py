@@ -0,0 +1,380 @@
+"""
+Synthetic raw-measurement generator.
+
+Writes a raw CSV tree in the lab's header format (``#Procedure`` /
+``#Parameters`` / ``#Metadata`` / ``#Data`` blocks, see
+``config/procedures.yml``) so the pipeline can be exercised and benchmarked
+without the DVC-tracked lab data. Traces are simple physical models with
+Gaussian noise:
+
+- IVg: looped gate sweeps ``0 → +V → -V → 0`` with a CNP parabola-like
+  transfer curve, a small hysteresis between legs and a light-induced shift
+- VVg: the same transfer curve as a drain voltage at fixed current
+- It / Vt: OFF → ON → OFF LED cycles with exponential rise and decay
+- LaserCalibration: ``VL → Power`` curves above a threshold voltage
+
+Output layout follows the lab convention::
+
+    <root>/<YYYY-MM-DD>/<Proc><YYYY-MM-DD>_<n>.csv
+
+Everything is derived from ``SyntheticSpec.seed``, so the same spec always
+produces byte-identical files.
+
+Example:
+    >>> spec = SyntheticSpec(n_chips=4, n_days=3, sweep_points=400)
+    >>> summary = generate_raw_tree(Path("bench/data/01_raw"), spec)
+    >>> summary.files, summary.per_procedure["IVg"]
+    (78, 24)
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+import numpy as np
+
+# 12:00 UTC is 08:00-09:00 in America/Santiago, so the local date is the
+# UTC date and staged ``date_local`` values match the folder names.
+DEFAULT_START = dt.datetime(2025, 3, 3, 12, 0, tzinfo=dt.timezone.utc)
+
+PROCEDURE_CLASSES = {
+    "IVg": "laser_setup.procedures.IVg",
+    "VVg": "laser_setup.procedures.VVg",
+    "It": "laser_setup.procedures.It",
+    "Vt": "laser_setup.procedures.Vt",
+    "LaserCalibration": "laser_setup.procedures.LaserCalibration",
+}
+
+
+@dataclass
+class SyntheticSpec:
+    """
+    Size and shape of a synthetic raw tree.
+
+    Attributes:
+        n_chips: Number of chips (numbered from ``first_chip``)
+        chip_group: Chip group name written to every chip header
+        first_chip: Number of the first chip
+        n_days: Number of measurement days (one folder per day)
+        ivg_per_day: IVg sweeps per chip and day (alternating dark / light)
+        vvg_per_day: VVg sweeps per chip and day
+        it_per_day: It runs per chip and day (cycling through wavelengths)
+        vt_per_day: Vt runs per chip and day
+        wavelengths_nm: Laser wavelengths; one calibration per wavelength and day
+        sweep_points: Samples per gate sweep (whole loop)
+        time_points: Samples per It / Vt trace
+        calibration_points: Samples per laser calibration curve
+        noise: Relative Gaussian noise (fraction of the signal scale)
+        vg_max: Gate sweep amplitude in volts
+        laser_period_s: Laser ON+OFF period of It / Vt runs
+        seed: RNG seed; same spec and seed produce identical files
+        start: First measurement time (UTC)
+    """
+    n_chips: int = 2
+    chip_group: str = "Synth"
+    first_chip: int = 1
+    n_days: int = 2
+    ivg_per_day: int = 2
+    vvg_per_day: int = 1
+    it_per_day: int = 2
+    vt_per_day: int = 1
+    wavelengths_nm: Sequence[float] = (365.0, 455.0)
+    sweep_points: int = 201
+    time_points: int = 600
+    calibration_points: int = 41
+    noise: float = 0.01
+    vg_max: float = 5.0
+    laser_period_s: float = 120.0
+    seed: int = 0
+    start: dt.datetime = DEFAULT_START
+
+    @property
+    def files_per_day(self) -> int:
+        """Raw files written per day folder."""
+        per_chip = self.ivg_per_day + self.vvg_per_day + self.it_per_day + self.vt_per_day
+        return len(self.wavelengths_nm) + self.n_chips * per_chip
+
+
+@dataclass
+class SyntheticSummary:
+    """
+    What :func:`generate_raw_tree` wrote.
+
+    Attributes:
+        root: Raw tree root
+        files: Number of CSV files
+        rows: Total number of data rows
+        bytes: Total size on disk
+        per_procedure: File count per procedure
+        paths: Written files, in measurement order
+    """
+    root: Path
+    files: int = 0
+    rows: int = 0
+    bytes: int = 0
+    per_procedure: Dict[str, int] = field(default_factory=dict)
+    paths: List[Path] = field(default_factory=list)
+
+
+class _Writer:
+    """Numbers files per day and accumulates the summary."""
+
+    def __init__(self, root: Path, summary: SyntheticSummary):
+        self.root = root
+        self.summary = summary
+        self._counters: Dict[tuple, int] = {}
+
+    def write(
+        self,
+        proc: str,
+        day: dt.date,
+        start: dt.datetime,
+        params: Dict[str, str],
+        metadata: Dict[str, str],
+        columns: Dict[str, np.ndarray],
+    ) -> Path:
+        date = day.isoformat()
+        n = self._counters.get((proc, date), 0)
+        self._counters[(proc, date)] = n + 1
+        path = self.root / date / f"{proc}{date}_{n}.csv"
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        lines = [f"#Procedure: <{PROCEDURE_CLASSES[proc]}>", "#Parameters:"]
+        lines += [f"#\t{key}: {value}" for key, value in params.items()]
+        lines.append("#Metadata:")
+        lines.append(f"#\tStart time: {start.timestamp():.6f}")
+        lines += [f"#\t{key}: {value}" for key, value in metadata.items()]
+        lines.append("#Data:")
+        lines.append(",".join(columns))
+        data = np.column_stack(list(columns.values()))
+        body = "\n".join(",".join(f"{x:.9g}" for x in row) for row in data.tolist())
+        path.write_text("\n".join(lines) + "\n" + body + "\n")
+
+        s = self.summary
+        s.files += 1
+        s.rows += data.shape[0]
+        s.bytes += path.stat().st_size
+        s.per_procedure[proc] = s.per_procedure.get(proc, 0) + 1
+        s.paths.append(path)
+        return path
+
+
+# ── trace models ────────────────────────────────────────────────────────
+
+
+def _gate_loop(n: int, vg_max: float) -> np.ndarray:
+    """``0 → +vg_max → -vg_max → 0`` in ``n`` points (at least 8)."""
+    n = max(int(n), 8)
+    q = n // 4
+    up = np.linspace(0.0, vg_max, q, endpoint=False)
+    down = np.linspace(vg_max, -vg_max, 2 * q, endpoint=False)
+    back = np.linspace(-vg_max, 0.0, n - 3 * q)
+    return np.round(np.concatenate([up, down, back]), 6)
+
+
+def _transfer(vg: np.ndarray, cnp: float, width: float, hysteresis: float) -> np.ndarray:
+    """Normalized graphene transfer curve (1 at the CNP), shifted per leg."""
+    direction = np.sign(np.gradient(vg))
+    shifted = cnp + 0.5 * hysteresis * direction
+    return np.sqrt(1.0 + ((vg - shifted) / width) ** 2)
+
+
+def _led_cycle(n: int, period: float, tau_rise: float, tau_fall: float):
+    """Time axis, LED-on mask and normalized response of one OFF/ON/OFF run."""
+    t = np.linspace(0.0, 1.5 * period, max(int(n), 12))
+    t_on, t_off = 0.5 * period, period
+    on = (t >= t_on) & (t < t_off)
+    response = np.where(t >= t_on, 1.0 - np.exp(-(t - t_on) / tau_rise), 0.0)
+    peak = 1.0 - np.exp(-(t_off - t_on) / tau_rise)
+    response = np.where(t >= t_off, peak * np.exp(-(t - t_off) / tau_fall), response)
+    return np.round(t, 6), on, response
+
+
+def _chip_params(spec: SyntheticSpec, chip: int) -> Dict[str, str]:
+    return {
+        "Chip group name": spec.chip_group,
+        "Chip number": str(chip),
+        "Sample": "a",
+        "Information": "synthetic",
+        "Procedure version": "1.0.0",
+    }
+
+
+# ── generator ───────────────────────────────────────────────────────────
+
+
+def generate_raw_tree(root: Path, spec: SyntheticSpec = SyntheticSpec()) -> SyntheticSummary:
+    """
+    Write a synthetic raw CSV tree.
+
+    Per day: one LaserCalibration per wavelength, then for every chip its
+    IVg, It, VVg and Vt runs, with start times a few minutes apart. Each
+    chip has its own CNP, which drifts slowly from day to day.
+
+    Args:
+        root: Raw tree root (e.g. ``data/01_raw`` of a scratch workspace)
+        spec: Tree size, trace lengths and noise
+
+    Returns:
+        SyntheticSummary of the written files
+    """
+    root = Path(root)
+    rng = np.random.default_rng(spec.seed)
+    summary = SyntheticSummary(root=root)
+    writer = _Writer(root, summary)
+    wavelengths = [float(w) for w in spec.wavelengths_nm]
+    chips = list(range(spec.first_chip, spec.first_chip + spec.n_chips))
+    base_cnp = {chip: rng.uniform(-1.0, 1.0) for chip in chips}
+    step = dt.timedelta(minutes=5)
+
+    for day_index in range(spec.n_days):
+        when = spec.start + dt.timedelta(days=day_index)
+        day = when.date()
+
+        for wl in wavelengths:
+            _write_calibration(writer, spec, rng, day, when, wl)
+            when += step
+
+        for chip in chips:
+            common = _chip_params(spec, chip)
+            cnp = base_cnp[chip] + 0.05 * day_index
+            i_scale = rng.uniform(0.5, 2.0) * 1e-6
+            for k in range(spec.ivg_per_day):
+                laser_v = 0.0 if k % 2 == 0 else 2.0
+                _write_ivg(writer, spec, rng, day, when, common, cnp, i_scale, laser_v,
+                           wavelengths[k % len(wavelengths)])
+                when += step
+            for k in range(spec.it_per_day):
+                _write_time_trace(writer, spec, rng, day, when, common, "It", i_scale,
+                                  wavelengths[k % len(wavelengths)], 1.0 + k % 3)
+                when += step
+            for k in range(spec.vvg_per_day):
+                _write_vvg(writer, spec, rng, day, when, common, cnp)
+                when += step
+            for k in range(spec.vt_per_day):
+                _write_time_trace(writer, spec, rng, day, when, common, "Vt", i_scale,
+                                  wavelengths[k % len(wavelengths)], 1.0 + k % 3)
+                when += step
+
+    return summary
+
+
+def _write_calibration(writer, spec, rng, day, when, wavelength):
+    vl = np.round(np.linspace(0.0, 5.0, max(spec.calibration_points, 4)), 6)
+    threshold = 0.4 + rng.uniform(-0.05, 0.05)
+    power = 1e-3 * np.clip(vl - threshold, 0.0, None) ** 1.4
+    power = np.abs(power + spec.noise * 1e-5 * rng.standard_normal(vl.size))
+    writer.write(
+        "LaserCalibration", day, when,
+        params={
+            "N_avg": "2",
+            "Optical fiber": "50 um",
+            "Laser wavelength": f"{wavelength:g} nm",
+            "Procedure version": "1.0.0",
+            "Step time": "1 s",
+            "Laser voltage start": "0 V",
+            "Laser voltage end": "5 V",
+            "Laser voltage step": f"{vl[1] - vl[0]:.6g} V",
+        },
+        metadata={"Sensor model": "S120VC"},
+        columns={"VL (V)": vl, "Power (W)": power},
+    )
+
+
+def _write_ivg(writer, spec, rng, day, when, common, cnp, i_scale, laser_v, wavelength):
+    vg = _gate_loop(spec.sweep_points, spec.vg_max)
+    shift = -0.2 if laser_v > 0 else 0.0
+    current = i_scale * _transfer(vg, cnp + shift, 0.8, 0.1)
+    current = current + spec.noise * i_scale * rng.standard_normal(vg.size)
+    writer.write(
+        "IVg", day, when,
+        params={
+            **common,
+            "Irange": "0.001 A",
+            "N_avg": "1",
+            "NPLC": "1",
+            "Burn-in time": "0 s",
+            "Laser toggle": "True" if laser_v > 0 else "False",
+            "Laser voltage": f"{laser_v:g} V",
+            "Laser wavelength": f"{wavelength:g} nm",
+            "Step time": "0.1 s",
+            "VDS": "0.1 V",
+            "VG start": f"{-spec.vg_max:g} V",
+            "VG end": f"{spec.vg_max:g} V",
+            "VG step": f"{abs(vg[1] - vg[0]):.6g} V",
+        },
+        metadata={},
+        columns={"Vg (V)": vg, "I (A)": current},
+    )
+
+
+def _write_vvg(writer, spec, rng, day, when, common, cnp):
+    vg = _gate_loop(spec.sweep_points, spec.vg_max)
+    vds = 0.5 / _transfer(vg, cnp, 0.8, 0.1)
+    vds = vds + spec.noise * 0.5 * rng.standard_normal(vg.size)
+    t = np.round(np.arange(vg.size) * 0.1, 6)
+    plate = 25.0 + 0.05 * rng.standard_normal(vg.size)
+    writer.write(
+        "VVg", day, when,
+        params={
+            **common,
+            "NPLC": "1",
+            "Vrange": "2 V",
+            "Burn-in time": "0 s",
+            "Drain-Source current": "1e-06 A",
+            "Laser voltage": "0 V",
+            "Laser wavelength": "455 nm",
+            "Step time": "0.1 s",
+            "VG start": f"{-spec.vg_max:g} V",
+            "VG end": f"{spec.vg_max:g} V",
+            "VG step": f"{abs(vg[1] - vg[0]):.6g} V",
+        },
+        metadata={},
+        columns={
+            "Vg (V)": vg,
+            "VDS (V)": vds,
+            "t (s)": t,
+            "Plate T (degC)": plate,
+            "Ambient T (degC)": plate - 3.0,
+            "Clock (ms)": t * 1000.0,
+        },
+    )
+
+
+def _write_time_trace(writer, spec, rng, day, when, common, proc, i_scale, wavelength, laser_v):
+    period = spec.laser_period_s
+    t, on, response = _led_cycle(spec.time_points, period, 0.08 * period, 0.15 * period)
+    vl = np.where(on, laser_v, 0.0)
+    drift = 1.0 - 0.02 * t / t[-1]
+    params = {
+        **common,
+        "NPLC": "1",
+        "Laser ON+OFF period": f"{period:g} s",
+        "Laser toggle": "True",
+        "Laser voltage": f"{laser_v:g} V",
+        "Laser wavelength": f"{wavelength:g} nm",
+        "Sampling time (excluding Keithley)": f"{t[1] - t[0]:.6g} s",
+        "VG": "0 V",
+    }
+    if proc == "It":
+        signal = i_scale * (drift + 0.2 * laser_v * response)
+        signal = signal + spec.noise * i_scale * rng.standard_normal(t.size)
+        params.update({"Irange": "0.001 A", "N_avg": "1", "VDS": "0.1 V"})
+        columns = {"t (s)": t, "I (A)": signal, "VL (V)": vl}
+    else:
+        signal = 0.5 * (drift - 0.1 * laser_v * response)
+        signal = signal + spec.noise * 0.5 * rng.standard_normal(t.size)
+        params.update({"Vrange": "2 V", "Drain-Source current": "1e-06 A"})
+        plate = 25.0 + 0.05 * rng.standard_normal(t.size)
+        columns = {
+            "t (s)": t,
+            "VDS (V)": signal,
+            "VL (V)": vl,
+            "Plate T (degC)": plate,
+            "Ambient T (degC)": plate - 3.0,
+            "Clock (ms)": t * 1000.0,
+        }
+    writer.write(proc, day, when, params=params, metadata={}, columns=columns)
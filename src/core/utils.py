@@ -2,9 +2,12 @@ from __future__ import annotations
 import logging
 import re
 from pathlib import Path
-from typing import Dict
+from typing import Dict, Optional, Sequence
 import polars as pl
 
+from src.core import data_cache, packed_store
+from src.core.manifest_index import get_manifest_index
+
 logger = logging.getLogger(__name__)
 
 # -------------------------------
@@ -142,7 +145,12 @@ def _read_measurement(path: Path) -> pl.DataFrame:
 # -------------------------------
 # Make timeline + sessions
 # -------------------------------
-def read_measurement_parquet(path: Path) -> pl.DataFrame:
+def read_measurement_parquet(
+    path: Path,
+    manifest_path: Optional[Path] = None,
+    columns: Optional[Sequence[str]] = None,
+    with_metadata: bool = True,
+) -> pl.DataFrame:
     """
     Read measurement data from staged Parquet file.
 
@@ -153,6 +161,16 @@ def read_measurement_parquet(path: Path) -> pl.DataFrame:
     ----------
     path : Path
         Path to staged Parquet file (e.g., data/02_stage/raw_measurements/proc=It/date=2025-10-18/run_id=abc123/part-000.parquet)
+    manifest_path : Optional[Path]
+        Manifest to join metadata from. Defaults to ``<stage_root>/_manifest/manifest.parquet``
+        inferred from the Hive layout of ``path``.
+    columns : Optional[Sequence[str]]
+        Data columns to read (None = all). Requested columns the file does
+        not have are skipped, so optional columns (e.g. ``"VDS (V)"``) can
+        be listed unconditionally.
+    with_metadata : bool
+        Add manifest metadata as constant columns (default). Callers that
+        already hold the manifest row (e.g. metric extraction) pass False.
 
     Returns
     -------
@@ -167,6 +185,17 @@ def read_measurement_parquet(path: Path) -> pl.DataFrame:
     - Standardized column names
     - No header parsing needed
 
+    Metadata is looked up in the process-wide manifest index
+    (``src.core.manifest_index``), so the manifest is read once per process
+    rather than once per measurement.
+
+    ``path`` is the loose staged path; measurements folded into pack files
+    (``src.core.packed_store``) are found through the pack index, so both
+    layouts read the same.
+
+    After ``src.core.data_cache.enable_parquet_caching()`` reads go through
+    the shared data cache (see ``read_measurement_cached``).
+
     Example
     -------
     >>> path = Path("data/02_stage/raw_measurements/proc=It/date=2025-10-18/run_id=a1b2c3d4/part-000.parquet")
@@ -174,51 +203,53 @@ def read_measurement_parquet(path: Path) -> pl.DataFrame:
     >>> print(df.columns)
     ['t (s)', 'I (A)', 'VL (V)', ...]
     """
-
+    if data_cache.caching_enabled():
+        return data_cache.read_measurement_cached(path, manifest_path, columns, with_metadata)
+    return _read_measurement_parquet(path, manifest_path, columns, with_metadata)
+
+
+def _read_measurement_parquet(
+    path: Path,
+    manifest_path: Optional[Path] = None,
+    columns: Optional[Sequence[str]] = None,
+    with_metadata: bool = True,
+) -> pl.DataFrame:
+    """Uncached body of ``read_measurement_parquet``."""
     try:
-        df = pl.read_parquet(path)
-        
-        # --- NEW: Join metadata from manifest ---
-        # The parquet file now only contains RunID and data. 
-        # We must look up the metadata (wavelength, chip, etc.) from the manifest.
-        if "run_id" in df.columns:
-            # 1. Infer manifest path (go up from .../proc=X/date=Y/run_id=Z/part-000.parquet)
-            # data/02_stage/raw_measurements/_manifest/manifest.parquet
+        wanted = None
+        if columns is not None:
+            wanted = set(columns)
+            if with_metadata:
+                wanted.add("run_id")
+
+        entry = None if Path(path).exists() else packed_store.locate(path)
+        if entry is not None:
+            df = packed_store.read_packed(entry, wanted)
+        elif wanted is not None:
+            df = pl.read_parquet(path, columns=[c for c in pl.read_parquet_schema(path) if c in wanted])
+        else:
+            df = pl.read_parquet(path)
+
+        # The parquet file only contains run_id and data; metadata
+        # (wavelength, chip, etc.) lives in the manifest.
+        if with_metadata and "run_id" in df.columns and df.height > 0:
             try:
-                # Path(path) is like: roots/proc=X/date=Y/run_id=Z/part-000.parquet
-                # Parent x3 is 'roots' (raw_measurements)
-                stage_root = Path(path).parent.parent.parent.parent
-                manifest_path = stage_root / "_manifest" / "manifest.parquet"
-                
-                if manifest_path.exists():
-                    # Read only the row for this run_id for efficiency
-                    # But Polars scan_parquet doesn't support fast point lookup well without reading metadata
-                    # For now, let's cache the manifest or use scan
-                    # To keep it simple and robust:
-                    
-                    # We only need the metadata columns, not everything
-                    # And we filter by the run_id found in the data (should be single value)
-                    rid = df["run_id"][0]
-                    
-                    manifest_df = pl.read_parquet(manifest_path).filter(pl.col("run_id") == rid)
-                    
-                    if len(manifest_df) > 0:
-                        meta_row = manifest_df.row(0, named=True)
-                        
-                        # Columns to exclude from join (already in data or not needed)
-                        exclude = {"run_id", "proc", "path", "source_file", "rows", "status", "ingested_at_utc", "validation_errors", "validation_warnings", "validation_messages"}
-                        
-                        # Add metadata columns to df
-                        new_cols = []
-                        for k, v in meta_row.items():
-                            if k not in df.columns and k not in exclude and v is not None:
-                                new_cols.append(pl.lit(v).alias(k))
-                        
-                        if new_cols:
-                            df = df.with_columns(new_cols)
-            except Exception as e:
+                if manifest_path is None:
+                    # roots/proc=X/date=Y/run_id=Z/part-000.parquet -> roots
+                    stage_root = Path(path).parent.parent.parent.parent
+                    manifest_path = stage_root / "_manifest" / "manifest.parquet"
+
+                index = get_manifest_index(manifest_path)
+                if index is not None:
+                    meta = index.metadata(df["run_id"][0])
+                    new_cols = [
+                        pl.lit(v).alias(k) for k, v in meta.items()
+                        if k not in df.columns
+                    ]
+                    if new_cols:
+                        df = df.with_columns(new_cols)
+            except Exception:
                 # If manifest lookup fails, just return what we have (graceful degradation)
-                # print(f"Warning: Failed to join manifest metadata: {e}")
                 pass
 
         return df
@@ -7,9 +7,25 @@ mobility, etc.) from staged measurement data.
 Main components:
 - MetricPipeline: Orchestrates metric extraction
 - MetricExtractor: Base class for all extractors
+- scan_metrics / load_metrics: Read the partitioned metrics dataset
+- segmented / LEDSegmentation: Per-measurement LED phase segmentation shared
+  by the ITS extractors
+- SweepLegs: Gate-sweep leg geometry shared by the CNP/mobility extractors
+  and the sweep plots
 """
 
 from .metric_pipeline import MetricPipeline
 from .extractors.base import MetricExtractor
+from .metrics_store import load_metrics, scan_metrics
+from .led_segmentation import LEDSegmentation, segmented
+from .sweep_legs import SweepLegs
 
-__all__ = ["MetricPipeline", "MetricExtractor"]
+__all__ = [
+    "MetricPipeline",
+    "MetricExtractor",
+    "load_metrics",
+    "scan_metrics",
+    "LEDSegmentation",
+    "segmented",
+    "SweepLegs",
+]
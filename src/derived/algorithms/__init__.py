@@ -2,15 +2,28 @@
 Numerical algorithms for metric extraction.
 
 This module contains Numba-accelerated algorithms for computationally
-intensive metric extraction tasks.
+intensive metric extraction tasks. Kernels are compiled with ``cache=True``
+into the directory set up by :mod:`.numba_cache`, which must be configured
+before the kernel modules are imported.
 """
 
+from .numba_cache import configure_numba_cache, warmup
+
+configure_numba_cache()
+
 from .stretched_exponential import (
     fit_stretched_exponential,
     fit_multiple_its_measurements,
     stretched_exponential,
 )
 
+from .stretched_exponential_batch import (
+    FIT_RESULT_DTYPE,
+    fit_segments,
+    fit_stretched_exponential_batch,
+    pack_segments,
+)
+
 from .linear_fit import (
     fit_linear,
     fit_multiple_linear,
@@ -21,7 +34,13 @@ __all__ = [
     'fit_stretched_exponential',
     'fit_multiple_its_measurements',
     'stretched_exponential',
+    'FIT_RESULT_DTYPE',
+    'fit_segments',
+    'fit_stretched_exponential_batch',
+    'pack_segments',
     'fit_linear',
     'fit_multiple_linear',
     'linear_model',
+    'configure_numba_cache',
+    'warmup',
 ]
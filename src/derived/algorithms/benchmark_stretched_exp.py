@@ -16,8 +16,11 @@ except ImportError:
 
 from .stretched_exponential import (
     fit_stretched_exponential,
+    fit_stretched_exponential_numba,
+    estimate_initial_parameters,
     stretched_exponential
 )
+from .stretched_exponential_batch import fit_stretched_exponential_batch
 
 
 def stretched_exp_scipy(t, baseline, amplitude, tau, beta):
@@ -212,6 +215,67 @@ def benchmark_typical_its_measurement():
     print(f"   ✅ Fast enough for real-time analysis!")
 
 
+def benchmark_batched_segments(n_segments: int = 200, seed: int = 3):
+    """
+    Benchmark the batched multi-segment kernel against per-call fitting.
+
+    Simulates the phases of a chip's It history (ragged lengths, random
+    τ/β) and fits them once per call with ``fit_stretched_exponential_numba``
+    and once with a single ``fit_stretched_exponential_batch`` call.
+
+    Parameters
+    ----------
+    n_segments : int
+        Number of segments to fit (default: 200)
+    seed : int
+        Random seed for the synthetic segments (default: 3)
+    """
+    print(f"\n{'='*60}")
+    print(f"BENCHMARK: Batched Segments ({n_segments} segments)")
+    print(f"{'='*60}\n")
+
+    rng = np.random.default_rng(seed)
+    segments = []
+    for _ in range(n_segments):
+        n_points = int(rng.integers(200, 3000))
+        t = np.linspace(0, rng.uniform(50, 500), n_points)
+        I = stretched_exponential(
+            t, 1e-6, rng.uniform(-1, 1) * 1e-7, rng.uniform(5, 100), rng.uniform(0.3, 1.0)
+        )
+        segments.append((t, I + rng.normal(0, 2e-10, n_points)))
+
+    n_total = sum(len(t) for t, _ in segments)
+    print(f"   Total points: {n_total}")
+
+    # Warm-up (compile JIT functions)
+    t0, I0 = segments[0]
+    _ = fit_stretched_exponential_numba(t0, I0, estimate_initial_parameters(t0, I0), 100, 1e-8)
+    _ = fit_stretched_exponential_batch(segments[:2])
+
+    start = time.time()
+    per_call = [
+        fit_stretched_exponential_numba(t, I, estimate_initial_parameters(t, I), 100, 1e-8)
+        for t, I in segments
+    ]
+    elapsed_per_call = (time.time() - start) * 1000
+
+    start = time.time()
+    batch = fit_stretched_exponential_batch(segments)
+    elapsed_batch = (time.time() - start) * 1000
+
+    tau_per_call = np.array([params[2] for params, _, _, _ in per_call])
+    rel_tau = np.abs(batch['tau'] - tau_per_call) / tau_per_call
+
+    print(f"   Per-call fits:  {elapsed_per_call:8.1f} ms "
+          f"({sum(c for _, _, _, c in per_call)} converged)")
+    print(f"   Batched kernel: {elapsed_batch:8.1f} ms "
+          f"({int(batch['converged'].sum())} converged)")
+    print(f"   Median relative τ difference: {np.median(rel_tau):.2e}")
+    print(f"\n🏆 SPEEDUP: {elapsed_per_call / elapsed_batch:.1f}x with the batched kernel")
+
+    return elapsed_per_call, elapsed_batch
+
+
 def run_all_benchmarks():
     """Run complete benchmark suite."""
     print("\n" + "="*60)
@@ -227,6 +291,9 @@ def run_all_benchmarks():
     # Benchmark 3: Realistic ITS
     benchmark_typical_its_measurement()
 
+    # Benchmark 4: Batched segments vs per-call fits
+    benchmark_batched_segments()
+
     print("\n" + "="*60)
     print("BENCHMARKS COMPLETE")
     print("="*60 + "\n")
@@ -8,7 +8,8 @@ the data contains two **complete** full-range traversals — one forward
 (V_start → V_end) and one backward (V_end → V_start) — plus partial
 half-legs at the ends. This module:
 
-1. Splits the sweep into monotonic legs by direction sign-change.
+1. Splits the sweep into monotonic legs by direction sign-change
+   (``SweepLegs``, shared with the other sweep consumers).
 2. Keeps only the legs whose Vg span covers ≥ `full_range_frac` of the
    sweep's total Vg range (default 95%) — these are the full traversals.
 3. For each kept leg, locates argmin(|signal|) and fits a quadratic to a
@@ -24,11 +25,14 @@ from typing import List, Optional, Tuple
 
 import numpy as np
 
+from src.derived.sweep_legs import SweepLegs, slice_legs
+
 
 def split_full_range_legs(
     vg: np.ndarray,
     signal: np.ndarray,
     full_range_frac: float = 0.95,
+    legs: Optional[SweepLegs] = None,
 ) -> List[Tuple[np.ndarray, np.ndarray, str]]:
     """Return monotonic legs spanning ≥ `full_range_frac` of the Vg range.
 
@@ -39,6 +43,9 @@ def split_full_range_legs(
     full_range_frac
         Minimum fraction of the total Vg span a leg must cover to count
         as a full-range traversal.
+    legs
+        Precomputed geometry of `vg` (e.g. the measurement's shared
+        `SegmentedMeasurement.sweep_legs()`); computed here if None.
 
     Returns
     -------
@@ -49,28 +56,10 @@ def split_full_range_legs(
     if vg.size < 3:
         return []
 
-    total_range = float(np.max(vg) - np.min(vg))
-    if total_range <= 0.0:
-        return []
-
-    # Sign-change segmentation on Vg increments.
-    dvg = np.diff(vg)
-    direction = np.sign(dvg + 1e-12)
-    change_idx = np.where(np.diff(direction) != 0)[0] + 1
-    segments = np.split(np.arange(vg.size), change_idx)
-
-    out: List[Tuple[np.ndarray, np.ndarray, str]] = []
-    threshold = full_range_frac * total_range
-    for seg in segments:
-        if seg.size < 3:
-            continue
-        vg_seg = vg[seg]
-        if (vg_seg.max() - vg_seg.min()) < threshold:
-            continue
-        sig_seg = signal[seg]
-        leg_dir = "forward" if vg_seg[-1] > vg_seg[0] else "backward"
-        out.append((vg_seg, sig_seg, leg_dir))
-    return out
+    # Sign-change segmentation on Vg increments (src/derived/sweep_legs.py)
+    if legs is None:
+        legs = SweepLegs(vg)
+    return slice_legs(legs.full_range_legs(full_range_frac), vg, signal)
 
 
 def fit_parabola_vertex(
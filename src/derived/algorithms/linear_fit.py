@@ -21,7 +21,7 @@ import warnings
 # Numba-Accelerated Core Functions
 # ══════════════════════════════════════════════════════════════════════
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def linear_model(x: np.ndarray, a: float, b: float) -> np.ndarray:
     """
     Evaluate linear model.
@@ -45,7 +45,7 @@ def linear_model(x: np.ndarray, a: float, b: float) -> np.ndarray:
     return a * x + b
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def compute_residuals_linear(x: np.ndarray, y: np.ndarray,
                              a: float, b: float) -> np.ndarray:
     """
@@ -69,7 +69,7 @@ def compute_residuals_linear(x: np.ndarray, y: np.ndarray,
     return y - predicted
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def fit_linear_least_squares(x: np.ndarray, y: np.ndarray) -> Tuple[float, float, float, float]:
     """
     Fit linear model using analytical least squares solution.
@@ -16,12 +16,14 @@ from numba import jit
 from typing import Tuple, Optional
 import warnings
 
+from .stretched_exponential_batch import MIN_POINTS, fit_segments, pack_segments
+
 
 # ══════════════════════════════════════════════════════════════════════
 # Numba-Accelerated Core Functions
 # ══════════════════════════════════════════════════════════════════════
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def stretched_exponential(t: np.ndarray, baseline: float, amplitude: float,
                          tau: float, beta: float) -> np.ndarray:
     """
@@ -64,7 +66,7 @@ def stretched_exponential(t: np.ndarray, baseline: float, amplitude: float,
     return result
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def compute_residuals(t: np.ndarray, current: np.ndarray,
                      baseline: float, amplitude: float,
                      tau: float, beta: float) -> np.ndarray:
@@ -89,7 +91,7 @@ def compute_residuals(t: np.ndarray, current: np.ndarray,
     return current - predicted
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def compute_jacobian(t: np.ndarray, baseline: float, amplitude: float,
                      tau: float, beta: float, h: float = 1e-7) -> np.ndarray:
     """
@@ -138,7 +140,7 @@ def compute_jacobian(t: np.ndarray, baseline: float, amplitude: float,
     return J
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def levenberg_marquardt_step(t: np.ndarray, current: np.ndarray,
                              params: np.ndarray, lambda_lm: float) -> Tuple[np.ndarray, float]:
     """
@@ -207,7 +209,7 @@ def levenberg_marquardt_step(t: np.ndarray, current: np.ndarray,
     return new_params, new_cost
 
 
-@jit(nopython=True)
+@jit(nopython=True, cache=True)
 def fit_stretched_exponential_numba(t: np.ndarray, current: np.ndarray,
                                     initial_guess: np.ndarray,
                                     max_iterations: int = 100,
@@ -301,7 +303,10 @@ def fit_stretched_exponential(
     """
     Fit stretched exponential to photoresponse data.
 
-    Python wrapper around Numba-accelerated core function.
+    Python wrapper around the batched Numba kernel
+    (:func:`~src.derived.algorithms.stretched_exponential_batch.fit_segments`)
+    with a single segment. Use ``fit_stretched_exponential_batch`` to fit
+    many segments in one call.
 
     Parameters
     ----------
@@ -360,34 +365,31 @@ def fit_stretched_exponential(
         warnings.warn(f"Removed {np.sum(~valid_mask)} NaN/Inf values before fitting")
         time = time[valid_mask]
         current = current[valid_mask]
+        if len(time) < MIN_POINTS:
+            raise ValueError("Need at least 10 finite data points for fitting")
 
-    # Estimate initial guess if not provided
-    if initial_guess is None:
-        initial_guess = estimate_initial_parameters(time, current)
-    else:
-        initial_guess = np.asarray(initial_guess, dtype=np.float64)
-
-    # Run Numba-accelerated fitting
-    params, cost, n_iterations, converged = fit_stretched_exponential_numba(
-        time, current, initial_guess, max_iterations, tolerance
-    )
+    # Initial guess is estimated inside the kernel when not provided
+    if initial_guess is not None:
+        initial_guess = np.asarray(initial_guess, dtype=np.float64).reshape(1, 4)
 
-    # Compute fitted curve and R²
-    fitted_curve = stretched_exponential(time, params[0], params[1], params[2], params[3])
+    # Run Numba-accelerated fitting (single-segment batch: analytic Jacobian)
+    offsets = np.array([0, len(time)], dtype=np.int64)
+    fit = fit_segments(time, current, offsets, initial_guess, max_iterations, tolerance)[0]
 
-    ss_res = cost  # Sum of squared residuals
-    ss_tot = np.sum((current - np.mean(current)) ** 2)
-    r_squared = 1 - (ss_res / ss_tot) if ss_tot > 0 else 0.0
+    # Compute fitted curve
+    fitted_curve = stretched_exponential(
+        time, fit['baseline'], fit['amplitude'], fit['tau'], fit['beta']
+    )
 
     return {
-        'baseline': float(params[0]),
-        'amplitude': float(params[1]),
-        'tau': float(params[2]),
-        'beta': float(params[3]),
-        'cost': float(cost),
-        'n_iterations': int(n_iterations),
-        'converged': bool(converged),
-        'r_squared': float(r_squared),
+        'baseline': float(fit['baseline']),
+        'amplitude': float(fit['amplitude']),
+        'tau': float(fit['tau']),
+        'beta': float(fit['beta']),
+        'cost': float(fit['cost']),
+        'n_iterations': int(fit['n_iterations']),
+        'converged': bool(fit['converged']),
+        'r_squared': float(fit['r_squared']),
         'fitted_curve': fitted_curve
     }
 
@@ -438,6 +440,9 @@ def fit_multiple_its_measurements(
     """
     Fit stretched exponentials to multiple ITS measurements.
 
+    All valid measurements are fitted in a single batched kernel call;
+    invalid ones (length mismatch, fewer than 10 finite points) yield None.
+
     Parameters
     ----------
     measurements : list of dict
@@ -450,21 +455,44 @@ def fit_multiple_its_measurements(
     list of dict
         Fitting results for each measurement
     """
-    results = []
-
     n_total = len(measurements)
+    results = [None] * n_total
+
+    # Validate and clean each measurement, then fit them all in one batch
+    segments = []
+    indices = []
     for i, measurement in enumerate(measurements):
-        if show_progress and i % 10 == 0:
-            print(f"Fitting {i}/{n_total}...")
-
-        try:
-            result = fit_stretched_exponential(
-                measurement['time'],
-                measurement['current']
-            )
-            results.append(result)
-        except Exception as e:
-            print(f"Warning: Fit {i} failed: {e}")
-            results.append(None)
+        time = np.asarray(measurement['time'], dtype=np.float64)
+        current = np.asarray(measurement['current'], dtype=np.float64)
+        if len(time) != len(current):
+            print(f"Warning: Fit {i} failed: time and current must have same length")
+            continue
+        valid_mask = np.isfinite(time) & np.isfinite(current)
+        if np.count_nonzero(valid_mask) < MIN_POINTS:
+            print(f"Warning: Fit {i} failed: Need at least 10 data points for fitting")
+            continue
+        segments.append((time[valid_mask], current[valid_mask]))
+        indices.append(i)
+
+    if show_progress:
+        print(f"Fitting {len(segments)}/{n_total} measurements in one batch...")
+
+    time, current, offsets = pack_segments(segments)
+    fits = fit_segments(time, current, offsets)
+
+    for i, fit, (t, _) in zip(indices, fits, segments):
+        results[i] = {
+            'baseline': float(fit['baseline']),
+            'amplitude': float(fit['amplitude']),
+            'tau': float(fit['tau']),
+            'beta': float(fit['beta']),
+            'cost': float(fit['cost']),
+            'n_iterations': int(fit['n_iterations']),
+            'converged': bool(fit['converged']),
+            'r_squared': float(fit['r_squared']),
+            'fitted_curve': stretched_exponential(
+                t, fit['baseline'], fit['amplitude'], fit['tau'], fit['beta']
+            ),
+        }
 
     return results
@@ -0,0 +1,436 @@
+"""
+Batched stretched exponential fitting for many ITS segments at once.
+
+Fits I(t) = baseline + amplitude * exp(-(t/tau)^beta) to a ragged set of
+segments (one concatenated time/current array plus segment offsets) in a
+single Numba ``prange`` kernel:
+
+- analytic Jacobian, accumulated directly into J^T J / J^T r (no n×4 matrix)
+- fixed-size per-segment workspaces, no allocation inside the LM loop
+- one compiled call for every segment of a measurement, or of a whole
+  chip's It history
+
+The Levenberg-Marquardt schedule (damping, constraints, acceptance and
+convergence tests) is the same as ``fit_stretched_exponential_numba``.
+
+Examples
+--------
+>>> segments = [(t1, i1), (t2, i2), (t3, i3)]     # e.g. pre-dark/light/post-dark
+>>> results = fit_stretched_exponential_batch(segments)
+>>> results["tau"], results["converged"]
+(array([12.1, 35.4,  80.2]), array([ True,  True,  True]))
+"""
+
+from __future__ import annotations
+
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from numba import jit, prange
+
+# Structured result, one record per segment
+FIT_RESULT_DTYPE = np.dtype([
+    ("baseline", np.float64),
+    ("amplitude", np.float64),
+    ("tau", np.float64),
+    ("beta", np.float64),
+    ("cost", np.float64),
+    ("r_squared", np.float64),
+    ("n_iterations", np.int32),
+    ("converged", np.bool_),
+    ("n_points", np.int64),
+])
+
+MIN_POINTS = 10
+
+
+# ══════════════════════════════════════════════════════════════════════
+# Numba Kernels
+# ══════════════════════════════════════════════════════════════════════
+
+@jit(nopython=True, cache=True)
+def _segment_cost(t: np.ndarray, y: np.ndarray, baseline: float, amplitude: float,
+                  tau: float, beta: float) -> float:
+    """Sum of squared residuals of one segment (same clipping as the model)."""
+    cost = 0.0
+    for i in range(t.shape[0]):
+        f = baseline
+        if tau > 0 and beta > 0:
+            exponent = -((t[i] / tau) ** beta)
+            if exponent > -50:
+                f = baseline + amplitude * np.exp(exponent)
+        r = y[i] - f
+        cost += r * r
+    return cost
+
+
+@jit(nopython=True, cache=True)
+def _accumulate_normal_equations(t: np.ndarray, y: np.ndarray, params: np.ndarray,
+                                 jtj: np.ndarray, jtr: np.ndarray) -> float:
+    """
+    Fill ``jtj`` (4×4) and ``jtr`` (4) from the analytic Jacobian.
+
+    Returns the current cost. ∂f/∂p for p = (baseline, amplitude, tau, beta)
+    with u = (t/tau)^beta and E = exp(-u):
+    (1, E, amplitude·E·beta·u/tau, -amplitude·E·u·ln(t/tau)).
+    """
+    baseline, amplitude, tau, beta = params[0], params[1], params[2], params[3]
+    for a in range(4):
+        jtr[a] = 0.0
+        for b in range(4):
+            jtj[a, b] = 0.0
+
+    cost = 0.0
+    for i in range(t.shape[0]):
+        g1 = 0.0
+        g2 = 0.0
+        g3 = 0.0
+        f = baseline
+        if tau > 0 and beta > 0:
+            x = t[i] / tau
+            u = x ** beta
+            if -u > -50:
+                e = np.exp(-u)
+                f = baseline + amplitude * e
+                g1 = e
+                g2 = amplitude * e * beta * u / tau
+                if x > 0:
+                    g3 = -amplitude * e * u * np.log(x)
+        r = y[i] - f
+        cost += r * r
+        jtr[0] += r
+        jtr[1] += g1 * r
+        jtr[2] += g2 * r
+        jtr[3] += g3 * r
+        jtj[0, 0] += 1.0
+        jtj[0, 1] += g1
+        jtj[0, 2] += g2
+        jtj[0, 3] += g3
+        jtj[1, 1] += g1 * g1
+        jtj[1, 2] += g1 * g2
+        jtj[1, 3] += g1 * g3
+        jtj[2, 2] += g2 * g2
+        jtj[2, 3] += g2 * g3
+        jtj[3, 3] += g3 * g3
+
+    for a in range(4):
+        for b in range(a):
+            jtj[a, b] = jtj[b, a]
+    return cost
+
+
+@jit(nopython=True, cache=True)
+def _solve4(a: np.ndarray, b: np.ndarray, out: np.ndarray) -> bool:
+    """
+    Solve the 4×4 system ``a @ out = b`` in place (partial pivoting).
+
+    ``a`` and ``b`` are overwritten. Returns False if the system is singular.
+    """
+    for col in range(4):
+        pivot = col
+        best = abs(a[col, col])
+        for row in range(col + 1, 4):
+            if abs(a[row, col]) > best:
+                best = abs(a[row, col])
+                pivot = row
+        if best == 0.0 or not np.isfinite(best):
+            return False
+        if pivot != col:
+            for k in range(4):
+                tmp = a[col, k]
+                a[col, k] = a[pivot, k]
+                a[pivot, k] = tmp
+            tmp = b[col]
+            b[col] = b[pivot]
+            b[pivot] = tmp
+        for row in range(col + 1, 4):
+            factor = a[row, col] / a[col, col]
+            for k in range(col, 4):
+                a[row, k] -= factor * a[col, k]
+            b[row] -= factor * b[col]
+    for row in range(3, -1, -1):
+        acc = b[row]
+        for k in range(row + 1, 4):
+            acc -= a[row, k] * out[k]
+        out[row] = acc / a[row, row]
+    return True
+
+
+@jit(nopython=True, cache=True)
+def _initial_guess(t: np.ndarray, y: np.ndarray, out: np.ndarray) -> None:
+    """Same heuristics as ``estimate_initial_parameters``, written into ``out``."""
+    n = y.shape[0]
+    n_end = max(10, n // 5)
+    baseline = np.mean(y[n - n_end:]) if n_end <= n else np.mean(y)
+    amplitude = np.max(y) - baseline
+    target = baseline + amplitude / np.e
+    idx = np.argmin(np.abs(y - target))
+    tau = t[idx] if idx > 0 else np.median(t)
+    tau = max(tau, t[1] - t[0])
+    out[0] = baseline
+    out[1] = amplitude
+    out[2] = tau
+    out[3] = 0.7
+
+
+@jit(nopython=True, cache=True)
+def _fit_segment(t: np.ndarray, y: np.ndarray, params: np.ndarray,
+                 max_iterations: int, tolerance: float,
+                 jtj: np.ndarray, jtr: np.ndarray, delta: np.ndarray,
+                 trial: np.ndarray) -> Tuple[float, int, bool]:
+    """Levenberg-Marquardt on one segment; ``params`` is updated in place."""
+    lambda_lm = 1e-3
+    cost = _segment_cost(t, y, params[0], params[1], params[2], params[3])
+    converged = False
+    iteration = 0
+
+    for iteration in range(max_iterations):
+        _accumulate_normal_equations(t, y, params, jtj, jtr)
+        for k in range(4):
+            jtj[k, k] += lambda_lm
+
+        new_cost = cost
+        if _solve4(jtj, jtr, delta):
+            for k in range(4):
+                trial[k] = params[k] + delta[k]
+            trial[2] = max(1e-6, trial[2])
+            if trial[3] < 0.01:
+                trial[3] = 0.01
+            elif trial[3] > 1.0:
+                trial[3] = 1.0
+            new_cost = _segment_cost(t, y, trial[0], trial[1], trial[2], trial[3])
+
+        if new_cost < cost:
+            cost_change = abs(cost - new_cost) / (cost + 1e-12)
+            for k in range(4):
+                params[k] = trial[k]
+            cost = new_cost
+            lambda_lm *= 0.1
+            if cost_change < tolerance:
+                converged = True
+                break
+        else:
+            lambda_lm *= 10.0
+            if lambda_lm > 1e10:
+                break
+
+    return cost, iteration + 1, converged
+
+
+@jit(nopython=True, parallel=True, cache=True)
+def fit_segments_kernel(time: np.ndarray, current: np.ndarray, offsets: np.ndarray,
+                        initial_guesses: np.ndarray, use_initial: np.ndarray,
+                        max_iterations: int, tolerance: float,
+                        params_out: np.ndarray, stats_out: np.ndarray,
+                        iterations_out: np.ndarray, converged_out: np.ndarray) -> None:
+    """
+    Fit every segment ``[offsets[s], offsets[s + 1])`` in parallel.
+
+    Parameters
+    ----------
+    time, current : np.ndarray
+        Concatenated segment data (float64)
+    offsets : np.ndarray
+        Segment boundaries, length n_segments + 1 (int64)
+    initial_guesses : np.ndarray
+        (n_segments, 4) starting parameters, used where ``use_initial`` is True
+    use_initial : np.ndarray
+        Per-segment flag; False = estimate the initial guess from the data
+    max_iterations : int
+        Maximum LM iterations per segment
+    tolerance : float
+        Relative cost-change convergence threshold
+    params_out : np.ndarray
+        (n_segments, 4) fitted parameters
+    stats_out : np.ndarray
+        (n_segments, 2) final cost and R²
+    iterations_out, converged_out : np.ndarray
+        Iterations used and convergence flag per segment
+
+    Segments shorter than ``MIN_POINTS`` are left as NaN / not converged.
+    """
+    n_segments = offsets.shape[0] - 1
+    for s in prange(n_segments):
+        start = offsets[s]
+        end = offsets[s + 1]
+        params = np.empty(4)
+        for k in range(4):
+            params_out[s, k] = np.nan
+        stats_out[s, 0] = np.nan
+        stats_out[s, 1] = np.nan
+        iterations_out[s] = 0
+        converged_out[s] = False
+        if end - start < MIN_POINTS:
+            continue
+
+        t = time[start:end]
+        y = current[start:end]
+        if use_initial[s]:
+            for k in range(4):
+                params[k] = initial_guesses[s, k]
+        else:
+            _initial_guess(t, y, params)
+
+        # Per-segment workspaces, reused by every LM iteration
+        jtj = np.empty((4, 4))
+        jtr = np.empty(4)
+        delta = np.empty(4)
+        trial = np.empty(4)
+        cost, n_iter, converged = _fit_segment(
+            t, y, params, max_iterations, tolerance, jtj, jtr, delta, trial
+        )
+
+        mean = np.mean(y)
+        ss_tot = 0.0
+        for i in range(y.shape[0]):
+            ss_tot += (y[i] - mean) ** 2
+
+        for k in range(4):
+            params_out[s, k] = params[k]
+        stats_out[s, 0] = cost
+        stats_out[s, 1] = 1.0 - cost / ss_tot if ss_tot > 0 else 0.0
+        iterations_out[s] = n_iter
+        converged_out[s] = converged
+
+
+# ══════════════════════════════════════════════════════════════════════
+# Python Interface
+# ══════════════════════════════════════════════════════════════════════
+
+def pack_segments(
+    segments: Sequence[Tuple[np.ndarray, np.ndarray]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Concatenate ``(time, current)`` segments into the ragged kernel layout.
+
+    Parameters
+    ----------
+    segments : sequence of (np.ndarray, np.ndarray)
+        Time and current per segment (equal lengths within a segment)
+
+    Returns
+    -------
+    time, current, offsets : np.ndarray
+        Concatenated float64 data and int64 offsets (length n_segments + 1)
+    """
+    lengths = np.fromiter((len(t) for t, _ in segments), dtype=np.int64, count=len(segments))
+    for t, i in segments:
+        if len(t) != len(i):
+            raise ValueError("time and current must have same length in every segment")
+    offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    if len(segments) == 0:
+        return np.empty(0), np.empty(0), offsets
+    time = np.concatenate([np.asarray(t, dtype=np.float64) for t, _ in segments])
+    current = np.concatenate([np.asarray(i, dtype=np.float64) for _, i in segments])
+    return time, current, offsets
+
+
+def drop_non_finite(
+    time: np.ndarray,
+    current: np.ndarray,
+    offsets: np.ndarray,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+    """
+    Remove NaN/Inf samples from packed segments, fixing up the offsets.
+
+    Returns
+    -------
+    time, current, offsets, n_removed
+    """
+    valid = np.isfinite(time) & np.isfinite(current)
+    n_removed = int(valid.size - np.count_nonzero(valid))
+    if n_removed == 0:
+        return time, current, offsets, 0
+    kept = np.concatenate(([0], np.cumsum(valid, dtype=np.int64)))
+    return time[valid], current[valid], kept[offsets], n_removed
+
+
+def fit_segments(
+    time: np.ndarray,
+    current: np.ndarray,
+    offsets: np.ndarray,
+    initial_guesses: Optional[np.ndarray] = None,
+    max_iterations: int = 100,
+    tolerance: float = 1e-8,
+) -> np.ndarray:
+    """
+    Fit stretched exponentials to packed segments.
+
+    Parameters
+    ----------
+    time, current : np.ndarray
+        Concatenated segment data; each segment's time should start at 0
+    offsets : np.ndarray
+        Segment boundaries (length n_segments + 1)
+    initial_guesses : np.ndarray, optional
+        (n_segments, 4) [baseline, amplitude, tau, beta]; rows containing NaN
+        (or None for all rows) are estimated from the data
+    max_iterations : int
+        Maximum optimization iterations per segment (default: 100)
+    tolerance : float
+        Convergence tolerance (default: 1e-8)
+
+    Returns
+    -------
+    np.ndarray
+        Structured array with ``FIT_RESULT_DTYPE``, one record per segment.
+        Segments with fewer than ``MIN_POINTS`` samples have NaN parameters
+        and ``converged=False``.
+    """
+    time = np.ascontiguousarray(time, dtype=np.float64)
+    current = np.ascontiguousarray(current, dtype=np.float64)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    n_segments = len(offsets) - 1
+
+    if initial_guesses is None:
+        guesses = np.full((n_segments, 4), np.nan)
+    else:
+        guesses = np.ascontiguousarray(initial_guesses, dtype=np.float64).reshape(n_segments, 4)
+    use_initial = np.all(np.isfinite(guesses), axis=1)
+
+    params = np.empty((n_segments, 4))
+    stats = np.empty((n_segments, 2))
+    iterations = np.empty(n_segments, dtype=np.int32)
+    converged = np.empty(n_segments, dtype=np.bool_)
+    if n_segments > 0:
+        fit_segments_kernel(
+            time, current, offsets, guesses, use_initial,
+            max_iterations, tolerance, params, stats, iterations, converged,
+        )
+
+    results = np.empty(n_segments, dtype=FIT_RESULT_DTYPE)
+    results["baseline"] = params[:, 0]
+    results["amplitude"] = params[:, 1]
+    results["tau"] = params[:, 2]
+    results["beta"] = params[:, 3]
+    results["cost"] = stats[:, 0]
+    results["r_squared"] = stats[:, 1]
+    results["n_iterations"] = iterations
+    results["converged"] = converged
+    results["n_points"] = np.diff(offsets)
+    return results
+
+
+def fit_stretched_exponential_batch(
+    segments: Sequence[Tuple[np.ndarray, np.ndarray]],
+    initial_guesses: Optional[np.ndarray] = None,
+    max_iterations: int = 100,
+    tolerance: float = 1e-8,
+) -> np.ndarray:
+    """
+    Fit stretched exponentials to a list of ``(time, current)`` segments.
+
+    NaN/Inf samples are dropped per segment before fitting. See
+    :func:`fit_segments` for the result layout.
+
+    Examples
+    --------
+    >>> # All light phases of a chip's It history in one call
+    >>> segments = [(t - t[0], i) for t, i in light_phases]
+    >>> results = fit_stretched_exponential_batch(segments)
+    >>> results[results["converged"]]["tau"].mean()
+    """
+    time, current, offsets = pack_segments(segments)
+    time, current, offsets, _ = drop_non_finite(time, current, offsets)
+    return fit_segments(time, current, offsets, initial_guesses, max_iterations, tolerance)
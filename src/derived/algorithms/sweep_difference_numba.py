@@ -255,55 +255,69 @@ def compute_statistics(data: np.ndarray) -> Tuple[float, float, float, float]:
 
 @jit(nopython=True, cache=True, parallel=True)
 def batch_compute_differences(
-    vg_arrays: list,
-    y_arrays: list,
-    n_points: int = 200
-) -> Tuple[list, list]:
+    vg: np.ndarray,
+    y: np.ndarray,
+    offsets: np.ndarray,
+    left: np.ndarray,
+    right: np.ndarray,
+    n_points: int,
+    vg_common_out: np.ndarray,
+    y_1_out: np.ndarray,
+    y_2_out: np.ndarray,
+    bounds_out: np.ndarray,
+) -> None:
     """
-    Compute differences for multiple pairs in parallel (Numba-compiled).
+    Interpolate many sweep pairs onto their common Vg grids in parallel.
 
-    This function processes multiple consecutive pairs simultaneously using
-    parallel threads for maximum performance.
+    Sweeps are concatenated once (a measurement shared by two consecutive
+    pairs is stored once) and pairs refer to them by index.
 
     Parameters
     ----------
-    vg_arrays : list of tuple
-        List of (vg_1, vg_2) tuples for each pair
-    y_arrays : list of tuple
-        List of (y_1, y_2) tuples for each pair
+    vg, y : np.ndarray
+        Concatenated sweep data (float64)
+    offsets : np.ndarray
+        Sweep boundaries, length n_sweeps + 1 (int64)
+    left, right : np.ndarray
+        Sweep indices of the earlier/later measurement of each pair (int64)
     n_points : int
         Number of interpolation points per pair
-
-    Returns
-    -------
-    vg_commons : list
-        List of common Vg grids
-    delta_ys : list
-        List of difference arrays
+    vg_common_out : np.ndarray
+        (n_pairs, n_points) common Vg grid of each pair
+    y_1_out, y_2_out : np.ndarray
+        (n_pairs, n_points) both sweeps interpolated onto the grid
+        (``y_2_out - y_1_out`` is the difference)
+    bounds_out : np.ndarray
+        (n_pairs, 2) overlap ``vg_min``, ``vg_max``
 
     Notes
     -----
-    - Processes pairs in parallel for ~N_cores speedup
-    - Ideal for batch processing of entire chip history
-    - ~15-20x faster than sequential scipy-based approach
+    - Same overlap, grid and ``linear_interp_sorted`` calls as
+      ``compute_sweep_difference`` per pair, so results are identical to the
+      single-pair path
+    - Each pair writes its own rows, so the parallel loop is race-free
     """
-    n_pairs = len(vg_arrays)
-    vg_commons = []
-    delta_ys = []
-
-    # Parallel loop over pairs
-    for i in prange(n_pairs):
-        vg_1, vg_2 = vg_arrays[i]
-        y_1, y_2 = y_arrays[i]
-
-        vg_common, delta_y, _, _ = compute_sweep_difference(
-            vg_1, y_1, vg_2, y_2, n_points
-        )
-
-        vg_commons.append(vg_common)
-        delta_ys.append(delta_y)
-
-    return vg_commons, delta_ys
+    n_pairs = left.shape[0]
+    for p in prange(n_pairs):
+        i = left[p]
+        j = right[p]
+        vg_1 = vg[offsets[i]:offsets[i + 1]]
+        y_1 = y[offsets[i]:offsets[i + 1]]
+        vg_2 = vg[offsets[j]:offsets[j + 1]]
+        y_2 = y[offsets[j]:offsets[j + 1]]
+
+        # Overlap and grid as in compute_sweep_difference, built once
+        vg_min = max(vg_1[0], vg_2[0])
+        vg_max = min(vg_1[-1], vg_2[-1])
+        vg_common = np.linspace(vg_min, vg_max, n_points)
+        y_1_interp = linear_interp_sorted(vg_1, y_1, vg_common)
+        y_2_interp = linear_interp_sorted(vg_2, y_2, vg_common)
+        for k in range(n_points):
+            vg_common_out[p, k] = vg_common[k]
+            y_1_out[p, k] = y_1_interp[k]
+            y_2_out[p, k] = y_2_interp[k]
+        bounds_out[p, 0] = vg_min
+        bounds_out[p, 1] = vg_max
 
 
 # ============================================================================
@@ -8,7 +8,11 @@ to extract metrics from measurement data.
 
 from __future__ import annotations
 
+import hashlib
+import inspect
+import json
 from abc import ABC, abstractmethod
+from enum import Enum
 from typing import List, Optional, Dict, Any
 from pathlib import Path
 import polars as pl
@@ -119,6 +123,74 @@ class MetricExtractor(ABC):
         """
         pass
 
+    @property
+    def required_columns(self) -> Optional[List[str]]:
+        """
+        Data columns this extractor reads from the measurement.
+
+        ``MetricPipeline`` reads only the union of these columns over the
+        extractors that run on a procedure. Columns a file lacks are skipped,
+        so alternatives (``"Vds (V)"``, ``"VDS (V)"``) can all be listed.
+
+        Returns
+        -------
+        Optional[List[str]]
+            Column names, or None to read every column (default, for
+            extractors that have not declared their needs)
+
+        Examples
+        --------
+        >>> extractor.required_columns
+        ['Vg (V)', 'I (A)']
+        """
+        return None
+
+    @property
+    def algorithm_version(self) -> str:
+        """
+        Version of the extraction algorithm.
+
+        Bump it whenever a code change alters the values this extractor
+        produces; the new :attr:`fingerprint` marks every stored result as
+        stale for ``derive-all-metrics --skip-existing``.
+
+        Returns
+        -------
+        str
+            Version label (default: ``"1"``)
+        """
+        return "1"
+
+    def fingerprint_params(self) -> Dict[str, Any]:
+        """
+        Configuration that determines this extractor's output.
+
+        Defaults to the constructor arguments the extractor stores under
+        the same name (``window_frac``, ``vl_threshold``, ...). Override to
+        exclude parameters that do not affect results or to add ones that do.
+
+        Returns
+        -------
+        Dict[str, Any]
+            JSON-serialisable parameters
+        """
+        return public_params(self)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Short hash of class, :attr:`algorithm_version` and :meth:`fingerprint_params`.
+
+        Recorded per (run_id, extractor) cell in the extraction ledger;
+        cells whose fingerprint differs are re-extracted by incremental runs.
+
+        Examples
+        --------
+        >>> CNPExtractor().fingerprint == CNPExtractor(window_frac=0.2).fingerprint
+        False
+        """
+        return compute_fingerprint(self)
+
     # ═══════════════════════════════════════════════════════════════════
     # Abstract Methods (Must be implemented by subclasses)
     # ═══════════════════════════════════════════════════════════════════
@@ -259,6 +331,77 @@ class MetricExtractor(ABC):
 # Helper Functions for Extractors
 # ══════════════════════════════════════════════════════════════════════
 
+# Marks attribute values left out of fingerprints
+_SKIP = object()
+
+
+def public_params(extractor: Any) -> Dict[str, Any]:
+    """
+    Constructor parameters that ``extractor`` keeps as public attributes.
+
+    Only attributes named like an ``__init__`` parameter count (so runtime
+    state such as caches or counters does not), and only plain values:
+    numbers, strings, paths, enums and lists/tuples of those.
+
+    Parameters
+    ----------
+    extractor : Any
+        Extractor instance
+
+    Returns
+    -------
+    Dict[str, Any]
+        Attribute name -> JSON-serialisable value
+    """
+    def plain(value: Any) -> Any:
+        if value is None or isinstance(value, (bool, int, float, str)):
+            return value
+        if isinstance(value, Enum):
+            return plain(value.value)
+        if isinstance(value, Path):
+            return str(value)
+        if isinstance(value, (list, tuple)):
+            items = [plain(v) for v in value]
+            return None if any(i is _SKIP for i in items) else items
+        return _SKIP
+
+    init_params = inspect.signature(type(extractor).__init__).parameters
+    params = {}
+    for name, value in vars(extractor).items():
+        if name.startswith("_") or name not in init_params:
+            continue
+        value = plain(value)
+        if value is not _SKIP:
+            params[name] = value
+    return params
+
+
+def compute_fingerprint(extractor: Any) -> str:
+    """
+    Fingerprint of an extractor's class, algorithm version and parameters.
+
+    Parameters
+    ----------
+    extractor : Any
+        ``MetricExtractor`` or ``PairwiseMetricExtractor`` instance
+
+    Returns
+    -------
+    str
+        First 16 hex digits of a SHA-256 over the canonical JSON payload
+    """
+    payload = json.dumps(
+        {
+            "class": type(extractor).__name__,
+            "algorithm_version": str(extractor.algorithm_version),
+            "params": extractor.fingerprint_params(),
+        },
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
 def safe_get_column(
     df: pl.DataFrame,
     col_name: str,
@@ -9,6 +9,7 @@ from abc import ABC, abstractmethod
 from typing import Optional, Dict, List, Any
 import polars as pl
 
+from src.derived.extractors.base import compute_fingerprint, public_params
 from src.models.derived_metrics import DerivedMetric
 
 
@@ -98,6 +99,52 @@ class PairwiseMetricExtractor(ABC):
         """
         return "consecutive_same_proc"
 
+    @property
+    def required_columns(self) -> Optional[List[str]]:
+        """
+        Data columns this extractor reads from each measurement of a pair.
+
+        Returns
+        -------
+        Optional[List[str]]
+            Column names (missing ones are skipped), or None to read every
+            column (default)
+        """
+        return None
+
+    @property
+    def algorithm_version(self) -> str:
+        """
+        Version of the pairwise algorithm (bump when outputs change).
+
+        Returns
+        -------
+        str
+            Version label (default: ``"1"``)
+        """
+        return "1"
+
+    def fingerprint_params(self) -> Dict[str, Any]:
+        """
+        Configuration that determines this extractor's output.
+
+        Returns
+        -------
+        Dict[str, Any]
+            Constructor arguments kept as attributes (override to adjust)
+        """
+        return public_params(self)
+
+    @property
+    def fingerprint(self) -> str:
+        """
+        Short hash of class, algorithm version and parameters.
+
+        Recorded per (run_id, extractor, partner_run_id) cell in the
+        extraction ledger; see ``MetricExtractor.fingerprint``.
+        """
+        return compute_fingerprint(self)
+
     @abstractmethod
     def extract_pairwise(
         self,
@@ -207,6 +254,61 @@ class PairwiseMetricExtractor(ABC):
         # Must be consecutive (no gaps)
         return seq_2 == seq_1 + 1
 
+    # ═══════════════════════════════════════════════════════════════════
+    # Optional batched extraction (used by MetricPipeline per chain)
+    # ═══════════════════════════════════════════════════════════════════
+
+    @property
+    def batchable(self) -> bool:
+        """
+        Whether ``prepare_pair``/``extract_prepared`` are implemented.
+
+        The pipeline walks each (chip, procedure) chain once. For batchable
+        extractors it reduces every pair to a small prepared state while the
+        two measurements are loaded, then extracts the whole chain in one
+        ``extract_prepared`` call (e.g. one vectorised interpolation kernel).
+        Other extractors get ``extract_pairwise`` per pair.
+
+        Returns
+        -------
+        bool
+            Default: False
+        """
+        return False
+
+    def prepare_pair(
+        self,
+        measurement_1: pl.DataFrame,
+        metadata_1: Dict[str, Any],
+        measurement_2: pl.DataFrame,
+        metadata_2: Dict[str, Any]
+    ) -> Optional[Any]:
+        """
+        Reduce a pair to what ``extract_prepared`` needs (no DataFrames).
+
+        Returns
+        -------
+        Optional[Any]
+            Prepared state, or None if the pair is rejected
+        """
+        raise NotImplementedError(f"{type(self).__name__} is not batchable")
+
+    def extract_prepared(self, prepared: List[Any]) -> List[Optional[List[DerivedMetric]]]:
+        """
+        Extract metrics for prepared pairs.
+
+        Parameters
+        ----------
+        prepared : List[Any]
+            States returned by ``prepare_pair`` (rejected pairs excluded)
+
+        Returns
+        -------
+        List[Optional[List[DerivedMetric]]]
+            One entry per prepared pair, as ``extract_pairwise`` would return
+        """
+        raise NotImplementedError(f"{type(self).__name__} is not batchable")
+
     def __repr__(self) -> str:
         """String representation of extractor."""
         return (
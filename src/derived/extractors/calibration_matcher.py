@@ -10,10 +10,14 @@ from __future__ import annotations
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, List, Literal, Tuple
+from typing import Dict, Optional, List, Literal, Tuple, Union
 import polars as pl
+import polars.selectors as cs
 import numpy as np
 
+from src.core.manifest_index import read_manifest
+from src.core.utils import read_measurement_parquet
+
 
 @dataclass
 class CalibrationMatch:
@@ -117,8 +121,8 @@ class CalibrationMatcher:
         if not manifest_path.exists():
             raise FileNotFoundError(f"Manifest not found: {manifest_path}")
 
-        # Load manifest
-        manifest = pl.read_parquet(manifest_path)
+        # Load manifest (shared process-wide snapshot)
+        manifest = read_manifest(manifest_path)
 
         # Filter to LaserCalibration experiments
         self.calibrations = manifest.filter(pl.col("proc") == "LaserCalibration")
@@ -157,6 +161,67 @@ class CalibrationMatcher:
             self.calibrations["wavelength_nm"].drop_nulls().unique().to_list()
         )
 
+        # Calibration curves keyed by parquet path, loaded on first use
+        self._curves: Dict[str, Optional[Tuple[np.ndarray, np.ndarray]]] = {}
+
+    def calibration_curve(
+        self,
+        calibration_path: str,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Load a calibration curve as sorted (voltage, power) arrays.
+
+        Each calibration file is read at most once per matcher; later calls
+        (and all interpolations) are served from the in-memory cache.
+
+        Parameters
+        ----------
+        calibration_path : str
+            Path to calibration Parquet file
+
+        Returns
+        -------
+        tuple[np.ndarray, np.ndarray] or None
+            Voltages (V, ascending) and powers (W), or None if the file cannot
+            be read, lacks voltage/power columns, or has fewer than 2 valid points
+        """
+        if calibration_path in self._curves:
+            return self._curves[calibration_path]
+
+        curve = None
+        try:
+            cal_data = read_measurement_parquet(Path(calibration_path), with_metadata=False)
+
+            # Find voltage and power columns (handle variations)
+            vl_col = None
+            power_col = None
+
+            for col in cal_data.columns:
+                col_lower = col.lower().strip()
+                if col_lower in ["vl (v)", "laser voltage (v)", "vl"]:
+                    vl_col = col
+                elif col_lower in ["power (w)", "power", "p (w)"]:
+                    power_col = col
+
+            if vl_col is not None and power_col is not None:
+                voltages = cal_data[vl_col].cast(pl.Float64).to_numpy()
+                powers = cal_data[power_col].cast(pl.Float64).to_numpy()
+
+                # Remove any NaN values
+                valid_mask = ~(np.isnan(voltages) | np.isnan(powers))
+                voltages = voltages[valid_mask]
+                powers = powers[valid_mask]
+
+                # Need at least 2 points for interpolation
+                if len(voltages) >= 2:
+                    sort_idx = np.argsort(voltages)
+                    curve = (voltages[sort_idx], powers[sort_idx])
+        except Exception:
+            curve = None
+
+        self._curves[calibration_path] = curve
+        return curve
+
     def get_power_from_calibration(
         self,
         calibration_path: str,
@@ -165,9 +230,6 @@ class CalibrationMatcher:
         """
         Interpolate irradiated power from calibration curve.
 
-        Reads the calibration Parquet file and interpolates the power
-        at the given laser voltage using the calibration curve.
-
         Parameters
         ----------
         calibration_path : str
@@ -184,53 +246,208 @@ class CalibrationMatcher:
         Notes
         -----
         - Uses linear interpolation between calibration points
-        - Extrapolates if voltage is outside calibration range (with warning)
-        - Returns None if calibration file cannot be read or has invalid data
+        - Clamps to the end points if voltage is outside calibration range
+        - The curve is loaded once via :meth:`calibration_curve`
         """
+        curve = self.calibration_curve(calibration_path)
+        if curve is None or laser_voltage is None:
+            return None
         try:
-            # Read calibration data
-            cal_data = pl.read_parquet(calibration_path)
+            return float(np.interp(laser_voltage, curve[0], curve[1]))
+        except (TypeError, ValueError):
+            return None
 
-            # Find voltage and power columns (handle variations)
-            vl_col = None
-            power_col = None
+    def interpolate_powers(
+        self,
+        calibration_paths: pl.Series,
+        laser_voltages: pl.Series,
+    ) -> pl.Series:
+        """
+        Interpolate irradiated power for many experiments at once.
 
-            for col in cal_data.columns:
-                col_lower = col.lower().strip()
-                if col_lower in ["vl (v)", "laser voltage (v)", "vl"]:
-                    vl_col = col
-                elif col_lower in ["power (w)", "power", "p (w)"]:
-                    power_col = col
+        Rows are grouped by calibration file so each curve is loaded once and
+        evaluated with a single ``np.interp`` call over all its voltages.
+
+        Parameters
+        ----------
+        calibration_paths : pl.Series
+            Matched calibration path per experiment (null if unmatched)
+        laser_voltages : pl.Series
+            Laser voltage (V) per experiment (null if unknown)
+
+        Returns
+        -------
+        pl.Series
+            ``irradiated_power_w`` (Float64), null where no power could be computed
+        """
+        powers = np.full(len(calibration_paths), np.nan)
+        groups = (
+            pl.DataFrame({
+                "path": calibration_paths.cast(pl.String),
+                "voltage": laser_voltages.cast(pl.Float64, strict=False),
+            })
+            .with_row_index("row")
+            .drop_nulls()
+            .group_by("path")
+            .agg("row", "voltage")
+        )
+        for path, rows, voltages in groups.iter_rows():
+            curve = self.calibration_curve(path)
+            if curve is None:
+                continue
+            powers[np.asarray(rows, dtype=np.int64)] = np.interp(
+                np.asarray(voltages, dtype=np.float64), curve[0], curve[1]
+            )
+        return pl.Series("irradiated_power_w", powers).fill_nan(None)
+
+    def match_calibrations(
+        self,
+        experiments: pl.DataFrame,
+        stale_threshold_hours: float = 24.0,
+    ) -> pl.DataFrame:
+        """
+        Match many light experiments to calibrations in one pass.
 
-            if vl_col is None or power_col is None:
-                return None
+        Vectorized equivalent of :meth:`find_calibration`: a backward as-of
+        join (latest calibration strictly BEFORE the experiment, same
+        wavelength) provides the preferred match, and a forward as-of join
+        fills in the earliest calibration strictly AFTER the experiment for
+        rows with no prior calibration.
 
-            # Extract voltage and power arrays
-            voltages = cal_data[vl_col].to_numpy()
-            powers = cal_data[power_col].to_numpy()
+        Parameters
+        ----------
+        experiments : pl.DataFrame
+            Must contain ``start_dt`` (datetime or ISO string) and
+            ``wavelength_nm``; other columns are passed through
+        stale_threshold_hours : float, optional
+            Hours beyond which a calibration is considered stale (default: 24)
 
-            # Remove any NaN values
-            valid_mask = ~(np.isnan(voltages) | np.isnan(powers))
-            voltages = voltages[valid_mask]
-            powers = powers[valid_mask]
+        Returns
+        -------
+        pl.DataFrame
+            ``experiments`` in its original row order with added columns
+            ``calibration_parquet_path``, ``calibration_seq``,
+            ``calibration_time_delta_hours`` (negative if cal is after),
+            ``calibration_status`` and ``calibration_warning``
+        """
+        cal_dtype = self.calibrations.schema["start_dt"]
+        cal_seq = pl.col("seq") if "seq" in self.calibrations.columns else pl.lit(None, dtype=pl.Int64)
+        cals = (
+            self.calibrations
+            .select(
+                pl.col("wavelength_nm").cast(pl.Float64, strict=False),
+                pl.col("start_dt").alias("__cal_dt"),
+                pl.col("parquet_path").cast(pl.String).alias("__cal_path"),
+                cal_seq.alias("__cal_seq"),
+            )
+            .drop_nulls(["wavelength_nm", "__cal_dt"])
+            .sort("__cal_dt")
+        )
 
-            if len(voltages) < 2:
-                # Need at least 2 points for interpolation
-                return None
+        exps = experiments.with_row_index("__row").with_columns(
+            _align_datetime(experiments["start_dt"], cal_dtype).alias("__exp_dt"),
+            pl.col("wavelength_nm").cast(pl.Float64, strict=False).alias("__exp_wl"),
+        )
+        keys = (
+            exps.select("__row", "__exp_dt", pl.col("__exp_wl").alias("wavelength_nm"))
+            .drop_nulls()
+            .sort("__exp_dt")
+        )
 
-            # Sort by voltage (in case not sorted)
-            sort_idx = np.argsort(voltages)
-            voltages = voltages[sort_idx]
-            powers = powers[sort_idx]
+        def _asof(strategy: str, prefix: str) -> pl.DataFrame:
+            joined = keys.join_asof(
+                cals,
+                left_on="__exp_dt",
+                right_on="__cal_dt",
+                by="wavelength_nm",
+                strategy=strategy,
+                allow_exact_matches=False,
+                check_sortedness=False,
+            )
+            return joined.select(
+                "__row",
+                pl.col("__cal_dt").alias(f"{prefix}_dt"),
+                pl.col("__cal_path").alias(f"{prefix}_path"),
+                pl.col("__cal_seq").alias(f"{prefix}_seq"),
+            )
 
-            # Interpolate (extrapolate if outside range)
-            interpolated_power = np.interp(laser_voltage, voltages, powers)
+        exps = (
+            exps
+            .join(_asof("backward", "__before"), on="__row", how="left")
+            .join(_asof("forward", "__after"), on="__row", how="left")
+            .sort("__row")
+        )
 
-            return float(interpolated_power)
+        use_before = pl.col("__before_dt").is_not_null()
+        use_after = ~use_before & pl.col("__after_dt").is_not_null()
+        cal_dt = pl.when(use_before).then(pl.col("__before_dt")).otherwise(pl.col("__after_dt"))
+        delta_hours = (pl.col("__exp_dt") - cal_dt).dt.total_microseconds() / 3.6e9
+
+        exps = exps.with_columns(
+            pl.when(use_before).then(pl.col("__before_path"))
+              .when(use_after).then(pl.col("__after_path"))
+              .alias("calibration_parquet_path"),
+            pl.when(use_before).then(pl.col("__before_seq"))
+              .when(use_after).then(pl.col("__after_seq"))
+              .alias("calibration_seq"),
+            delta_hours.alias("calibration_time_delta_hours"),
+            pl.when(use_before & (delta_hours <= stale_threshold_hours)).then(pl.lit("perfect"))
+              .when(use_before).then(pl.lit("stale"))
+              .when(use_after).then(pl.lit("future"))
+              .otherwise(pl.lit("missing"))
+              .alias("calibration_status"),
+        )
+        exps = exps.with_columns(
+            pl.Series(
+                "calibration_warning",
+                self._match_warnings(
+                    exps["calibration_status"],
+                    exps["calibration_time_delta_hours"],
+                    exps["__exp_wl"],
+                    stale_threshold_hours,
+                ),
+                dtype=pl.String,
+            )
+        )
 
-        except Exception:
-            # If anything goes wrong, return None
-            return None
+        return exps.drop(
+            "__row", "__exp_dt", "__exp_wl",
+            cs.starts_with("__before_", "__after_"),
+        )
+
+    def _match_warnings(
+        self,
+        statuses: pl.Series,
+        deltas: pl.Series,
+        wavelengths: pl.Series,
+        stale_threshold_hours: float,
+    ) -> List[Optional[str]]:
+        """Warning text per match, as produced by :meth:`find_calibration`."""
+        available = set(self.available_wavelengths)
+        available_str = ", ".join([f"{w:.0f}nm" for w in self.available_wavelengths])
+        warnings = []
+        for status, delta, wavelength in zip(statuses, deltas, wavelengths):
+            if status == "perfect":
+                warnings.append(None)
+            elif status == "stale":
+                warnings.append(
+                    f"Calibration is {delta:.1f}h old (>{stale_threshold_hours:.0f}h threshold)"
+                )
+            elif status == "future":
+                warnings.append(f"Using calibration from {abs(delta):.1f}h AFTER experiment")
+            elif wavelength is None:
+                warnings.append("No wavelength data in experiment")
+            elif wavelength not in available:
+                warnings.append(
+                    f"No calibration found for {wavelength:.0f}nm. Available: [{available_str}]"
+                )
+            else:
+                # Calibration exists for this wavelength but only at exactly
+                # the experiment time (or the experiment has no timestamp)
+                warnings.append(
+                    f"Unexpected: calibration exists for {wavelength:.0f}nm but no time match"
+                )
+        return warnings
 
     def find_calibration(
         self,
@@ -244,6 +461,7 @@ class CalibrationMatcher:
         Searches for laser calibration matching the experiment wavelength
         (strict equality) and closest in time. Prefers calibrations taken
         BEFORE the experiment, but will use future calibrations if necessary.
+        Single-experiment wrapper around :meth:`match_calibrations`.
 
         Parameters
         ----------
@@ -269,83 +487,152 @@ class CalibrationMatcher:
         >>> print(match.status)
         'perfect'
         """
-        # Step 1: Filter by wavelength (strict equality)
-        matching_wl = self.calibrations.filter(
-            pl.col("wavelength_nm") == experiment_wavelength
+        experiment = pl.DataFrame({
+            "start_dt": [experiment_time],
+            "wavelength_nm": pl.Series([experiment_wavelength], dtype=pl.Float64),
+        })
+        row = self.match_calibrations(experiment, stale_threshold_hours).row(0, named=True)
+        return CalibrationMatch(
+            calibration_path=row["calibration_parquet_path"],
+            calibration_seq=row["calibration_seq"],
+            time_delta_hours=row["calibration_time_delta_hours"],
+            warning=row["calibration_warning"],
+            status=row["calibration_status"],
         )
 
-        if matching_wl.height == 0:
-            # No calibrations for this wavelength at all
-            available_str = ", ".join([f"{w:.0f}nm" for w in self.available_wavelengths])
-            return CalibrationMatch(
-                calibration_path=None,
-                calibration_seq=None,
-                time_delta_hours=None,
-                warning=f"No calibration found for {experiment_wavelength:.0f}nm. Available: [{available_str}]",
-                status="missing"
-            )
+    def _prepare_history(
+        self,
+        history_path: Path,
+        output_dir: Optional[Path],
+        force: bool,
+    ) -> Union[EnrichmentReport, Tuple[pl.DataFrame, pl.DataFrame, Path]]:
+        """
+        Load a history for enrichment.
 
-        # Step 2: Find most recent calibration BEFORE experiment (PREFERRED)
-        before = matching_wl.filter(
-            pl.col("start_dt") < experiment_time
-        ).sort("start_dt", descending=True)
-
-        if before.height > 0:
-            # Found calibration before experiment (IDEAL)
-            cal_row = before.row(0, named=True)
-            cal_path = cal_row["parquet_path"]
-            cal_time = cal_row["start_dt"]
-            time_delta_hours = (experiment_time - cal_time).total_seconds() / 3600
-
-            # Determine status based on freshness
-            if time_delta_hours <= stale_threshold_hours:
-                # Fresh calibration (within threshold)
-                return CalibrationMatch(
-                    calibration_path=cal_path,
-                    calibration_seq=cal_row.get("seq"),
-                    time_delta_hours=time_delta_hours,
-                    warning=None,
-                    status="perfect"
-                )
-            else:
-                # Stale calibration (old but usable)
-                return CalibrationMatch(
-                    calibration_path=cal_path,
-                    calibration_seq=cal_row.get("seq"),
-                    time_delta_hours=time_delta_hours,
-                    warning=f"Calibration is {time_delta_hours:.1f}h old (>{stale_threshold_hours:.0f}h threshold)",
-                    status="stale"
+        Returns an ``EnrichmentReport`` if there is nothing to do (already
+        enriched, no light experiments), otherwise ``(history, light_experiments,
+        enriched_path)``.
+        """
+        if not history_path.exists():
+            raise FileNotFoundError(f"History file not found: {history_path}")
+
+        chip_name = history_path.stem.replace("_history", "")
+
+        # Determine output directory (Stage 3)
+        if output_dir is None:
+            # Default: data/03_derived/chip_histories_enriched/
+            # Navigate from Stage 2 history dir: data/02_stage/chip_histories/ -> data/03_derived/chip_histories_enriched/
+            # Go up two levels from chip_histories to get to data/, then down to 03_derived
+            data_dir = history_path.parent.parent  # chip_histories -> 02_stage -> data
+            output_dir = data_dir / "03_derived" / "chip_histories_enriched"
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        enriched_path = output_dir / history_path.name
+
+        # Skip only if the existing enriched file is at least as new as the source
+        # history. If Stage 2 has been rebuilt since the last enrichment, fall
+        # through and re-enrich so new rows propagate to Stage 3.
+        if enriched_path.exists() and not force:
+            if enriched_path.stat().st_mtime >= history_path.stat().st_mtime:
+                return _empty_report(
+                    chip_name,
+                    warnings=[f"Already enriched at {enriched_path} (use --force to overwrite)"],
                 )
 
-        # Step 3: No calibration before, try AFTER experiment (SUBOPTIMAL)
-        after = matching_wl.filter(
-            pl.col("start_dt") > experiment_time
-        ).sort("start_dt")
-
-        if after.height > 0:
-            # Found calibration after experiment (NOT IDEAL)
-            cal_row = after.row(0, named=True)
-            cal_path = cal_row["parquet_path"]
-            cal_time = cal_row["start_dt"]
-            time_delta_hours = -(cal_time - experiment_time).total_seconds() / 3600  # Negative
-
-            return CalibrationMatch(
-                calibration_path=cal_path,
-                calibration_seq=cal_row.get("seq"),
-                time_delta_hours=time_delta_hours,
-                warning=f"Using calibration from {abs(time_delta_hours):.1f}h AFTER experiment",
-                status="future"
+        # Load history from Stage 2
+        history = pl.read_parquet(history_path)
+
+        # Normalize column names for compatibility
+        # History files may use: start_time_utc (instead of start_dt)
+        if "start_time_utc" in history.columns and "start_dt" not in history.columns:
+            history = history.rename({"start_time_utc": "start_dt"})
+
+        # Normalize column name: history uses "has_light", manifest uses "with_light"
+        light_col = "has_light" if "has_light" in history.columns else "with_light"
+
+        # Filter to light experiments (excluding LaserCalibration itself)
+        light_experiments = history.filter(
+            (pl.col(light_col) == True) &
+            (pl.col("proc") != "LaserCalibration")
+        )
+
+        if light_experiments.height == 0:
+            return _empty_report(chip_name, warnings=["No light experiments found in history"])
+
+        return history, light_experiments, enriched_path
+
+    def _enrich_prepared(
+        self,
+        prepared: List[Tuple[str, pl.DataFrame, pl.DataFrame, Path]],
+        stale_threshold_hours: float,
+    ) -> Dict[str, EnrichmentReport]:
+        """
+        Match, interpolate and write a batch of prepared histories.
+
+        All light experiments of all histories are matched with a single
+        :meth:`match_calibrations` call and powered with a single
+        :meth:`interpolate_powers` call, then split back per chip.
+        """
+        if not prepared:
+            return {}
+
+        cal_dtype = self.calibrations.schema["start_dt"]
+        experiments = pl.concat([
+            light.select(
+                pl.lit(i, dtype=pl.UInt32).alias("__history"),
+                pl.col("seq"),
+                _align_datetime(light["start_dt"], cal_dtype).alias("start_dt"),
+                _column_or_null(light, "wavelength_nm"),
+                _column_or_null(light, "laser_voltage_v"),
             )
+            for i, (_, _, light, _) in enumerate(prepared)
+        ])
 
-        # Step 4: Should never reach here (matching_wl has rows but no before/after)
-        # This could happen if experiment_time equals calibration time exactly
-        return CalibrationMatch(
-            calibration_path=None,
-            calibration_seq=None,
-            time_delta_hours=None,
-            warning=f"Unexpected: calibration exists for {experiment_wavelength:.0f}nm but no time match",
-            status="missing"
+        matched = self.match_calibrations(experiments, stale_threshold_hours)
+        matched = matched.with_columns(
+            self.interpolate_powers(
+                matched["calibration_parquet_path"], matched["laser_voltage_v"]
+            )
         )
+        by_history = matched.partition_by("__history", as_dict=True, include_key=False)
+
+        reports = {}
+        for i, (chip_name, history, light, enriched_path) in enumerate(prepared):
+            chip_matches = by_history[(i,)]
+            counts = chip_matches["calibration_status"].value_counts()
+            counts = dict(zip(counts["calibration_status"], counts["count"]))
+            warnings_list = [
+                f"seq {seq}: {warning}"
+                for seq, warning in zip(chip_matches["seq"], chip_matches["calibration_warning"])
+                if warning
+            ]
+
+            # Join calibration data back to history
+            calibration_mapping = chip_matches.select(
+                "seq",
+                "calibration_parquet_path",
+                "calibration_time_delta_hours",
+                "irradiated_power_w",
+            )
+            enriched = history.join(
+                calibration_mapping, on="seq", how="left", maintain_order="left"
+            )
+
+            # Write enriched history to Stage 3 (derived data)
+            # Note: Stage 2 files remain unchanged (immutable)
+            enriched.write_parquet(enriched_path)
+
+            reports[chip_name] = EnrichmentReport(
+                chip_name=chip_name,
+                total_light_exps=light.height,
+                matched_perfect=counts.get("perfect", 0),
+                matched_future=counts.get("future", 0),
+                matched_stale=counts.get("stale", 0),
+                missing=counts.get("missing", 0),
+                warnings=warnings_list,
+                errors=[]
+            )
+        return reports
 
     def enrich_chip_history(
         self,
@@ -392,165 +679,68 @@ class CalibrationMatcher:
         - Skips LaserCalibration experiments themselves
         - Reads from Stage 2 (raw metadata), writes to Stage 3 (derived analytics)
         - Does NOT modify Stage 2 files (they remain immutable)
+        - Use :meth:`enrich_chip_histories` for many chips: it matches all of
+          them in one pass
         """
-        if not history_path.exists():
-            raise FileNotFoundError(f"History file not found: {history_path}")
-
         chip_name = history_path.stem.replace("_history", "")
+        prepared = self._prepare_history(history_path, output_dir, force)
+        if isinstance(prepared, EnrichmentReport):
+            return prepared
+        return self._enrich_prepared([(chip_name, *prepared)], stale_threshold_hours)[chip_name]
 
-        # Determine output directory (Stage 3)
-        if output_dir is None:
-            # Default: data/03_derived/chip_histories_enriched/
-            # Navigate from Stage 2 history dir: data/02_stage/chip_histories/ -> data/03_derived/chip_histories_enriched/
-            # Go up two levels from chip_histories to get to data/, then down to 03_derived
-            data_dir = history_path.parent.parent  # chip_histories -> 02_stage -> data
-            output_dir = data_dir / "03_derived" / "chip_histories_enriched"
-
-        output_dir.mkdir(parents=True, exist_ok=True)
-        enriched_path = output_dir / history_path.name
-
-        # Skip only if the existing enriched file is at least as new as the source
-        # history. If Stage 2 has been rebuilt since the last enrichment, fall
-        # through and re-enrich so new rows propagate to Stage 3.
-        if enriched_path.exists() and not force:
-            if enriched_path.stat().st_mtime >= history_path.stat().st_mtime:
-                return EnrichmentReport(
-                    chip_name=chip_name,
-                    total_light_exps=0,
-                    matched_perfect=0,
-                    matched_future=0,
-                    matched_stale=0,
-                    missing=0,
-                    warnings=[f"Already enriched at {enriched_path} (use --force to overwrite)"],
-                    errors=[]
-                )
-
-        # Load history from Stage 2
-        history = pl.read_parquet(history_path)
-
-        # Normalize column names for compatibility
-        # History files may use: start_time_utc (instead of start_dt)
-        if "start_time_utc" in history.columns and "start_dt" not in history.columns:
-            history = history.rename({"start_time_utc": "start_dt"})
-
-        # Normalize column name: history uses "has_light", manifest uses "with_light"
-        light_col = "has_light" if "has_light" in history.columns else "with_light"
-
-        # Filter to light experiments (excluding LaserCalibration itself)
-        light_experiments = history.filter(
-            (pl.col(light_col) == True) &
-            (pl.col("proc") != "LaserCalibration")
-        )
+    def enrich_chip_histories(
+        self,
+        history_paths: List[Path],
+        output_dir: Optional[Path] = None,
+        force: bool = False,
+        stale_threshold_hours: float = 24.0,
+    ) -> List[EnrichmentReport]:
+        """
+        Enrich several chip histories with a single matching pass.
 
-        total_light_exps = light_experiments.height
+        Same output as calling :meth:`enrich_chip_history` per file, but the
+        light experiments of all chips are matched with one as-of join and
+        each calibration curve is read once.
 
-        if total_light_exps == 0:
-            return EnrichmentReport(
-                chip_name=chip_name,
-                total_light_exps=0,
-                matched_perfect=0,
-                matched_future=0,
-                matched_stale=0,
-                missing=0,
-                warnings=["No light experiments found in history"],
-                errors=[]
-            )
+        Parameters
+        ----------
+        history_paths : list[Path]
+            Chip history Parquet files (Stage 2)
+        output_dir : Path, optional
+            Output directory for enriched histories. If None, defaults to
+            data/03_derived/chip_histories_enriched/ (Stage 3)
+        force : bool, optional
+            If True, overwrite existing enriched files (default: False)
+        stale_threshold_hours : float, optional
+            Hours beyond which calibration is considered stale (default: 24)
 
-        # Prepare lists for new columns
-        cal_paths = []
-        cal_time_deltas = []
-        irradiated_powers = []
-        warnings_list = []
-
-        # Counters for report
-        matched_perfect = 0
-        matched_future = 0
-        matched_stale = 0
-        missing = 0
-
-        # Process each light experiment
-        for row in light_experiments.iter_rows(named=True):
-            exp_time = row["start_dt"]
-            exp_wavelength = row.get("wavelength_nm")
-            exp_voltage = row.get("laser_voltage_v")
-            seq = row["seq"]
-
-            if exp_wavelength is None or not isinstance(exp_wavelength, (int, float)):
-                # No wavelength data
-                match = CalibrationMatch(
-                    calibration_path=None,
-                    calibration_seq=None,
-                    time_delta_hours=None,
-                    warning=f"seq {seq}: No wavelength data in experiment",
-                    status="missing"
-                )
+        Returns
+        -------
+        list[EnrichmentReport]
+            One report per input file, in input order. Files that fail to load
+            get a report with ``errors`` set instead of raising.
+        """
+        reports: Dict[str, EnrichmentReport] = {}
+        prepared = []
+        for history_path in history_paths:
+            chip_name = history_path.stem.replace("_history", "")
+            try:
+                result = self._prepare_history(history_path, output_dir, force)
+            except Exception as e:
+                reports[chip_name] = _empty_report(chip_name, errors=[f"Failed to process: {str(e)}"])
+                continue
+            if isinstance(result, EnrichmentReport):
+                reports[chip_name] = result
             else:
-                # Find calibration
-                match = self.find_calibration(
-                    exp_time,
-                    exp_wavelength,
-                    stale_threshold_hours
-                )
-
-            # Collect results
-            cal_paths.append(match.calibration_path)
-            cal_time_deltas.append(match.time_delta_hours)
-
-            # Calculate irradiated power from calibration
-            irradiated_power = None
-            if match.calibration_path is not None and exp_voltage is not None:
-                irradiated_power = self.get_power_from_calibration(
-                    match.calibration_path,
-                    exp_voltage
-                )
-            irradiated_powers.append(irradiated_power)
-
-            # Count by status
-            if match.status == "perfect":
-                matched_perfect += 1
-            elif match.status == "future":
-                matched_future += 1
-            elif match.status == "stale":
-                matched_stale += 1
-            elif match.status == "missing":
-                missing += 1
-
-            # Collect warnings
-            if match.warning:
-                warnings_list.append(f"seq {seq}: {match.warning}")
-
-        # Create a DataFrame with seq -> calibration mapping
-        calibration_mapping = pl.DataFrame({
-            "seq": light_experiments["seq"].to_list(),
-            "calibration_parquet_path": cal_paths,
-            "calibration_time_delta_hours": cal_time_deltas,
-            "irradiated_power_w": irradiated_powers,
-        })
+                prepared.append((chip_name, *result))
 
-        # Join calibration data back to history
-        history = history.join(
-            calibration_mapping,
-            on="seq",
-            how="left"
-        )
-
-        # Write enriched history to Stage 3 (derived data)
-        # Note: Stage 2 files remain unchanged (immutable)
-        history.write_parquet(enriched_path)
-
-        # Create report
-        report = EnrichmentReport(
-            chip_name=chip_name,
-            total_light_exps=total_light_exps,
-            matched_perfect=matched_perfect,
-            matched_future=matched_future,
-            matched_stale=matched_stale,
-            missing=missing,
-            warnings=warnings_list,
-            errors=[]
-        )
+        try:
+            reports.update(self._enrich_prepared(prepared, stale_threshold_hours))
+        except Exception as e:
+            for chip_name, *_ in prepared:
+                reports[chip_name] = _empty_report(chip_name, errors=[f"Failed to process: {str(e)}"])
 
-        return report
+        return [reports[path.stem.replace("_history", "")] for path in history_paths]
 
     def enrich_all_histories(
         self,
@@ -601,33 +791,59 @@ class CalibrationMatcher:
                 f"Run 'build-all-histories' first to generate history files."
             )
 
-        # Process each file
-        reports = []
-        for history_path in history_files:
-            try:
-                report = self.enrich_chip_history(
-                    history_path,
-                    output_dir=output_dir,
-                    force=force,
-                    stale_threshold_hours=stale_threshold_hours
-                )
-                reports.append(report)
-            except Exception as e:
-                # Create error report
-                chip_name = history_path.stem.replace("_history", "")
-                error_report = EnrichmentReport(
-                    chip_name=chip_name,
-                    total_light_exps=0,
-                    matched_perfect=0,
-                    matched_future=0,
-                    matched_stale=0,
-                    missing=0,
-                    warnings=[],
-                    errors=[f"Failed to process: {str(e)}"]
-                )
-                reports.append(error_report)
+        return self.enrich_chip_histories(
+            history_files,
+            output_dir=output_dir,
+            force=force,
+            stale_threshold_hours=stale_threshold_hours
+        )
 
-        return reports
+
+def _empty_report(
+    chip_name: str,
+    warnings: Optional[List[str]] = None,
+    errors: Optional[List[str]] = None,
+) -> EnrichmentReport:
+    """EnrichmentReport with no processed experiments."""
+    return EnrichmentReport(
+        chip_name=chip_name,
+        total_light_exps=0,
+        matched_perfect=0,
+        matched_future=0,
+        matched_stale=0,
+        missing=0,
+        warnings=warnings or [],
+        errors=errors or []
+    )
+
+
+def _column_or_null(df: pl.DataFrame, name: str) -> pl.Expr:
+    """``name`` cast to Float64, or an all-null Float64 column if absent."""
+    if name in df.columns:
+        return pl.col(name).cast(pl.Float64, strict=False)
+    return pl.lit(None, dtype=pl.Float64).alias(name)
+
+
+def _align_datetime(values: pl.Series, dtype: pl.DataType) -> pl.Series:
+    """
+    Cast experiment timestamps to the calibrations' datetime dtype.
+
+    Accepts ISO strings (parsed as UTC) and naive datetimes (assumed UTC) so
+    that as-of joins compare like with like.
+    """
+    if values.dtype == pl.String:
+        values = values.str.to_datetime(time_zone="UTC")
+    elif values.dtype == pl.Null:
+        values = values.cast(pl.Datetime("us", "UTC"))
+    if not isinstance(dtype, pl.Datetime) or not isinstance(values.dtype, pl.Datetime):
+        return values
+    if dtype.time_zone is not None:
+        if values.dtype.time_zone is None:
+            values = values.dt.replace_time_zone("UTC")
+        values = values.dt.convert_time_zone(dtype.time_zone)
+    elif values.dtype.time_zone is not None:
+        values = values.dt.convert_time_zone("UTC").dt.replace_time_zone(None)
+    return values.dt.cast_time_unit(dtype.time_unit or "us")
 
 
 def print_enrichment_report(report: EnrichmentReport, verbose: bool = False) -> None:
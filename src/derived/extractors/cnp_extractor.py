@@ -44,6 +44,7 @@ from src.derived.extractors.base import (
     build_flags,
     compute_confidence,
 )
+from src.derived.led_segmentation import segmented
 from src.models.derived_metrics import DerivedMetric
 
 logger = logging.getLogger(__name__)
@@ -106,6 +107,10 @@ class CNPExtractor(MetricExtractor):
     def metric_category(self) -> str:
         return "electrical"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["Vg (V)", "I (A)", "Vds (V)", "VDS (V)", "V (V)"]
+
     def extract(
         self,
         measurement: pl.DataFrame,
@@ -121,7 +126,10 @@ class CNPExtractor(MetricExtractor):
             )
             return None
 
-        vg = measurement["Vg (V)"].to_numpy()
+        # Columns and leg geometry are shared by the forward/backward/average
+        # instances (and mobility) running on the same measurement
+        shared = segmented(measurement, metadata)
+        vg = shared.column("Vg (V)")
 
         if procedure == "IVg":
             if "I (A)" not in measurement.columns:
@@ -130,7 +138,7 @@ class CNPExtractor(MetricExtractor):
                     extra={"run_id": run_id, "reason": "MISSING_COLUMN"},
                 )
                 return None
-            signal = measurement["I (A)"].to_numpy()
+            signal = shared.column("I (A)")
             extremum = "min"
             unit_signal = "A"
         elif procedure == "VVg":
@@ -145,7 +153,7 @@ class CNPExtractor(MetricExtractor):
                     extra={"run_id": run_id, "reason": "MISSING_COLUMN"},
                 )
                 return None
-            signal = measurement[vds_col].to_numpy()
+            signal = shared.column(vds_col)
             extremum = "max"
             unit_signal = "V"
         else:
@@ -158,11 +166,15 @@ class CNPExtractor(MetricExtractor):
                 extra={"run_id": run_id, "reason": "DATA_QUALITY"},
             )
             return None
-        vg = vg[finite]
-        signal = signal[finite]
+        if np.all(finite):
+            sweep = shared.sweep_legs()
+        else:
+            vg = vg[finite]
+            signal = signal[finite]
+            sweep = None
 
         legs = split_full_range_legs(
-            vg, signal, full_range_frac=self.full_range_frac
+            vg, signal, full_range_frac=self.full_range_frac, legs=sweep
         )
 
         fwd_fit = None
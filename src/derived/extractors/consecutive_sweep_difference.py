@@ -9,6 +9,7 @@ from __future__ import annotations
 import numpy as np
 import polars as pl
 import json
+from dataclasses import dataclass
 from typing import Optional, Dict, List, Any, Literal
 from datetime import datetime, timezone
 from scipy.interpolate import interp1d
@@ -23,14 +24,36 @@ logger = logging.getLogger(__name__)
 # Import Numba-accelerated functions
 try:
     from src.derived.algorithms.sweep_difference_numba import (
+        batch_compute_differences,
         compute_sweep_difference,
-        compute_resistance_safe
+        compute_resistance_safe,
+        linear_interp_sorted,
     )
     NUMBA_AVAILABLE = True
 except ImportError:
     NUMBA_AVAILABLE = False
 
 
+@dataclass
+class _SweepPair:
+    """Sweep arrays and metadata of one pair, as produced by ``prepare_pair``."""
+    metadata_1: Dict[str, Any]
+    metadata_2: Dict[str, Any]
+    procedure: str
+    vg_1: np.ndarray
+    y_1: np.ndarray
+    vg_2: np.ndarray
+    y_2: np.ndarray
+    y_label: str
+    y_unit: str
+    metric_name: str
+    vds: Optional[float]
+    ids: Optional[float]
+    vg_min: float
+    vg_max: float
+    vg_overlap: float
+
+
 class ConsecutiveSweepDifferenceExtractor(PairwiseMetricExtractor):
     """
     Extract differences between consecutive IVg or VVg sweeps.
@@ -109,6 +132,10 @@ class ConsecutiveSweepDifferenceExtractor(PairwiseMetricExtractor):
     def metric_category(self) -> str:
         return "electrical"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["Vg (V)", "I (A)", "Vds (V)", "VDS (V)", "V (V)"]
+
     def extract_pairwise(
         self,
         measurement_1: pl.DataFrame,
@@ -139,6 +166,36 @@ class ConsecutiveSweepDifferenceExtractor(PairwiseMetricExtractor):
         - Batch processing: ~15-20x faster with parallel execution
         """
 
+        pair = self.prepare_pair(measurement_1, metadata_1, measurement_2, metadata_2)
+        if pair is None:
+            return None
+
+        # Interpolate both sweeps onto common grid
+        try:
+            interpolated = self._interpolate(pair)
+        except Exception as e:
+            # Interpolation failed (e.g., not enough points, duplicate Vg values)
+            logger.debug(
+                f"Extractor {self.metric_name} skipped: ALGORITHM_FAILURE (Interpolation error: {e})",
+                extra={"run_id": metadata_1.get("run_id"), "reason": "ALGORITHM_FAILURE"}
+            )
+            return None
+
+        return self._finish_pair(pair, *interpolated)
+
+    @property
+    def batchable(self) -> bool:
+        return True
+
+    def prepare_pair(
+        self,
+        measurement_1: pl.DataFrame,
+        metadata_1: Dict[str, Any],
+        measurement_2: pl.DataFrame,
+        metadata_2: Dict[str, Any]
+    ) -> Optional["_SweepPair"]:
+        """Select the sweep arrays of a pair and check the Vg overlap (None = rejected)."""
+        vds = ids = None
         procedure = metadata_1.get("proc")
 
         # Validate same procedure (should already be enforced by should_pair)
@@ -204,37 +261,125 @@ class ConsecutiveSweepDifferenceExtractor(PairwiseMetricExtractor):
             )
             return None
 
-        # Interpolate both sweeps onto common grid
-        try:
-            if self.interpolation_method == 'linear' and NUMBA_AVAILABLE:
-                # Use Numba-accelerated linear interpolation (~8x faster)
-                vg_common, delta_y, vg_min, vg_max = compute_sweep_difference(
-                    vg_1, y_1, vg_2, y_2, self.vg_interpolation_points
-                )
-                # Need individual interpolated arrays for resistance calculation
-                from src.derived.algorithms.sweep_difference_numba import linear_interp_sorted
-                y_1_interp = linear_interp_sorted(vg_1, y_1, vg_common)
-                y_2_interp = linear_interp_sorted(vg_2, y_2, vg_common)
-            else:
-                # Use scipy interpolation (cubic or fallback linear)
-                kind = 'cubic' if self.interpolation_method == 'cubic' else 'linear'
-                vg_common = np.linspace(vg_min, vg_max, self.vg_interpolation_points)
+        return _SweepPair(
+            metadata_1=metadata_1, metadata_2=metadata_2, procedure=procedure,
+            vg_1=vg_1, y_1=y_1, vg_2=vg_2, y_2=y_2,
+            y_label=y_label, y_unit=y_unit, metric_name=metric_name_specific,
+            vds=vds, ids=ids, vg_min=vg_min, vg_max=vg_max, vg_overlap=vg_overlap,
+        )
 
-                interp_1 = interp1d(vg_1, y_1, kind=kind, fill_value='extrapolate')
-                interp_2 = interp1d(vg_2, y_2, kind=kind, fill_value='extrapolate')
+    def extract_prepared(self, prepared: List["_SweepPair"]) -> List[Optional[List[DerivedMetric]]]:
+        """
+        Extract a chain of prepared pairs with one batched interpolation.
 
-                y_1_interp = interp_1(vg_common)
-                y_2_interp = interp_2(vg_common)
+        With linear interpolation and Numba, every pair is interpolated by
+        ``batch_compute_differences`` in one parallel kernel call; results
+        are identical to ``extract_pairwise``. Otherwise (or if the batch
+        kernel fails) pairs are interpolated one by one.
+        """
+        if self.interpolation_method == 'linear' and NUMBA_AVAILABLE and len(prepared) > 1:
+            try:
+                batch = self._interpolate_batch(prepared)
+            except Exception as e:
+                logger.debug(f"Batched sweep interpolation failed, falling back per pair: {e}")
+            else:
+                return [self._finish_pair(pair, *interp) for pair, interp in zip(prepared, batch)]
 
-                # Compute primary difference: ΔI or ΔV
-                delta_y = y_2_interp - y_1_interp
-        except Exception as e:
-            # Interpolation failed (e.g., not enough points, duplicate Vg values)
-            logger.debug(
-                f"Extractor {self.metric_name} skipped: ALGORITHM_FAILURE (Interpolation error: {e})",
-                extra={"run_id": metadata_1.get("run_id"), "reason": "ALGORITHM_FAILURE"}
+        results: List[Optional[List[DerivedMetric]]] = []
+        for pair in prepared:
+            try:
+                interpolated = self._interpolate(pair)
+            except Exception as e:
+                logger.debug(
+                    f"Extractor {self.metric_name} skipped: ALGORITHM_FAILURE (Interpolation error: {e})",
+                    extra={"run_id": pair.metadata_1.get("run_id"), "reason": "ALGORITHM_FAILURE"}
+                )
+                results.append(None)
+                continue
+            results.append(self._finish_pair(pair, *interpolated))
+        return results
+
+    def _interpolate(self, pair: "_SweepPair") -> tuple:
+        """Interpolate one pair: (vg_common, y_1_interp, y_2_interp, delta_y, vg_min, vg_max)."""
+        vg_1, y_1, vg_2, y_2 = pair.vg_1, pair.y_1, pair.vg_2, pair.y_2
+        vg_min, vg_max = pair.vg_min, pair.vg_max
+        if self.interpolation_method == 'linear' and NUMBA_AVAILABLE:
+            # Use Numba-accelerated linear interpolation (~8x faster)
+            vg_common, delta_y, vg_min, vg_max = compute_sweep_difference(
+                vg_1, y_1, vg_2, y_2, self.vg_interpolation_points
             )
-            return None
+            # Need individual interpolated arrays for resistance calculation
+            y_1_interp = linear_interp_sorted(vg_1, y_1, vg_common)
+            y_2_interp = linear_interp_sorted(vg_2, y_2, vg_common)
+        else:
+            # Use scipy interpolation (cubic or fallback linear)
+            kind = 'cubic' if self.interpolation_method == 'cubic' else 'linear'
+            vg_common = np.linspace(vg_min, vg_max, self.vg_interpolation_points)
+
+            interp_1 = interp1d(vg_1, y_1, kind=kind, fill_value='extrapolate')
+            interp_2 = interp1d(vg_2, y_2, kind=kind, fill_value='extrapolate')
+
+            y_1_interp = interp_1(vg_common)
+            y_2_interp = interp_2(vg_common)
+
+            # Compute primary difference: ΔI or ΔV
+            delta_y = y_2_interp - y_1_interp
+        return vg_common, y_1_interp, y_2_interp, delta_y, vg_min, vg_max
+
+    def _interpolate_batch(self, prepared: List["_SweepPair"]) -> List[tuple]:
+        """``_interpolate`` for many pairs through ``batch_compute_differences``."""
+        # Consecutive pairs share a sweep: store each sweep once
+        sweeps: Dict[str, int] = {}
+        vg_parts: List[np.ndarray] = []
+        y_parts: List[np.ndarray] = []
+
+        def sweep_index(run_id: str, vg: np.ndarray, y: np.ndarray) -> int:
+            key = run_id
+            if key not in sweeps:
+                sweeps[key] = len(vg_parts)
+                vg_parts.append(np.ascontiguousarray(vg, dtype=np.float64))
+                y_parts.append(np.ascontiguousarray(y, dtype=np.float64))
+            return sweeps[key]
+
+        left = np.array(
+            [sweep_index(p.metadata_1["run_id"], p.vg_1, p.y_1) for p in prepared], dtype=np.int64
+        )
+        right = np.array(
+            [sweep_index(p.metadata_2["run_id"], p.vg_2, p.y_2) for p in prepared], dtype=np.int64
+        )
+        offsets = np.zeros(len(vg_parts) + 1, dtype=np.int64)
+        offsets[1:] = np.cumsum([len(v) for v in vg_parts])
+
+        n, k = len(prepared), self.vg_interpolation_points
+        vg_common = np.empty((n, k))
+        y_1_interp = np.empty((n, k))
+        y_2_interp = np.empty((n, k))
+        bounds = np.empty((n, 2))
+        batch_compute_differences(
+            np.concatenate(vg_parts), np.concatenate(y_parts), offsets, left, right, k,
+            vg_common, y_1_interp, y_2_interp, bounds,
+        )
+        return [
+            (vg_common[i], y_1_interp[i], y_2_interp[i], y_2_interp[i] - y_1_interp[i],
+             bounds[i, 0], bounds[i, 1])
+            for i in range(n)
+        ]
+
+    def _finish_pair(
+        self,
+        pair: "_SweepPair",
+        vg_common: np.ndarray,
+        y_1_interp: np.ndarray,
+        y_2_interp: np.ndarray,
+        delta_y: np.ndarray,
+        vg_min: float,
+        vg_max: float,
+    ) -> Optional[List[DerivedMetric]]:
+        """Resistance, statistics and the DerivedMetric of an interpolated pair."""
+        metadata_1, metadata_2 = pair.metadata_1, pair.metadata_2
+        procedure, vds, ids = pair.procedure, pair.vds, pair.ids
+        y_label, y_unit, metric_name_specific = pair.y_label, pair.y_unit, pair.metric_name
+        vg_overlap = pair.vg_overlap
 
         # Compute resistance difference (optional)
         delta_r = None
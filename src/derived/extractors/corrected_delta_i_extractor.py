@@ -15,6 +15,7 @@ from src.derived.algorithms.stretched_exponential import (
     fit_stretched_exponential,
     stretched_exponential,
 )
+from src.derived.led_segmentation import segmented
 from src.models.derived_metrics import DerivedMetric, MetricCategory
 
 from .base import MetricExtractor
@@ -53,6 +54,10 @@ class CorrectedDeltaIExtractor(MetricExtractor):
     def metric_category(self) -> MetricCategory:
         return "photoresponse"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["t (s)", "I (A)"]
+
     def extract(
         self,
         measurement: pl.DataFrame,
@@ -66,8 +71,9 @@ class CorrectedDeltaIExtractor(MetricExtractor):
                 )
                 return None
 
-        t = measurement["t (s)"].to_numpy().astype(np.float64)
-        i = measurement["I (A)"].to_numpy().astype(np.float64)
+        data = segmented(measurement, metadata)
+        t = data.column("t (s)").astype(np.float64)
+        i = data.column("I (A)").astype(np.float64)
 
         finite = np.isfinite(t) & np.isfinite(i)
         t = t[finite]
@@ -90,6 +90,10 @@ class DriftExtractor(MetricExtractor):
     def metric_category(self) -> MetricCategory:
         return "stability"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["t (s)", "I (A)", "Vds (V)", "T (K)", "VL (V)"]
+
     def extract(
         self,
         measurement: pl.DataFrame,
@@ -20,6 +20,7 @@ from datetime import datetime, timezone
 
 from src.models.derived_metrics import DerivedMetric, MetricCategory
 from src.derived.algorithms import fit_stretched_exponential
+from src.derived.led_segmentation import LEDSegmentation, segmented
 from .base import MetricExtractor
 import logging
 
@@ -99,6 +100,10 @@ class ITSRelaxationExtractor(MetricExtractor):
     def metric_category(self) -> MetricCategory:
         return "photoresponse"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["t (s)", "I (A)", "VL (V)"]
+
     def extract(
         self,
         measurement: pl.DataFrame,
@@ -136,26 +141,23 @@ class ITSRelaxationExtractor(MetricExtractor):
             )
             return None
 
-        # Extract data
-        time = measurement["t (s)"].to_numpy()
-        current = measurement["I (A)"].to_numpy()
-        vl = measurement["VL (V)"].to_numpy()
-
-        # Identify LED states
-        led_on_mask = vl > self.vl_threshold
-        led_off_mask = ~led_on_mask
+        # Extract data and LED states (shared with the other ITS extractors)
+        data = segmented(measurement, metadata)
+        time = data.column("t (s)")
+        current = data.column("I (A)")
+        segmentation = data.segmentation(self.vl_threshold)
 
         # Try fitting based on configuration
         if self.fit_segment == "light":
-            return self._fit_light_segment(time, current, vl, led_on_mask, metadata)
+            return self._fit_light_segment(time, current, segmentation, metadata)
         elif self.fit_segment == "dark":
-            return self._fit_dark_segment(time, current, vl, led_off_mask, metadata)
+            return self._fit_dark_segment(time, current, segmentation, metadata)
         elif self.fit_segment == "both":
             # Try light first, then dark if light fails
-            light_metric = self._fit_light_segment(time, current, vl, led_on_mask, metadata)
+            light_metric = self._fit_light_segment(time, current, segmentation, metadata)
             if light_metric is not None:
                 return light_metric
-            return self._fit_dark_segment(time, current, vl, led_off_mask, metadata)
+            return self._fit_dark_segment(time, current, segmentation, metadata)
 
         return None
 
@@ -163,8 +165,7 @@ class ITSRelaxationExtractor(MetricExtractor):
         self,
         time: np.ndarray,
         current: np.ndarray,
-        vl: np.ndarray,
-        led_on_mask: np.ndarray,
+        segmentation: LEDSegmentation,
         metadata: Dict[str, Any]
     ) -> Optional[DerivedMetric]:
         """
@@ -175,7 +176,7 @@ class ITSRelaxationExtractor(MetricExtractor):
         Optional[DerivedMetric]
             Metric for light relaxation, or None if fitting fails
         """
-        if not np.any(led_on_mask):
+        if not segmentation.has_light:
             logger.debug(
                 f"Extractor {self.metric_name} skipped: PRECONDITION_FAILED (No LED ON segment)",
                 extra={"run_id": metadata.get("run_id"), "reason": "PRECONDITION_FAILED"}
@@ -183,7 +184,7 @@ class ITSRelaxationExtractor(MetricExtractor):
             return None
 
         # Find longest continuous LED ON segment
-        led_segment = self._find_longest_led_segment(time, led_on_mask)
+        led_segment = segmentation.longest_on_run()
         if led_segment is None:
             return None
 
@@ -284,8 +285,7 @@ class ITSRelaxationExtractor(MetricExtractor):
         self,
         time: np.ndarray,
         current: np.ndarray,
-        vl: np.ndarray,
-        led_off_mask: np.ndarray,
+        segmentation: LEDSegmentation,
         metadata: Dict[str, Any]
     ) -> Optional[DerivedMetric]:
         """
@@ -299,19 +299,15 @@ class ITSRelaxationExtractor(MetricExtractor):
         Optional[DerivedMetric]
             Metric for dark relaxation, or None if fitting fails
         """
-        if not np.any(led_off_mask):
+        if segmentation.off_starts.size == 0:
             return None
 
-        # Find LED OFF→ON transitions to identify dark segments after light exposure
-        transitions = np.diff((~led_off_mask).astype(int))
-        off_edges = np.where(transitions == -1)[0] + 1  # ON→OFF transitions
-
-        if len(off_edges) == 0:
+        if segmentation.falling_edges.size == 0:
             # No LED turn-off events, try longest dark segment
-            dark_segment = self._find_longest_led_segment(time, led_off_mask)
+            dark_segment = segmentation.longest_off_run()
         else:
             # Find longest dark segment AFTER a LED OFF transition
-            dark_segment = self._find_longest_dark_after_light(time, led_off_mask, off_edges)
+            dark_segment = segmentation.longest_dark_after_light()
 
         if dark_segment is None:
             return None
@@ -393,89 +389,6 @@ class ITSRelaxationExtractor(MetricExtractor):
             flags=flags
         )
 
-    def _find_longest_dark_after_light(
-        self,
-        time: np.ndarray,
-        led_off_mask: np.ndarray,
-        off_edges: np.ndarray
-    ) -> Optional[tuple]:
-        """
-        Find the longest dark segment that immediately follows a LED ON period.
-
-        Parameters
-        ----------
-        time : np.ndarray
-            Time values
-        led_off_mask : np.ndarray
-            Boolean mask where True = LED OFF
-        off_edges : np.ndarray
-            Indices where LED transitioned from ON to OFF
-
-        Returns
-        -------
-        Optional[tuple]
-            (start_index, end_index) of longest dark segment after light, or None
-        """
-        # For each OFF edge, find the dark segment that follows
-        candidate_segments = []
-
-        for off_edge in off_edges:
-            # Start from the OFF transition
-            start_idx = off_edge
-
-            # Find how long the dark period lasts
-            # Scan forward until LED turns back on or end of data
-            end_idx = start_idx
-            while end_idx < len(led_off_mask) and led_off_mask[end_idx]:
-                end_idx += 1
-
-            # Clamp end_idx to array bounds
-            end_idx = min(end_idx, len(time))
-
-            if end_idx > start_idx:
-                duration = time[end_idx - 1] - time[start_idx]
-                candidate_segments.append((start_idx, end_idx, duration))
-
-        if not candidate_segments:
-            return None
-
-        # Return the longest segment
-        longest = max(candidate_segments, key=lambda x: x[2])  # Sort by duration
-        return (int(longest[0]), int(longest[1]))
-
-    def _find_longest_led_segment(
-        self,
-        time: np.ndarray,
-        led_on_mask: np.ndarray
-    ) -> Optional[tuple]:
-        """
-        Find the longest continuous LED ON segment.
-
-        Returns
-        -------
-        tuple or None
-            (start_index, end_index) of longest segment, or None if no segments
-        """
-        # Find transitions
-        transitions = np.diff(led_on_mask.astype(int))
-        on_edges = np.where(transitions == 1)[0] + 1  # OFF→ON
-        off_edges = np.where(transitions == -1)[0] + 1  # ON→OFF
-
-        # Handle edge cases
-        if led_on_mask[0]:
-            on_edges = np.concatenate([[0], on_edges])
-        if led_on_mask[-1]:
-            off_edges = np.concatenate([off_edges, [len(led_on_mask)]])
-
-        if len(on_edges) == 0 or len(off_edges) == 0:
-            return None
-
-        # Find longest segment
-        segment_lengths = off_edges - on_edges
-        longest_idx = np.argmax(segment_lengths)
-
-        return (int(on_edges[longest_idx]), int(off_edges[longest_idx]))
-
     def _compute_confidence(self, fit_result: dict) -> float:
         """
         Compute confidence score based on fit quality.
@@ -24,6 +24,7 @@ from typing import Any, Dict, List, Optional, Tuple
 import numpy as np
 import polars as pl
 
+from src.derived.led_segmentation import segment_led, segmented
 from src.models.derived_metrics import DerivedMetric, MetricCategory
 from .base import MetricExtractor
 
@@ -69,23 +70,13 @@ class ITSRiseFallExtractor(MetricExtractor):
     def metric_category(self) -> MetricCategory:
         return "photoresponse"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["t (s)", "I (A)", "VL (V)"]
+
     def _find_led_segment(self, vl: np.ndarray) -> Optional[Tuple[int, int]]:
         """Return (start, end) of the longest contiguous LED-ON run, or None."""
-        led_on = vl > self.vl_threshold
-        if not np.any(led_on):
-            return None
-        transitions = np.diff(led_on.astype(int))
-        on_edges = np.where(transitions == 1)[0] + 1
-        off_edges = np.where(transitions == -1)[0] + 1
-        if led_on[0]:
-            on_edges = np.concatenate([[0], on_edges])
-        if led_on[-1]:
-            off_edges = np.concatenate([off_edges, [len(led_on)]])
-        if len(on_edges) == 0 or len(off_edges) == 0:
-            return None
-        lengths = off_edges - on_edges
-        idx = int(np.argmax(lengths))
-        return int(on_edges[idx]), int(off_edges[idx])
+        return segment_led(vl, self.vl_threshold).longest_on_run()
 
     def _phase_baseline(self, i: np.ndarray, start: int, end: int) -> float:
         """Mean of the last `baseline_frac` of i[start:end] (tail mean)."""
@@ -206,11 +197,11 @@ class ITSRiseFallExtractor(MetricExtractor):
             )
             return None
 
-        t = measurement["t (s)"].to_numpy()
-        i = measurement["I (A)"].to_numpy()
-        vl = measurement["VL (V)"].to_numpy()
+        data = segmented(measurement, metadata)
+        t = data.column("t (s)")
+        i = data.column("I (A)")
 
-        seg = self._find_led_segment(vl)
+        seg = data.segmentation(self.vl_threshold).longest_on_run()
         if seg is None:
             logger.debug(
                 f"Extractor {self.metric_name} skipped: PRECONDITION_FAILED (no LED-ON segment)",
@@ -20,7 +20,8 @@ from typing import Optional, Dict, List, Any
 from datetime import datetime, timezone
 
 from src.models.derived_metrics import DerivedMetric, MetricCategory
-from src.derived.algorithms import fit_stretched_exponential
+from src.derived.algorithms import fit_stretched_exponential_batch
+from src.derived.led_segmentation import LEDSegmentation, segmented
 from .base import MetricExtractor
 
 
@@ -94,6 +95,10 @@ class ITSThreePhaseFitExtractor(MetricExtractor):
     def metric_category(self) -> MetricCategory:
         return "photoresponse"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["t (s)", "I (A)", "VL (V)"]
+
     def extract(
         self,
         measurement: pl.DataFrame,
@@ -119,46 +124,23 @@ class ITSThreePhaseFitExtractor(MetricExtractor):
         if not required_cols.issubset(measurement.columns):
             return None
 
-        # Extract data
-        time = measurement["t (s)"].to_numpy()
-        current = measurement["I (A)"].to_numpy()
-        vl = measurement["VL (V)"].to_numpy()
-
-        # Identify LED states
-        led_on_mask = vl > self.vl_threshold
+        # Extract data and LED states (shared with the other ITS extractors)
+        data = segmented(measurement, metadata)
+        time = data.column("t (s)")
+        current = data.column("I (A)")
 
         # Find phase boundaries
-        phases = self._identify_phases(time, current, vl, led_on_mask)
+        phases = self._identify_phases(time, data.segmentation(self.vl_threshold))
 
         if phases is None:
             return None
 
-        # Fit each phase
-        pre_dark_fit = None
-        light_fit = None
-        post_dark_fit = None
-        phases_fitted = []
-
-        if phases["pre_dark"] is not None:
-            pre_dark_fit = self._fit_phase(
-                time, current, phases["pre_dark"], "pre_dark"
-            )
-            if pre_dark_fit is not None:
-                phases_fitted.append("pre_dark")
-
-        if phases["light"] is not None:
-            light_fit = self._fit_phase(
-                time, current, phases["light"], "light"
-            )
-            if light_fit is not None:
-                phases_fitted.append("light")
-
-        if phases["post_dark"] is not None:
-            post_dark_fit = self._fit_phase(
-                time, current, phases["post_dark"], "post_dark"
-            )
-            if post_dark_fit is not None:
-                phases_fitted.append("post_dark")
+        # Fit all phases in one batched call
+        fits = self._fit_phases(time, current, phases)
+        pre_dark_fit = fits.get("pre_dark")
+        light_fit = fits.get("light")
+        post_dark_fit = fits.get("post_dark")
+        phases_fitted = list(fits)
 
         # Check if we have enough fits
         if self.require_all_phases and len(phases_fitted) < 3:
@@ -223,68 +205,31 @@ class ITSThreePhaseFitExtractor(MetricExtractor):
     def _identify_phases(
         self,
         time: np.ndarray,
-        current: np.ndarray,
-        vl: np.ndarray,
-        led_on_mask: np.ndarray
+        segmentation: LEDSegmentation
     ) -> Optional[Dict[str, Optional[tuple]]]:
         """
         Identify the three phases: PRE-DARK, LIGHT, POST-DARK.
 
+        The main pulse is the longest LED ON segment; PRE-DARK runs from the
+        start of the trace to it and POST-DARK from its end to the end of the
+        trace.
+
         Returns
         -------
         dict or None
             Dictionary with keys "pre_dark", "light", "post_dark"
             Each value is (start_idx, end_idx) tuple or None
         """
-        # Find LED transitions
-        transitions = np.diff(led_on_mask.astype(int))
-        on_edges = np.where(transitions == 1)[0] + 1   # OFF→ON
-        off_edges = np.where(transitions == -1)[0] + 1  # ON→OFF
-
-        # Handle edge cases
-        if led_on_mask[0]:
-            on_edges = np.concatenate([[0], on_edges])
-        if led_on_mask[-1]:
-            off_edges = np.concatenate([off_edges, [len(led_on_mask)]])
-
-        # We need at least one LED ON period
-        if len(on_edges) == 0 or len(off_edges) == 0:
+        windows = segmentation.main_pulse_windows()
+        if windows is None:
             return None
 
-        # Find the main LED ON period (assume there's one main pulse)
-        # Use the longest LED ON segment
-        if len(on_edges) > 0 and len(off_edges) > 0:
-            led_on_durations = off_edges - on_edges
-            main_pulse_idx = np.argmax(led_on_durations)
-            light_start = on_edges[main_pulse_idx]
-            light_end = off_edges[main_pulse_idx]
-        else:
-            return None
-
-        # PRE-DARK: From start to LED ON
-        if light_start > 0:
-            pre_dark = (0, light_start)
-        else:
-            pre_dark = None
-
-        # LIGHT: LED ON period
-        light = (light_start, light_end)
-
-        # POST-DARK: From LED OFF to end
-        if light_end < len(time):
-            post_dark = (light_end, len(time))
-        else:
-            post_dark = None
-
         # Validate each phase
-        phases = {
-            "pre_dark": self._validate_phase(time, pre_dark, "pre_dark"),
-            "light": self._validate_phase(time, light, "light"),
-            "post_dark": self._validate_phase(time, post_dark, "post_dark")
+        return {
+            name: self._validate_phase(time, window, name)
+            for name, window in windows.items()
         }
 
-        return phases
-
     def _validate_phase(
         self,
         time: np.ndarray,
@@ -328,46 +273,81 @@ class ITSThreePhaseFitExtractor(MetricExtractor):
 
         return phase
 
-    def _fit_phase(
+    def _fit_phases(
         self,
         time: np.ndarray,
         current: np.ndarray,
+        phases: Dict[str, Optional[tuple]]
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Fit stretched exponentials to all valid phases in one batched call.
+
+        Parameters
+        ----------
+        time : np.ndarray
+            Full time array
+        current : np.ndarray
+            Full current array
+        phases : dict
+            Phase name -> (start_idx, end_idx) or None
+
+        Returns
+        -------
+        dict
+            Phase name -> fitting results (see ``_phase_result``), in phase
+            order, for phases whose fit succeeded
+        """
+        names = [name for name, phase in phases.items() if phase is not None]
+        if not names:
+            return {}
+
+        # Each phase is reset to t=0
+        segments = [
+            (time[start:end] - time[start], current[start:end])
+            for start, end in (phases[name] for name in names)
+        ]
+        try:
+            fit_results = fit_stretched_exponential_batch(segments)
+        except Exception:
+            return {}
+
+        fits = {}
+        for name, fit_result in zip(names, fit_results):
+            result = self._phase_result(time, fit_result, phases[name], name)
+            if result is not None:
+                fits[name] = result
+        return fits
+
+    def _phase_result(
+        self,
+        time: np.ndarray,
+        fit_result: np.void,
         phase: tuple,
         phase_name: str
     ) -> Optional[Dict[str, Any]]:
         """
-        Fit stretched exponential to a single phase.
+        Build the result dictionary for a single fitted phase.
 
         Parameters
         ----------
         time : np.ndarray
             Full time array
-        current : np.ndarray
-            Full current array
+        fit_result : np.void
+            Batched fit record (``FIT_RESULT_DTYPE``)
         phase : tuple
-            (start_idx, end_idx) of phase to fit
+            (start_idx, end_idx) of the fitted phase
         phase_name : str
             Name of phase ("pre_dark", "light", "post_dark")
 
         Returns
         -------
         dict or None
-            Fitting results with tau, beta, R², etc., or None if fit fails
+            Fitting results with tau, beta, R², etc., or None if fit failed
         """
         start_idx, end_idx = phase
 
-        # Extract phase data
-        t_phase = time[start_idx:end_idx] - time[start_idx]  # Reset to t=0
-        i_phase = current[start_idx:end_idx]
-
-        # Fit stretched exponential
-        try:
-            fit_result = fit_stretched_exponential(t_phase, i_phase)
-        except Exception:
-            return None
-
         # Check fit quality
-        if not fit_result['converged'] or fit_result['r_squared'] < 0.5:
+        if not fit_result['converged'] or not fit_result['r_squared'] >= 0.5:
             return None
 
         # Extract parameters
@@ -410,7 +390,7 @@ class ITSThreePhaseFitExtractor(MetricExtractor):
 
         Parameters
         ----------
-        fit_result : dict
+        fit_result : dict or np.void
             Fitting results
         tau : float
             Fitted relaxation time
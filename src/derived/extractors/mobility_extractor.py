@@ -28,6 +28,7 @@ for the underlying derivation.
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 from datetime import datetime, timezone
@@ -54,6 +55,7 @@ from src.derived.extractors.base import (
     build_flags,
     compute_confidence,
 )
+from src.derived.led_segmentation import segmented
 from src.models.derived_metrics import DerivedMetric
 
 logger = logging.getLogger(__name__)
@@ -63,6 +65,14 @@ _VALID_BRANCHES = ("holes", "electrons")
 _VALID_DIRECTIONS = ("forward", "backward", "average")
 
 
+def _file_digest(path: Path) -> Optional[str]:
+    """Short SHA-256 of a file's bytes (None if it cannot be read)."""
+    try:
+        return hashlib.sha256(Path(path).read_bytes()).hexdigest()[:16]
+    except OSError:
+        return None
+
+
 class MobilityExtractor(MetricExtractor):
     """Peak-gm field-effect mobility on one (branch, direction) of an IVg sweep.
 
@@ -109,6 +119,14 @@ class MobilityExtractor(MetricExtractor):
         self.saturation_heavy_threshold = saturation_heavy_threshold
         self.full_range_frac = full_range_frac
         self._encap: EncapConfig = load_encap_config(encap_yaml_path)
+        self._encap_digest = _file_digest(encap_yaml_path)
+
+    def fingerprint_params(self) -> Dict[str, Any]:
+        # The path does not change when the YAML is edited: also hash the
+        # contents C_ox and L/W were loaded from
+        params = super().fingerprint_params()
+        params["encap_yaml_sha256"] = self._encap_digest
+        return params
 
     # ── Required base-class properties ─────────────────────────────────
 
@@ -126,6 +144,10 @@ class MobilityExtractor(MetricExtractor):
     def metric_category(self) -> str:
         return "electrical"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["Vg (V)", "I (A)"]
+
     # ── Extraction ─────────────────────────────────────────────────────
 
     def extract(
@@ -167,10 +189,13 @@ class MobilityExtractor(MetricExtractor):
             )
             return None
 
-        vg = measurement["Vg (V)"].to_numpy()
-        i = measurement["I (A)"].to_numpy()
+        shared = segmented(measurement, metadata)
+        vg = shared.column("Vg (V)")
+        i = shared.column("I (A)")
 
-        legs = split_full_range_legs(vg, i, full_range_frac=self.full_range_frac)
+        legs = split_full_range_legs(
+            vg, i, full_range_frac=self.full_range_frac, legs=shared.sweep_legs()
+        )
         if not legs:
             logger.warning(
                 f"{self.metric_name} skipped: SWEEP_NOT_LOOPED "
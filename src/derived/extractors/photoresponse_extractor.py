@@ -13,6 +13,7 @@ import json
 from typing import Optional, Dict, List, Any
 from datetime import datetime, timezone
 
+from src.derived.led_segmentation import LEDSegmentation, segmented
 from src.models.derived_metrics import DerivedMetric, MetricCategory
 from .base import MetricExtractor
 import logging
@@ -75,6 +76,10 @@ class PhotoresponseExtractor(MetricExtractor):
         """Category of this metric."""
         return "photoresponse"
 
+    @property
+    def required_columns(self) -> List[str]:
+        return ["t (s)", "I (A)", "VDS (V)", "VL (V)"]
+
     def extract(
         self,
         measurement: pl.DataFrame,
@@ -105,7 +110,7 @@ class PhotoresponseExtractor(MetricExtractor):
             )
             return None
 
-        vl = measurement["VL (V)"].to_numpy()
+        data = segmented(measurement, metadata)
 
         # Determine measured quantity based on procedure
         if procedure in ["It", "ITt"]:
@@ -117,7 +122,7 @@ class PhotoresponseExtractor(MetricExtractor):
                 )
                 return None
 
-            measured_values = measurement["I (A)"].to_numpy()
+            measured_values = data.column("I (A)")
             metric_name = "delta_current"
             unit = "A"
 
@@ -130,14 +135,15 @@ class PhotoresponseExtractor(MetricExtractor):
                 )
                 return None
 
-            measured_values = measurement["VDS (V)"].to_numpy()
+            measured_values = data.column("VDS (V)")
             metric_name = "delta_voltage"
             unit = "V"
         else:
             return None
 
-        # Identify LED states
-        led_on_mask = vl > self.vl_threshold
+        # Identify LED states (shared with the other ITS extractors)
+        segmentation = data.segmentation(self.vl_threshold)
+        led_on_mask = segmentation.led_on
         led_off_mask = ~led_on_mask
 
         # Check we have enough samples in each state
@@ -162,12 +168,12 @@ class PhotoresponseExtractor(MetricExtractor):
         std_off = np.std(values_off)
 
         # Analyze LED cycles to assess consistency
-        cycle_analysis = self._analyze_cycles(vl, measured_values, led_on_mask)
+        cycle_analysis = self._analyze_cycles(measured_values, segmentation)
 
         # Calculate photoresponse using cycle-based approach to handle drift
         # This compares adjacent ON/OFF periods rather than global means
         delta = self._calculate_photoresponse_from_cycles(
-            measured_values, led_on_mask, cycle_analysis
+            measured_values, segmentation, cycle_analysis
         )
 
         # Calculate response ratio (fractional change)
@@ -212,7 +218,7 @@ class PhotoresponseExtractor(MetricExtractor):
     def _calculate_photoresponse_from_cycles(
         self,
         values: np.ndarray,
-        led_on_mask: np.ndarray,
+        segmentation: LEDSegmentation,
         cycle_analysis: Dict[str, Any]
     ) -> float:
         """
@@ -229,8 +235,8 @@ class PhotoresponseExtractor(MetricExtractor):
         ----------
         values : np.ndarray
             Measured values (current or voltage)
-        led_on_mask : np.ndarray
-            Boolean mask for LED ON state (VL > threshold)
+        segmentation : LEDSegmentation
+            LED ON/OFF runs of the measurement (VL > threshold)
         cycle_analysis : dict
             Cycle analysis from _analyze_cycles (not used in simple method)
 
@@ -239,16 +245,13 @@ class PhotoresponseExtractor(MetricExtractor):
         float
             Photoresponse (last_ON - first_ON) in same units as values
         """
-        # Find indices where LED is ON
-        on_indices = np.where(led_on_mask)[0]
-
-        if len(on_indices) == 0:
+        if not segmentation.has_light:
             # No LED ON period detected - return 0
             return 0.0
 
         # Get first and last points of LED ON interval
-        first_on_idx = on_indices[0]
-        last_on_idx = on_indices[-1]
+        first_on_idx = segmentation.on_starts[0]
+        last_on_idx = segmentation.on_ends[-1] - 1
 
         # Photoresponse = difference between last and first ON points
         i_first = values[first_on_idx]
@@ -260,9 +263,8 @@ class PhotoresponseExtractor(MetricExtractor):
 
     def _analyze_cycles(
         self,
-        vl: np.ndarray,
         values: np.ndarray,
-        led_on_mask: np.ndarray
+        segmentation: LEDSegmentation
     ) -> Dict[str, Any]:
         """
         Analyze individual LED ON/OFF cycles for consistency.
@@ -272,10 +274,9 @@ class PhotoresponseExtractor(MetricExtractor):
         - cycle_deltas: ΔI or ΔV for each cycle
         - delta_consistency: Std dev of cycle deltas
         """
-        # Find transitions
-        transitions = np.diff(led_on_mask.astype(int))
-        on_starts = np.where(transitions == 1)[0] + 1
-        off_starts = np.where(transitions == -1)[0] + 1
+        # Transitions (OFF→ON and ON→OFF), excluding the trace boundaries
+        on_starts = segmentation.rising_edges
+        off_starts = segmentation.falling_edges
 
         # Count cycles (a cycle = one ON period + one OFF period)
         n_cycles = min(len(on_starts), len(off_starts))
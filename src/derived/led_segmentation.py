@@ -0,0 +1,281 @@
+"""
+Shared LED phase segmentation for time-series (It / ITt / ITS / Vt) extractors.
+
+Every ITS extractor needs the same preliminaries: convert ``t (s)``, ``I (A)``
+and ``VL (V)`` to NumPy and find where the LED switches on and off. This
+module does that once per measurement. ``MetricPipeline`` attaches a
+:class:`SegmentedMeasurement` to the metadata dict before running the
+extractors; each extractor asks for it with :func:`segmented`, which falls
+back to building one on the fly when an extractor is called directly.
+
+Examples
+--------
+>>> seg = segmented(measurement, metadata).segmentation(vl_threshold=0.1)
+>>> seg.longest_on_run()
+(120, 480)
+>>> seg.main_pulse_windows()
+{'pre_dark': (0, 120), 'light': (120, 480), 'post_dark': (480, 900)}
+>>> seg.phases.columns
+['led_on', 'start', 'end', 'n_points', 't_start', 't_end', 'vl_mean']
+
+The same per-measurement cache also holds the gate-sweep leg geometry used
+by the IVg/VVg extractors (:meth:`SegmentedMeasurement.sweep_legs`).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+import polars as pl
+
+from src.derived.sweep_legs import VG_COLUMN, SweepLegs
+
+# Metadata key under which MetricPipeline stores the per-measurement cache
+SEGMENTATION_KEY = "_segmented_measurement"
+
+TIME_COLUMN = "t (s)"
+VL_COLUMN = "VL (V)"
+
+Window = Tuple[int, int]
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start and (exclusive) end indices of the True runs of ``mask``."""
+    if mask.size == 0:
+        empty = np.empty(0, dtype=np.int64)
+        return empty, empty
+    padded = np.concatenate(([False], mask, [False])).astype(np.int8)
+    edges = np.diff(padded)
+    return np.flatnonzero(edges == 1), np.flatnonzero(edges == -1)
+
+
+class LEDSegmentation:
+    """
+    LED ON/OFF segmentation of one measurement at a given threshold.
+
+    Runs are half-open ``[start, end)`` index windows; ties between equally
+    long runs resolve to the earliest one.
+
+    Parameters
+    ----------
+    vl : np.ndarray
+        LED voltage per sample
+    vl_threshold : float
+        ``VL > vl_threshold`` means LED ON
+    time : np.ndarray, optional
+        Sample times, used for the phase table and duration-based selection
+
+    Attributes
+    ----------
+    led_on : np.ndarray
+        Boolean LED-ON mask
+    rising_edges : np.ndarray
+        Indices of OFF→ON transitions (first ON sample), excluding sample 0
+    falling_edges : np.ndarray
+        Indices of ON→OFF transitions (first OFF sample)
+    on_starts, on_ends : np.ndarray
+        LED-ON runs, including runs touching either end of the trace
+    off_starts, off_ends : np.ndarray
+        LED-OFF runs, including runs touching either end of the trace
+    """
+
+    def __init__(self, vl: np.ndarray, vl_threshold: float, time: Optional[np.ndarray] = None):
+        self.vl = vl
+        self.vl_threshold = vl_threshold
+        self.time = time
+        self.n_samples = len(vl)
+        self.led_on = vl > vl_threshold
+
+        transitions = np.diff(self.led_on.astype(np.int8))
+        self.rising_edges = np.flatnonzero(transitions == 1) + 1
+        self.falling_edges = np.flatnonzero(transitions == -1) + 1
+
+        self.on_starts, self.on_ends = _runs(self.led_on)
+        self.off_starts, self.off_ends = _runs(~self.led_on)
+        self._phases: Optional[pl.DataFrame] = None
+
+    @property
+    def has_light(self) -> bool:
+        """True if the LED is ON for at least one sample."""
+        return self.on_starts.size > 0
+
+    @property
+    def phases(self) -> pl.DataFrame:
+        """
+        Compact phase table, one row per contiguous LED state.
+
+        Columns: ``led_on``, ``start``, ``end`` (exclusive), ``n_points``,
+        ``t_start``, ``t_end`` (time of the last sample; null without a time
+        axis) and ``vl_mean``.
+        """
+        if self._phases is None:
+            starts = np.concatenate((self.on_starts, self.off_starts))
+            ends = np.concatenate((self.on_ends, self.off_ends))
+            led_on = np.concatenate((
+                np.ones(self.on_starts.size, dtype=bool),
+                np.zeros(self.off_starts.size, dtype=bool),
+            ))
+            order = np.argsort(starts, kind="stable")
+            starts, ends, led_on = starts[order], ends[order], led_on[order]
+
+            if starts.size:
+                vl_mean = np.add.reduceat(self.vl.astype(np.float64), starts) / (ends - starts)
+            else:
+                vl_mean = np.empty(0, dtype=np.float64)
+            if self.time is not None and starts.size:
+                t_start, t_end = self.time[starts], self.time[ends - 1]
+            else:
+                t_start = t_end = [None] * starts.size
+
+            self._phases = pl.DataFrame({
+                "led_on": led_on,
+                "start": starts.astype(np.int64),
+                "end": ends.astype(np.int64),
+                "n_points": (ends - starts).astype(np.int64),
+                "t_start": pl.Series(t_start, dtype=pl.Float64),
+                "t_end": pl.Series(t_end, dtype=pl.Float64),
+                "vl_mean": vl_mean,
+            })
+        return self._phases
+
+    def longest_on_run(self) -> Optional[Window]:
+        """Longest LED-ON run by sample count, or None if the LED never turns on."""
+        return self._longest(self.on_starts, self.on_ends)
+
+    def longest_off_run(self) -> Optional[Window]:
+        """Longest LED-OFF run by sample count, or None if the LED is always on."""
+        return self._longest(self.off_starts, self.off_ends)
+
+    def longest_dark_after_light(self) -> Optional[Window]:
+        """
+        Longest (by duration) LED-OFF run that directly follows an LED-ON run.
+
+        Requires a time axis; returns None if there is no ON→OFF transition.
+        """
+        after_light = self.off_starts > 0
+        if self.time is None or not np.any(after_light):
+            return None
+        starts = self.off_starts[after_light]
+        ends = self.off_ends[after_light]
+        durations = self.time[ends - 1] - self.time[starts]
+        k = int(np.argmax(durations))
+        return int(starts[k]), int(ends[k])
+
+    def main_pulse_windows(self) -> Optional[Dict[str, Optional[Window]]]:
+        """
+        Pre-dark / light / post-dark windows around the longest LED-ON run.
+
+        Returns
+        -------
+        dict or None
+            ``{"pre_dark", "light", "post_dark"}`` -> ``(start, end)`` or None
+            when that phase is empty; None if the LED never turns on
+        """
+        light = self.longest_on_run()
+        if light is None:
+            return None
+        start, end = light
+        return {
+            "pre_dark": (0, start) if start > 0 else None,
+            "light": light,
+            "post_dark": (end, self.n_samples) if end < self.n_samples else None,
+        }
+
+    @staticmethod
+    def _longest(starts: np.ndarray, ends: np.ndarray) -> Optional[Window]:
+        if starts.size == 0:
+            return None
+        k = int(np.argmax(ends - starts))
+        return int(starts[k]), int(ends[k])
+
+
+def segment_led(
+    vl: np.ndarray,
+    vl_threshold: float = 0.1,
+    time: Optional[np.ndarray] = None,
+) -> LEDSegmentation:
+    """
+    Segment an LED voltage trace into ON/OFF runs.
+
+    Parameters
+    ----------
+    vl : np.ndarray
+        LED voltage per sample
+    vl_threshold : float
+        ``VL > vl_threshold`` means LED ON (default: 0.1 V)
+    time : np.ndarray, optional
+        Sample times
+
+    Returns
+    -------
+    LEDSegmentation
+    """
+    return LEDSegmentation(np.asarray(vl), vl_threshold, time)
+
+
+class SegmentedMeasurement:
+    """
+    Per-measurement cache of NumPy columns, LED segmentations and sweep legs.
+
+    Column arrays are converted once and marked read-only since they are
+    shared by every extractor that runs on the measurement.
+
+    Parameters
+    ----------
+    measurement : pl.DataFrame
+        Staged measurement data
+    """
+
+    def __init__(self, measurement: pl.DataFrame):
+        self.measurement = measurement
+        self._columns: Dict[str, np.ndarray] = {}
+        self._segmentations: Dict[float, LEDSegmentation] = {}
+        self._sweep_legs: Dict[str, SweepLegs] = {}
+
+    def column(self, name: str) -> Optional[np.ndarray]:
+        """``measurement[name]`` as a read-only NumPy array, or None if absent."""
+        array = self._columns.get(name)
+        if array is None:
+            if name not in self.measurement.columns:
+                return None
+            array = self.measurement[name].to_numpy()
+            if array.flags.writeable:
+                array.setflags(write=False)
+            self._columns[name] = array
+        return array
+
+    def segmentation(self, vl_threshold: float = 0.1) -> Optional[LEDSegmentation]:
+        """LED segmentation at ``vl_threshold``, or None without a ``VL (V)`` column."""
+        seg = self._segmentations.get(vl_threshold)
+        if seg is None:
+            vl = self.column(VL_COLUMN)
+            if vl is None:
+                return None
+            seg = LEDSegmentation(vl, vl_threshold, self.column(TIME_COLUMN))
+            self._segmentations[vl_threshold] = seg
+        return seg
+
+    def sweep_legs(self, vg_column: str = VG_COLUMN) -> Optional[SweepLegs]:
+        """Leg geometry of the ``vg_column`` trace, or None if the column is absent."""
+        legs = self._sweep_legs.get(vg_column)
+        if legs is None:
+            vg = self.column(vg_column)
+            if vg is None:
+                return None
+            legs = SweepLegs(vg)
+            self._sweep_legs[vg_column] = legs
+        return legs
+
+
+def segmented(measurement: pl.DataFrame, metadata: Dict[str, Any]) -> SegmentedMeasurement:
+    """
+    Shared :class:`SegmentedMeasurement` for ``measurement``.
+
+    Returns the instance the pipeline attached to ``metadata`` when it
+    belongs to this exact DataFrame, otherwise a fresh (unshared) one.
+    """
+    cached = metadata.get(SEGMENTATION_KEY)
+    if isinstance(cached, SegmentedMeasurement) and cached.measurement is measurement:
+        return cached
+    return SegmentedMeasurement(measurement)
@@ -0,0 +1,268 @@
+"""
+run_id-keyed metric lookup for plot-time overlays.
+
+Plots that overlay a metric (CNP markers on IVg/VVg sweeps, ΔI in the
+photoresponse plot) used to re-run the extractor on every measurement each
+time they were drawn, although ``derive-all-metrics`` had usually stored the
+same value already. :class:`MetricLookup` answers in this order:
+
+1. the metrics store (``_metrics/dataset`` and legacy ``metrics.parquet``),
+   loaded once per metric name and process;
+2. the plot memo (``_metrics/_plot_memo/memo-*.parquet``): values a plot had
+   to extract itself in an earlier session;
+3. the history row, when an enriched chip history carries a column named
+   after the metric (scalar only, no ``value_json``);
+4. on-demand extraction, whose result is kept in memory and written to the
+   plot memo on :meth:`MetricLookup.flush`.
+
+Store values always win over memo values, so re-running the derive step
+supersedes anything a plot computed. The memo is a cache: deleting
+``_plot_memo`` is always safe.
+
+Example:
+    >>> lookup = get_metric_lookup()
+    >>> value = lookup.get_or_extract(run_id, "cnp_voltage", extract_cnp)
+    >>> value.value_float, value.source
+    (0.42, 'store')
+    >>> lookup.flush()
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import polars as pl
+
+from src.core.stage_raw_measurements import atomic_write_parquet
+from src.derived.metrics_store import scan_metrics
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_METRICS_DIR = Path("data/03_derived/_metrics")
+PLOT_MEMO_DIRNAME = "_plot_memo"
+
+# Bump when a plot's on-the-fly extraction changes definition; memos from
+# older generations live in sibling v<N> directories and are ignored
+MEMO_VERSION = 2
+
+# Memo part files are folded into one once there are more than this many
+MEMO_COMPACT_THRESHOLD = 32
+
+MEMO_SCHEMA = {
+    "run_id": pl.Utf8,
+    "metric_name": pl.Utf8,
+    "value_float": pl.Float64,
+    "value_json": pl.Utf8,
+    "memoized_at": pl.Datetime("us", "UTC"),
+}
+
+
+@dataclass(frozen=True)
+class MetricValue:
+    """
+    A metric value and where it came from.
+
+    Attributes:
+        value_float: Scalar value (None if the metric only has JSON)
+        value_json: JSON payload (e.g. all detected CNPs), if known
+        source: ``"store"``, ``"memo"``, ``"history"`` or ``"extracted"``
+    """
+    value_float: Optional[float]
+    value_json: Optional[str] = None
+    source: str = "extracted"
+
+
+class MetricLookup:
+    """
+    Process-local metric lookup over the metrics store and the plot memo.
+
+    Args:
+        metrics_dir: The ``_metrics`` directory
+    """
+
+    def __init__(self, metrics_dir: Path = DEFAULT_METRICS_DIR):
+        self.metrics_dir = Path(metrics_dir)
+        self.memo_dir = self.metrics_dir / PLOT_MEMO_DIRNAME / f"v{MEMO_VERSION}"
+        self._store: Dict[str, Dict[str, Tuple[Optional[float], Optional[str]]]] = {}
+        self._memo: Optional[Dict[Tuple[str, str], Tuple[Optional[float], Optional[str]]]] = None
+        self._pending: List[dict] = []
+        # Extractions that produced nothing this session (not persisted)
+        self._failed: set = set()
+        self._lock = threading.Lock()
+
+    # ── sources ─────────────────────────────────────────────────────────
+
+    def _store_values(self, metric_name: str) -> Dict[str, Tuple[Optional[float], Optional[str]]]:
+        values = self._store.get(metric_name)
+        if values is None:
+            try:
+                df = (
+                    scan_metrics(self.metrics_dir, metric_names=[metric_name])
+                    .select("run_id", "value_float", "value_json")
+                    .collect()
+                )
+                values = {
+                    rid: (vf, vj)
+                    for rid, vf, vj in zip(
+                        df["run_id"].to_list(), df["value_float"].to_list(), df["value_json"].to_list()
+                    )
+                }
+            except Exception as e:
+                logger.warning(f"Could not read {metric_name} from {self.metrics_dir}: {e}")
+                values = {}
+            self._store[metric_name] = values
+        return values
+
+    def _memo_values(self) -> Dict[Tuple[str, str], Tuple[Optional[float], Optional[str]]]:
+        if self._memo is None:
+            self._memo = {}
+            files = sorted(self.memo_dir.glob("memo-*.parquet")) if self.memo_dir.exists() else []
+            if files:
+                try:
+                    # File names sort in write order: later rows win
+                    df = pl.concat([pl.read_parquet(f) for f in files], how="vertical_relaxed")
+                    for rid, name, vf, vj in df.select(
+                        "run_id", "metric_name", "value_float", "value_json"
+                    ).iter_rows():
+                        self._memo[(rid, name)] = (vf, vj)
+                except Exception as e:
+                    logger.warning(f"Ignoring unreadable plot memo in {self.memo_dir}: {e}")
+        return self._memo
+
+    # ── queries ─────────────────────────────────────────────────────────
+
+    def get(self, run_id: str, metric_name: str) -> Optional[MetricValue]:
+        """
+        Stored or memoized value of ``metric_name`` for ``run_id``.
+
+        Returns:
+            MetricValue, or None if neither the store nor the memo has it
+        """
+        with self._lock:
+            hit = self._store_values(metric_name).get(run_id)
+            if hit is not None:
+                return MetricValue(hit[0], hit[1], "store")
+            hit = self._memo_values().get((run_id, metric_name))
+            if hit is not None:
+                return MetricValue(hit[0], hit[1], "memo")
+        return None
+
+    def get_or_extract(
+        self,
+        run_id: str,
+        metric_name: str,
+        extract: Callable[[], Optional[MetricValue]],
+        history_row: Optional[Mapping[str, Any]] = None,
+    ) -> Optional[MetricValue]:
+        """
+        Look ``metric_name`` up, extracting (and memoizing) it only if unknown.
+
+        Args:
+            run_id: Measurement id
+            metric_name: Metric name as stored by the extractors
+            extract: Computes the value when no source has it (may return None)
+            history_row: Chip-history row; an enriched history's
+                ``metric_name`` column is used before extracting
+
+        Returns:
+            MetricValue, or None if the metric cannot be obtained
+        """
+        value = self.get(run_id, metric_name)
+        if value is not None:
+            return value
+
+        if history_row is not None and history_row.get(metric_name) is not None:
+            try:
+                return MetricValue(float(history_row[metric_name]), None, "history")
+            except (TypeError, ValueError):
+                pass
+
+        key = (run_id, metric_name)
+        if key in self._failed:
+            return None
+        value = extract()
+        if value is None or (value.value_float is None and value.value_json is None):
+            self._failed.add(key)
+            return None
+
+        with self._lock:
+            self._memo_values()[key] = (value.value_float, value.value_json)
+            self._pending.append({
+                "run_id": run_id,
+                "metric_name": metric_name,
+                "value_float": value.value_float,
+                "value_json": value.value_json,
+                "memoized_at": datetime.now(timezone.utc),
+            })
+        return MetricValue(value.value_float, value.value_json, "extracted")
+
+    # ── persistence ─────────────────────────────────────────────────────
+
+    def flush(self) -> int:
+        """
+        Write values extracted since the last flush to the plot memo.
+
+        Returns:
+            Number of memoized values written
+        """
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if not pending:
+            return 0
+        try:
+            out = self.memo_dir / f"memo-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+            atomic_write_parquet(pl.DataFrame(pending, schema=MEMO_SCHEMA), out)
+            self._compact_memo()
+        except Exception as e:
+            logger.warning(f"Could not write plot memo to {self.memo_dir}: {e}")
+            return 0
+        return len(pending)
+
+    def _compact_memo(self) -> None:
+        files = sorted(self.memo_dir.glob("memo-*.parquet"))
+        if len(files) <= MEMO_COMPACT_THRESHOLD:
+            return
+        df = (
+            pl.concat([pl.read_parquet(f) for f in files], how="vertical_relaxed")
+            .unique(subset=["run_id", "metric_name"], keep="last", maintain_order=True)
+        )
+        # The compacted file sorts after the parts it replaces
+        atomic_write_parquet(
+            df, self.memo_dir / f"memo-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+        )
+        for f in files:
+            f.unlink(missing_ok=True)
+
+
+_LOOKUPS: Dict[Path, MetricLookup] = {}
+_LOOKUPS_LOCK = threading.Lock()
+
+
+def get_metric_lookup(metrics_dir: Optional[Path] = None) -> MetricLookup:
+    """Process-wide :class:`MetricLookup` for ``metrics_dir`` (default location if None)."""
+    path = Path(metrics_dir) if metrics_dir is not None else DEFAULT_METRICS_DIR
+    with _LOOKUPS_LOCK:
+        lookup = _LOOKUPS.get(path)
+        if lookup is None:
+            lookup = _LOOKUPS[path] = MetricLookup(path)
+        return lookup
+
+
+def clear_metric_lookup_cache() -> None:
+    """
+    Drop process-wide lookups (unflushed values are written first).
+
+    Called after the metrics store changes so the next lookup reloads it.
+    """
+    with _LOOKUPS_LOCK:
+        lookups = list(_LOOKUPS.values())
+        _LOOKUPS.clear()
+    for lookup in lookups:
+        lookup.flush()
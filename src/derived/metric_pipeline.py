@@ -4,39 +4,55 @@ Metric pipeline for extracting derived analytical results from staged measuremen
 This module orchestrates the extraction of metrics like CNP, photoresponse,
 mobility, etc. from staged Parquet files using registered MetricExtractor instances.
 
-Performance Optimization
-------------------------
-v3.5.0 (2025-01-22):
-
-**Uses sequential processing exclusively** (benchmarked 2-10x faster than parallel).
-
-Benchmark results comparing sequential vs parallel (IVg procedure):
-- Small (38 pairs):    Sequential 0.20s  vs  Parallel 2.05s  →  10x faster
-- Medium (124 pairs):  Sequential 0.54s  vs  Parallel 2.13s  →  4x faster
-- Large (293 pairs):   Sequential 1.32s  vs  Parallel 2.31s  →  1.8x faster
-
-Why sequential wins:
-- Fast Parquet I/O (~0.004s per measurement)
-- Lightweight extraction (not CPU bound)
-- Parallel overhead (~2s) exceeds any parallel benefit
-
-See BENCHMARK_RESULTS_PAIRWISE.md for full analysis.
+Execution Model
+---------------
+Single-measurement extraction runs sequentially in-process, or (with
+``parallel=True``) on a pool of long-lived spawned workers. Manifest rows
+are grouped by procedure and date into chunks of at most
+``DEFAULT_CHUNK_SIZE`` measurements; each worker builds its pipeline and
+warms the Numba kernels once, then returns every chunk's metrics as one
+Arrow IPC buffer.
+
+Pairwise extraction walks each (chip, procedure) chain once with a sliding
+two-measurement window, so every measurement is read once instead of twice,
+and batchable extractors interpolate the whole chain in one Numba call.
+Parallelism is across chains (never per pair), and only for runs of at
+least ``PAIRWISE_PARALLEL_MIN_PAIRS`` pairs: per-pair tasks were 2-10x
+slower than sequential because the ~2 s pool start-up dwarfed the
+millisecond-scale work (see BENCHMARK_RESULTS_PAIRWISE.md).
 """
 
 from __future__ import annotations
 
 import polars as pl
 from pathlib import Path
-from typing import List, Optional, Dict, Any, Tuple
+from typing import TYPE_CHECKING, List, Optional, Dict, Any, Tuple
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime, timezone
+import io
 import logging
 import multiprocessing
+import os
+import time
 
+from src.core.manifest_index import read_manifest
 from src.core.utils import read_measurement_parquet
 from src.models.derived_metrics import DerivedMetric
 from src.derived.extractors.base import MetricExtractor
 from src.derived.extractors.base_pairwise import PairwiseMetricExtractor
+from src.derived.led_segmentation import SEGMENTATION_KEY, SegmentedMeasurement
+from src.derived.metric_lookup import clear_metric_lookup_cache
+from src.derived.metrics_store import (
+    ExtractionLedger,
+    append_metrics,
+    empty_metrics_frame,
+    metrics_exist,
+    metrics_to_frame,
+    scan_metrics,
+)
+
+if TYPE_CHECKING:
+    from src.derived.algorithms.numba_cache import WarmupReport
 
 # Configure logging
 logger = logging.getLogger(__name__)
@@ -64,6 +80,165 @@ def _reset_process_globals():
         pass
 
 
+# Per-worker state, set once by _init_worker
+_WORKER_PIPELINE: Optional["MetricPipeline"] = None
+# Warm-up report of this worker, handed back with its first task
+_WORKER_WARMUP: Optional["WarmupReport"] = None
+
+# Upper bound on measurements per task; smaller for small runs so every
+# worker gets several tasks
+DEFAULT_CHUNK_SIZE = 32
+
+# Pairwise chains run in worker processes only above this many pairs:
+# below it the spawn + warm-up cost (~2 s) exceeds the sequential time
+PAIRWISE_PARALLEL_MIN_PAIRS = 1000
+
+
+def column_projection(extractors: List[Any]) -> Optional[List[str]]:
+    """
+    Data columns needed by a set of extractors.
+
+    Parameters
+    ----------
+    extractors : List[MetricExtractor | PairwiseMetricExtractor]
+        Extractors that will run on the same measurement
+
+    Returns
+    -------
+    Optional[List[str]]
+        Sorted union of their ``required_columns``, or None (read every
+        column) if any extractor does not declare its columns
+    """
+    needed: set = set()
+    for extractor in extractors:
+        columns = extractor.required_columns
+        if columns is None:
+            return None
+        needed.update(columns)
+    return sorted(needed)
+
+
+def _init_worker(pipeline: "MetricPipeline"):
+    """
+    Initialize a spawned extraction worker.
+
+    The pipeline (with its extractor set) is unpickled once per worker
+    instead of once per task. Every Numba kernel is then loaded from the
+    on-disk cache (compiling on a cold cache) before the first task, so JIT
+    cost is measured separately from extraction.
+    """
+    global _WORKER_PIPELINE, _WORKER_WARMUP
+    _reset_process_globals()
+    _WORKER_PIPELINE = pipeline
+    try:
+        from src.derived.algorithms.numba_cache import warmup
+        _WORKER_WARMUP = warmup()
+    except Exception as e:
+        logger.warning(f"Numba warm-up failed in worker {os.getpid()}: {e}")
+
+
+def _extract_chunk(
+    rows: pl.DataFrame,
+    pending: Optional[Dict[str, List[str]]],
+) -> Tuple[bytes, Dict[str, List[str]], Dict[str, str], int, float, Optional["WarmupReport"]]:
+    """
+    Run the worker's pipeline on a chunk of manifest rows.
+
+    Returns
+    -------
+    Tuple
+        Metrics as an Arrow IPC stream (metrics schema), completed metric
+        names per run_id, errors per run_id, worker pid, extraction time and
+        the worker's warm-up report (first task only)
+    """
+    global _WORKER_WARMUP
+    warmup_report, _WORKER_WARMUP = _WORKER_WARMUP, None
+    start = time.perf_counter()
+
+    metrics: List[DerivedMetric] = []
+    done: Dict[str, List[str]] = {}
+    errors: Dict[str, str] = {}
+    for row in rows.iter_rows(named=True):
+        run_id = row["run_id"]
+        try:
+            row_metrics, row_done = _WORKER_PIPELINE._extract_cells(
+                row, pending.get(run_id) if pending is not None else None
+            )
+        except Exception as e:
+            errors[run_id] = str(e)
+            continue
+        metrics.extend(row_metrics)
+        done[run_id] = row_done
+
+    buffer = io.BytesIO()
+    metrics_to_frame(metrics).write_ipc_stream(buffer)
+    return buffer.getvalue(), done, errors, os.getpid(), time.perf_counter() - start, warmup_report
+
+
+def _plan_names(plan: List[Tuple[int, List[Any]]]) -> List[Tuple[int, List[str]]]:
+    """Pair plan with extractors replaced by their metric names (for pickling)."""
+    return [(i, [ext.metric_name for ext in extractors]) for i, extractors in plan]
+
+
+def _extract_chain_task(
+    proc: str,
+    rows: List[Dict[str, Any]],
+    plan: List[Tuple[int, List[str]]],
+) -> Tuple[bytes, List[Tuple[str, str, str]]]:
+    """
+    Run the worker's pipeline along one pairwise chain.
+
+    Returns
+    -------
+    Tuple
+        Metrics as an Arrow IPC stream (metrics schema) and the ledger marks
+    """
+    by_name = {ext.metric_name: ext for ext in _WORKER_PIPELINE.pairwise_extractor_map[proc]}
+    resolved = [(i, [by_name[name] for name in names]) for i, names in plan]
+    metrics, done = _WORKER_PIPELINE._extract_chain(proc, rows, resolved)
+    buffer = io.BytesIO()
+    metrics_to_frame(metrics).write_ipc_stream(buffer)
+    return buffer.getvalue(), done
+
+
+def _plan_chunks(manifest: pl.DataFrame, chunk_size: int) -> List[pl.DataFrame]:
+    """
+    Split manifest rows into tasks of at most ``chunk_size`` measurements.
+
+    Rows are grouped by procedure and date, so a task runs a single
+    extractor set over files that sit together in the staged layout.
+    """
+    if "date_local" in manifest.columns:
+        date = pl.col("date_local").cast(pl.Utf8)
+    else:
+        date = pl.lit(None, dtype=pl.Utf8)
+    keyed = manifest.with_columns(date.alias("__date"))
+
+    chunks = []
+    for group in keyed.partition_by(["proc", "__date"], maintain_order=True):
+        group = group.drop("__date")
+        for offset in range(0, group.height, chunk_size):
+            chunks.append(group.slice(offset, chunk_size))
+    return chunks
+
+
+def _log_worker_timings(timings: Dict[int, Dict[str, Any]]) -> None:
+    """Log JIT (warm-up) versus extraction time per worker process."""
+    for pid, stats in sorted(timings.items()):
+        report = stats["warmup"]
+        if report is not None:
+            jit = (
+                f"JIT {report.jit_seconds:.2f}s "
+                f"({report.cache_hits} cached, {report.cache_misses} compiled)"
+            )
+        else:
+            jit = "JIT n/a"
+        logger.info(
+            f"Worker {pid}: {jit}, compute {stats['compute']:.2f}s "
+            f"over {stats['measurements']} measurements"
+        )
+
+
 # ══════════════════════════════════════════════════════════════════════
 # Pipeline Orchestration
 # ══════════════════════════════════════════════════════════════════════
@@ -80,7 +255,7 @@ class MetricPipeline:
        - Runs applicable extractors
        - Validates results
        - Collects metrics
-    4. Saves all metrics to metrics.parquet
+    4. Appends all metrics to the partitioned metrics dataset
     5. Optionally creates enriched chip histories
 
     Parameters
@@ -250,7 +425,7 @@ class MetricPipeline:
         if not manifest_path.exists():
             raise FileNotFoundError(f"Manifest not found: {manifest_path}")
 
-        manifest = pl.read_parquet(manifest_path)
+        manifest = read_manifest(manifest_path)
         logger.info(f"Loaded manifest with {manifest.height} measurements")
 
         # Filter by procedure if specified
@@ -277,7 +452,7 @@ class MetricPipeline:
         chip_numbers: Optional[List[int]] = None,
         parallel: bool = True,
         workers: int = 6,
-        skip_existing: bool = False
+        skip_existing: bool = False,
     ) -> Path:
         """
         Extract all metrics from staged measurements.
@@ -293,24 +468,29 @@ class MetricPipeline:
         workers : int
             Number of parallel workers (default: 6)
         skip_existing : bool
-            Skip measurements that already have metrics (default: False)
-
+            Incremental mode: only run (measurement, extractor) cells and
+            consecutive pairs that are missing from the extraction ledger or
+            were recorded with another extractor fingerprint (default: False).
+            Preview them with :meth:`plan_extraction`.
         Returns
         -------
         Path
-            Path to saved metrics.parquet file
+            Metrics directory (read it with ``metrics_store.scan_metrics``)
 
         Examples
         --------
         >>> # Extract all metrics in parallel
         >>> pipeline.derive_all_metrics()
-        PosixPath('data/03_derived/_metrics/metrics.parquet')
+        PosixPath('data/03_derived/_metrics')
 
         >>> # Extract only from IVg measurements
         >>> pipeline.derive_all_metrics(procedures=['IVg'])
 
         >>> # Extract for specific chip
         >>> pipeline.derive_all_metrics(chip_numbers=[67])
+
+        >>> # Daily incremental run: only new measurements and new pairs
+        >>> pipeline.derive_all_metrics(skip_existing=True)
         """
         logger.info("Starting metric extraction pipeline")
 
@@ -319,57 +499,170 @@ class MetricPipeline:
 
         if manifest.height == 0:
             logger.warning("No measurements to process")
-            return self._save_empty_metrics()
+            self.metrics_dir.mkdir(parents=True, exist_ok=True)
+            return self.metrics_dir
 
-        # Load existing metrics if skip_existing
-        existing_run_ids = set()
-        if skip_existing:
-            existing_metrics_path = self.derived_dir / "_metrics" / "metrics.parquet"
-            if existing_metrics_path.exists():
-                existing_metrics = pl.read_parquet(existing_metrics_path)
-                existing_run_ids = set(existing_metrics["run_id"].unique().to_list())
-                logger.info(f"Found {len(existing_run_ids)} measurements with existing metrics")
+        ledger = ExtractionLedger.load(self.metrics_dir)
+        pending = self._plan_pending(manifest, ledger) if skip_existing else None
+        if pending is not None:
+            logger.info(
+                f"Incremental mode: {len(pending)} of {manifest.height} measurements "
+                f"have pending extractors"
+            )
 
         # Extract single-measurement metrics
         if parallel:
-            metrics = self._extract_parallel(manifest, workers, existing_run_ids)
+            metrics = self._extract_parallel(manifest, workers, set(), pending=pending, ledger=ledger)
         else:
-            metrics = self._extract_sequential(manifest, existing_run_ids)
+            metrics = metrics_to_frame(
+                self._extract_sequential(manifest, set(), pending=pending, ledger=ledger)
+            )
 
-        logger.info(f"Extracted {len(metrics)} single-measurement metrics from {manifest.height} measurements")
+        logger.info(f"Extracted {metrics.height} single-measurement metrics from {manifest.height} measurements")
 
         # Extract pairwise metrics
         try:
-            pairwise_metrics = self._extract_pairwise_metrics(manifest)
-            logger.info(f"Extracted {len(pairwise_metrics)} pairwise metrics")
+            pairwise_metrics = self._extract_pairwise_metrics(
+                manifest, ledger=ledger, incremental=skip_existing,
+                workers=workers if parallel else 1,
+            )
+            logger.info(f"Extracted {pairwise_metrics.height} pairwise metrics")
         except Exception as e:
             logger.error(f"Pairwise metrics extraction failed: {e}", exc_info=True)
-            pairwise_metrics = []
+            pairwise_metrics = empty_metrics_frame()
 
         # Combine all metrics
-        all_metrics = metrics + pairwise_metrics
-        logger.info(f"Total: {len(all_metrics)} metrics ({len(metrics)} single + {len(pairwise_metrics)} pairwise)")
+        all_metrics = pl.concat([metrics, pairwise_metrics], how="vertical_relaxed")
+        logger.info(f"Total: {all_metrics.height} metrics ({metrics.height} single + {pairwise_metrics.height} pairwise)")
 
-        # Save metrics
+        # Save metrics, then the ledger (a crash in between only causes rework)
         try:
             metrics_path = self._save_metrics(all_metrics)
+            ledger.save()
         except Exception as e:
             logger.error(f"Failed to save metrics: {e}", exc_info=True)
             raise
 
+        # Plot-time lookups in this process must see the new metrics
+        clear_metric_lookup_cache()
+
         return metrics_path
 
+    def plan_extraction(
+        self,
+        procedures: Optional[List[str]] = None,
+        chip_numbers: Optional[List[int]] = None,
+    ) -> pl.DataFrame:
+        """
+        Preview what an incremental run would recompute, per extractor.
+
+        Nothing is extracted or written.
+
+        Parameters
+        ----------
+        procedures : Optional[List[str]]
+            Filter to specific procedures. If None, all.
+        chip_numbers : Optional[List[int]]
+            Filter to specific chip numbers. If None, all.
+
+        Returns
+        -------
+        pl.DataFrame
+            One row per extractor: ``extractor``, ``kind`` (single/pairwise),
+            ``fingerprint``, ``up_to_date``, ``stale`` (recorded with another
+            fingerprint) and ``missing`` cell counts
+
+        Examples
+        --------
+        >>> pipeline.plan_extraction(procedures=["IVg"])
+        shape: (3, 6)
+        ...
+        """
+        manifest = self._load_and_filter_manifest(procedures, chip_numbers)
+        ledger = ExtractionLedger.load(self.metrics_dir)
+        fingerprints = self._fingerprints()
+        column = {"done": "up_to_date", "stale": "stale", "missing": "missing"}
+        counts: Dict[Tuple[str, str], Dict[str, int]] = {}
+
+        def count(name: str, kind: str, state: str) -> None:
+            cell = counts.setdefault((name, kind), dict.fromkeys(column.values(), 0))
+            cell[column[state]] += 1
+
+        for rid, proc in zip(manifest["run_id"].to_list(), manifest["proc"].to_list()):
+            for ext in self.extractor_map.get(proc, []):
+                name = ext.metric_name
+                count(name, "single", ledger.status(rid, name, fingerprint=fingerprints[name]))
+
+        if manifest.height and self.pairwise_extractors:
+            chains, _ = self._plan_pairwise_chains(manifest, None, incremental=False)
+            for _, rows, plan in chains:
+                for i, extractors in plan:
+                    for ext in extractors:
+                        name = ext.metric_name
+                        count(name, "pairwise", ledger.status(
+                            rows[i + 1]["run_id"], name, rows[i]["run_id"], fingerprints[name]
+                        ))
+
+        return pl.DataFrame(
+            [
+                {"extractor": name, "kind": kind, "fingerprint": fingerprints[name], **cells}
+                for (name, kind), cells in counts.items()
+            ],
+            schema={
+                "extractor": pl.Utf8, "kind": pl.Utf8, "fingerprint": pl.Utf8,
+                "up_to_date": pl.Int64, "stale": pl.Int64, "missing": pl.Int64,
+            },
+        ).sort(["kind", "extractor"], descending=[True, False])
+
+    @property
+    def metrics_dir(self) -> Path:
+        """Directory holding the metrics dataset and the extraction ledger."""
+        return self.derived_dir / "_metrics"
+
+    def _fingerprints(self) -> Dict[str, str]:
+        """Current fingerprint of every (single and pairwise) extractor, by metric name."""
+        return {
+            ext.metric_name: ext.fingerprint
+            for ext in [*self.extractors, *self.pairwise_extractors]
+        }
+
+    def _plan_pending(
+        self,
+        manifest: pl.DataFrame,
+        ledger: ExtractionLedger
+    ) -> Dict[str, List[str]]:
+        """
+        Map run_id -> names of applicable extractors that are missing or stale.
+
+        A cell is stale when the ledger holds it under another fingerprint
+        (the extractor's parameters or algorithm version changed).
+        Measurements whose extractors are all up to date are omitted.
+        """
+        fingerprints = self._fingerprints()
+        pending: Dict[str, List[str]] = {}
+        for rid, proc in zip(manifest["run_id"].to_list(), manifest["proc"].to_list()):
+            names = [
+                ext.metric_name for ext in self.extractor_map.get(proc, [])
+                if not ledger.is_done(rid, ext.metric_name, fingerprint=fingerprints[ext.metric_name])
+            ]
+            if names:
+                pending[rid] = names
+        return pending
+
     def _extract_sequential(
         self,
         manifest: pl.DataFrame,
-        skip_run_ids: set
+        skip_run_ids: set,
+        pending: Optional[Dict[str, List[str]]] = None,
+        ledger: Optional[ExtractionLedger] = None,
     ) -> List[DerivedMetric]:
         """Extract metrics sequentially (for debugging)."""
         metrics = []
         total = manifest.height
+        fingerprints = self._fingerprints()
 
         for i, row in enumerate(manifest.iter_rows(named=True), 1):
-            if row["run_id"] in skip_run_ids:
+            if row["run_id"] in skip_run_ids or (pending is not None and row["run_id"] not in pending):
                 logger.debug(f"[{i}/{total}] Skipping {row['run_id']} (already processed)")
                 continue
 
@@ -379,8 +672,11 @@ class MetricPipeline:
                 f"({row.get('proc', '?')})"
             )
 
-            row_metrics = self._extract_from_measurement(row)
+            only = pending.get(row["run_id"]) if pending is not None else None
+            row_metrics, done = self._extract_cells(row, only)
             metrics.extend(row_metrics)
+            if ledger is not None:
+                ledger.mark_many(row["run_id"], done, self.extraction_version, fingerprints)
 
         return metrics
 
@@ -388,59 +684,102 @@ class MetricPipeline:
         self,
         manifest: pl.DataFrame,
         workers: int,
-        skip_run_ids: set
-    ) -> List[DerivedMetric]:
-        """Extract metrics in parallel using ProcessPoolExecutor."""
-        rows = [
-            row for row in manifest.iter_rows(named=True)
-            if row["run_id"] not in skip_run_ids
-        ]
+        skip_run_ids: set,
+        pending: Optional[Dict[str, List[str]]] = None,
+        ledger: Optional[ExtractionLedger] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> pl.DataFrame:
+        """
+        Extract metrics in parallel using ProcessPoolExecutor.
+
+        Each worker receives the pipeline once (initializer); tasks are
+        chunks of manifest rows grouped by procedure and date, and results
+        come back as Arrow IPC streams rather than pickled DerivedMetric
+        objects.
+
+        Returns
+        -------
+        pl.DataFrame
+            Extracted metrics in the metrics schema
+        """
+        rows = manifest.filter(~pl.col("run_id").is_in(list(skip_run_ids)))
+        if pending is not None:
+            rows = rows.filter(pl.col("run_id").is_in(list(pending)))
 
-        if not rows:
+        if rows.height == 0:
             logger.info("All measurements already processed")
-            return []
+            return empty_metrics_frame()
 
-        logger.info(f"Processing {len(rows)} measurements with {workers} workers")
+        # At least ~4 tasks per worker so slow chunks don't leave workers idle
+        chunk_size = max(1, min(chunk_size, -(-rows.height // (workers * 4))))
+        chunks = _plan_chunks(rows, chunk_size)
+        logger.info(
+            f"Processing {rows.height} measurements with {workers} workers "
+            f"({len(chunks)} tasks)"
+        )
 
         # Use 'spawn' instead of 'fork' to avoid issues with fork-unsafe objects
         # (threading locks, Rich console objects, etc.)
         mp_context = multiprocessing.get_context('spawn')
 
-        metrics = []
+        frames = []
+        worker_timings: Dict[int, Dict[str, Any]] = {}
+        fingerprints = self._fingerprints()
         with ProcessPoolExecutor(
             max_workers=workers,
-            mp_context=mp_context
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self,),
         ) as executor:
             # Submit all tasks
-            future_to_row = {
-                executor.submit(self._extract_from_measurement, row): row
-                for row in rows
-            }
+            future_to_chunk = {}
+            for chunk in chunks:
+                chunk_pending = None
+                if pending is not None:
+                    chunk_pending = {rid: pending[rid] for rid in chunk["run_id"].to_list()}
+                future_to_chunk[executor.submit(_extract_chunk, chunk, chunk_pending)] = chunk
 
             # Collect results as they complete
             completed = 0
-            total = len(future_to_row)
+            total = len(future_to_chunk)
 
-            for future in as_completed(future_to_row):
+            for future in as_completed(future_to_chunk):
                 completed += 1
-                row = future_to_row[future]
+                chunk = future_to_chunk[future]
+                label = f"{chunk['proc'][0]} x{chunk.height}"
+                if "date_local" in chunk.columns:
+                    label += f" ({chunk['date_local'][0]})"
 
                 try:
-                    row_metrics = future.result()
-                    metrics.extend(row_metrics)
-                    chip_name = f"{row.get('chip_group', '?')}{row.get('chip_number', '?')}"
-                    logger.info(
-                        f"[{completed}/{total}] Completed {chip_name} "
-                        f"({row.get('proc', '?')}) - extracted {len(row_metrics)} metrics"
-                    )
+                    ipc, done, errors, pid, elapsed, warmup_report = future.result()
                 except Exception as e:
-                    chip_name = f"{row.get('chip_group', '?')}{row.get('chip_number', '?')}"
-                    logger.error(
-                        f"[{completed}/{total}] Failed {chip_name} "
-                        f"({row.get('proc', '?')}): {e}"
-                    )
+                    logger.error(f"[{completed}/{total}] Failed {label}: {e}")
+                    continue
 
-        return metrics
+                timing = worker_timings.setdefault(
+                    pid, {"warmup": None, "compute": 0.0, "measurements": 0}
+                )
+                timing["compute"] += elapsed
+                timing["measurements"] += chunk.height
+                if warmup_report is not None:
+                    timing["warmup"] = warmup_report
+
+                chunk_metrics = pl.read_ipc_stream(io.BytesIO(ipc))
+                frames.append(chunk_metrics)
+                if ledger is not None:
+                    for run_id, names in done.items():
+                        ledger.mark_many(run_id, names, self.extraction_version, fingerprints)
+                for run_id, error in errors.items():
+                    logger.error(f"[{completed}/{total}] Failed {run_id}: {error}")
+                logger.info(
+                    f"[{completed}/{total}] Completed {label} "
+                    f"- extracted {chunk_metrics.height} metrics"
+                )
+
+        _log_worker_timings(worker_timings)
+        if not frames:
+            return empty_metrics_frame()
+        return pl.concat(frames, how="vertical_relaxed")
 
     def _extract_from_measurement(self, metadata: Dict[str, Any]) -> List[DerivedMetric]:
         """
@@ -456,31 +795,69 @@ class MetricPipeline:
         List[DerivedMetric]
             Extracted metrics (may be empty if all extractors fail)
         """
+        metrics, _ = self._extract_cells(metadata)
+        return metrics
+
+    def _extract_cells(
+        self,
+        metadata: Dict[str, Any],
+        only: Optional[List[str]] = None,
+    ) -> Tuple[List[DerivedMetric], List[str]]:
+        """
+        Run applicable extractors on one measurement.
+
+        Parameters
+        ----------
+        metadata : Dict[str, Any]
+            Metadata from manifest.parquet row
+        only : Optional[List[str]]
+            Restrict to extractors with these metric names (None = all applicable)
+
+        Returns
+        -------
+        Tuple[List[DerivedMetric], List[str]]
+            Extracted metrics, and the metric names of extractors that ran to
+            completion (returned a metric or None without raising). Extractors
+            that raised are left out so incremental runs retry them.
+        """
         metrics = []
+        done: List[str] = []
 
         procedure = metadata.get("proc", metadata.get("procedure"))  # Support both column names
         parquet_path = Path(metadata.get("parquet_path", metadata.get("path")))
 
         # Get extractors for this procedure
         extractors = self.extractor_map.get(procedure, [])
+        if only is not None:
+            extractors = [e for e in extractors if e.metric_name in only]
 
         if not extractors:
-            return metrics
+            return metrics, done
 
-        # Load measurement data
+        # Load only the columns the extractors read; metadata is the manifest
+        # row itself, so it is not broadcast into the frame
+        columns = column_projection(extractors)
         try:
-            measurement = read_measurement_parquet(parquet_path)
+            measurement = read_measurement_parquet(
+                parquet_path, self.manifest_path,
+                columns=columns, with_metadata=columns is None,
+            )
         except Exception as e:
             logger.error(f"Failed to load {parquet_path}: {e}")
-            return metrics
+            return metrics, done
 
         # Add extraction version to metadata for provenance
         metadata["extraction_version"] = self.extraction_version
 
+        # NumPy columns and LED segmentation are built once and shared by all
+        # extractors of this measurement (see src/derived/led_segmentation.py)
+        metadata[SEGMENTATION_KEY] = SegmentedMeasurement(measurement)
+
         # Run each applicable extractor
         for extractor in extractors:
             try:
                 metric = extractor.extract(measurement, metadata)
+                done.append(extractor.metric_name)
 
                 if metric is None:
                     logger.debug(f"Extractor {extractor.metric_name} returned None for {parquet_path}")
@@ -502,51 +879,136 @@ class MetricPipeline:
                     exc_info=True
                 )
 
-        return metrics
+        metadata.pop(SEGMENTATION_KEY, None)
+        return metrics, done
 
     def _extract_pairwise_metrics(
         self,
-        manifest: pl.DataFrame
-    ) -> List[DerivedMetric]:
+        manifest: pl.DataFrame,
+        ledger: Optional[ExtractionLedger] = None,
+        incremental: bool = False,
+        workers: int = 1,
+    ) -> pl.DataFrame:
         """
         Extract metrics from consecutive measurement pairs.
 
-        Uses sequential processing (benchmarked 2-10x faster than parallel for typical workloads).
-
-        This method processes measurements in pairs to compute comparative metrics
-        like consecutive sweep differences. Pairs are formed by:
-        1. Grouping by (chip_number, proc)
+        Pairs are formed by:
+        1. Grouping by (chip_number, proc) into chronological chains
         2. Sorting by start_time_utc (chronological order)
         3. Pairing consecutive measurements that satisfy extractor pairing logic
 
+        Each chain is walked once with a two-measurement window, so every
+        measurement is read once (see ``_extract_chain``). Chains run in
+        ``workers`` processes when there are enough pairs to pay for the
+        pool start-up (``PAIRWISE_PARALLEL_MIN_PAIRS``); per-pair parallelism
+        was benchmarked slower than sequential (module docstring).
+
         Parameters
         ----------
         manifest : pl.DataFrame
             Manifest DataFrame with measurement metadata
+        ledger : Optional[ExtractionLedger]
+            Ledger to record processed pairs in
+        incremental : bool
+            Skip pairs whose extractors are all recorded in ``ledger`` with
+            their current fingerprint
+        workers : int
+            Worker processes for chain-level parallelism (1 = sequential)
 
         Returns
         -------
-        List[DerivedMetric]
-            Extracted pairwise metrics
+        pl.DataFrame
+            Extracted pairwise metrics (metrics schema)
         """
-        import time
-
         if not self.pairwise_extractors:
-            return []
+            return empty_metrics_frame()
 
         start_time = time.perf_counter()
-        metrics = []
+        chains, num_groups = self._plan_pairwise_chains(manifest, ledger, incremental)
+        total_pairs = sum(len(plan) for _, _, plan in chains)
+        if not total_pairs:
+            logger.info("No pairwise tasks to process")
+            return empty_metrics_frame()
+
+        parallel = workers > 1 and len(chains) > 1 and total_pairs >= PAIRWISE_PARALLEL_MIN_PAIRS
+        logger.info(
+            f"Processing {total_pairs} pairs in {len(chains)} chains across "
+            f"{num_groups} chip groups ({f'{workers} workers' if parallel else 'sequential mode'})"
+        )
+
+        frames: List[pl.DataFrame] = []
+        fingerprints = self._fingerprints()
+
+        def collect(chain_metrics: pl.DataFrame, done) -> None:
+            frames.append(chain_metrics)
+            if ledger is not None:
+                for run_id, metric_name, partner in done:
+                    ledger.mark(
+                        run_id, metric_name, self.extraction_version,
+                        partner_run_id=partner, fingerprint=fingerprints[metric_name],
+                    )
 
-        # Group by chip and procedure
+        if parallel:
+            # Largest chains first so the last ones to finish are short
+            chains.sort(key=lambda chain: len(chain[2]), reverse=True)
+            with ProcessPoolExecutor(
+                max_workers=min(workers, len(chains)),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_worker,
+                initargs=(self,),
+            ) as executor:
+                futures = [
+                    executor.submit(_extract_chain_task, proc, rows, _plan_names(plan))
+                    for proc, rows, plan in chains
+                ]
+                for future in as_completed(futures):
+                    try:
+                        ipc, done = future.result()
+                    except Exception as e:
+                        logger.error(f"Pairwise chain failed: {e}")
+                        continue
+                    collect(pl.read_ipc_stream(io.BytesIO(ipc)), done)
+        else:
+            for completed, (proc, rows, plan) in enumerate(chains, 1):
+                chain_metrics, done = self._extract_chain(proc, rows, plan)
+                collect(metrics_to_frame(chain_metrics), done)
+                logger.debug(
+                    f"Pairwise extraction progress: {completed}/{len(chains)} chains "
+                    f"({sum(f.height for f in frames)} metrics extracted so far)"
+                )
+
+        metrics = pl.concat(frames, how="vertical_relaxed") if frames else empty_metrics_frame()
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            f"Extracted {metrics.height} pairwise metrics from "
+            f"{total_pairs} pairs across {num_groups} chip groups "
+            f"in {elapsed:.2f}s ({total_pairs / elapsed:.1f} pairs/sec)"
+        )
+        return metrics
+
+    def _plan_pairwise_chains(
+        self,
+        manifest: pl.DataFrame,
+        ledger: Optional[ExtractionLedger],
+        incremental: bool,
+    ) -> Tuple[List[Tuple[str, List[Dict[str, Any]], List[Tuple[int, List[PairwiseMetricExtractor]]]]], int]:
+        """
+        Chronological (chip_number, proc) chains and the pairs to extract in each.
+
+        Returns
+        -------
+        Tuple
+            ``[(proc, rows, plan)]`` where ``plan`` lists ``(i, extractors)``
+            for the pair ``rows[i]`` → ``rows[i + 1]``, and the number of groups
+        """
+        chains = []
+        num_groups = 0
+        fingerprints = self._fingerprints()
         try:
             grouped = manifest.group_by(["chip_number", "proc"])
         except Exception as e:
             logger.error(f"Failed to group manifest for pairwise extraction: {e}")
-            return metrics
-
-        # Collect all pair tasks across all chip groups
-        all_pair_tasks = []
-        num_groups = 0
+            return chains, num_groups
 
         for (chip_num, proc), group_df in grouped:
             num_groups += 1
@@ -563,7 +1025,7 @@ class MetricPipeline:
 
                 # Add temporary seq_num based on chronological order
                 if "seq_num" not in sorted_group.columns:
-                    sorted_group = sorted_group.with_row_count("seq_num", offset=1)
+                    sorted_group = sorted_group.with_row_index("seq_num", offset=1)
 
                 # Add parquet_path if not present
                 if "parquet_path" not in sorted_group.columns:
@@ -583,70 +1045,107 @@ class MetricPipeline:
                 continue
 
             # Identify valid pairs for this chip group
+            plan = []
             for i in range(len(rows) - 1):
                 metadata_1 = rows[i]
                 metadata_2 = rows[i + 1]
 
                 # Check if measurements should be paired (using extractor's logic)
-                should_pair = all(
-                    ext.should_pair(metadata_1, metadata_2)
-                    for ext in extractors
-                )
-
-                if should_pair:
-                    # Store tuple: (metadata_1, metadata_2, extractors)
-                    all_pair_tasks.append((metadata_1, metadata_2, extractors))
-                else:
+                if not all(ext.should_pair(metadata_1, metadata_2) for ext in extractors):
                     logger.debug(
                         f"Skipping pair: seq {metadata_1.get('seq_num')} and "
                         f"{metadata_2.get('seq_num')} (not consecutive or different proc)"
                     )
+                    continue
 
-        if not all_pair_tasks:
-            logger.info("No pairwise tasks to process")
-            return metrics
+                pair_extractors = extractors
+                if incremental and ledger is not None:
+                    pair_extractors = [
+                        ext for ext in extractors
+                        if not ledger.is_done(
+                            metadata_2["run_id"], ext.metric_name, metadata_1["run_id"],
+                            fingerprint=fingerprints[ext.metric_name],
+                        )
+                    ]
+                    if not pair_extractors:
+                        continue
+                plan.append((i, pair_extractors))
 
-        logger.info(
-            f"Processing {len(all_pair_tasks)} pairs across "
-            f"{num_groups} chip groups (sequential mode)"
-        )
+            if plan:
+                chains.append((proc, rows, plan))
+        return chains, num_groups
+
+    def _extract_chain(
+        self,
+        proc: str,
+        rows: List[Dict[str, Any]],
+        plan: List[Tuple[int, List[PairwiseMetricExtractor]]],
+    ) -> Tuple[List[DerivedMetric], List[Tuple[str, str, str]]]:
+        """
+        Run pairwise extractors along one chronological chain.
+
+        A two-slot window holds the previous measurement, so each measurement
+        is read once (only the columns the procedure's pairwise extractors
+        declare). Batchable extractors reduce each pair to its arrays while
+        it is in the window and extract the whole chain in one
+        ``extract_prepared`` call.
 
-        # Process all pairs sequentially
-        for i, (metadata_1, metadata_2, extractors) in enumerate(all_pair_tasks, 1):
-            # Load both measurements
+        Returns
+        -------
+        Tuple
+            Metrics, and ``(run_id, metric_name, partner_run_id)`` for every
+            extractor that ran to completion on a pair (for the ledger)
+        """
+        columns = column_projection(self.pairwise_extractor_map[proc])
+        read = dict(columns=columns, with_metadata=columns is None)
+        metrics: List[DerivedMetric] = []
+        done: List[Tuple[str, str, str]] = []
+        batches: Dict[int, Tuple[PairwiseMetricExtractor, List[Tuple[int, Any]]]] = {}
+        window: Optional[Tuple[int, pl.DataFrame]] = None
+
+        def load(i: int) -> pl.DataFrame:
+            if window is not None and window[0] == i:
+                return window[1]
+            return read_measurement_parquet(Path(rows[i]["parquet_path"]), self.manifest_path, **read)
+
+        def collect(extractor: PairwiseMetricExtractor, i: int, pair_metrics) -> None:
+            done.append((rows[i + 1]["run_id"], extractor.metric_name, rows[i]["run_id"]))
+            for metric in pair_metrics or []:
+                if not extractor.validate(metric):
+                    logger.warning(
+                        f"Validation failed for pairwise {extractor.metric_name}: "
+                        f"value={metric.value_float}"
+                    )
+                metrics.append(metric)
+
+        for i, extractors in plan:
+            metadata_1, metadata_2 = rows[i], rows[i + 1]
             try:
-                meas_1 = read_measurement_parquet(Path(metadata_1["parquet_path"]))
-                meas_2 = read_measurement_parquet(Path(metadata_2["parquet_path"]))
+                meas_1 = load(i)
+                meas_2 = load(i + 1)
             except Exception as e:
                 logger.warning(
                     f"Failed to load pair {metadata_1['run_id']}, {metadata_2['run_id']}: {e}"
                 )
                 continue
+            window = (i + 1, meas_2)
 
             # Add extraction version
             metadata_1["extraction_version"] = self.extraction_version
             metadata_2["extraction_version"] = self.extraction_version
 
-            # Run pairwise extractors
             for extractor in extractors:
                 try:
-                    pair_metrics = extractor.extract_pairwise(
-                        meas_1, metadata_1,
-                        meas_2, metadata_2
-                    )
-
-                    if pair_metrics is None:
-                        continue
-
-                    # Validate and collect metrics
-                    for metric in pair_metrics:
-                        if not extractor.validate(metric):
-                            logger.warning(
-                                f"Validation failed for pairwise {extractor.metric_name}: "
-                                f"value={metric.value_float}"
-                            )
-                        metrics.append(metric)
-
+                    if extractor.batchable:
+                        state = extractor.prepare_pair(meas_1, metadata_1, meas_2, metadata_2)
+                        if state is None:
+                            collect(extractor, i, None)
+                        else:
+                            batches.setdefault(id(extractor), (extractor, []))[1].append((i, state))
+                    else:
+                        collect(extractor, i, extractor.extract_pairwise(
+                            meas_1, metadata_1, meas_2, metadata_2
+                        ))
                 except Exception as e:
                     logger.error(
                         f"Pairwise extractor {extractor.metric_name} failed on "
@@ -654,116 +1153,50 @@ class MetricPipeline:
                         exc_info=True
                     )
 
-            # Progress logging every 10 pairs
-            if i % 10 == 0 or i == len(all_pair_tasks):
-                logger.info(
-                    f"Pairwise extraction progress: {i}/{len(all_pair_tasks)} pairs "
-                    f"({len(metrics)} metrics extracted so far)"
+        for extractor, items in batches.values():
+            try:
+                results = extractor.extract_prepared([state for _, state in items])
+            except Exception as e:
+                logger.error(
+                    f"Pairwise extractor {extractor.metric_name} failed on a {proc} chain "
+                    f"of {len(items)} pairs: {e}",
+                    exc_info=True
                 )
+                continue
+            for (i, _), pair_metrics in zip(items, results):
+                collect(extractor, i, pair_metrics)
 
-        elapsed = time.perf_counter() - start_time
-        logger.info(
-            f"Extracted {len(metrics)} pairwise metrics from "
-            f"{len(all_pair_tasks)} pairs across {num_groups} chip groups "
-            f"in {elapsed:.2f}s ({len(all_pair_tasks) / elapsed:.1f} pairs/sec)"
-        )
-        return metrics
+        return metrics, done
 
     # ═══════════════════════════════════════════════════════════════════
     # Saving & Loading
     # ═══════════════════════════════════════════════════════════════════
 
-    def _save_metrics(self, metrics: List[DerivedMetric]) -> Path:
+    def _save_metrics(self, metrics: pl.DataFrame) -> Path:
         """
-        Save metrics to Parquet file.
+        Append metrics to the partitioned metrics dataset.
+
+        Rows supersede earlier rows with the same (run_id, metric_name) when
+        read back through ``scan_metrics``.
 
         Parameters
         ----------
-        metrics : List[DerivedMetric]
-            Metrics to save
+        metrics : pl.DataFrame
+            Metrics to save, in the metrics schema
 
         Returns
         -------
         Path
-            Path to saved metrics.parquet
+            Metrics directory
         """
-        metrics_dir = self.derived_dir / "_metrics"
-        metrics_dir.mkdir(parents=True, exist_ok=True)
-        metrics_path = metrics_dir / "metrics.parquet"
-
-        if not metrics:
-            logger.warning("No metrics to save - creating empty metrics.parquet")
-            return self._save_empty_metrics()
-
-        # Convert to Polars DataFrame with explicit schema to avoid type inference issues
-        metrics_dicts = [m.model_dump() for m in metrics]
-        
-        # Define explicit schema to ensure consistent types
-        schema = {
-            "run_id": pl.Utf8,
-            "chip_number": pl.Int64,
-            "chip_group": pl.Utf8,
-            "procedure": pl.Utf8,
-            "seq_num": pl.Int64,
-            "metric_name": pl.Utf8,
-            "metric_category": pl.Utf8,
-            "value_float": pl.Float64,
-            "value_str": pl.Utf8,
-            "value_json": pl.Utf8,
-            "unit": pl.Utf8,
-            "extraction_method": pl.Utf8,
-            "extraction_version": pl.Utf8,
-            "extraction_timestamp": pl.Datetime("us", "UTC"),
-            "confidence": pl.Float64,
-            "flags": pl.Utf8,
-        }
-        
-        try:
-            metrics_df = pl.DataFrame(metrics_dicts, schema=schema)
-        except Exception as e:
-            logger.error(f"Failed to create DataFrame with schema: {e}")
-            # Fallback: try with infer_schema_length
-            metrics_df = pl.DataFrame(metrics_dicts, infer_schema_length=len(metrics_dicts))
-
-        # Sort by chip, procedure, sequence number for better compression
-        metrics_df = metrics_df.sort(["chip_group", "chip_number", "procedure", "seq_num"])
-
-        # Write to Parquet
-        metrics_df.write_parquet(metrics_path)
-
-        logger.info(f"Saved {len(metrics)} metrics to {metrics_path}")
-
-        return metrics_path
+        self.metrics_dir.mkdir(parents=True, exist_ok=True)
 
-    def _save_empty_metrics(self) -> Path:
-        """Create empty metrics.parquet with correct schema."""
-        metrics_dir = self.derived_dir / "_metrics"
-        metrics_dir.mkdir(parents=True, exist_ok=True)
-        metrics_path = metrics_dir / "metrics.parquet"
-
-        # Create empty DataFrame with correct schema
-        empty_df = pl.DataFrame({
-            "run_id": pl.Series([], dtype=pl.Utf8),
-            "chip_number": pl.Series([], dtype=pl.Int64),
-            "chip_group": pl.Series([], dtype=pl.Utf8),
-            "procedure": pl.Series([], dtype=pl.Utf8),
-            "seq_num": pl.Series([], dtype=pl.Int64),
-            "metric_name": pl.Series([], dtype=pl.Utf8),
-            "metric_category": pl.Series([], dtype=pl.Utf8),
-            "value_float": pl.Series([], dtype=pl.Float64),
-            "value_str": pl.Series([], dtype=pl.Utf8),
-            "value_json": pl.Series([], dtype=pl.Utf8),
-            "unit": pl.Series([], dtype=pl.Utf8),
-            "extraction_method": pl.Series([], dtype=pl.Utf8),
-            "extraction_version": pl.Series([], dtype=pl.Utf8),
-            "extraction_timestamp": pl.Series([], dtype=pl.Datetime),
-            "confidence": pl.Series([], dtype=pl.Float64),
-            "flags": pl.Series([], dtype=pl.Utf8),
-        })
-
-        empty_df.write_parquet(metrics_path)
+        if metrics.height == 0:
+            logger.info("No new metrics to save")
+            return self.metrics_dir
 
-        return metrics_path
+        append_metrics(self.metrics_dir, metrics)
+        return self.metrics_dir
 
     # ═══════════════════════════════════════════════════════════════════
     # Enriched Chip Histories
@@ -808,23 +1241,18 @@ class MetricPipeline:
         history = pl.read_parquet(history_path)
         logger.info(f"Loaded chip history with {history.height} measurements")
 
-        # Load metrics
-        metrics_path = self.derived_dir / "_metrics" / "metrics.parquet"
-        if not metrics_path.exists():
-            logger.warning(f"No metrics found at {metrics_path} - creating history without metrics")
+        # Load metrics (only this chip's partitions are read)
+        if not metrics_exist(self.metrics_dir):
+            logger.warning(f"No metrics found in {self.metrics_dir} - creating history without metrics")
             enriched_path = self._save_enriched_history(history, chip_number, chip_group)
             return enriched_path
 
-        metrics = pl.read_parquet(metrics_path)
-
-        # Filter metrics for this chip
-        chip_metrics = metrics.filter(
-            (pl.col("chip_number") == chip_number) &
-            (pl.col("chip_group") == chip_group)
-        )
-
-        if metric_names:
-            chip_metrics = chip_metrics.filter(pl.col("metric_name").is_in(metric_names))
+        chip_metrics = scan_metrics(
+            self.metrics_dir,
+            chip_group=chip_group,
+            chip_number=chip_number,
+            metric_names=metric_names or None,
+        ).collect()
 
         logger.info(f"Found {chip_metrics.height} metrics for this chip")
 
@@ -887,8 +1315,7 @@ class MetricPipeline:
         >>> print(f"Created {len(paths)} enriched histories")
         """
         # Load manifest to find all chips
-        manifest_path = self.manifest_path
-        manifest = pl.read_parquet(manifest_path)
+        manifest = read_manifest(self.manifest_path)
 
         # Get unique chip combinations
         chips = (
@@ -0,0 +1,527 @@
+"""
+Storage helpers for derived metrics.
+
+Metrics live under ``data/03_derived/_metrics/``:
+
+- ``dataset/``: Hive-partitioned, append-only metrics dataset, laid out like
+  the staging layer::
+
+      dataset/metric_name=cnp_voltage/chip_group=Alisson/chip_number=67/part-<ns>-<id>.parquet
+
+  Every extraction run appends new part files to the partitions it touched;
+  nothing is rewritten. Readers use :func:`scan_metrics`, which pushes chip
+  and metric filters down to the partition paths so a single chip only
+  touches its own files, and resolves duplicates by keeping the newest row
+  per ``(run_id, metric_name)``. ``extraction_version`` is kept as
+  provenance; a re-extraction supersedes the old row rather than sitting
+  beside it, which would duplicate rows when metrics are pivoted into chip
+  histories. :func:`compact_metrics` folds each partition back into a
+  single file.
+- ``metrics.parquet``: legacy monolithic file. Still read (as the oldest
+  source) until ``compact-metrics`` migrates it into the dataset.
+- ``extraction_ledger.parquet``: which (run_id, extractor) cells - and, for
+  pairwise extractors, which (earlier run_id -> run_id) pairs - have been
+  processed. Extractors may legitimately return no metric (e.g. a dark It
+  has no photoresponse), so "has a metric row" cannot tell finished work
+  from pending work; the ledger can.
+
+All writes are atomic (temp file + rename).
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+import polars as pl
+
+from src.core.stage_raw_measurements import atomic_write_parquet
+from src.models.derived_metrics import DerivedMetric
+
+logger = logging.getLogger(__name__)
+
+METRICS_DATASET_DIRNAME = "dataset"
+METRICS_FILENAME = "metrics.parquet"  # legacy monolithic file
+LEDGER_FILENAME = "extraction_ledger.parquet"
+
+# Rows with the same key supersede each other (newest wins)
+METRIC_KEY = ["run_id", "metric_name"]
+
+# Hive partition columns, outermost first
+PARTITION_KEYS = ["metric_name", "chip_group", "chip_number"]
+
+METRICS_SCHEMA = {
+    "run_id": pl.Utf8,
+    "chip_number": pl.Int64,
+    "chip_group": pl.Utf8,
+    "procedure": pl.Utf8,
+    "seq_num": pl.Int64,
+    "metric_name": pl.Utf8,
+    "metric_category": pl.Utf8,
+    "value_float": pl.Float64,
+    "value_str": pl.Utf8,
+    "value_json": pl.Utf8,
+    "unit": pl.Utf8,
+    "extraction_method": pl.Utf8,
+    "extraction_version": pl.Utf8,
+    "extraction_timestamp": pl.Datetime("us", "UTC"),
+    "confidence": pl.Float64,
+    "flags": pl.Utf8,
+}
+
+HIVE_SCHEMA = {k: METRICS_SCHEMA[k] for k in PARTITION_KEYS}
+
+METRICS_SORT = ["chip_group", "chip_number", "procedure", "seq_num"]
+
+LEDGER_SCHEMA = {
+    "run_id": pl.Utf8,
+    "extractor": pl.Utf8,
+    "partner_run_id": pl.Utf8,
+    "extraction_version": pl.Utf8,
+    "fingerprint": pl.Utf8,
+    "processed_at": pl.Datetime("us", "UTC"),
+}
+
+_PART_COLUMN = "__part"
+
+
+def empty_metrics_frame() -> pl.DataFrame:
+    """Empty DataFrame with the metrics schema."""
+    return pl.DataFrame(schema=METRICS_SCHEMA)
+
+
+def metrics_to_frame(metrics: List[DerivedMetric]) -> pl.DataFrame:
+    """Convert DerivedMetric objects to a DataFrame with the metrics schema."""
+    if not metrics:
+        return empty_metrics_frame()
+    metrics_dicts = [m.model_dump() for m in metrics]
+    try:
+        return pl.DataFrame(metrics_dicts, schema=METRICS_SCHEMA)
+    except Exception as e:
+        logger.error(f"Failed to create DataFrame with schema: {e}")
+        # Fallback: try with infer_schema_length
+        return pl.DataFrame(metrics_dicts, infer_schema_length=len(metrics_dicts))
+
+
+def dataset_dir(metrics_dir: Path) -> Path:
+    """Root of the partitioned metrics dataset inside ``metrics_dir``."""
+    return Path(metrics_dir) / METRICS_DATASET_DIRNAME
+
+
+def partition_dir(metrics_dir: Path, metric_name: str, chip_group: str, chip_number: int) -> Path:
+    """Directory of one ``metric_name=/chip_group=/chip_number=`` partition."""
+    return (
+        dataset_dir(metrics_dir)
+        / f"metric_name={quote(str(metric_name), safe='')}"
+        / f"chip_group={quote(str(chip_group), safe='')}"
+        / f"chip_number={chip_number}"
+    )
+
+
+def _part_name() -> str:
+    # Names sort in write order, which breaks timestamp ties on read
+    return f"part-{time.time_ns():020d}-{uuid.uuid4().hex[:8]}.parquet"
+
+
+def _part_files(metrics_dir: Path) -> List[Path]:
+    root = dataset_dir(metrics_dir)
+    return sorted(root.rglob("part-*.parquet")) if root.exists() else []
+
+
+def _to_part_frame(df: pl.DataFrame) -> pl.DataFrame:
+    """Cast to the metrics schema and drop partition columns (encoded in the path)."""
+    return df.select([
+        pl.col(c).cast(t, strict=False) if c in df.columns else pl.lit(None, dtype=t).alias(c)
+        for c, t in METRICS_SCHEMA.items()
+        if c not in PARTITION_KEYS
+    ])
+
+
+def append_metrics(metrics_dir: Path, new_metrics: pl.DataFrame) -> int:
+    """
+    Append ``new_metrics`` to the partitioned dataset.
+
+    One new part file is written per ``(metric_name, chip_group, chip_number)``
+    partition present in ``new_metrics``; existing files are never touched.
+
+    Args:
+        metrics_dir: The ``_metrics`` directory (dataset is created if missing)
+        new_metrics: Freshly extracted rows with the metrics schema
+
+    Returns:
+        Number of part files written
+    """
+    if new_metrics.height == 0:
+        return 0
+
+    written = 0
+    for key, part in new_metrics.partition_by(PARTITION_KEYS, as_dict=True).items():
+        metric_name, chip_group, chip_number = key
+        out = partition_dir(metrics_dir, metric_name, chip_group, chip_number) / _part_name()
+        atomic_write_parquet(_to_part_frame(part).sort(METRICS_SORT[2:]), out)
+        written += 1
+
+    logger.info(
+        f"Appended {new_metrics.height} metrics to {dataset_dir(metrics_dir)} "
+        f"({written} partitions)"
+    )
+    return written
+
+
+def metrics_exist(metrics_dir: Path) -> bool:
+    """Whether any metrics (dataset parts or legacy file) exist in ``metrics_dir``."""
+    return bool(_part_files(metrics_dir)) or (Path(metrics_dir) / METRICS_FILENAME).exists()
+
+
+def _as_list(value) -> Optional[list]:
+    if value is None:
+        return None
+    if isinstance(value, (str, int)):
+        return [value]
+    return list(value)
+
+
+def scan_metrics(
+    metrics_dir: Path,
+    chip_group: Optional[str] = None,
+    chip_number: Optional[int | Sequence[int]] = None,
+    metric_names: Optional[str | Sequence[str]] = None,
+    procedures: Optional[Sequence[str]] = None,
+    deduplicate: bool = True,
+) -> pl.LazyFrame:
+    """
+    Lazily scan metrics with filters pushed down to the partition paths.
+
+    Args:
+        metrics_dir: The ``_metrics`` directory
+        chip_group: Only this chip group
+        chip_number: Only this chip number (or list of numbers)
+        metric_names: Only these metric names
+        procedures: Only these procedures
+        deduplicate: Keep only the newest row per ``(run_id, metric_name)``
+
+    Returns:
+        LazyFrame with the metrics schema (empty if no metrics exist)
+
+    Example:
+        >>> cnp = scan_metrics(Path("data/03_derived/_metrics"),
+        ...                    chip_group="Alisson", chip_number=67,
+        ...                    metric_names=["cnp_voltage"]).collect()
+    """
+    metrics_dir = Path(metrics_dir)
+    sources: List[pl.LazyFrame] = []
+    columns = list(METRICS_SCHEMA) + [_PART_COLUMN]
+
+    legacy = metrics_dir / METRICS_FILENAME
+    if legacy.exists():
+        # Oldest source: sorts before every dataset part
+        sources.append(
+            pl.scan_parquet(legacy)
+            .with_columns(pl.lit("").alias(_PART_COLUMN))
+            .select([pl.col(c) if c in METRICS_SCHEMA else pl.col(_PART_COLUMN) for c in columns])
+        )
+
+    if _part_files(metrics_dir):
+        sources.append(
+            pl.scan_parquet(
+                dataset_dir(metrics_dir) / "**" / "*.parquet",
+                hive_partitioning=True,
+                hive_schema=HIVE_SCHEMA,
+                include_file_paths=_PART_COLUMN,
+            ).select(columns)
+        )
+
+    if not sources:
+        return empty_metrics_frame().lazy()
+
+    lf = sources[0] if len(sources) == 1 else pl.concat(sources, how="diagonal_relaxed")
+
+    filters = []
+    if chip_group is not None:
+        filters.append(pl.col("chip_group") == chip_group)
+    if chip_number is not None:
+        filters.append(pl.col("chip_number").is_in(_as_list(chip_number)))
+    if metric_names is not None:
+        filters.append(pl.col("metric_name").is_in(_as_list(metric_names)))
+    if procedures is not None:
+        filters.append(pl.col("procedure").is_in(_as_list(procedures)))
+    if filters:
+        lf = lf.filter(pl.all_horizontal(filters))
+
+    if deduplicate:
+        lf = (
+            lf.sort(["extraction_timestamp", _PART_COLUMN], nulls_last=False)
+            .unique(subset=METRIC_KEY, keep="last", maintain_order=True)
+        )
+
+    return lf.drop(_PART_COLUMN)
+
+
+def load_metrics(metrics_dir: Path, **filters) -> pl.DataFrame:
+    """Eager :func:`scan_metrics`, sorted by chip/procedure/sequence."""
+    return scan_metrics(metrics_dir, **filters).collect().sort(METRICS_SORT)
+
+
+@dataclass
+class CompactionReport:
+    """Outcome of :func:`compact_metrics`."""
+
+    partitions: int = 0
+    partitions_compacted: int = 0
+    files_removed: int = 0
+    rows_before: int = 0
+    rows_after: int = 0
+    legacy_migrated: bool = False
+
+
+def compact_metrics(metrics_dir: Path, min_files: int = 2, dry_run: bool = False) -> CompactionReport:
+    """
+    Rewrite each partition with ``min_files`` or more parts as a single file.
+
+    Superseded rows are dropped (newest per ``(run_id, metric_name)`` is kept).
+    A legacy ``metrics.parquet`` is first appended to the dataset and then
+    removed. The compacted file is written before the old parts are deleted,
+    and its name sorts after them, so concurrent readers never see a gap.
+
+    Args:
+        metrics_dir: The ``_metrics`` directory
+        min_files: Only compact partitions with at least this many part files
+        dry_run: Report what would be done without writing or deleting
+
+    Returns:
+        CompactionReport
+    """
+    metrics_dir = Path(metrics_dir)
+    report = CompactionReport()
+
+    legacy = metrics_dir / METRICS_FILENAME
+    if legacy.exists():
+        report.legacy_migrated = True
+        if not dry_run:
+            legacy_df = pl.read_parquet(legacy)
+            append_metrics(metrics_dir, legacy_df)
+            legacy.unlink()
+            logger.info(f"Migrated {legacy_df.height} rows from legacy {legacy}")
+
+    by_partition: dict = {}
+    for part in _part_files(metrics_dir):
+        by_partition.setdefault(part.parent, []).append(part)
+    report.partitions = len(by_partition)
+
+    for directory, parts in sorted(by_partition.items()):
+        if len(parts) < min_files:
+            continue
+        frames = [
+            pl.read_parquet(p).with_columns(pl.lit(p.name).alias(_PART_COLUMN))
+            for p in parts
+        ]
+        combined = pl.concat(frames, how="diagonal_relaxed")
+        # metric_name is fixed by the partition path, so run_id is the key here
+        compacted = (
+            combined.sort(["extraction_timestamp", _PART_COLUMN], nulls_last=False)
+            .unique(subset=["run_id"], keep="last", maintain_order=True)
+            .drop(_PART_COLUMN)
+            .sort(METRICS_SORT[2:])
+        )
+        report.partitions_compacted += 1
+        report.files_removed += len(parts)
+        report.rows_before += combined.height
+        report.rows_after += compacted.height
+        if dry_run:
+            continue
+        atomic_write_parquet(compacted, directory / _part_name())
+        for p in parts:
+            p.unlink()
+
+    logger.info(
+        f"Compacted {report.partitions_compacted}/{report.partitions} partitions: "
+        f"{report.files_removed} files, {report.rows_before} -> {report.rows_after} rows"
+    )
+    return report
+
+
+class ExtractionLedger:
+    """
+    Record of processed (run_id, extractor[, partner_run_id]) cells.
+
+    Each cell keeps the fingerprint of the extractor configuration that
+    produced it (``MetricExtractor.fingerprint``), so a cell processed with
+    other parameters or an older algorithm version is not "done".
+
+    Example:
+        >>> ledger = ExtractionLedger.load(metrics_dir)
+        >>> ledger.is_done("a1b2...", "cnp_voltage", fingerprint=ext.fingerprint)
+        False
+        >>> ledger.mark("a1b2...", "cnp_voltage", version="v3.9.3",
+        ...             fingerprint=ext.fingerprint)
+        >>> ledger.save()
+    """
+
+    def __init__(self, path: Path, cells: Optional[Dict[Tuple[str, str, str], Optional[str]]] = None):
+        self.path = path
+        # cell -> fingerprint (None: recorded before fingerprints existed)
+        self._cells: Dict[Tuple[str, str, str], Optional[str]] = cells or {}
+        self._new: List[dict] = []
+        self._existing: Optional[pl.DataFrame] = None
+
+    @classmethod
+    def load(cls, metrics_dir: Path) -> "ExtractionLedger":
+        """
+        Load the ledger from ``metrics_dir``.
+
+        If no ledger exists yet but metrics do, it is seeded from the
+        ``(run_id, metric_name)`` pairs already present, so the first
+        incremental run after upgrading does not redo all existing work.
+        Pairwise metrics are seeded with the earlier measurement they were
+        computed against (``run_id_1`` in their ``value_json``).
+        """
+        path = metrics_dir / LEDGER_FILENAME
+        ledger = cls(path)
+        if path.exists():
+            df = pl.read_parquet(path)
+            if "fingerprint" not in df.columns:
+                df = df.with_columns(pl.lit(None, dtype=pl.Utf8).alias("fingerprint"))
+            ledger._existing = df
+            ledger._cells = dict(zip(
+                zip(df["run_id"].to_list(), df["extractor"].to_list(),
+                    df["partner_run_id"].fill_null("").to_list()),
+                df["fingerprint"].to_list(),
+            ))
+            return ledger
+
+        if metrics_exist(metrics_dir):
+            seeded = (
+                scan_metrics(metrics_dir, deduplicate=False)
+                .select(
+                    "run_id",
+                    "metric_name",
+                    pl.col("value_json").str.json_path_match("$.run_id_1")
+                    .fill_null("").alias("partner_run_id"),
+                )
+                .unique()
+                .collect()
+            )
+            ledger._cells = {
+                key: None
+                for key in zip(
+                    seeded["run_id"].to_list(),
+                    seeded["metric_name"].to_list(),
+                    seeded["partner_run_id"].to_list(),
+                )
+            }
+            # Persisted with the first save()
+            ledger._existing = seeded.select(
+                pl.col("run_id"),
+                pl.col("metric_name").alias("extractor"),
+                pl.col("partner_run_id"),
+                pl.lit(None, dtype=pl.Utf8).alias("extraction_version"),
+                pl.lit(None, dtype=pl.Utf8).alias("fingerprint"),
+                pl.lit(None, dtype=pl.Datetime("us", "UTC")).alias("processed_at"),
+            )
+            logger.info(f"Seeded extraction ledger from {len(ledger._cells)} existing metric rows")
+        return ledger
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    def status(
+        self,
+        run_id: str,
+        extractor: str,
+        partner_run_id: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+    ) -> str:
+        """
+        State of one cell: ``"done"``, ``"stale"`` or ``"missing"``.
+
+        A cell is stale when it was processed with a different fingerprint.
+        Cells recorded before fingerprints existed are taken to match the
+        current configuration and adopt ``fingerprint`` (persisted with the
+        next :meth:`save`), so upgrading does not trigger a full re-run but
+        later parameter changes are detected.
+
+        Args:
+            run_id: Measurement id
+            extractor: Extractor (metric) name
+            partner_run_id: Earlier measurement of a pairwise cell
+            fingerprint: Current extractor fingerprint (None: presence only)
+        """
+        key = (run_id, extractor, partner_run_id or "")
+        if key not in self._cells:
+            return "missing"
+        stored = self._cells[key]
+        if fingerprint is None or stored == fingerprint:
+            return "done"
+        if stored is None:
+            self._record(key, None, fingerprint)
+            return "done"
+        return "stale"
+
+    def is_done(
+        self,
+        run_id: str,
+        extractor: str,
+        partner_run_id: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+    ) -> bool:
+        """Whether ``extractor`` has processed ``run_id`` (with ``fingerprint``, if given)."""
+        return self.status(run_id, extractor, partner_run_id, fingerprint) == "done"
+
+    def mark(
+        self,
+        run_id: str,
+        extractor: str,
+        version: str,
+        partner_run_id: Optional[str] = None,
+        fingerprint: Optional[str] = None,
+    ) -> None:
+        """Record that ``extractor`` (with ``fingerprint``) processed ``run_id``."""
+        self._record((run_id, extractor, partner_run_id or ""), version, fingerprint)
+
+    def mark_many(
+        self,
+        run_id: str,
+        extractors: Iterable[str],
+        version: str,
+        fingerprints: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Record several extractors as done for ``run_id`` (fingerprints by name)."""
+        for name in extractors:
+            self.mark(run_id, name, version,
+                      fingerprint=fingerprints.get(name) if fingerprints else None)
+
+    def _record(self, key: Tuple[str, str, str], version: Optional[str], fingerprint: Optional[str]) -> None:
+        self._cells[key] = fingerprint
+        self._new.append({
+            "run_id": key[0],
+            "extractor": key[1],
+            "partner_run_id": key[2],
+            "extraction_version": version,
+            "fingerprint": fingerprint,
+            "processed_at": datetime.now(timezone.utc),
+        })
+
+    def save(self) -> None:
+        """Atomically persist newly marked cells (no-op if nothing changed)."""
+        if not self._new and self.path.exists():
+            return
+        new = pl.DataFrame(self._new, schema=LEDGER_SCHEMA)
+        if self._existing is not None and self._existing.height > 0:
+            df = pl.concat([self._existing, new], how="diagonal_relaxed")
+        else:
+            df = new
+        keys = ["run_id", "extractor", "partner_run_id"]
+        df = (
+            # Adopted cells (see status()) keep the version they were extracted with
+            df.with_columns(pl.col("extraction_version").forward_fill().over(keys))
+            .unique(subset=keys, keep="last", maintain_order=True)
+        )
+        atomic_write_parquet(df, self.path)
+        self._existing = df
+        self._new = []
@@ -0,0 +1,201 @@
+"""
+Shared monotonic-leg geometry for gate sweeps (IVg / VVg).
+
+A looped gate sweep ``0 → V_start → V_end → V_start → 0`` consists of
+monotonic legs. CNP, mobility and the transconductance plots all need the
+leg boundaries; :class:`SweepLegs` computes the ``np.diff``/direction pass
+once per Vg trace and answers both segmentation conventions in use:
+
+- :meth:`SweepLegs.full_range_legs` — sign-change legs covering most of the
+  Vg range (CNP parabola fits, per-direction mobility);
+- :meth:`SweepLegs.segments` — noise-thresholded monotonic segments
+  (``segment_voltage_sweep`` in the plotting helpers).
+
+``MetricPipeline`` shares one instance between every extractor of a
+measurement through :meth:`SegmentedMeasurement.sweep_legs
+<src.derived.led_segmentation.SegmentedMeasurement.sweep_legs>`.
+
+Examples
+--------
+>>> legs = SweepLegs(vg)
+>>> legs.full_range_legs(0.95)
+[(101, 301, 'forward'), (301, 501, 'backward')]
+>>> legs.legs.columns
+['leg', 'start', 'end', 'n_points', 'direction', 'vg_start', 'vg_end', 'vg_min', 'vg_max']
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import polars as pl
+
+VG_COLUMN = "Vg (V)"
+
+# (start, end, direction) with ``end`` exclusive
+Leg = Tuple[int, int, str]
+
+
+class SweepLegs:
+    """
+    Leg boundaries of one Vg trace.
+
+    Boundaries are half-open ``[start, end)`` index windows into the trace,
+    so consumers slice their own signal arrays with them.
+
+    Parameters
+    ----------
+    vg : np.ndarray
+        Gate voltage per sample
+
+    Attributes
+    ----------
+    dvg : np.ndarray
+        Vg increments (``np.diff(vg)``), computed once
+    starts, ends : np.ndarray
+        Sign-change legs: a new leg starts wherever the sweep direction
+        flips (the turning point belongs to the following leg)
+    """
+
+    def __init__(self, vg: np.ndarray):
+        self.vg = np.asarray(vg)
+        self.n_samples = self.vg.size
+        self.dvg = np.diff(self.vg) if self.n_samples else np.empty(0, dtype=np.float64)
+
+        if self.n_samples:
+            sign = np.sign(self.dvg + 1e-12)
+            changes = np.flatnonzero(np.diff(sign) != 0) + 1
+        else:
+            changes = np.empty(0, dtype=np.int64)
+        bounds = np.concatenate(([0], changes, [self.n_samples])).astype(np.int64)
+        self.starts, self.ends = bounds[:-1], bounds[1:]
+        self._full_range: Dict[float, List[Leg]] = {}
+        self._segments: Dict[int, List[Leg]] = {}
+        self._legs: Optional[pl.DataFrame] = None
+
+    @property
+    def vg_range(self) -> float:
+        """Total Vg span of the trace (0.0 for an empty trace)."""
+        if self.n_samples == 0:
+            return 0.0
+        return float(np.max(self.vg) - np.min(self.vg))
+
+    def _direction(self, start: int, end: int) -> str:
+        return "forward" if self.vg[end - 1] > self.vg[start] else "backward"
+
+    def full_range_legs(self, full_range_frac: float = 0.95) -> List[Leg]:
+        """
+        Sign-change legs spanning at least ``full_range_frac`` of the Vg range.
+
+        Legs shorter than 3 samples are ignored; traces shorter than 3
+        samples or without any Vg span have no legs.
+
+        Returns
+        -------
+        List[Leg]
+            ``(start, end, direction)``, direction ``"forward"`` (Vg
+            increasing) or ``"backward"``
+        """
+        cached = self._full_range.get(full_range_frac)
+        if cached is not None:
+            return cached
+        out: List[Leg] = []
+        total_range = self.vg_range
+        if self.n_samples >= 3 and total_range > 0.0:
+            threshold = full_range_frac * total_range
+            for start, end in zip(self.starts.tolist(), self.ends.tolist()):
+                if end - start < 3:
+                    continue
+                seg = self.vg[start:end]
+                if seg.max() - seg.min() < threshold:
+                    continue
+                out.append((start, end, self._direction(start, end)))
+        self._full_range[full_range_frac] = out
+        return out
+
+    def segments(self, min_segment_length: int = 5) -> List[Leg]:
+        """
+        Monotonic segments with at least ``min_segment_length`` samples.
+
+        Vg steps within 10% of the step standard deviation count as flat,
+        so dwell points split segments instead of flipping direction.
+
+        Returns
+        -------
+        List[Leg]
+            ``(start, end, direction)``, direction ``"forward"`` (mean step
+            positive) or ``"reverse"``
+        """
+        cached = self._segments.get(min_segment_length)
+        if cached is not None:
+            return cached
+        out: List[Leg] = []
+        if self.n_samples >= min_segment_length:
+            threshold = np.std(self.dvg) * 0.1
+            directions = np.zeros(len(self.dvg))
+            directions[self.dvg > threshold] = 1
+            directions[self.dvg < -threshold] = -1
+            changes = np.flatnonzero(np.diff(directions) != 0) + 1
+            bounds = np.concatenate([[0], changes, [self.n_samples]])
+            for start, end in zip(bounds[:-1].tolist(), bounds[1:].tolist()):
+                if end - start < min_segment_length:
+                    continue
+                direction = "forward" if np.mean(self.dvg[start:end - 1]) > 0 else "reverse"
+                out.append((start, end, direction))
+        self._segments[min_segment_length] = out
+        return out
+
+    @property
+    def legs(self) -> pl.DataFrame:
+        """
+        Compact leg table, one row per sign-change leg.
+
+        Columns: ``leg``, ``start``, ``end`` (exclusive), ``n_points``,
+        ``direction``, ``vg_start``, ``vg_end``, ``vg_min`` and ``vg_max``.
+        """
+        if self._legs is None:
+            rows = []
+            for k, (start, end) in enumerate(zip(self.starts.tolist(), self.ends.tolist())):
+                if end <= start:
+                    continue
+                seg = self.vg[start:end]
+                rows.append({
+                    "leg": k,
+                    "start": start,
+                    "end": end,
+                    "n_points": end - start,
+                    "direction": self._direction(start, end),
+                    "vg_start": float(seg[0]),
+                    "vg_end": float(seg[-1]),
+                    "vg_min": float(seg.min()),
+                    "vg_max": float(seg.max()),
+                })
+            self._legs = pl.DataFrame(rows, schema={
+                "leg": pl.Int64, "start": pl.Int64, "end": pl.Int64, "n_points": pl.Int64,
+                "direction": pl.Utf8, "vg_start": pl.Float64, "vg_end": pl.Float64,
+                "vg_min": pl.Float64, "vg_max": pl.Float64,
+            })
+        return self._legs
+
+
+def slice_legs(
+    legs: List[Leg],
+    vg: np.ndarray,
+    signal: np.ndarray,
+) -> List[Tuple[np.ndarray, np.ndarray, str]]:
+    """
+    ``(vg_leg, signal_leg, direction)`` views for index-window legs.
+
+    Parameters
+    ----------
+    legs : List[Leg]
+        From :meth:`SweepLegs.full_range_legs` or :meth:`SweepLegs.segments`
+    vg, signal : np.ndarray
+        Arrays the legs were computed on (same length)
+
+    Returns
+    -------
+    List[Tuple[np.ndarray, np.ndarray, str]]
+    """
+    return [(vg[start:end], signal[start:end], direction) for start, end, direction in legs]
@@ -29,7 +29,7 @@ class StagingConfig(BaseModel):
     Optional Paths (auto-filled from stage_root if not provided)
     --------------------------------------------------------------
     - rejects_dir: Directory for reject records (default: {stage_root}/../_rejects)
-    - events_dir: Directory for per-run event JSONs (default: {stage_root}/_manifest/events)
+    - events_dir: Event log directory (default: {stage_root}/_manifest/events)
     - manifest_path: Path to manifest Parquet file (default: {stage_root}/_manifest/manifest.parquet)
 
     Performance Settings
@@ -96,7 +96,7 @@ class StagingConfig(BaseModel):
 
     events_dir: Optional[Path] = Field(
         default=None,
-        description="Directory for per-run event JSONs (default: {stage_root}/_manifest/events)"
+        description="Event log directory (default: {stage_root}/_manifest/events)"
     )
 
     manifest_path: Optional[Path] = Field(
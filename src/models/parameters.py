@@ -54,7 +54,7 @@ class StagingParameters(BaseModel):
     )
     events_dir: Optional[Path] = Field(
         None,
-        description="Directory for per-run event JSONs (default: {stage_root}/_manifest/events)"
+        description="Event log directory (default: {stage_root}/_manifest/events)"
     )
     manifest: Optional[Path] = Field(
         None,
@@ -92,6 +92,14 @@ class StagingParameters(BaseModel):
         default=False,
         description="Strict validation mode - fail on schema validation errors (missing required columns, etc.)"
     )
+    use_source_index: bool = Field(
+        default=True,
+        description="Skip CSVs whose size/mtime match the source index without opening them (ignored with force)"
+    )
+    fingerprint_sources: bool = Field(
+        default=False,
+        description="Store a head/tail content fingerprint in the source index so files with a new mtime but identical content are still skipped"
+    )
 
     model_config = ConfigDict(
         arbitrary_types_allowed=True,
@@ -202,7 +210,7 @@ class IntermediateParameters(BaseModel):
     # Optional paths (with defaults)
     events_dir: Optional[Path] = Field(
         None,
-        description="Directory for event JSONs (default: {output_root}/_manifest/events)"
+        description="Event log directory (default: {output_root}/_manifest/events)"
     )
     manifest: Optional[Path] = Field(
         None,
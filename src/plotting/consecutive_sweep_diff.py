@@ -48,7 +48,7 @@ def plot_consecutive_sweep_differences(
     chip_group : str
         Chip group prefix (default: "Alisson")
     metrics_path : Optional[Path]
-        Path to metrics.parquet. If None, uses default location.
+        Metrics directory (``data/03_derived/_metrics``). If None, uses default location.
     procedure : Optional[str]
         Filter to specific procedure ("IVg" or "VVg"). If None, plots both.
     output_dir : Optional[Path]
@@ -78,26 +78,25 @@ def plot_consecutive_sweep_differences(
     >>> # Only summary plot, no individual plots
     >>> plot_consecutive_sweep_differences(67, plot_individual=False)
     """
+    from src.derived.metrics_store import metrics_exist, scan_metrics
+
     # Apply science style
     set_plot_style("prism_rain")
 
     # Load metrics
     if metrics_path is None:
-        metrics_path = Path("data/03_derived/_metrics/metrics.parquet")
-
-    if not metrics_path.exists():
-        raise FileNotFoundError(f"Metrics file not found: {metrics_path}")
+        metrics_path = Path("data/03_derived/_metrics")
 
-    metrics = pl.read_parquet(metrics_path)
+    if not metrics_exist(metrics_path):
+        raise FileNotFoundError(f"Metrics not found: {metrics_path}")
 
-    # Filter to consecutive sweep differences for this chip
-    pairwise = metrics.filter(
-        (pl.col("metric_name") == "consecutive_sweep_difference") &
-        (pl.col("chip_number") == chip_number)
-    )
-
-    if procedure is not None:
-        pairwise = pairwise.filter(pl.col("procedure") == procedure)
+    # Consecutive sweep differences for this chip (only its partitions are read)
+    pairwise = scan_metrics(
+        metrics_path,
+        chip_number=chip_number,
+        metric_names="consecutive_sweep_difference",
+        procedures=[procedure] if procedure is not None else None,
+    ).collect()
 
     if pairwise.height == 0:
         raise ValueError(
@@ -9,6 +9,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import polars as pl
 from typing import Optional
+from src.core.packed_store import measurement_exists
 from src.core.utils import read_measurement_parquet
 from src.plotting.shared.plot_utils import (
     interpolate_baseline,
@@ -22,6 +23,7 @@ from src.plotting.shared.plot_utils import (
     print_warning
 )
 from src.plotting.shared.config import PlotConfig
+from src.plotting.shared.decimate import decimate_for_display, led_edges
 from src.plotting.shared.formatters import get_legend_formatter
 
 logger = logging.getLogger(__name__)
@@ -185,7 +187,7 @@ def _get_experiment_durations(df: pl.DataFrame, base_dir: Path) -> list[float]:
 
     for row in its.iter_rows(named=True):
         path = base_dir / row["source_file"]
-        if not path.exists():
+        if not measurement_exists(path):
             continue
 
         try:
@@ -370,7 +372,7 @@ def plot_its_overlay(
 
     for row in its.iter_rows(named=True):
         path = base_dir / row["source_file"]
-        if not path.exists():
+        if not measurement_exists(path):
             logger.warning(f"missing file: {path}")
             continue
 
@@ -388,9 +390,13 @@ def plot_its_overlay(
         if tt.size == 0 or yy.size == 0:
             logger.warning(f"empty/invalid series in {path}")
             continue
+        vl = np.asarray(d["VL"]) if "VL" in d.columns else None
         if not np.all(np.diff(tt) >= 0):
             idx = np.argsort(tt)
             tt = tt[idx]; yy = yy[idx]
+            vl = vl[idx] if vl is not None else None
+        # LED on/off edges survive trace decimation
+        edges = led_edges(vl) if vl is not None else None
 
         # baseline correction (three modes)
         if apply_baseline == "interpolate":
@@ -474,11 +480,11 @@ def plot_its_overlay(
 
             # Store y-values for visible window only
             all_y_values.extend(G[visible_mask])
-            plt.plot(tt, G, label=lbl)
+            plt.plot(*decimate_for_display(tt, G, config, keep=edges), label=lbl)
         else:
             # Original current plot
             all_y_values.extend((yy_corr * 1e6)[visible_mask])
-            plt.plot(tt, yy_corr * 1e6, label=lbl)
+            plt.plot(*decimate_for_display(tt, yy_corr * 1e6, config, keep=edges), label=lbl)
 
         curves_plotted += 1
 
@@ -776,7 +782,7 @@ def plot_its_dark(
 
     for row in its.iter_rows(named=True):
         path = base_dir / row["source_file"]
-        if not path.exists():
+        if not measurement_exists(path):
             logger.warning(f"missing file: {path}")
             continue
 
@@ -794,9 +800,13 @@ def plot_its_dark(
         if tt.size == 0 or yy.size == 0:
             logger.warning(f"empty/invalid series in {path}")
             continue
+        vl = np.asarray(d["VL"]) if "VL" in d.columns else None
         if not np.all(np.diff(tt) >= 0):
             idx = np.argsort(tt)
             tt = tt[idx]; yy = yy[idx]
+            vl = vl[idx] if vl is not None else None
+        # LED on/off edges survive trace decimation
+        edges = led_edges(vl) if vl is not None else None
 
         # baseline correction (three modes)
         if apply_baseline == "interpolate":
@@ -877,11 +887,11 @@ def plot_its_dark(
 
             # Store y-values for visible window only
             all_y_values.extend(G[visible_mask])
-            plt.plot(tt, G, label=lbl)
+            plt.plot(*decimate_for_display(tt, G, config, keep=edges), label=lbl)
         else:
             # Original current plot
             all_y_values.extend((yy_corr * 1e6)[visible_mask])
-            plt.plot(tt, yy_corr * 1e6, label=lbl)
+            plt.plot(*decimate_for_display(tt, yy_corr * 1e6, config, keep=edges), label=lbl)
 
         curves_plotted += 1
 
@@ -1057,7 +1067,7 @@ def plot_its_sequential(
 
     # Storage for plotting
     all_y_values = []  # For auto y-scaling
-    experiment_segments = []  # Store (time_array, current_array, label, color) for each experiment
+    experiment_segments = []  # Store (time_array, current_array, label, color, led_edges) for each experiment
     experiment_boundaries = []  # Time points where each new experiment starts
 
     time_offset = 0.0  # Running time offset for concatenation
@@ -1086,7 +1096,7 @@ def plot_its_sequential(
         if not fp.is_absolute():
             fp = base_dir / fp
 
-        if not fp.exists():
+        if not measurement_exists(fp):
             logger.warning(f"File not found: {fp}")
             continue
 
@@ -1116,6 +1126,8 @@ def plot_its_sequential(
         mask = tt >= plot_start_time
         tt_trimmed = tt[mask]
         yy_trimmed = yy[mask]
+        # LED on/off edges survive trace decimation
+        edges = led_edges(np.asarray(d["VL"])[mask]) if "VL" in d.columns else None
 
         if len(tt_trimmed) == 0:
             logger.warning(f"No data after trimming to t>={plot_start_time}s for experiment {i}")
@@ -1205,7 +1217,7 @@ def plot_its_sequential(
         color = colors[i % num_colors]
 
         # Store segment data
-        experiment_segments.append((tt_offset, yy_ua, lbl, color))
+        experiment_segments.append((tt_offset, yy_ua, lbl, color, edges))
 
         # Store for y-axis scaling
         all_y_values.extend(yy_ua)
@@ -1228,7 +1240,11 @@ def plot_its_sequential(
     plt.figure(figsize=config.figsize_timeseries)
 
     # Plot each experiment segment with its own color
-    for tt_seg, yy_seg, label, color in experiment_segments:
+    # Each experiment gets the share of the figure width its time span covers
+    total_span = max(float(time_offset), 1e-12)
+    for tt_seg, yy_seg, label, color, edges in experiment_segments:
+        fraction = float(tt_seg[-1] - tt_seg[0]) / total_span
+        tt_seg, yy_seg = decimate_for_display(tt_seg, yy_seg, config, fraction=fraction, keep=edges)
         plt.plot(tt_seg, yy_seg, linewidth=4, color=color, label=label)
 
     # Mark experiment boundaries (optional)
@@ -10,6 +10,7 @@ import matplotlib.dates as mdates
 import polars as pl
 import numpy as np
 
+from src.core.packed_store import measurement_exists
 from src.core.utils import read_measurement_parquet
 from src.plotting.shared.config import PlotConfig
 
@@ -147,7 +148,9 @@ def plot_its_photoresponse(
     Notes
     -----
     - Automatically detects if enriched history is available (has delta_current column)
-    - Falls back to on-the-fly extraction if delta_current not present
+    - Otherwise takes delta_current from the metrics store or the plot memo
+      (run_id lookup), running PhotoresponseExtractor on-the-fly and
+      memoizing only what is missing
     - Only plots light experiments (has_light == True)
     - Supports same filtering as plot_photoresponse
     """
@@ -196,28 +199,57 @@ def plot_its_photoresponse(
                 "Run 'derive-all-metrics' to extract photoresponse metrics."
             )
     else:
-        # Extract delta_current on-the-fly from ITS measurements
-        logger.info("Extracting delta_current on-the-fly from ITS measurements...")
+        # Look delta_current up in the metrics store / plot memo, extracting
+        # on-the-fly only for measurements neither has
+        from src.derived.metric_lookup import MetricValue, get_metric_lookup
+
+        logger.info("Looking up delta_current (extracting missing values from ITS measurements)...")
+        lookup = get_metric_lookup()
 
         delta_currents = []
         valid_indices = []
 
-        for idx, row in enumerate(its_data.iter_rows(named=True)):
-            # Load measurement
-            parquet_path = Path(row.get("parquet_path") or row.get("source_file"))
-            if not parquet_path.exists():
-                logger.warning(f"Missing file: {parquet_path}")
-                continue
-
-            measurement = read_measurement_parquet(parquet_path)
+        # Same extractor (and settings) as derive-all-metrics, so values
+        # from the store, the memo and fresh extraction agree
+        from src.derived.extractors.photoresponse_extractor import PhotoresponseExtractor
+        extractor = PhotoresponseExtractor(vl_threshold=0.1, min_samples_per_state=5)
 
-            # Extract delta_current
-            delta_i = _extract_delta_current_from_its(measurement, row)
+        for idx, row in enumerate(its_data.iter_rows(named=True)):
+            def extract(row=row) -> Optional[MetricValue]:
+                # Load measurement
+                parquet_path = Path(row.get("parquet_path") or row.get("source_file"))
+                if not measurement_exists(parquet_path):
+                    logger.warning(f"Missing file: {parquet_path}")
+                    return None
+
+                measurement = read_measurement_parquet(parquet_path)
+                metadata = {
+                    "run_id": row.get("run_id") or "unknown",
+                    "chip_number": row.get("chip_number"),
+                    "chip_group": row.get("chip_group"),
+                    "proc": row.get("proc", "It"),
+                    "seq_num": row.get("seq"),
+                }
+                try:
+                    metric = extractor.extract(measurement, metadata)
+                except Exception as e:
+                    logger.warning(f"Could not extract delta_current from {parquet_path}: {e}")
+                    return None
+                if metric is None or metric.metric_name != "delta_current":
+                    return None
+                return MetricValue(metric.value_float, metric.value_json)
+
+            if row.get("run_id"):
+                value = lookup.get_or_extract(row["run_id"], "delta_current", extract)
+            else:
+                value = extract()
 
-            if delta_i is not None:
-                delta_currents.append(delta_i)
+            if value is not None and value.value_float is not None:
+                delta_currents.append(value.value_float)
                 valid_indices.append(idx)
 
+        lookup.flush()
+
         if len(delta_currents) == 0:
             raise ValueError(
                 f"Could not extract delta_current from any ITS measurements. "
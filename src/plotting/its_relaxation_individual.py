@@ -58,7 +58,8 @@ def generate_individual_relaxation_plots(
     --------
     >>> # Load history and metrics
     >>> history = pl.read_parquet("data/02_stage/chip_histories/Alisson67_history.parquet")
-    >>> metrics = pl.read_parquet("data/03_derived/_metrics/metrics.parquet")
+    >>> from src.derived import load_metrics
+    >>> metrics = load_metrics(Path("data/03_derived/_metrics"))
     >>>
     >>> # Filter to It experiments with metrics
     >>> its_exps = history.filter(pl.col("proc") == "It")
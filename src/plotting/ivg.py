@@ -9,6 +9,7 @@ import matplotlib.pyplot as plt
 import polars as pl
 import numpy as np
 
+from src.core.packed_store import measurement_exists
 from src.core.utils import read_measurement_parquet
 from src.plotting.shared.config import PlotConfig
 
@@ -79,7 +80,7 @@ def plot_ivg_sequence(
     units = None
     for row in ivg.iter_rows(named=True):
         path = base_dir / row["source_file"]
-        if not path.exists():
+        if not measurement_exists(path):
             logger.warning(f"missing file: {path}")
             continue
         d = read_measurement_parquet(path)
@@ -154,6 +155,11 @@ def plot_ivg_sequence(
 
                 cnp_markers_added = True
 
+    if show_cnp:
+        # Memoize CNPs fitted above so the next plot of these sweeps skips the fit
+        from src.derived.metric_lookup import get_metric_lookup
+        get_metric_lookup().flush()
+
     plt.xlabel("$\\rm{V_g\\ (V)}$")
 
     # Update axis labels and title based on mode
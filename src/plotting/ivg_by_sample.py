@@ -9,7 +9,6 @@ from __future__ import annotations
 
 import logging
 
-import re
 from collections import defaultdict
 from pathlib import Path
 from typing import Optional, Dict, Tuple
@@ -17,104 +16,73 @@ from typing import Optional, Dict, Tuple
 import matplotlib.pyplot as plt
 import polars as pl
 
+from src.core.header_catalog import HEADER_CATALOG_FILENAME
+from src.core.manifest_index import read_manifest
 from src.core.utils import read_measurement_parquet
 from src.plotting.shared.config import PlotConfig
 from src.plotting.shared.plot_utils import ensure_standard_columns
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_MANIFEST_PATH = Path("data/02_stage/raw_measurements/_manifest/manifest.parquet")
+
+# Default for ``catalog_path``: the catalog staging maintains next to the manifest
+_MANIFEST_CATALOG = object()
+
+
+def _manifest_catalog(manifest_path: Optional[Path]) -> Path:
+    """Header catalog path staging uses for ``manifest_path``."""
+    return Path(manifest_path or DEFAULT_MANIFEST_PATH).parent / HEADER_CATALOG_FILENAME
 
 
 def scan_csvs_for_chip_samples(
     raw_root: Path,
     chip_group: str,
     chip_number: int,
-    procedure: str = "IVg"
+    procedure: str = "IVg",
+    catalog_path: Optional[Path] | object = _MANIFEST_CATALOG,
+    manifest_path: Optional[Path] = None,
 ) -> Dict[str, Tuple[Path, float]]:
     """
-    Scan raw CSV files to find the last measurement for each sample.
+    Find the last raw CSV measurement for each sample of a chip.
 
-    This is a fallback method when staged data is not available.
+    This is a fallback method when staged data is not available. Headers
+    come from the persistent header catalog, so only CSVs that are new or
+    changed since the last scan are opened.
 
     Args:
         raw_root: Root directory with raw CSV files
         chip_group: Chip group name (e.g., "Margarita")
         chip_number: Chip number (e.g., 1)
         procedure: Procedure type (default: "IVg")
+        catalog_path: Header catalog location (default:
+            ``header_catalog.parquet`` next to the manifest, shared with
+            staging; None: in-memory only, nothing is written)
+        manifest_path: Staged manifest locating the default catalog
+            (default: ``DEFAULT_MANIFEST_PATH``)
 
     Returns:
         Dictionary mapping sample letter -> (csv_path, timestamp)
     """
-    from src.core.stage_raw_measurements import discover_csvs
-
-    KV_PAT = re.compile(r"^#\s*([^:]+):\s*(.*)\s*$")
-    PROC_LINE_RE = re.compile(r"^#\s*Procedure\s*:\s*<.*\.([^.>]+)>.*$", re.I)
-
-    # Find all CSVs
-    all_csvs = discover_csvs(raw_root)
-
-    # Track: sample_letter -> (path, timestamp)
-    sample_data: Dict[str, Tuple[Path, float]] = {}
-
-    for csv_path in all_csvs:
-        # Parse header to extract metadata
-        proc_type = None
-        found_chip_group = None
-        found_chip_number = None
-        found_sample = None
-        timestamp = None
-
-        try:
-            with open(csv_path, "r", encoding="utf-8", errors="replace") as f:
-                for line in f:
-                    line = line.strip()
-
-                    # Stop at data section
-                    if line.startswith("#\tData:") or (line and not line.startswith("#")):
-                        break
-
-                    # Extract procedure type
-                    if proc_type is None:
-                        m = PROC_LINE_RE.match(line)
-                        if m:
-                            proc_type = m.group(1)
-
-                    # Parse key-value pairs
-                    m = KV_PAT.match(line)
-                    if m:
-                        key = m.group(1).strip()
-                        value = m.group(2).strip()
-
-                        if key.lower() in ["chip group name", "chip group"]:
-                            found_chip_group = value
-                        elif key.lower() in ["chip number", "chip"]:
-                            try:
-                                found_chip_number = int(value)
-                            except ValueError:
-                                pass
-                        elif key.lower() == "sample":
-                            found_sample = value.strip().upper()
-                        elif key.lower() == "start time":
-                            try:
-                                timestamp = float(value)
-                            except ValueError:
-                                pass
-
-        except Exception:
-            continue  # Skip files with read errors
-
-        # Check if this matches our target chip and procedure
-        if (proc_type == procedure and
-            found_chip_group == chip_group and
-            found_chip_number == chip_number and
-            found_sample and
-            timestamp is not None):
-
-            # Keep only the latest measurement for each sample
-            if found_sample not in sample_data or timestamp > sample_data[found_sample][1]:
-                sample_data[found_sample] = (csv_path, timestamp)
-
-    return sample_data
+    from src.core.header_catalog import HeaderCatalog
+
+    if catalog_path is _MANIFEST_CATALOG:
+        catalog_path = _manifest_catalog(manifest_path)
+    catalog = HeaderCatalog.load(catalog_path) if catalog_path is not None else HeaderCatalog()
+    catalog.refresh(raw_root)
+    catalog.save()
+
+    rows = catalog.query(proc=procedure, chip_group=chip_group, chip_number=chip_number)
+    latest = (
+        rows.filter(pl.col("sample").is_not_null() & pl.col("start_time").is_not_null())
+        .sort("start_time")
+        .group_by("sample", maintain_order=True)
+        .last()
+    )
+    return {
+        row["sample"]: (Path(row["source_file"]), row["start_time"])
+        for row in latest.iter_rows(named=True)
+    }
 
 
 def load_sample_data_from_manifest(
@@ -133,7 +101,7 @@ def load_sample_data_from_manifest(
     Returns:
         Dictionary mapping sample letter -> parquet_path
     """
-    df = pl.read_parquet(manifest_path)
+    df = read_manifest(manifest_path)
 
     # Filter for our chip and IVg procedure
     filtered = df.filter(
@@ -179,6 +147,7 @@ def plot_ivg_by_sample(
     manifest_path: Optional[Path] = None,
     conductance: bool = False,
     config: Optional[PlotConfig] = None,
+    catalog_path: Optional[Path] = None,
 ) -> Optional[Path]:
     """
     Plot the last IVg measurement for each sample (A-J) of a chip.
@@ -193,6 +162,9 @@ def plot_ivg_by_sample(
         manifest_path: Path to manifest.parquet (if available)
         conductance: If True, plot G=I/V instead of current
         config: Plot configuration (includes output_dir)
+        catalog_path: Header catalog used by the raw CSV fallback
+            (default: ``header_catalog.parquet`` next to the manifest, or
+            next to ``DEFAULT_MANIFEST_PATH`` without one)
 
     Returns:
         Path to saved figure, or None if no data found
@@ -219,7 +191,10 @@ def plot_ivg_by_sample(
     # Fallback to scanning raw CSVs
     if not sample_files and raw_root:
         logger.info(f"Scanning raw CSVs for {chip_group} {chip_number}...")
-        sample_data = scan_csvs_for_chip_samples(raw_root, chip_group, chip_number)
+        sample_data = scan_csvs_for_chip_samples(
+            raw_root, chip_group, chip_number,
+            catalog_path=catalog_path or _manifest_catalog(manifest_path),
+        )
 
         if not sample_data:
             logger.error(f"No IVg measurements found for {chip_group} {chip_number}")
@@ -14,6 +14,7 @@ import matplotlib.pyplot as plt
 import polars as pl
 from typing import Optional
 
+from src.core.packed_store import measurement_exists
 from src.core.utils import read_measurement_parquet
 from src.plotting.shared.config import PlotConfig
 
@@ -120,7 +121,7 @@ def plot_laser_calibration(
     for row in data.iter_rows(named=True):
         # Load measurement data from staged Parquet
         parquet_path = Path(row["parquet_path"])
-        if not parquet_path.exists():
+        if not measurement_exists(parquet_path):
             logger.warning(f"Missing file: {parquet_path}")
             continue
 
@@ -322,7 +323,7 @@ def plot_laser_calibration_comparison(
 
         for row in group_data.iter_rows(named=True):
             parquet_path = Path(row["parquet_path"])
-            if not parquet_path.exists():
+            if not measurement_exists(parquet_path):
                 continue
 
             measurement = read_measurement_parquet(parquet_path)
@@ -6,5 +6,6 @@ Cross-cutting modules used by every plot type:
 - formatters.py: Legend/label formatters (wavelength, voltage, power, ...)
 - plot_utils.py: Shared data-prep and helper functions
 - transforms.py: Resistance/conductance conversions
+- decimate.py: Display-aware min/max decimation of long time-series traces
 - batch.py: Batch-plot orchestration from YAML configs
 """
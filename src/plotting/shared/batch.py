@@ -14,12 +14,13 @@ Performance:
 
 from __future__ import annotations
 
+import multiprocessing
 import os
 import time
 import sys
 import io
 from pathlib import Path
-from typing import Any
+from typing import TYPE_CHECKING, Any
 from dataclasses import dataclass, field
 from concurrent.futures import ProcessPoolExecutor, as_completed
 from contextlib import contextmanager
@@ -41,12 +42,15 @@ from rich.progress import (
 from rich.table import Table
 
 from src.plotting.shared.config import PlotConfig
+from src.plotting.shared.batch_planner import BatchPlan, plan_batch
 from src.cli.helpers import parse_seq_list
 
-# Plotting modules are imported lazily inside execute_plot() so that the
-# caller (CLI batch-plot command) has a chance to call
-# enable_parquet_caching() first — the cache patches read_measurement_parquet
-# via attribute rebind, which only catches calls bound AFTER the patch.
+if TYPE_CHECKING:
+    from src.cli.config import CLIConfig
+
+# Plotting modules are imported lazily inside execute_plot() to keep
+# import time low; measurement reads go through the shared data cache once
+# the caller (CLI batch-plot command) has called enable_parquet_caching().
 CACHE_AVAILABLE = True
 
 
@@ -334,8 +338,7 @@ def execute_plot(spec: PlotSpec, chip_group: str, quiet: bool = True) -> PlotRes
     PlotResult
         Execution result with timing and error information
     """
-    # Lazy plotting imports: enable_parquet_caching() must run before
-    # plotting modules bind read_measurement_parquet by name.
+    # Lazy plotting imports (heavy matplotlib modules)
     from src.plotting.its import plot_its_overlay, plot_its_sequential
     from src.plotting.ivg import plot_ivg_sequence
     from src.plotting.transconductance import (
@@ -739,19 +742,70 @@ def execute_sequential(plot_specs: list[PlotSpec], chip_group: str) -> list[Plot
     return results
 
 
-def _worker_init():
-    """Silence all output in worker processes to prevent terminal corruption."""
+def _worker_init(cache_mb: float | None = None, cli_config: CLIConfig | None = None):
+    """
+    Silence all output in worker processes to prevent terminal corruption.
+
+    Also routes measurement reads through the worker's process-wide data
+    cache (bounded to ``cache_mb``), which outlives the individual specs,
+    and installs the parent's ``CLIConfig``: spawned workers start from a
+    fresh interpreter, so ``--config``/``--output-dir`` overrides and the
+    history/stage dirs would otherwise revert to the defaults.
+    """
     devnull = open(os.devnull, "w")
     sys.stdout = devnull
     sys.stderr = devnull
     sys.__stdout__ = devnull
     sys.__stderr__ = devnull
 
+    if cli_config is not None:
+        from src.cli.main import set_config
+        set_config(cli_config)
+
+    from src.core.data_cache import configure_cache, enable_parquet_caching
+    enable_parquet_caching()
+    if cache_mb is not None:
+        configure_cache(max_size_mb=cache_mb)
+
+
+def plan_parallel(plot_specs: list[PlotSpec], chip_group: str, workers: int) -> BatchPlan:
+    """
+    Plan which worker executes which specs (see ``batch_planner``).
+
+    Parameters
+    ----------
+    plot_specs : list[PlotSpec]
+        List of plot specifications (single chip)
+    chip_group : str
+        Chip group name (e.g., "Alisson")
+    workers : int
+        Number of parallel workers
 
-def execute_parallel(plot_specs: list[PlotSpec], chip_group: str, workers: int) -> list[PlotResult]:
+    Returns
+    -------
+    BatchPlan
+        Specs per worker and the estimated I/O saved
+    """
+    if not plot_specs:
+        return BatchPlan()
+    history = get_chip_history(plot_specs[0].chip, chip_group)
+    return plan_batch(plot_specs, history, workers)
+
+
+def execute_parallel(
+    plot_specs: list[PlotSpec],
+    chip_group: str,
+    workers: int,
+    plan: BatchPlan | None = None,
+    cache_mb: float | None = None,
+) -> list[PlotResult]:
     """
     Execute plots in parallel with progress bar.
 
+    Specs are grouped by the measurements they read (``plan_parallel``) and
+    each group of the plan runs on its own worker process, so overlapping
+    specs hit that worker's measurement cache instead of re-reading Parquet.
+
     Parameters
     ----------
     plot_specs : list[PlotSpec]
@@ -760,6 +814,10 @@ def execute_parallel(plot_specs: list[PlotSpec], chip_group: str, workers: int)
         Chip group name (e.g., "Alisson")
     workers : int
         Number of parallel workers
+    plan : BatchPlan, optional
+        Precomputed plan (computed here if None)
+    cache_mb : float, optional
+        Measurement cache budget per worker in MB (default: data cache default)
 
     Returns
     -------
@@ -767,6 +825,8 @@ def execute_parallel(plot_specs: list[PlotSpec], chip_group: str, workers: int)
         List of execution results
     """
     results = []
+    if plan is None:
+        plan = plan_parallel(plot_specs, chip_group, workers)
 
     with Progress(
         SpinnerColumn(),
@@ -778,9 +838,26 @@ def execute_parallel(plot_specs: list[PlotSpec], chip_group: str, workers: int)
     ) as progress:
         task = progress.add_task("[cyan]Generating plots...", total=len(plot_specs))
 
-        with ProcessPoolExecutor(max_workers=workers, initializer=_worker_init) as executor:
+        # One single-process executor per bin pins the bin's specs to one
+        # worker (and its cache); futures still complete spec by spec.
+        # 'spawn' rather than 'fork': planning already used Polars in this
+        # process, and forking a live Polars thread pool can deadlock.
+        from src.cli.main import get_config
+        mp_context = multiprocessing.get_context("spawn")
+        executors = [
+            ProcessPoolExecutor(
+                max_workers=1, mp_context=mp_context,
+                initializer=_worker_init, initargs=(cache_mb, get_config()),
+            )
+            for _ in plan.bins
+        ]
+        try:
             # Submit all tasks (quiet mode enabled for parallel execution)
-            futures = {executor.submit(execute_plot, spec, chip_group, True): spec for spec in plot_specs}
+            futures = {
+                executor.submit(execute_plot, spec, chip_group, True): spec
+                for executor, specs in zip(executors, plan.bins)
+                for spec in specs
+            }
 
             # Collect results as they complete
             for future in as_completed(futures):
@@ -801,6 +878,9 @@ def execute_parallel(plot_specs: list[PlotSpec], chip_group: str, workers: int)
                 if result.warnings:
                     for warning in result.warnings:
                         _progress_console.print(f"  [yellow]⚠[/yellow] {warning}")
+        finally:
+            for executor in executors:
+                executor.shutdown(wait=True, cancel_futures=True)
 
     return results
 
@@ -865,6 +945,32 @@ def display_summary(results: list[PlotResult], total_time: float, parallel_worke
         console.print(f"\n[dim]See warnings above for details ({total_warnings} warnings)[/dim]")
 
 
+def display_plan(plan: BatchPlan) -> None:
+    """
+    Display the worker assignment and the I/O the plan avoids.
+
+    Parameters
+    ----------
+    plan : BatchPlan
+        Plan returned by ``plan_parallel``
+    """
+    table = Table(title="Batch Plan", show_header=False, box=None)
+    table.add_column("Metric", style="cyan")
+    table.add_column("Value", style="bold")
+
+    table.add_row("Shared-data clusters", str(plan.clusters))
+    table.add_row("Specs per worker", ", ".join(str(len(b)) for b in plan.bins) or "-")
+    table.add_row("Measurement reads", f"{plan.reads_planned} (vs {plan.reads_per_spec} per spec)")
+    if plan.reads_avoided > 0:
+        table.add_row(
+            "I/O avoided",
+            f"[green]{plan.reads_avoided} reads, {plan.bytes_avoided / 2**20:.1f} MB[/green]",
+        )
+
+    console.print(table)
+    console.print()
+
+
 def print_cache_stats():
     """Print cache statistics if caching is available."""
     if not CACHE_AVAILABLE:
@@ -875,10 +981,12 @@ def print_cache_stats():
     console.print("\n" + "=" * 60)
     console.print("Data Cache Statistics")
     console.print("=" * 60)
-    console.print(f"Cache size:      {stats['size']}/{stats['maxsize']} items")
+    console.print(f"Cache size:      {stats['size']} items, "
+                  f"{stats['bytes'] / 2**20:.1f}/{stats['max_bytes'] / 2**20:.0f} MB")
     console.print(f"Total requests:  {stats['total_requests']}")
     console.print(f"Cache hits:      {stats['hits']}")
     console.print(f"Cache misses:    {stats['misses']}")
+    console.print(f"Evictions:       {stats['evictions']}")
     console.print(f"Hit rate:        {stats['hit_rate_pct']}")
     console.print("=" * 60)
 
@@ -0,0 +1,225 @@
+"""
+Batch-plot planner: group plot specs by the measurements they read.
+
+Neighbouring entries of a batch config usually plot overlapping seq ranges
+(e.g. several ``plot-its-suite`` entries over the same day), so they read
+many of the same staged Parquet files. Scheduling them one future per spec
+scatters those reads over all workers and every worker loads every file.
+
+The planner:
+
+1. resolves each spec to the set of measurement files it will read (from the
+   chip history, filtered by the procedure the plot type draws);
+2. clusters specs that share at least one file (union-find);
+3. packs clusters onto ``workers`` bins, largest first, so that every file is
+   read by as few workers as possible while keeping the bins balanced.
+
+Each bin is executed by one dedicated worker process whose bounded
+measurement cache survives across its specs. ``BatchPlan`` reports how many
+reads (and bytes) that avoids compared to reading per spec; byte counts are
+those of the staged data, loose or packed (``packed_store.measurement_size``).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, List, Sequence, Set
+
+import polars as pl
+
+from src.cli.helpers import parse_seq_list
+from src.core.packed_store import measurement_size
+
+if TYPE_CHECKING:
+    from src.plotting.shared.batch import PlotSpec
+
+
+# Procedure drawn by each plot type and how many times one spec reads each
+# of its measurements (suites draw an overlay and a sequential plot)
+PLOT_TYPE_READS: Dict[str, tuple[str | None, int]] = {
+    "plot-its": ("It", 1),
+    "plot-its-sequential": ("It", 1),
+    "plot-its-suite": ("It", 2),
+    "plot-ivg": ("IVg", 1),
+    "plot-transconductance": ("IVg", 1),
+    "plot-vvg": ("VVg", 1),
+    "plot-vt": ("Vt", 1),
+    "plot-vts-suite": ("Vt", 2),
+}
+
+
+@dataclass
+class BatchPlan:
+    """
+    Assignment of plot specs to workers.
+
+    Attributes
+    ----------
+    bins : list[list[PlotSpec]]
+        Specs per worker, in execution order
+    needs : list[frozenset[str]]
+        Measurement files read by each spec (same order as the input specs)
+    clusters : int
+        Number of groups of specs sharing at least one measurement
+    reads_per_spec : int
+        File reads when every spec loads its own measurements
+    reads_planned : int
+        File reads when each worker loads a measurement once (i.e. its
+        measurement cache holds the bin's working set)
+    bytes_per_spec : int
+        Bytes read when every spec loads its own measurements
+    bytes_planned : int
+        Bytes read with the plan
+    """
+    bins: List[List["PlotSpec"]] = field(default_factory=list)
+    needs: List[frozenset] = field(default_factory=list)
+    clusters: int = 0
+    reads_per_spec: int = 0
+    reads_planned: int = 0
+    bytes_per_spec: int = 0
+    bytes_planned: int = 0
+
+    @property
+    def reads_avoided(self) -> int:
+        """File reads saved by the plan."""
+        return self.reads_per_spec - self.reads_planned
+
+    @property
+    def bytes_avoided(self) -> int:
+        """Bytes of Parquet not re-read thanks to the plan."""
+        return self.bytes_per_spec - self.bytes_planned
+
+
+def spec_measurements(spec: "PlotSpec", history: pl.DataFrame) -> frozenset:
+    """
+    Measurement files a plot spec will read.
+
+    Parameters
+    ----------
+    spec : PlotSpec
+        Plot specification
+    history : pl.DataFrame
+        Chip history with ``seq``, ``proc`` and ``source_file`` columns
+        (as returned by ``get_chip_history``)
+
+    Returns
+    -------
+    frozenset[str]
+        ``source_file`` values of the selected measurements (the staged
+        Parquet paths: ``get_chip_history`` renames ``parquet_path`` to
+        ``source_file``)
+    """
+    seq_list = spec.seq if isinstance(spec.seq, list) else parse_seq_list(str(spec.seq))
+    df = history.filter(pl.col("seq").is_in(seq_list))
+    proc, _ = PLOT_TYPE_READS.get(spec.type, (None, 1))
+    if proc is not None and "proc" in df.columns:
+        df = df.filter(pl.col("proc") == proc)
+    if "source_file" not in df.columns:
+        return frozenset()
+    return frozenset(p for p in df["source_file"].to_list() if p)
+
+
+def _clusters(needs: Sequence[frozenset]) -> List[List[int]]:
+    """Group spec indices that (transitively) share a measurement."""
+    parent = list(range(len(needs)))
+
+    def find(i: int) -> int:
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    owner: Dict[str, int] = {}
+    for i, files in enumerate(needs):
+        for f in files:
+            if f in owner:
+                parent[find(i)] = find(owner[f])
+            else:
+                owner[f] = i
+
+    groups: Dict[int, List[int]] = {}
+    for i in range(len(needs)):
+        groups.setdefault(find(i), []).append(i)
+    return list(groups.values())
+
+
+def _file_size(path: str, base_dir: Path) -> int:
+    return measurement_size(base_dir / path)
+
+
+def plan_batch(
+    plot_specs: Sequence["PlotSpec"],
+    history: pl.DataFrame,
+    workers: int,
+    base_dir: Path = Path("."),
+) -> BatchPlan:
+    """
+    Cluster plot specs by shared measurements and pack them onto workers.
+
+    Clusters are kept whole when there are at least as many clusters as
+    workers; otherwise the largest clusters are split (in measurement order,
+    so the halves still share most of their files) until every worker has work.
+
+    Parameters
+    ----------
+    plot_specs : Sequence[PlotSpec]
+        Specs of one batch config (single chip)
+    history : pl.DataFrame
+        Chip history used to resolve seq numbers to measurement files
+    workers : int
+        Number of worker processes
+    base_dir : Path, optional
+        Directory ``source_file`` paths are relative to (for byte counts)
+
+    Returns
+    -------
+    BatchPlan
+        Bins of specs plus the I/O estimate
+    """
+    workers = max(1, workers)
+    needs = [spec_measurements(spec, history) for spec in plot_specs]
+    groups = _clusters(needs)
+    plan = BatchPlan(needs=needs, clusters=len(groups))
+
+    def first_file(i: int) -> str:
+        return min(needs[i]) if needs[i] else ""
+
+    # Deterministic order inside a cluster: by first measurement, then input order
+    groups = [sorted(g, key=lambda i: (first_file(i), i)) for g in groups]
+    while groups and len(groups) < workers:
+        largest = max(groups, key=len)
+        if len(largest) < 2:
+            break
+        groups.remove(largest)
+        half = len(largest) // 2
+        groups += [largest[:half], largest[half:]]
+
+    def cost(group: List[int]) -> int:
+        return sum(max(1, len(needs[i])) for i in group)
+
+    loads = [0] * min(workers, len(groups))
+    bins: List[List[int]] = [[] for _ in loads]
+    for group in sorted(groups, key=cost, reverse=True):
+        target = loads.index(min(loads))
+        bins[target].extend(group)
+        loads[target] += cost(group)
+
+    sizes: Dict[str, int] = {}
+
+    def size(path: str) -> int:
+        if path not in sizes:
+            sizes[path] = _file_size(path, base_dir)
+        return sizes[path]
+
+    for i, spec in enumerate(plot_specs):
+        _, reads = PLOT_TYPE_READS.get(spec.type, (None, 1))
+        plan.reads_per_spec += reads * len(needs[i])
+        plan.bytes_per_spec += reads * sum(size(p) for p in needs[i])
+    for members in bins:
+        files: Set[str] = set().union(*(needs[i] for i in members)) if members else set()
+        plan.reads_planned += len(files)
+        plan.bytes_planned += sum(size(p) for p in files)
+
+    plan.bins = [[plot_specs[i] for i in members] for members in bins if members]
+    return plan
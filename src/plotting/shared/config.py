@@ -276,6 +276,22 @@ class PlotConfig(BaseModel):
         description="Default baseline time (seconds) for fixed baseline mode"
     )
 
+    decimate_traces: bool = Field(
+        default=True,
+        description=(
+            "Reduce long time-series traces (It, Vt) to min/max per pixel column "
+            "before drawing. Extrema and LED on/off edges are kept; set False to "
+            "draw every sample (e.g. publication renders meant to be zoomed)."
+        )
+    )
+
+    decimation_oversample: float = Field(
+        default=1.0,
+        ge=0.25,
+        le=16.0,
+        description="Decimation buckets per pixel column of the time-series figure (figsize × dpi)"
+    )
+
     # ============================================================================
     # Legend Configuration
     # ============================================================================
@@ -382,6 +398,7 @@ class PlotConfig(BaseModel):
         ("plot_legend_loc", "legend_default_position"),
         ("plot_legend_font_scale", "legend_font_scale"),
         ("plot_legend_framealpha", "legend_framealpha"),
+        ("plot_decimate", "decimate_traces"),
     )
 
     @classmethod
@@ -391,7 +408,7 @@ class PlotConfig(BaseModel):
 
         Always-forwarded: output_dir, format, dpi, theme.
         Optionally-forwarded (only when set on CLIConfig): palette, font_family,
-        font_weight, legend_*, figsize_*. None on CLIConfig means "use
+        font_weight, legend_*, decimate_traces, figsize_*. None on CLIConfig means "use
         PlotConfig's own default for that field" — there's no value duplication.
 
         Examples
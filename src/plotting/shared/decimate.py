@@ -0,0 +1,184 @@
+"""Display-aware decimation of long time-series traces.
+
+Multi-hour It/Vt traces (and sequential plots that concatenate dozens of
+them) carry far more samples than the figure has pixel columns. Handing all
+of them to matplotlib makes drawing and ``savefig`` slow and PDF/SVG output
+huge, without changing a single rendered pixel.
+
+``decimate_minmax`` splits the x-range into one bucket per pixel column and
+keeps, per bucket, the first, last, minimum and maximum sample (in original
+order). The drawn line therefore still reaches every extremum and keeps
+every step: an LED switching on or off shows up as a min/max pair in its
+bucket. A bucket containing NaN also keeps its first NaN, so gaps in the
+trace still break the line. Indices passed as ``keep`` (e.g. ``led_edges``)
+survive verbatim.
+
+The number of buckets follows the figure: ``PlotConfig.figsize_timeseries``
+width × ``PlotConfig.dpi``, times ``PlotConfig.decimation_oversample``.
+Set ``PlotConfig.decimate_traces=False`` to draw every sample (e.g. for
+publication renders that will be zoomed or post-processed).
+
+Functions:
+- display_buckets(config, fraction): Bucket budget for a trace
+- decimate_minmax(x, y, n_buckets, keep): Min/max-per-bucket decimation
+- decimate_for_display(x, y, config, fraction, keep): Config-driven wrapper
+- led_edges(vl, vl_threshold): Sample indices where the light switches on/off
+"""
+from __future__ import annotations
+
+from typing import Optional, Tuple
+
+import numpy as np
+
+from src.plotting.shared.config import PlotConfig
+
+# Traces with at most this many samples per bucket are drawn as-is: four
+# points per bucket is what min/max decimation keeps anyway.
+_MIN_REDUCTION = 4
+
+
+def display_buckets(config: PlotConfig, fraction: float = 1.0) -> int:
+    """
+    Number of decimation buckets for a trace spanning ``fraction`` of the x-axis.
+
+    Parameters
+    ----------
+    config : PlotConfig
+        Plot configuration (time-series figure width, dpi, oversampling)
+    fraction : float, optional
+        Share of the x-axis covered by the trace (sequential plots give each
+        experiment its share). Default: 1.0
+
+    Returns
+    -------
+    int
+        Bucket count (at least 1)
+
+    Examples
+    --------
+    >>> display_buckets(PlotConfig(dpi=100, figsize_timeseries=(10.0, 5.0)))
+    1000
+    """
+    width_px = config.figsize_timeseries[0] * config.dpi * config.decimation_oversample
+    return max(1, int(width_px * min(max(fraction, 0.0), 1.0)))
+
+
+def led_edges(vl: np.ndarray, vl_threshold: float = 0.1) -> np.ndarray:
+    """
+    Indices of the samples on both sides of every light on/off transition.
+
+    Parameters
+    ----------
+    vl : np.ndarray
+        Laser/LED voltage column (``VL``)
+    vl_threshold : float
+        ``VL > vl_threshold`` means light on (as in ``segment_led``)
+
+    Returns
+    -------
+    np.ndarray
+        Sorted sample indices to keep through decimation
+    """
+    on = np.asarray(vl) > vl_threshold
+    change = np.flatnonzero(on[1:] != on[:-1])
+    return np.unique(np.concatenate([change, change + 1]))
+
+
+def decimate_minmax(
+    x: np.ndarray,
+    y: np.ndarray,
+    n_buckets: int,
+    keep: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Reduce a trace to the first/last/min/max sample of each x bucket.
+
+    Parameters
+    ----------
+    x : np.ndarray
+        Sample positions, sorted ascending
+    y : np.ndarray
+        Sample values (NaN-aware: every bucket containing a NaN keeps one,
+        so gaps keep breaking the line)
+    n_buckets : int
+        Number of equal-width buckets over ``[x[0], x[-1]]``
+    keep : np.ndarray, optional
+        Extra sample indices that must be kept (e.g. ``led_edges``)
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Decimated ``(x, y)``; the input arrays unchanged when decimation
+        would not remove enough samples or ``x`` is not sorted
+
+    Examples
+    --------
+    >>> t = np.linspace(0, 3600, 360_000)
+    >>> td, yd = decimate_minmax(t, np.sin(t), n_buckets=1000)
+    >>> len(td) <= 4000
+    True
+    """
+    x = np.asarray(x)
+    y = np.asarray(y)
+    n = len(x)
+    if n_buckets < 1 or n <= _MIN_REDUCTION * n_buckets:
+        return x, y
+    span = float(x[-1] - x[0])
+    if not np.isfinite(span) or span <= 0 or np.any(np.diff(x) < 0):
+        return x, y
+
+    bucket = np.minimum(((x - x[0]) * (n_buckets / span)).astype(np.int64), n_buckets - 1)
+    starts = np.flatnonzero(np.r_[True, bucket[1:] != bucket[:-1]])
+    ends = np.r_[starts[1:], n] - 1
+
+    # Per-bucket extrema, then the first sample hitting each of them
+    seg = np.repeat(np.arange(len(starts)), ends - starts + 1)
+    finite = np.isfinite(y)
+    lo = np.fmin.reduceat(np.where(finite, y, np.inf), starts)
+    hi = np.fmax.reduceat(np.where(finite, y, -np.inf), starts)
+    at_lo = np.flatnonzero(finite & (y == lo[seg]))
+    at_hi = np.flatnonzero(finite & (y == hi[seg]))
+    first_lo = at_lo[np.unique(seg[at_lo], return_index=True)[1]]
+    first_hi = at_hi[np.unique(seg[at_hi], return_index=True)[1]]
+    at_gap = np.flatnonzero(np.isnan(y))
+    first_gap = at_gap[np.unique(seg[at_gap], return_index=True)[1]]
+
+    parts = [starts, ends, first_lo, first_hi, first_gap]
+    if keep is not None:
+        keep = np.asarray(keep, dtype=np.int64)
+        parts.append(keep[(keep >= 0) & (keep < n)])
+    idx = np.unique(np.concatenate(parts))
+    return x[idx], y[idx]
+
+
+def decimate_for_display(
+    x: np.ndarray,
+    y: np.ndarray,
+    config: PlotConfig,
+    fraction: float = 1.0,
+    keep: Optional[np.ndarray] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Decimate a trace to the resolution of the configured time-series figure.
+
+    No-op when ``config.decimate_traces`` is False.
+
+    Parameters
+    ----------
+    x, y : np.ndarray
+        Trace samples (``x`` sorted ascending)
+    config : PlotConfig
+        Plot configuration
+    fraction : float, optional
+        Share of the x-axis covered by the trace. Default: 1.0
+    keep : np.ndarray, optional
+        Sample indices that must be kept
+
+    Returns
+    -------
+    tuple[np.ndarray, np.ndarray]
+        Decimated ``(x, y)``
+    """
+    if not config.decimate_traces:
+        return np.asarray(x), np.asarray(y)
+    return decimate_minmax(x, y, display_buckets(config, fraction), keep=keep)
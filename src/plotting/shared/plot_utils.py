@@ -379,31 +379,16 @@ def load_and_prepare_metadata(meta_csv: str, chip: float) -> pl.DataFrame:
 
 
 def segment_voltage_sweep(vg: np.ndarray, i: np.ndarray, min_segment_length: int = 5) -> List[Tuple[np.ndarray, np.ndarray, str]]:
-    """Segment a voltage sweep into monotonic sections."""
-    if len(vg) < min_segment_length:
-        return []
-    
-    dvg = np.diff(vg)
-    threshold = np.std(dvg) * 0.1
-    directions = np.zeros(len(dvg))
-    directions[dvg > threshold] = 1
-    directions[dvg < -threshold] = -1
-    
-    direction_changes = np.where(np.diff(directions) != 0)[0] + 1
-    segment_bounds = np.concatenate([[0], direction_changes, [len(vg)]])
-    
-    segments = []
-    for i_start, i_end in zip(segment_bounds[:-1], segment_bounds[1:]):
-        if i_end - i_start < min_segment_length:
-            continue
-            
-        vg_seg = vg[i_start:i_end]
-        i_seg = i[i_start:i_end]
-        direction = 'forward' if np.mean(np.diff(vg_seg)) > 0 else 'reverse'
-        
-        segments.append((vg_seg, i_seg, direction))
-    
-    return segments
+    """Segment a voltage sweep into monotonic sections (``'forward'``/``'reverse'``).
+
+    Leg boundaries come from the shared sweep geometry
+    (``src.derived.sweep_legs.SweepLegs.segments``), the same pass the CNP
+    and mobility extractors use.
+    """
+    from src.derived.sweep_legs import SweepLegs, slice_legs
+
+    vg = np.asarray(vg)
+    return slice_legs(SweepLegs(vg).segments(min_segment_length), vg, np.asarray(i))
 
 
 def _savgol_derivative_corrected(
@@ -477,6 +462,13 @@ def extract_cnp_for_plotting(
     procedure : str
         Procedure type ("IVg" or "VVg")
 
+    Notes
+    -----
+    The CNP is looked up by run_id (``src.derived.metric_lookup``): the
+    metrics store, the plot memo and an enriched ``cnp_voltage`` column are
+    tried before ``CNPExtractor`` refits the sweep. Fits done here are
+    memoized once the caller flushes ``get_metric_lookup()``.
+
     Returns
     -------
     tuple[list[float] | None, list[float] | None, float | None, float | None]
@@ -498,6 +490,7 @@ def extract_cnp_for_plotting(
     """
     try:
         from src.derived.extractors.cnp_extractor import CNPExtractor
+        from src.derived.metric_lookup import MetricValue, get_metric_lookup
 
         # Prepare metadata for CNP extractor
         metadata = {
@@ -517,9 +510,20 @@ def extract_cnp_for_plotting(
             # Try to get from metadata, or use default
             metadata['ids_a'] = row_metadata.get('ids_a', 1e-5)  # Default 10 µA
 
-        # Extract CNP
-        extractor = CNPExtractor()
-        result = extractor.extract(measurement, metadata)
+        def extract() -> Optional[MetricValue]:
+            result = CNPExtractor().extract(measurement, metadata)
+            if result is None or result.value_float is None:
+                return None
+            return MetricValue(result.value_float, result.value_json)
+
+        # Stored CNP first; fit only if derive-all-metrics has not
+        run_id = row_metadata.get('run_id')
+        if run_id:
+            result = get_metric_lookup().get_or_extract(
+                run_id, "cnp_voltage", extract, history_row=row_metadata
+            )
+        else:
+            result = extract()
 
         if result is None or result.value_float is None:
             return None, None, None, None
@@ -1055,7 +1059,10 @@ def ensure_output_directory(path: Path, verbose: bool = False) -> Path:
 
 class ParquetCache:
     """
-    Simple in-memory cache for parquet files to avoid re-reading in overlay operations.
+    Overlay-plot view of the shared data cache (``src.core.data_cache``).
+
+    Reads go through the process-wide byte-bounded LRU store; this object
+    only keeps its own hit/miss counters for reporting.
 
     Usage
     -----
@@ -1066,29 +1073,30 @@ class ParquetCache:
     """
 
     def __init__(self):
-        self._cache: Dict[str, pl.DataFrame] = {}
+        self._keys: set[str] = set()
         self._hits = 0
         self._misses = 0
 
     def read(self, path: Path | str) -> pl.DataFrame:
         """Read parquet file, using cache if available."""
-        path_str = str(path)
+        from src.core.data_cache import measurement_key, read_measurement_cached, shared_cache
 
-        if path_str in self._cache:
+        path = Path(path).resolve()
+        key = measurement_key(path)
+        if key in shared_cache():
             self._hits += 1
-            return self._cache[path_str]
-
-        # Cache miss - read from disk
-        self._misses += 1
-        from src.core.utils import read_measurement_parquet
-
-        data = read_measurement_parquet(Path(path_str))
-        self._cache[path_str] = data
-        return data
+        else:
+            self._misses += 1
+        self._keys.add(key)
+        return read_measurement_cached(path)
 
     def clear(self):
-        """Clear cache."""
-        self._cache.clear()
+        """Drop the files read through this cache and reset its counters."""
+        from src.core.data_cache import shared_cache
+
+        for key in self._keys:
+            shared_cache().invalidate(key)
+        self._keys.clear()
         self._hits = 0
         self._misses = 0
 
@@ -1100,7 +1108,7 @@ class ParquetCache:
             "hits": self._hits,
             "misses": self._misses,
             "hit_rate": hit_rate,
-            "cached_files": len(self._cache)
+            "cached_files": len(self._keys)
         }
 
     def __repr__(self) -> str:
@@ -9,6 +9,7 @@ import numpy as np
 import matplotlib.pyplot as plt
 import polars as pl
 
+from src.core.packed_store import measurement_exists
 from src.core.utils import read_measurement_parquet
 from src.plotting.shared.config import PlotConfig
 from src.plotting.shared.plot_utils import (
@@ -208,7 +209,7 @@ def plot_ivg_transconductance(
 
     for meas_idx, row in enumerate(ivg.iter_rows(named=True)):
         path = base_dir / row["source_file"]
-        if not path.exists():
+        if not measurement_exists(path):
             logger.warning(f"missing file: {path}")
             continue
 
@@ -377,7 +378,7 @@ def plot_ivg_transconductance_savgol(
 
     for meas_idx, row in enumerate(ivg.iter_rows(named=True)):
         path = base_dir / row["source_file"]
-        if not path.exists():
+        if not measurement_exists(path):
             logger.warning(f"missing file: {path}")
             continue
 
@@ -12,8 +12,10 @@ import matplotlib.pyplot as plt
 import numpy as np
 import polars as pl
 
+from src.core.packed_store import measurement_exists
 from src.core.utils import read_measurement_parquet
 from src.plotting.shared.config import PlotConfig
+from src.plotting.shared.decimate import decimate_for_display, led_edges
 from src.plotting.shared.formatters import get_legend_formatter, normalize_legend_by
 from src.plotting.shared.plot_utils import (
     interpolate_baseline,
@@ -247,7 +249,7 @@ def plot_vt_overlay(
 
     for row in vt.iter_rows(named=True):
         path = base_dir / row["source_file"]
-        if not path.exists():
+        if not measurement_exists(path):
             logger.warning(f"missing file: {path}")
             continue
 
@@ -265,10 +267,14 @@ def plot_vt_overlay(
         if tt.size == 0 or yy.size == 0:
             logger.warning(f"empty/invalid series in {path}")
             continue
+        vl = np.asarray(d["VL"]) if "VL" in d.columns else None
         if not np.all(np.diff(tt) >= 0):
             idx = np.argsort(tt)
             tt = tt[idx]
             yy = yy[idx]
+            vl = vl[idx] if vl is not None else None
+        # LED on/off edges survive trace decimation
+        edges = led_edges(vl) if vl is not None else None
 
         # baseline correction (three modes)
         if apply_baseline == "interpolate":
@@ -309,14 +315,15 @@ def plot_vt_overlay(
             visible_mask = tt >= plot_start_time
             all_y_values.extend(R[visible_mask])
 
-            plt.plot(tt, R, label=lbl)
+            plt.plot(*decimate_for_display(tt, R, config, keep=edges), label=lbl)
         else:
             # Store y-values ONLY for the visible time window (t >= plot_start_time)
             # Convert to mV for display
             visible_mask = tt >= plot_start_time
             all_y_values.extend((yy_corr * 1e3)[visible_mask])
 
-            plt.plot(tt, yy_corr * 1e3, label=lbl)  # Convert V to mV
+            # Convert V to mV
+            plt.plot(*decimate_for_display(tt, yy_corr * 1e3, config, keep=edges), label=lbl)
 
         curves_plotted += 1
 
@@ -567,7 +574,7 @@ def plot_vt_sequential(
         if not fp.is_absolute():
             fp = base_dir / fp
 
-        if not fp.exists():
+        if not measurement_exists(fp):
             logger.warning(f"File not found: {fp}")
             continue
 
@@ -593,6 +600,8 @@ def plot_vt_sequential(
         mask = tt >= plot_start_time
         tt_trimmed = tt[mask]
         yy_trimmed = yy[mask]
+        # LED on/off edges survive trace decimation
+        edges = led_edges(np.asarray(d["VL"])[mask]) if "VL" in d.columns else None
 
         if len(tt_trimmed) == 0:
             logger.warning(f"No data after trimming to t>={plot_start_time}s for experiment {i}")
@@ -652,7 +661,7 @@ def plot_vt_sequential(
         tt_offset = tt_trimmed + time_offset
         color = colors[i % num_colors]
 
-        experiment_segments.append((tt_offset, yy_plot, lbl, color))
+        experiment_segments.append((tt_offset, yy_plot, lbl, color, edges))
         all_y_values.extend(yy_plot)
 
         time_offset += tt_trimmed[-1]
@@ -670,7 +679,11 @@ def plot_vt_sequential(
 
     plt.figure(figsize=config.figsize_timeseries)
 
-    for tt_seg, yy_seg, label, color in experiment_segments:
+    # Each experiment gets the share of the figure width its time span covers
+    total_span = max(float(time_offset), 1e-12)
+    for tt_seg, yy_seg, label, color, edges in experiment_segments:
+        fraction = float(tt_seg[-1] - tt_seg[0]) / total_span
+        tt_seg, yy_seg = decimate_for_display(tt_seg, yy_seg, config, fraction=fraction, keep=edges)
         plt.plot(tt_seg, yy_seg, linewidth=4, color=color, label=label)
 
     if show_boundaries and len(experiment_boundaries) > 1:
@@ -0,0 +1,131 @@
+"""
+Tests for vectorized laser calibration matching.
+
+Covers:
+- before/after preference, stale threshold and missing-wavelength statuses
+- find_calibration agrees with the bulk match_calibrations path
+- calibration curves are read once and powers interpolated per experiment
+- enrich_chip_histories matches several chips in one pass
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import polars as pl
+import pytest
+
+from src.core.manifest_index import clear_manifest_index_cache
+from src.derived.extractors.calibration_matcher import CalibrationMatcher
+
+T0 = datetime(2025, 9, 15, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_manifest_index_cache()
+    yield
+    clear_manifest_index_cache()
+
+
+def _matcher(tmp_path: Path) -> CalibrationMatcher:
+    rows = []
+    # 455nm at T0 and T0+48h (slope 1e-3 W/V), 365nm at T0+10h (slope 2e-3 W/V)
+    for i, (wavelength, hours, slope) in enumerate([(455.0, 0, 1e-3), (455.0, 48, 1e-3), (365.0, 10, 2e-3)]):
+        path = tmp_path / f"cal_{i}.parquet"
+        voltages = np.linspace(0.0, 5.0, 6)
+        pl.DataFrame({"VL (V)": voltages, "Power (W)": voltages * slope}).write_parquet(path)
+        rows.append({
+            "run_id": f"cal{i:013d}",
+            "proc": "LaserCalibration",
+            "wavelength_nm": wavelength,
+            "start_time_utc": (T0 + timedelta(hours=hours)).isoformat(),
+            "path": str(path),
+        })
+    manifest_path = tmp_path / "manifest.parquet"
+    pl.DataFrame(rows).write_parquet(manifest_path)
+    return CalibrationMatcher(manifest_path)
+
+
+def _experiments() -> pl.DataFrame:
+    return pl.DataFrame({
+        "start_dt": [T0 + timedelta(hours=h) for h in (2, 30, 5, -3, 1, 0)],
+        "wavelength_nm": [455.0, 455.0, 365.0, 455.0, None, 455.0],
+    })
+
+
+def test_match_statuses_and_deltas(tmp_path):
+    matched = _matcher(tmp_path).match_calibrations(_experiments(), stale_threshold_hours=24.0)
+
+    assert matched["calibration_status"].to_list() == [
+        "perfect",  # 2h after the T0 calibration
+        "stale",    # 30h after T0, next calibration is in the future
+        "future",   # only 365nm calibration is 5h later
+        "future",   # before any 455nm calibration
+        "missing",  # no wavelength
+        "future",   # exact-time match is skipped in favour of the next one
+    ]
+    assert matched["calibration_time_delta_hours"].to_list()[:4] == [2.0, 30.0, -5.0, -3.0]
+    assert matched["calibration_parquet_path"][0].endswith("cal_0.parquet")
+    assert matched["calibration_parquet_path"][5].endswith("cal_1.parquet")
+    assert matched["calibration_warning"][4] == "No wavelength data in experiment"
+    assert matched.columns[:2] == ["start_dt", "wavelength_nm"]
+
+
+def test_find_calibration_matches_bulk_path(tmp_path):
+    matcher = _matcher(tmp_path)
+    matched = matcher.match_calibrations(_experiments())
+    for row in matched.filter(pl.col("wavelength_nm").is_not_null()).iter_rows(named=True):
+        match = matcher.find_calibration(row["start_dt"], row["wavelength_nm"])
+        assert match.status == row["calibration_status"]
+        assert match.calibration_path == row["calibration_parquet_path"]
+        assert match.warning == row["calibration_warning"]
+
+    unknown = matcher.find_calibration(T0, 660.0)
+    assert unknown.status == "missing"
+    assert unknown.warning == "No calibration found for 660nm. Available: [365nm, 455nm]"
+
+
+def test_interpolate_powers_reads_each_curve_once(tmp_path):
+    matcher = _matcher(tmp_path)
+    cal = str(tmp_path / "cal_0.parquet")
+    powers = matcher.interpolate_powers(
+        pl.Series([cal, cal, None, str(tmp_path / "cal_2.parquet"), str(tmp_path / "nope.parquet")]),
+        pl.Series([1.0, 2.5, 1.0, 1.0, 1.0]),
+    )
+    assert powers.to_list()[:2] == pytest.approx([1e-3, 2.5e-3])
+    assert powers[3] == pytest.approx(2e-3)
+    assert powers[2] is None and powers[4] is None
+    assert sorted(Path(p).name for p in matcher._curves) == ["cal_0.parquet", "cal_2.parquet", "nope.parquet"]
+    assert matcher.get_power_from_calibration(cal, 4.0) == pytest.approx(4e-3)
+
+
+def test_enrich_chip_histories_single_pass(tmp_path):
+    matcher = _matcher(tmp_path)
+    history_dir = tmp_path / "chip_histories"
+    history_dir.mkdir()
+    for chip, hours in ((67, [2, 30]), (68, [5])):
+        pl.DataFrame({
+            "seq": list(range(1, len(hours) + 2)),
+            "proc": ["It"] * len(hours) + ["IVg"],
+            "has_light": [True] * len(hours) + [False],
+            "start_time_utc": [T0 + timedelta(hours=h) for h in hours] + [T0],
+            "wavelength_nm": [455.0] * len(hours) + [None],
+            "laser_voltage_v": [2.0] * len(hours) + [None],
+        }).write_parquet(history_dir / f"Alisson{chip}_history.parquet")
+
+    out = tmp_path / "enriched"
+    reports = matcher.enrich_chip_histories(
+        sorted(history_dir.glob("*_history.parquet")) + [history_dir / "Alisson99_history.parquet"],
+        output_dir=out,
+    )
+    assert [r.chip_name for r in reports] == ["Alisson67", "Alisson68", "Alisson99"]
+    assert (reports[0].matched_perfect, reports[0].matched_stale) == (1, 1)
+    assert reports[0].warnings == ["seq 2: Calibration is 30.0h old (>24h threshold)"]
+    assert (reports[1].total_light_exps, reports[1].matched_perfect) == (1, 1)
+    assert reports[2].errors
+
+    enriched = pl.read_parquet(out / "Alisson67_history.parquet")
+    assert enriched["seq"].to_list() == [1, 2, 3]
+    assert enriched["irradiated_power_w"].to_list()[:2] == pytest.approx([2e-3, 2e-3])
+    assert enriched["irradiated_power_w"][2] is None
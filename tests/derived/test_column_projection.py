@@ -0,0 +1,110 @@
+"""
+Tests for extractor-driven column projection of measurement reads.
+
+Covers:
+- read_measurement_parquet(columns=...) reads only existing requested columns
+- with_metadata=False leaves manifest metadata out of the frame
+- MetricPipeline reads the union of the extractors' required_columns
+- an extractor without required_columns falls back to a full read
+"""
+
+from typing import List, Optional
+
+import polars as pl
+
+from src.core.utils import read_measurement_parquet
+from src.derived.extractors.base import MetricExtractor
+from src.derived.metric_pipeline import MetricPipeline, column_projection
+
+
+def _stage(tmp_path):
+    """One staged It measurement plus its manifest, in the Hive layout."""
+    stage_root = tmp_path / "raw_measurements"
+    part = stage_root / "proc=It" / "date=2025-09-15" / "run_id=r1" / "part-000.parquet"
+    part.parent.mkdir(parents=True)
+    pl.DataFrame({
+        "run_id": ["r1", "r1"],
+        "t (s)": [0.0, 1.0],
+        "I (A)": [1.0, 2.0],
+        "VL (V)": [0.0, 3.0],
+        "Vg (V)": [0.5, 0.5],
+        "T (K)": [300.0, 300.0],
+    }).write_parquet(part)
+    manifest = stage_root / "_manifest" / "manifest.parquet"
+    manifest.parent.mkdir(parents=True)
+    pl.DataFrame({"run_id": ["r1"], "proc": ["It"], "chip_number": [67]}).write_parquet(manifest)
+    return part, manifest
+
+
+class _ColumnProbe(MetricExtractor):
+    """Records the columns of the measurement it is handed."""
+
+    def __init__(self, name: str, columns: Optional[List[str]], seen: list):
+        self._name = name
+        self._columns = columns
+        self.seen = seen
+
+    @property
+    def applicable_procedures(self):
+        return ["It"]
+
+    @property
+    def metric_name(self):
+        return self._name
+
+    @property
+    def metric_category(self):
+        return "photoresponse"
+
+    @property
+    def required_columns(self):
+        return self._columns
+
+    def extract(self, measurement, metadata):
+        self.seen.append(measurement.columns)
+        return None
+
+    def validate(self, result):
+        return True
+
+
+def test_projected_read_skips_missing_columns_and_metadata(tmp_path):
+    part, manifest = _stage(tmp_path)
+
+    full = read_measurement_parquet(part, manifest)
+    assert "chip_number" in full.columns and "T (K)" in full.columns
+
+    projected = read_measurement_parquet(
+        part, manifest, columns=["I (A)", "t (s)", "VDS (V)"], with_metadata=False
+    )
+    assert projected.columns == ["t (s)", "I (A)"]
+
+    with_meta = read_measurement_parquet(part, manifest, columns=["I (A)"])
+    assert {"run_id", "I (A)", "chip_number"} <= set(with_meta.columns)
+    assert "t (s)" not in with_meta.columns
+
+
+def test_pipeline_reads_union_of_required_columns(tmp_path):
+    part, manifest = _stage(tmp_path)
+    seen: list = []
+    extractors = [
+        _ColumnProbe("a", ["t (s)", "I (A)"], seen),
+        _ColumnProbe("b", ["VL (V)", "t (s)"], seen),
+    ]
+    pipeline = MetricPipeline(
+        base_dir=tmp_path, extractors=extractors, pairwise_extractors=[],
+        manifest_path=manifest,
+    )
+
+    pipeline._extract_cells({"run_id": "r1", "proc": "It", "path": str(part)})
+    assert seen == [["t (s)", "I (A)", "VL (V)"]] * 2
+
+    extractors.append(_ColumnProbe("c", None, seen))
+    assert column_projection(extractors) is None
+    seen.clear()
+    pipeline = MetricPipeline(
+        base_dir=tmp_path, extractors=extractors, pairwise_extractors=[],
+        manifest_path=manifest,
+    )
+    pipeline._extract_cells({"run_id": "r1", "proc": "It", "path": str(part)})
+    assert "T (K)" in seen[0] and "chip_number" in seen[0]
@@ -324,6 +324,16 @@ class TestMobilityExtractor:
             ).extract(df, meta) is None
 
 
+    def test_fingerprint_tracks_encap_yaml_contents(self, tmp_path):
+        encap = tmp_path / "encap.yaml"
+        encap.write_text("geometry:\n  aspect_ratio_LW: 2.0\n")
+        before = MobilityExtractor(branch="holes", encap_yaml_path=encap).fingerprint
+        assert MobilityExtractor(branch="holes", encap_yaml_path=encap).fingerprint == before
+
+        encap.write_text("geometry:\n  aspect_ratio_LW: 3.0\n")
+        assert MobilityExtractor(branch="holes", encap_yaml_path=encap).fingerprint != before
+
+
 class TestPhotoresponseExtractor:
     def test_basic_photoresponse(self):
         """Test basic photoresponse extraction."""
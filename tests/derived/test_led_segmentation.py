@@ -0,0 +1,117 @@
+"""
+Tests for the shared LED phase segmentation.
+
+Covers:
+- ON/OFF runs, transition edges and the compact phase table
+- pre-dark / light / post-dark windows and dark-after-light selection
+- one SegmentedMeasurement per measurement, shared by every extractor
+"""
+
+import numpy as np
+import polars as pl
+
+from src.derived.extractors.base import MetricExtractor
+from src.derived.led_segmentation import (
+    SEGMENTATION_KEY,
+    SegmentedMeasurement,
+    segment_led,
+    segmented,
+)
+from src.derived.metric_pipeline import MetricPipeline
+
+
+def _vl(n: int, pulses) -> np.ndarray:
+    vl = np.zeros(n)
+    for start, end in pulses:
+        vl[start:end] = 3.0
+    return vl
+
+
+def test_runs_edges_and_phase_table():
+    seg = segment_led(_vl(20, [(0, 3), (8, 15)]), 0.1, time=np.arange(20) * 0.5)
+
+    assert seg.on_starts.tolist() == [0, 8] and seg.on_ends.tolist() == [3, 15]
+    assert seg.off_starts.tolist() == [3, 15] and seg.off_ends.tolist() == [8, 20]
+    assert seg.rising_edges.tolist() == [8]
+    assert seg.falling_edges.tolist() == [3, 15]
+
+    phases = seg.phases
+    assert phases["led_on"].to_list() == [True, False, True, False]
+    assert phases["start"].to_list() == [0, 3, 8, 15]
+    assert phases["n_points"].sum() == 20
+    assert phases["t_end"].to_list() == [1.0, 3.5, 7.0, 9.5]
+    assert phases["vl_mean"].to_list() == [3.0, 0.0, 3.0, 0.0]
+
+
+def test_main_pulse_windows_and_dark_after_light():
+    seg = segment_led(_vl(30, [(5, 8), (12, 20)]), 0.1, time=np.arange(30.0))
+    assert seg.longest_on_run() == (12, 20)
+    assert seg.main_pulse_windows() == {"pre_dark": (0, 12), "light": (12, 20), "post_dark": (20, 30)}
+    assert seg.longest_dark_after_light() == (20, 30)
+    assert seg.longest_off_run() == (20, 30)
+
+    always_on = segment_led(np.ones(10), 0.1, time=np.arange(10.0))
+    assert always_on.main_pulse_windows() == {"pre_dark": None, "light": (0, 10), "post_dark": None}
+    assert always_on.longest_dark_after_light() is None
+
+    dark = segment_led(np.zeros(10), 0.1)
+    assert not dark.has_light and dark.main_pulse_windows() is None
+    assert dark.phases.height == 1
+
+
+def test_segmented_is_cached_per_measurement():
+    measurement = pl.DataFrame({"t (s)": [0.0, 1.0, 2.0], "I (A)": [1.0, 2.0, 3.0], "VL (V)": [0.0, 3.0, 0.0]})
+    shared = SegmentedMeasurement(measurement)
+    metadata = {SEGMENTATION_KEY: shared}
+
+    assert segmented(measurement, metadata) is shared
+    assert segmented(measurement.clone(), metadata) is not shared
+    assert shared.column("I (A)") is shared.column("I (A)")
+    assert not shared.column("I (A)").flags.writeable
+    assert shared.segmentation(0.1) is shared.segmentation(0.1)
+    assert shared.column("missing") is None
+
+
+class _SegmentationProbe(MetricExtractor):
+    """Records the SegmentedMeasurement it is handed."""
+
+    def __init__(self, name: str, seen: list):
+        self._name = name
+        self.seen = seen
+
+    @property
+    def applicable_procedures(self):
+        return ["It"]
+
+    @property
+    def metric_name(self):
+        return self._name
+
+    @property
+    def metric_category(self):
+        return "photoresponse"
+
+    def extract(self, measurement, metadata):
+        self.seen.append(segmented(measurement, metadata))
+        return None
+
+    def validate(self, result):
+        return True
+
+
+def test_pipeline_shares_one_segmentation_per_measurement(tmp_path):
+    part = tmp_path / "part-000.parquet"
+    pl.DataFrame({"t (s)": [0.0, 1.0], "I (A)": [1.0, 2.0], "VL (V)": [0.0, 3.0]}).write_parquet(part)
+    seen: list = []
+    pipeline = MetricPipeline(
+        base_dir=tmp_path,
+        extractors=[_SegmentationProbe("probe_a", seen), _SegmentationProbe("probe_b", seen)],
+        pairwise_extractors=[],
+    )
+
+    metadata = {"run_id": "r1", "proc": "It", "path": str(part)}
+    _, done = pipeline._extract_cells(metadata)
+
+    assert done == ["probe_a", "probe_b"]
+    assert len(seen) == 2 and seen[0] is seen[1]
+    assert SEGMENTATION_KEY not in metadata
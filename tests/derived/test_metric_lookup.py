@@ -0,0 +1,104 @@
+"""
+Tests for the run_id-keyed metric lookup used by plot overlays.
+
+Covers:
+- stored metrics are served without extracting
+- misses are extracted once, memoized on flush and read back by a new process
+- store rows win over memo rows; enriched history columns are used before extracting
+- extract_cnp_for_plotting takes the CNP from the store instead of refitting
+"""
+
+import json
+from datetime import datetime, timezone
+
+import numpy as np
+import polars as pl
+
+from src.derived import metric_lookup
+from src.derived.metric_lookup import MetricLookup, MetricValue, clear_metric_lookup_cache
+from src.derived.metrics_store import append_metrics, metrics_to_frame
+from src.models.derived_metrics import DerivedMetric
+
+R1, R2 = (f"run_{i:012d}" for i in (1, 2))
+
+
+def _store(metrics_dir, run_id, name, value, value_json=None):
+    append_metrics(metrics_dir, metrics_to_frame([DerivedMetric(
+        run_id=run_id,
+        chip_number=67,
+        chip_group="Alisson",
+        procedure="IVg",
+        metric_name=name,
+        metric_category="electrical",
+        value_float=value,
+        value_json=value_json,
+        unit="V",
+        extraction_method="test",
+        extraction_version="v1",
+        extraction_timestamp=datetime.now(timezone.utc),
+    )]))
+
+
+def _fail():
+    raise AssertionError("extractor must not run")
+
+
+def test_store_memo_and_history_sources(tmp_path):
+    metrics_dir = tmp_path / "_metrics"
+    _store(metrics_dir, R1, "cnp_voltage", 0.4)
+
+    lookup = MetricLookup(metrics_dir)
+    assert lookup.get_or_extract(R1, "cnp_voltage", _fail) == MetricValue(0.4, None, "store")
+
+    calls = []
+
+    def extract():
+        calls.append(1)
+        return MetricValue(0.7, '{"all_cnps": [0.7]}')
+
+    assert lookup.get_or_extract(R2, "cnp_voltage", extract).source == "extracted"
+    assert lookup.get_or_extract(R2, "cnp_voltage", extract).source == "memo"
+    assert len(calls) == 1
+    assert lookup.flush() == 1 and lookup.flush() == 0
+
+    # A new process reads the memo back
+    fresh = MetricLookup(metrics_dir)
+    assert fresh.get_or_extract(R2, "cnp_voltage", _fail) == MetricValue(0.7, '{"all_cnps": [0.7]}', "memo")
+
+    # The derive step's value supersedes the memo
+    _store(metrics_dir, R2, "cnp_voltage", 0.8)
+    assert MetricLookup(metrics_dir).get(R2, "cnp_voltage").value_float == 0.8
+
+    # Enriched history column before extracting; failed extractions are not retried
+    lookup = MetricLookup(metrics_dir)
+    row = {"delta_current": 1e-9}
+    assert lookup.get_or_extract(R1, "delta_current", _fail, history_row=row).source == "history"
+    calls.clear()
+    assert lookup.get_or_extract(R1, "tau_dark", lambda: calls.append(1)) is None
+    assert lookup.get_or_extract(R1, "tau_dark", lambda: calls.append(1)) is None
+    assert len(calls) == 1 and lookup.flush() == 0
+
+
+def test_cnp_overlay_uses_stored_cnp(tmp_path, monkeypatch):
+    from src.derived.extractors.cnp_extractor import CNPExtractor
+    from src.plotting.shared.plot_utils import extract_cnp_for_plotting
+
+    metrics_dir = tmp_path / "_metrics"
+    _store(metrics_dir, R1, "cnp_voltage", 0.5,
+           value_json=json.dumps({"all_cnps": [{"vg": 0.4}, {"vg": 0.6}]}))
+    monkeypatch.setattr(metric_lookup, "DEFAULT_METRICS_DIR", metrics_dir)
+    monkeypatch.setattr(CNPExtractor, "extract", lambda *a, **k: _fail())
+    clear_metric_lookup_cache()
+
+    vg = np.linspace(-1, 1, 21)
+    measurement = pl.DataFrame({"Vg (V)": vg, "I (A)": 1e-6 * (1 + vg ** 2)})
+    try:
+        all_vg, all_i, avg_vg, avg_i = extract_cnp_for_plotting(
+            measurement, {"run_id": R1, "vds_v": 0.1}, "IVg"
+        )
+    finally:
+        clear_metric_lookup_cache()
+
+    assert all_vg == [0.4, 0.6] and avg_vg == 0.5
+    assert avg_i == measurement["I (A)"][15]
+    assert len(all_i) == 2
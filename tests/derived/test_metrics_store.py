@@ -0,0 +1,244 @@
+"""
+Tests for incremental metric extraction and the metrics store.
+
+Covers:
+- appended rows supersede rows with the same (run_id, metric_name), the rest is kept
+- Hive layout metric_name=/chip_group=/chip_number= and partition-pruned scans
+- compaction (including migration of a legacy metrics.parquet)
+- extraction ledger round-trip and seeding from an existing metrics.parquet
+  (pairwise metrics keep the partner run_id from their value_json)
+- derive_all_metrics(skip_existing=True) only runs pending cells, including
+  extractors that returned no metric on the previous run
+- extractor fingerprints: changing one extractor's parameters marks only its
+  cells stale (plan_extraction), and only those are re-extracted; cells
+  recorded before fingerprints existed adopt the current fingerprint
+"""
+
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+import polars as pl
+
+from src.derived.extractors.base import MetricExtractor
+from src.derived.metric_pipeline import MetricPipeline
+from src.derived.metrics_store import (
+    ExtractionLedger,
+    METRICS_FILENAME,
+    append_metrics,
+    compact_metrics,
+    dataset_dir,
+    load_metrics,
+    metrics_to_frame,
+    scan_metrics,
+)
+from src.models.derived_metrics import DerivedMetric
+
+R1, R2, R3 = (f"run_{i:012d}" for i in (1, 2, 3))
+
+
+def _metric(run_id: str, name: str, value: float, chip: int = 67) -> DerivedMetric:
+    return DerivedMetric(
+        run_id=run_id,
+        chip_number=chip,
+        chip_group="Alisson",
+        procedure="It",
+        metric_name=name,
+        metric_category="photoresponse",
+        value_float=value,
+        unit="A",
+        extraction_method="test",
+        extraction_version="v1",
+        extraction_timestamp=datetime.now(timezone.utc),
+    )
+
+
+class _CountingExtractor(MetricExtractor):
+    """Records every run_id it sees; returns None for run_ids in ``no_result``."""
+
+    def __init__(self, name: str, no_result: Optional[set] = None, scale: float = 1.0):
+        self._name = name
+        self.no_result = no_result or set()
+        self.scale = scale
+        self.seen: List[str] = []
+
+    @property
+    def applicable_procedures(self) -> List[str]:
+        return ["It"]
+
+    @property
+    def metric_name(self) -> str:
+        return self._name
+
+    @property
+    def metric_category(self) -> str:
+        return "photoresponse"
+
+    def extract(self, measurement, metadata):
+        self.seen.append(metadata["run_id"])
+        if metadata["run_id"] in self.no_result:
+            return None
+        return _metric(metadata["run_id"], self._name, self.scale * float(measurement["I (A)"].sum()),
+                       chip=metadata["chip_number"])
+
+    def validate(self, result):
+        return True
+
+
+def _stage(base: Path, run_ids: List[str]) -> Path:
+    stage_root = base / "data" / "02_stage" / "raw_measurements"
+    rows = []
+    for i, rid in enumerate(run_ids):
+        part = stage_root / "proc=It" / "date=2025-09-15" / f"run_id={rid}" / "part-000.parquet"
+        part.parent.mkdir(parents=True, exist_ok=True)
+        pl.DataFrame({"t (s)": [0.0, 1.0], "I (A)": [1.0, float(i)]}).write_parquet(part)
+        rows.append({
+            "run_id": rid, "proc": "It", "chip_number": 67, "chip_group": "Alisson",
+            "start_time_utc": datetime(2025, 9, 15, 10, i, tzinfo=timezone.utc),
+            "path": str(part),
+        })
+    manifest_path = stage_root / "_manifest" / "manifest.parquet"
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    pl.DataFrame(rows).write_parquet(manifest_path)
+    return manifest_path
+
+
+def test_append_supersedes_matching_keys_and_keeps_others(tmp_path):
+    append_metrics(tmp_path, metrics_to_frame([_metric(R1, "m_a", 1.0), _metric(R2, "m_a", 2.0)]))
+    append_metrics(tmp_path, metrics_to_frame([_metric(R1, "m_a", 10.0), _metric(R1, "m_b", 3.0)]))
+
+    merged = load_metrics(tmp_path)
+    assert merged.height == 3
+    values = {(r["run_id"], r["metric_name"]): r["value_float"] for r in merged.iter_rows(named=True)}
+    assert values == {(R1, "m_a"): 10.0, (R2, "m_a"): 2.0, (R1, "m_b"): 3.0}
+    assert scan_metrics(tmp_path, deduplicate=False).collect().height == 4
+
+
+def test_partition_layout_and_filtered_scan(tmp_path):
+    append_metrics(tmp_path, metrics_to_frame([
+        _metric(R1, "cnp_voltage", 1.0, chip=67),
+        _metric(R2, "cnp_voltage", 2.0, chip=68),
+    ]))
+    part_dir = dataset_dir(tmp_path) / "metric_name=cnp_voltage" / "chip_group=Alisson" / "chip_number=67"
+    assert len(list(part_dir.glob("part-*.parquet"))) == 1
+
+    lf = scan_metrics(tmp_path, chip_group="Alisson", chip_number=67, metric_names="cnp_voltage")
+    assert "chip_number=68" not in lf.explain()
+    df = lf.collect()
+    assert df["run_id"].to_list() == [R1]
+    assert df.columns == load_metrics(tmp_path).columns
+
+
+def test_compaction_folds_parts_and_migrates_legacy(tmp_path):
+    metrics_to_frame([_metric(R3, "m_a", 0.5)]).write_parquet(tmp_path / METRICS_FILENAME)
+    append_metrics(tmp_path, metrics_to_frame([_metric(R1, "m_a", 1.0)]))
+    append_metrics(tmp_path, metrics_to_frame([_metric(R1, "m_a", 10.0)]))
+    before = load_metrics(tmp_path)
+
+    report = compact_metrics(tmp_path)
+    assert report.legacy_migrated
+    assert report.partitions_compacted == 1
+    assert report.rows_before == 3 and report.rows_after == 2
+    assert not (tmp_path / METRICS_FILENAME).exists()
+    assert len(list(dataset_dir(tmp_path).rglob("part-*.parquet"))) == 1
+    assert load_metrics(tmp_path).drop("extraction_timestamp").equals(
+        before.drop("extraction_timestamp")
+    )
+
+
+def test_ledger_roundtrip_and_seed(tmp_path):
+    append_metrics(tmp_path, metrics_to_frame([_metric(R1, "m_a", 1.0)]))
+
+    seeded = ExtractionLedger.load(tmp_path)
+    assert seeded.is_done(R1, "m_a")
+    assert not seeded.is_done(R1, "m_b")
+
+    seeded.mark(R2, "m_pair", "v1", partner_run_id=R1)
+    seeded.save()
+
+    loaded = ExtractionLedger.load(tmp_path)
+    assert loaded.is_done(R2, "m_pair", R1)
+    assert not loaded.is_done(R2, "m_pair")
+    assert loaded.is_done(R1, "m_a")
+
+
+def test_ledger_seeds_pairwise_partner_from_value_json(tmp_path):
+    pair = _metric(R2, "m_pair", 1.0).model_copy(update={"value_json": f'{{"run_id_1": "{R1}"}}'})
+    append_metrics(tmp_path, metrics_to_frame([_metric(R1, "m_a", 1.0), pair]))
+
+    seeded = ExtractionLedger.load(tmp_path)
+    assert seeded.is_done(R2, "m_pair", R1)
+    assert not seeded.is_done(R2, "m_pair")
+    assert seeded.is_done(R1, "m_a")
+
+
+def test_incremental_run_only_processes_pending_cells(tmp_path):
+    _stage(tmp_path, [R1, R2])
+    ext = _CountingExtractor("resp", no_result={R2})
+    pipeline = MetricPipeline(base_dir=tmp_path, extractors=[ext], pairwise_extractors=[],
+                              extraction_version="v1")
+
+    metrics_dir = pipeline.derive_all_metrics(parallel=False, skip_existing=True)
+    assert sorted(ext.seen) == [R1, R2]
+    assert load_metrics(metrics_dir)["run_id"].to_list() == [R1]
+
+    # Nothing new: r2 returned None but is recorded as processed
+    ext.seen.clear()
+    pipeline.derive_all_metrics(parallel=False, skip_existing=True)
+    assert ext.seen == []
+
+    # A new measurement and a new extractor: only the missing cells run
+    _stage(tmp_path, [R1, R2, R3])
+    ext2 = _CountingExtractor("resp2")
+    pipeline = MetricPipeline(base_dir=tmp_path, extractors=[ext, ext2], pairwise_extractors=[],
+                              extraction_version="v1")
+    pipeline.derive_all_metrics(parallel=False, skip_existing=True)
+    assert ext.seen == [R3]
+    assert sorted(ext2.seen) == [R1, R2, R3]
+
+    df = load_metrics(metrics_dir)
+    assert df.height == 5
+    assert df.filter(pl.col("metric_name") == "resp")["run_id"].sort().to_list() == [R1, R3]
+
+
+def test_ledger_fingerprints_and_adoption(tmp_path):
+    append_metrics(tmp_path, metrics_to_frame([_metric(R1, "m_a", 1.0)]))
+
+    # Seeded cells have no fingerprint: they adopt the current one
+    seeded = ExtractionLedger.load(tmp_path)
+    assert seeded.status(R1, "m_a", fingerprint="f1") == "done"
+    assert seeded.status(R1, "m_a", fingerprint="f2") == "stale"
+    assert seeded.status(R2, "m_a", fingerprint="f1") == "missing"
+    seeded.save()
+
+    loaded = ExtractionLedger.load(tmp_path)
+    assert loaded.is_done(R1, "m_a", fingerprint="f1")
+    assert not loaded.is_done(R1, "m_a", fingerprint="f2")
+    assert loaded.is_done(R1, "m_a")
+
+
+def test_changed_parameters_rerun_only_stale_cells(tmp_path):
+    _stage(tmp_path, [R1, R2])
+    ext, ext2 = _CountingExtractor("resp"), _CountingExtractor("resp2")
+    pipeline = MetricPipeline(base_dir=tmp_path, extractors=[ext, ext2], pairwise_extractors=[],
+                              extraction_version="v1")
+    metrics_dir = pipeline.derive_all_metrics(parallel=False, skip_existing=True)
+
+    plan = pipeline.plan_extraction()
+    assert plan.select("extractor", "up_to_date", "stale", "missing").rows() == [
+        ("resp", 2, 0, 0), ("resp2", 2, 0, 0),
+    ]
+
+    ext2.scale = 10.0
+    plan = pipeline.plan_extraction()
+    assert plan.select("extractor", "stale").rows() == [("resp", 0), ("resp2", 2)]
+    assert plan["fingerprint"].to_list() == [ext.fingerprint, ext2.fingerprint]
+
+    ext.seen.clear()
+    ext2.seen.clear()
+    pipeline.derive_all_metrics(parallel=False, skip_existing=True)
+    assert ext.seen == [] and sorted(ext2.seen) == [R1, R2]
+    assert pipeline.plan_extraction()["stale"].to_list() == [0, 0]
+
+    df = load_metrics(metrics_dir).filter(pl.col("run_id") == R2).sort("metric_name")
+    assert df["value_float"].to_list() == [2.0, 20.0]
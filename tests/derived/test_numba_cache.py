@@ -0,0 +1,53 @@
+"""
+Tests for the Numba compilation cache and kernel warm-up.
+
+Covers:
+- configure_numba_cache exports the directory to spawned workers
+- clear_numba_cache only removes compiled kernel files
+- warmup calls every kernel and splits JIT from compute time
+"""
+
+import os
+import sys
+
+from src.derived.algorithms.numba_cache import (
+    ENV_VAR,
+    KernelTiming,
+    clear_numba_cache,
+    configure_numba_cache,
+    warmup,
+)
+
+
+def test_configure_exports_cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(sys.modules["numba"].config, "CACHE_DIR", None, raising=False)
+    monkeypatch.setenv(ENV_VAR, str(tmp_path / "from_env"))
+    assert configure_numba_cache() == (tmp_path / "from_env").resolve()
+
+    path = configure_numba_cache(tmp_path / "explicit")
+    assert path.is_dir()
+    assert os.environ[ENV_VAR] == str(path)
+    assert sys.modules["numba"].config.CACHE_DIR == str(path)
+
+
+def test_clear_removes_only_kernel_files(tmp_path, monkeypatch):
+    monkeypatch.setenv(ENV_VAR, str(tmp_path))
+    nested = tmp_path / "algorithms_abc"
+    nested.mkdir()
+    for name in ("k.fit-1.py311.nbi", "k.fit-1.py311.1.nbc", "notes.txt"):
+        (nested / name).write_text("x")
+
+    assert clear_numba_cache() == 2
+    assert [p.name for p in nested.iterdir()] == ["notes.txt"]
+
+
+def test_warmup_times_every_kernel():
+    report = warmup()
+
+    names = [k.name for k in report.kernels]
+    assert "fit_segments_kernel" in names and "fit_linear_least_squares" in names
+    assert len(names) == len(set(names))
+    assert report.pid == os.getpid()
+    assert all(k.first_call_s >= 0 and k.compute_s >= 0 for k in report.kernels)
+    assert report.jit_seconds == sum(k.jit_s for k in report.kernels)
+    assert KernelTiming("k", first_call_s=0.5, compute_s=0.1).jit_s == 0.4
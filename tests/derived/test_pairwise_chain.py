@@ -0,0 +1,143 @@
+"""
+Tests for sliding-window pairwise extraction.
+
+Covers:
+- batch_compute_differences matches per-pair interpolation
+- a chain reads every measurement once and marks each pair in the ledger
+- batched ConsecutiveSweepDifference metrics equal per-pair extract_pairwise
+"""
+
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import polars as pl
+import pytest
+
+from src.derived import metric_pipeline
+from src.derived.extractors.consecutive_sweep_difference import (
+    NUMBA_AVAILABLE,
+    ConsecutiveSweepDifferenceExtractor,
+)
+from src.derived.metric_pipeline import MetricPipeline
+from src.derived.metrics_store import ExtractionLedger
+
+N_SWEEPS = 5
+
+
+def _run_id(k: int) -> str:
+    return f"{k:016x}"
+
+
+def _stage(tmp_path):
+    """Five consecutive IVg sweeps of one chip, staged in the Hive layout."""
+    stage_root = tmp_path / "raw_measurements"
+    t0 = datetime(2025, 9, 15, 12, tzinfo=timezone.utc)
+    rows = []
+    for k in range(N_SWEEPS):
+        run_id = _run_id(k)
+        vg = np.linspace(-5 + 0.1 * k, 5 - 0.1 * k, 101 + 10 * k)
+        current = 1e-6 * (1 + 0.05 * k + 0.02 * (vg - 0.2 * k) ** 2)
+        part = stage_root / "proc=IVg" / "date=2025-09-15" / f"run_id={run_id}" / "part-000.parquet"
+        part.parent.mkdir(parents=True)
+        pl.DataFrame({
+            "Vg (V)": vg, "I (A)": current, "VDS (V)": np.full_like(vg, 0.1),
+            "T (K)": np.full_like(vg, 300.0),
+        }).write_parquet(part)
+        rows.append({
+            "run_id": run_id, "proc": "IVg", "chip_number": 67, "chip_group": "Alisson",
+            "date_local": "2025-09-15", "start_time_utc": t0 + timedelta(minutes=k),
+            "vds_v": 0.1, "path": str(part),
+        })
+    manifest = pl.DataFrame(rows)
+    manifest_path = stage_root / "_manifest" / "manifest.parquet"
+    manifest_path.parent.mkdir(parents=True)
+    manifest.write_parquet(manifest_path)
+    return manifest, manifest_path
+
+
+def _pipeline(tmp_path, manifest_path):
+    return MetricPipeline(
+        base_dir=tmp_path,
+        stage_root=manifest_path.parent.parent,
+        extractors=[],
+        pairwise_extractors=[ConsecutiveSweepDifferenceExtractor()],
+        manifest_path=manifest_path,
+    )
+
+
+@pytest.mark.skipif(not NUMBA_AVAILABLE, reason="Numba not installed")
+def test_batch_kernel_matches_per_pair():
+    from src.derived.algorithms.sweep_difference_numba import (
+        batch_compute_differences,
+        compute_sweep_difference,
+        linear_interp_sorted,
+    )
+
+    rng = np.random.default_rng(0)
+    sweeps = []
+    for k in range(3):
+        vg = np.sort(rng.uniform(-5, 5, 80 + k))
+        sweeps.append((vg, np.sin(vg) + k))
+    offsets = np.cumsum([0] + [len(v) for v, _ in sweeps]).astype(np.int64)
+    left, right = np.array([0, 1], np.int64), np.array([1, 2], np.int64)
+    n = 50
+    vg_out, y1_out, y2_out = (np.empty((2, n)) for _ in range(3))
+    bounds = np.empty((2, 2))
+    batch_compute_differences(
+        np.concatenate([v for v, _ in sweeps]), np.concatenate([y for _, y in sweeps]),
+        offsets, left, right, n, vg_out, y1_out, y2_out, bounds,
+    )
+    for p in range(2):
+        (vg1, y1), (vg2, y2) = sweeps[left[p]], sweeps[right[p]]
+        vg_common, delta, vg_min, vg_max = compute_sweep_difference(vg1, y1, vg2, y2, n)
+        np.testing.assert_allclose(vg_out[p], vg_common)
+        np.testing.assert_allclose(y1_out[p], linear_interp_sorted(vg1, y1, vg_common))
+        np.testing.assert_allclose(y2_out[p] - y1_out[p], delta, atol=1e-12)
+        assert tuple(bounds[p]) == pytest.approx((vg_min, vg_max))
+
+
+def test_chain_reads_each_measurement_once(tmp_path, monkeypatch):
+    manifest, manifest_path = _stage(tmp_path)
+    pipeline = _pipeline(tmp_path, manifest_path)
+
+    reads = []
+    real_read = metric_pipeline.read_measurement_parquet
+
+    def counting_read(path, *args, **kwargs):
+        reads.append(path.parent.name)
+        return real_read(path, *args, **kwargs)
+
+    monkeypatch.setattr(metric_pipeline, "read_measurement_parquet", counting_read)
+    ledger = ExtractionLedger.load(pipeline.metrics_dir)
+    metrics = pipeline._extract_pairwise_metrics(manifest, ledger=ledger)
+
+    assert sorted(reads) == sorted(f"run_id={_run_id(k)}" for k in range(N_SWEEPS))
+    assert metrics.height == N_SWEEPS - 1
+    assert sorted(metrics["run_id"].to_list()) == [_run_id(k) for k in range(1, N_SWEEPS)]
+    assert ledger.is_done(_run_id(3), "sweep_delta", _run_id(2))
+
+    # Incremental rerun: every pair is already in the ledger
+    reads.clear()
+    again = pipeline._extract_pairwise_metrics(manifest, ledger=ledger, incremental=True)
+    assert again.height == 0 and reads == []
+
+
+def test_batched_metrics_match_per_pair(tmp_path):
+    manifest, manifest_path = _stage(tmp_path)
+    pipeline = _pipeline(tmp_path, manifest_path)
+    batched = pipeline._extract_pairwise_metrics(manifest).sort("run_id")
+
+    extractor = ConsecutiveSweepDifferenceExtractor()
+    rows = manifest.sort("start_time_utc").with_row_index("seq_num", offset=1).to_dicts()
+    expected = []
+    for md1, md2 in zip(rows, rows[1:]):
+        m1 = pl.read_parquet(md1["path"])
+        m2 = pl.read_parquet(md2["path"])
+        expected += extractor.extract_pairwise(m1, md1, m2, md2)
+
+    assert batched["value_float"].to_list() == pytest.approx(
+        [m.value_float for m in sorted(expected, key=lambda m: m.run_id)]
+    )
+    assert batched["value_json"].to_list() == [
+        m.value_json for m in sorted(expected, key=lambda m: m.run_id)
+    ]
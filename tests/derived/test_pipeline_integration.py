@@ -152,6 +152,57 @@ class TestMetricPipelineIntegration:
         assert metrics == []
 
 
+    def test_chunks_grouped_by_procedure_and_date(self):
+        """Test parallel tasks never mix procedures or dates."""
+        from src.derived.metric_pipeline import _plan_chunks
+
+        manifest = pl.DataFrame({
+            "run_id": [f"run_{i:016d}" for i in range(7)],
+            "proc": ["It", "IVg", "It", "It", "IVg", "It", "It"],
+            "date_local": ["d1", "d1", "d1", "d2", "d1", "d1", "d2"],
+        })
+        chunks = _plan_chunks(manifest, chunk_size=2)
+
+        assert [(c["proc"][0], c["date_local"][0], c.height) for c in chunks] == [
+            ("It", "d1", 2), ("It", "d1", 1), ("IVg", "d1", 2), ("It", "d2", 2),
+        ]
+        for chunk in chunks:
+            assert chunk.columns == manifest.columns
+            assert chunk["proc"].n_unique() == 1 and chunk["date_local"].n_unique() == 1
+
+    def test_extract_chunk_returns_arrow_metrics(self, temp_stage_dir, monkeypatch):
+        """Test a worker task returns an Arrow IPC metrics frame and done cells."""
+        import io
+        from src.derived import metric_pipeline
+
+        raw_dir = temp_stage_dir / "data" / "02_stage" / "raw_measurements"
+        rows = []
+        for i in range(2):
+            run_id = f"run_{i:016d}"
+            pq_path = raw_dir / f"proc=It/date=2023-01-01/run_id={run_id}/part-000.parquet"
+            create_it_parquet(pq_path)
+            rows.append({
+                "run_id": run_id, "chip_number": 1, "chip_group": "group_0", "proc": "It",
+                "date_local": "2023-01-01", "parquet_path": str(pq_path),
+            })
+        manifest = pl.DataFrame(rows)
+
+        pipeline = MetricPipeline(base_dir=temp_stage_dir)
+        monkeypatch.setattr(metric_pipeline, "_WORKER_PIPELINE", pipeline)
+        monkeypatch.setattr(metric_pipeline, "_WORKER_WARMUP", None)
+
+        only = {"run_0000000000000000": ["photoresponse"], "run_0000000000000001": ["photoresponse", "t_rise"]}
+        ipc, done, errors, _, _, warmup = metric_pipeline._extract_chunk(manifest, only)
+        frame = pl.read_ipc_stream(io.BytesIO(ipc))
+
+        expected = metric_pipeline.metrics_to_frame(
+            pipeline._extract_sequential(manifest, skip_run_ids=set(), pending=only)
+        )
+        assert frame.drop("extraction_timestamp").equals(expected.drop("extraction_timestamp"))
+        assert frame.height > 0
+        assert set(done) == set(only) and not errors and warmup is None
+
+
 class TestEdgeCases:
     """Test edge cases and error handling."""
     
@@ -0,0 +1,94 @@
+"""
+Tests for the batched multi-segment stretched exponential fit.
+
+Covers:
+- ragged segments fitted in one call match per-segment reference fits
+- short segments come back NaN / not converged without failing the batch
+- NaN samples are dropped per segment and offsets stay aligned
+- fit_stretched_exponential agrees with the reference per-call kernel
+"""
+
+import numpy as np
+import pytest
+
+from src.derived.algorithms.stretched_exponential import (
+    estimate_initial_parameters,
+    fit_stretched_exponential,
+    fit_stretched_exponential_numba,
+    stretched_exponential,
+)
+from src.derived.algorithms.stretched_exponential_batch import (
+    FIT_RESULT_DTYPE,
+    fit_stretched_exponential_batch,
+    pack_segments,
+)
+
+TRUE_PARAMS = [
+    (1.0e-6, 5e-7, 10.0, 0.8, 200),
+    (2.0e-6, -3e-7, 40.0, 0.6, 350),
+    (5.0e-7, 2e-7, 25.0, 1.0, 120),
+]
+
+
+def _segments():
+    rng = np.random.default_rng(0)
+    segments = []
+    for baseline, amplitude, tau, beta, n_points in TRUE_PARAMS:
+        t = np.linspace(0, 10 * tau, n_points)
+        current = stretched_exponential(t, baseline, amplitude, tau, beta)
+        segments.append((t, current + rng.normal(0, 1e-10, n_points)))
+    return segments
+
+
+def test_ragged_segments_match_per_call_fits():
+    segments = _segments()
+    results = fit_stretched_exponential_batch(segments)
+
+    assert results.dtype == FIT_RESULT_DTYPE
+    assert results["n_points"].tolist() == [200, 350, 120]
+    assert results["converged"].all()
+    for fit, (t, current) in zip(results, segments):
+        params, cost, n_iterations, _ = fit_stretched_exponential_numba(
+            t, current, estimate_initial_parameters(t, current), 100, 1e-8
+        )
+        assert [fit["baseline"], fit["amplitude"], fit["tau"], fit["beta"]] == pytest.approx(params, rel=1e-6)
+        assert fit["cost"] == pytest.approx(cost, rel=1e-6)
+        assert fit["n_iterations"] == n_iterations
+
+
+def test_short_segment_does_not_fail_batch():
+    segments = _segments()
+    short = (np.arange(5.0), np.ones(5))
+    results = fit_stretched_exponential_batch([segments[0], short, segments[1]])
+
+    assert results["converged"].tolist() == [True, False, True]
+    assert np.isnan(results["tau"][1])
+    assert results["n_points"][1] == 5
+
+
+def test_non_finite_samples_dropped_per_segment():
+    segments = _segments()
+    t, current = segments[0]
+    current = current.copy()
+    current[[3, 50]] = np.nan
+    results = fit_stretched_exponential_batch([(t, current), segments[1]])
+
+    assert results["n_points"].tolist() == [198, 350]
+    assert results["tau"][1] == pytest.approx(fit_stretched_exponential_batch([segments[1]])["tau"][0])
+
+    time, _, offsets = pack_segments([(t, current), segments[1]])
+    assert offsets.tolist() == [0, 200, 550] and len(time) == 550
+
+
+def test_single_fit_matches_reference_kernel():
+    t, current = _segments()[1]
+    params, cost, _, converged = fit_stretched_exponential_numba(
+        t, current, estimate_initial_parameters(t, current), 100, 1e-8
+    )
+    result = fit_stretched_exponential(t, current)
+
+    assert result["converged"] and converged
+    assert result["tau"] == pytest.approx(params[2], rel=1e-6)
+    assert result["beta"] == pytest.approx(params[3], rel=1e-6)
+    assert result["cost"] == pytest.approx(cost, rel=1e-6)
+    assert result["fitted_curve"].shape == t.shape
@@ -0,0 +1,92 @@
+"""
+Tests for the shared gate-sweep leg geometry.
+
+Covers:
+- sign-change legs, full-range selection and the compact leg table
+- thresholded segments (dwell points split, 'forward'/'reverse' labels)
+- split_full_range_legs / segment_voltage_sweep slice the shared geometry
+- CNP extractors on one measurement share a single SweepLegs
+"""
+
+import numpy as np
+import polars as pl
+
+from src.derived import led_segmentation
+from src.derived.algorithms.cnp_parabola import split_full_range_legs
+from src.derived.extractors.cnp_extractor import CNPExtractor
+from src.derived.led_segmentation import SEGMENTATION_KEY, SegmentedMeasurement
+from src.derived.sweep_legs import SweepLegs
+from src.plotting.shared.plot_utils import segment_voltage_sweep
+
+
+def _loop() -> np.ndarray:
+    """0 → 1.8, 2 → -1.8, -2 → 0 in steps of 0.2 V."""
+    return np.round(np.concatenate([
+        np.arange(0, 2, 0.2), np.arange(2, -2, -0.2), np.arange(-2, 0.01, 0.2),
+    ]), 6)
+
+
+def test_legs_table_and_full_range_legs():
+    vg = _loop()
+    legs = SweepLegs(vg)
+
+    assert legs.starts.tolist() == [0, 10, 30] and legs.ends.tolist() == [10, 30, 41]
+    table = legs.legs
+    assert table["direction"].to_list() == ["forward", "backward", "forward"]
+    assert table.select("vg_min", "vg_max").rows() == [(0.0, 1.8), (-1.8, 2.0), (-2.0, 0.0)]
+    assert table["n_points"].sum() == vg.size
+
+    # Only the middle leg covers 95% of the 4 V range
+    assert legs.full_range_legs(0.95) == [(10, 30, "backward")]
+    assert legs.full_range_legs(0.4) == [(0, 10, "forward"), (10, 30, "backward"), (30, 41, "forward")]
+    assert SweepLegs(np.array([1.0, 1.0, 1.0])).full_range_legs() == []
+
+
+def test_segments_split_at_dwell_points():
+    vg = np.concatenate([np.linspace(0, 1, 10), np.full(3, 1.0), np.linspace(1, -1, 20)[1:]])
+    segments = SweepLegs(vg).segments(min_segment_length=5)
+
+    assert [d for _, _, d in segments] == ["forward", "reverse"]
+    assert segments[0][0] == 0 and segments[1][1] == vg.size
+    assert SweepLegs(vg[:3]).segments(min_segment_length=5) == []
+
+
+def test_helpers_slice_the_shared_geometry():
+    vg = _loop()
+    i = 1e-6 * (1 + vg ** 2)
+    legs = SweepLegs(vg)
+
+    for (vg_leg, i_leg, d), (start, end, d2) in zip(
+        split_full_range_legs(vg, i, 0.4, legs=legs), legs.full_range_legs(0.4)
+    ):
+        assert d == d2
+        np.testing.assert_array_equal(vg_leg, vg[start:end])
+        np.testing.assert_array_equal(i_leg, i[start:end])
+
+    segs = segment_voltage_sweep(vg, i)
+    assert [(v[0], v[-1], d) for v, _, d in segs] == [
+        (vg[s], vg[e - 1], d) for s, e, d in legs.segments(5)
+    ]
+
+
+def test_cnp_extractors_share_one_geometry(monkeypatch):
+    vg = np.concatenate([np.linspace(-5, 5, 201), np.linspace(5, -5, 201)[1:]])
+    measurement = pl.DataFrame({"Vg (V)": vg, "I (A)": 1e-6 * (1 + (vg - 0.3) ** 2)})
+    metadata = {"run_id": "r" * 16, "proc": "IVg", "chip_number": 67, "chip_group": "Alisson",
+                "vds_v": 0.1, "extraction_version": "test"}
+    extractors = [CNPExtractor(direction=d) for d in ("forward", "backward", "average")]
+    unshared = [ext.extract(measurement, dict(metadata)).value_float for ext in extractors]
+
+    built = []
+
+    class CountingLegs(SweepLegs):
+        def __init__(self, vg):
+            built.append(1)
+            super().__init__(vg)
+
+    monkeypatch.setattr(led_segmentation, "SweepLegs", CountingLegs)
+    metadata[SEGMENTATION_KEY] = SegmentedMeasurement(measurement)
+    shared = [ext.extract(measurement, metadata).value_float for ext in extractors]
+
+    assert len(built) == 1
+    assert shared == unshared
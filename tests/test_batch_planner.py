@@ -0,0 +1,86 @@
+"""
+Tests for the batch-plot planner.
+
+Covers:
+- specs resolve to the measurement files of their procedure only
+- specs sharing files land in one cluster and on the same worker
+- a single large cluster is split so every worker gets work
+- the reported I/O saving (reads and bytes), sized from the staged data
+  whether loose or packed
+"""
+
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.core.packed_store import clear_pack_index_cache, pack_measurements
+from src.plotting.shared.batch import PlotSpec
+from src.plotting.shared.batch_planner import plan_batch, spec_measurements
+
+
+@pytest.fixture(autouse=True)
+def _fresh_pack_index():
+    clear_pack_index_cache()
+    yield
+    clear_pack_index_cache()
+
+
+def _history(tmp_path):
+    # Shaped like get_chip_history: source_file holds the staged Parquet path
+    procs = ["It"] * 10 + ["IVg"] * 2
+    files = []
+    for seq, proc in enumerate(procs, 1):
+        path = (
+            tmp_path / "raw_measurements" / f"proc={proc}" / "date=2025-09-15"
+            / f"run_id=r{seq:02d}" / "part-000.parquet"
+        )
+        path.parent.mkdir(parents=True, exist_ok=True)
+        pl.DataFrame({"t (s)": [float(seq)] * 50, "I (A)": [1e-6 * seq] * 50}).write_parquet(path)
+        files.append(str(path))
+    return pl.DataFrame({"seq": list(range(1, 13)), "proc": procs, "source_file": files})
+
+
+def test_spec_measurements_filters_by_procedure(tmp_path):
+    history = _history(tmp_path)
+    its = spec_measurements(PlotSpec(type="plot-its", chip=67, seq="9-12"), history)
+    ivg = spec_measurements(PlotSpec(type="plot-ivg", chip=67, seq="9-12"), history)
+    assert len(its) == 2 and len(ivg) == 2 and not its & ivg
+
+
+def test_overlapping_specs_share_a_worker(tmp_path):
+    history = _history(tmp_path)
+    specs = [
+        PlotSpec(type="plot-its-suite", chip=67, seq="1-4", tag="a"),
+        PlotSpec(type="plot-ivg", chip=67, seq="11-12", tag="ivg"),
+        PlotSpec(type="plot-its", chip=67, seq="3-6", tag="b"),
+        PlotSpec(type="plot-its", chip=67, seq="9,10", tag="c"),
+    ]
+    plan = plan_batch(specs, history, workers=3)
+
+    assert plan.clusters == 3
+    by_worker = [{s.tag for s in b} for b in plan.bins]
+    assert {"a", "b"} in by_worker and len(plan.bins) == 3
+
+    # suite reads 4 files twice, the other specs 2 + 4 + 2; the plan reads 10
+    assert (plan.reads_per_spec, plan.reads_planned) == (16, 10)
+    size = {p: Path(p).stat().st_size for p in history["source_file"].to_list()}
+    overlap = [p for p in plan.needs[2] if p in plan.needs[0]]
+    assert plan.reads_avoided == 6
+    assert plan.bytes_avoided == sum(size[p] for p in plan.needs[0]) + sum(size[p] for p in overlap)
+
+    # Packed: the loose files are gone, each measurement counts its row group
+    pack_measurements(tmp_path / "raw_measurements")
+    packed = plan_batch(specs, history, workers=3)
+    assert (packed.reads_per_spec, packed.reads_planned) == (16, 10)
+    assert 0 < packed.bytes_planned < packed.bytes_per_spec
+
+
+def test_single_cluster_is_split_across_workers(tmp_path):
+    history = _history(tmp_path)
+    specs = [PlotSpec(type="plot-its", chip=67, seq=f"{i}-{i + 1}", tag=str(i)) for i in range(1, 9)]
+    plan = plan_batch(specs, history, workers=2)
+
+    assert plan.clusters == 1
+    assert sorted(len(b) for b in plan.bins) == [4, 4]
+    assert plan.reads_planned < plan.reads_per_spec
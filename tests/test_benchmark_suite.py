@@ -0,0 +1,95 @@
+"""
+Tests for the synthetic raw generator and the benchmark suite helpers.
+
+Covers:
+- generated trees are deterministic per seed and follow the lab layout
+- every generated procedure stages without rejects, with chip/date/wavelength
+- scale presets and <chips>x<days> sizes
+- baseline comparison flags slow stages above both tolerance and noise floor
+"""
+
+from dataclasses import replace
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.core.benchmark_suite import (
+    compare_to_baseline,
+    load_results,
+    resolve_scale,
+    save_results,
+)
+from src.core.stage_raw_measurements import run_staging_pipeline
+from src.core.synthetic_raw import SyntheticSpec, generate_raw_tree
+from src.models.parameters import StagingParameters
+
+PROCEDURES_YAML = Path(__file__).resolve().parents[1] / "config" / "procedures.yml"
+
+SPEC = SyntheticSpec(n_chips=2, n_days=2, sweep_points=40, time_points=60, calibration_points=11)
+
+
+def test_generator_is_deterministic(tmp_path):
+    a = generate_raw_tree(tmp_path / "a", SPEC)
+    b = generate_raw_tree(tmp_path / "b", SPEC)
+
+    assert a.files == 2 * SPEC.files_per_day == 28
+    assert a.per_procedure == {"LaserCalibration": 4, "IVg": 8, "It": 8, "VVg": 4, "Vt": 4}
+    assert [p.relative_to(tmp_path / "a") for p in a.paths] == \
+        [p.relative_to(tmp_path / "b") for p in b.paths]
+    assert all(pa.read_bytes() == pb.read_bytes() for pa, pb in zip(a.paths, b.paths))
+    assert a.paths[0].relative_to(tmp_path / "a").as_posix() == \
+        "2025-03-03/LaserCalibration2025-03-03_0.csv"
+
+    other = generate_raw_tree(tmp_path / "c", replace(SPEC, seed=1))
+    assert other.paths[1].read_bytes() != a.paths[1].read_bytes()
+
+
+def test_generated_tree_stages_cleanly(tmp_path):
+    raw = tmp_path / "01_raw"
+    generate_raw_tree(raw, SPEC)
+    stage_root = tmp_path / "02_stage" / "raw_measurements"
+
+    summary = run_staging_pipeline(StagingParameters(
+        raw_root=raw, stage_root=stage_root, procedures_yaml=PROCEDURES_YAML, workers=1,
+    ))
+    assert summary.ok == 28 and summary.rejects == 0
+
+    manifest = pl.read_parquet(stage_root / "_manifest" / "manifest.parquet")
+    counts = dict(manifest.group_by("proc").len().iter_rows())
+    assert counts == {"LaserCalibration": 4, "IVg": 8, "It": 8, "VVg": 4, "Vt": 4}
+    chips = manifest.filter(pl.col("proc") != "LaserCalibration")
+    assert set(chips["chip_number"].to_list()) == {1, 2}
+    assert set(chips["chip_group"].to_list()) == {"Synth"}
+    assert set(manifest["date_local"].to_list()) == {"2025-03-03", "2025-03-04"}
+    assert set(manifest["wavelength_nm"].drop_nulls().to_list()) == {365.0, 455.0}
+
+
+def test_resolve_scale():
+    assert resolve_scale("small").n_chips == 2
+    custom = resolve_scale("8x10")
+    assert (custom.n_chips, custom.n_days) == (8, 10)
+    with pytest.raises(ValueError):
+        resolve_scale("huge")
+
+
+def test_compare_to_baseline(tmp_path):
+    def doc(**stages):
+        return {"results": [
+            {"scale": "small", "stage": name, "seconds": s, "items": 1, "ok": s is not None, "error": None}
+            for name, s in stages.items()
+        ]}
+
+    baseline = save_results(doc(staging=2.0, metrics=1.0, plotting=0.01, histories=1.0), tmp_path / "b.json")
+    current = doc(staging=2.4, metrics=1.5, plotting=0.04, histories=None, enrichment=9.0)
+
+    regressions = compare_to_baseline(current, load_results(baseline), tolerance=0.25)
+
+    # staging within tolerance, plotting under the noise floor, histories failed,
+    # enrichment has no baseline
+    assert [(r.stage, r.ratio) for r in regressions] == [("metrics", 1.5)]
+    assert compare_to_baseline(current, load_results(baseline), tolerance=0.6) == []
+
+    (tmp_path / "bad.json").write_text("[]")
+    with pytest.raises(ValueError):
+        load_results(tmp_path / "bad.json")
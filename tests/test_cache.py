@@ -8,6 +8,7 @@ Tests cache functionality including:
 - LRU eviction
 - Size limits
 - Thread safety
+- Shared-store limits applied from the CLI config
 """
 
 import pytest
@@ -258,5 +259,32 @@ def test_cache_with_polars_dataframe():
         temp_path.unlink()
 
 
+def test_get_cache_item_limit_only_when_configured(tmp_path):
+    """The CLI config caps the shared store's item count only if set"""
+    import src.cli.main as cli_main
+    from src.cli.cache import reset_cache
+    from src.cli.config import CLIConfig
+    from src.core.data_cache import shared_cache
+
+    store = shared_cache()
+    saved_config, saved_limits = cli_main._config, (store.maxsize, store.max_bytes)
+    dirs = dict(
+        raw_data_dir=tmp_path / "raw",
+        stage_dir=tmp_path / "stage",
+        history_dir=tmp_path / "stage" / "chip_histories",
+        output_dir=tmp_path / "output",
+    )
+    try:
+        for items in (None, 20):
+            cli_main.set_config(CLIConfig(cache_max_items=items, **dirs))
+            reset_cache()
+            assert get_cache()._store is store
+            assert store.maxsize == items
+    finally:
+        cli_main._config = saved_config
+        reset_cache()
+        store.resize(maxsize=saved_limits[0], max_bytes=saved_limits[1])
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,97 @@
+"""
+Tests for the shared byte-bounded LRU data cache.
+
+Covers:
+- LRU order: a hit protects an entry, the least recently used one is evicted
+- eviction by memory budget (estimated DataFrame size) and by item count
+- entries are invalidated when the source file's size/mtime changes
+- read_measurement_parquet goes through the cache only when enabled
+- CLI and plotting views report into the same statistics
+"""
+
+import os
+
+import polars as pl
+
+from src.cli.cache import DataCache as CLIDataCache
+from src.core import data_cache
+from src.core.data_cache import DataCache, estimate_size
+from src.core.utils import read_measurement_parquet
+from src.plotting.shared.plot_utils import ParquetCache
+
+
+def _frame(n: int) -> pl.DataFrame:
+    return pl.DataFrame({"x": [0.0] * n})
+
+
+def test_lru_order_and_byte_budget():
+    size = estimate_size(_frame(1000))
+    cache = DataCache(max_bytes=int(size * 2.5))
+    cache.put("a", _frame(1000))
+    cache.put("b", _frame(1000))
+    assert cache.get("a") is not None  # "b" is now least recently used
+
+    cache.put("c", _frame(1000))
+    assert "b" not in cache and "a" in cache and "c" in cache
+    assert cache.total_bytes == 2 * size
+    assert cache.stats()["evictions"] == 1
+
+    cache.put("huge", _frame(100_000))  # larger than the whole budget
+    assert "huge" not in cache and len(cache) == 2
+
+
+def test_item_limit():
+    cache = DataCache(maxsize=2)
+    for key in "abc":
+        cache.put(key, key)
+    assert list(cache._entries) == ["b", "c"]
+
+
+def test_file_change_invalidates(tmp_path):
+    path = tmp_path / "m.parquet"
+    _frame(3).write_parquet(path)
+    cache = DataCache()
+
+    first = cache.get_or_load("k", lambda: pl.read_parquet(path), file_path=path)
+    assert cache.get_or_load("k", lambda: None, file_path=path) is first
+
+    _frame(5).write_parquet(path)
+    os.utime(path, ns=(0, 0))
+    assert cache.get_or_load("k", lambda: pl.read_parquet(path), file_path=path).height == 5
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["invalidations"]) == (1, 2, 1)
+
+
+def test_measurement_reads_use_cache_only_when_enabled(tmp_path):
+    path = tmp_path / "part-000.parquet"
+    _frame(4).write_parquet(path)
+    data_cache.clear_cache()
+    try:
+        read_measurement_parquet(path)
+        assert data_cache.cache_stats()["total_requests"] == 0
+
+        data_cache.enable_parquet_caching()
+        first = read_measurement_parquet(path)
+        assert read_measurement_parquet(path) is first
+        assert data_cache.cache_stats()["hits"] == 1
+    finally:
+        data_cache.disable_parquet_caching()
+        data_cache.clear_cache()
+
+
+def test_views_share_statistics(tmp_path):
+    path = tmp_path / "part-000.parquet"
+    _frame(4).write_parquet(path)
+    data_cache.clear_cache()
+    try:
+        overlay = ParquetCache()
+        overlay.read(path)
+        overlay.read(path)
+        assert overlay.stats()["hits"] == 1
+
+        cli = CLIDataCache(store=data_cache.shared_cache())
+        cli.get(path, lambda p: pl.read_parquet(p))
+        assert cli.get_stats().hits == data_cache.cache_stats()["hits"] == 1
+        assert cli.get_info()["item_count"] == 2
+    finally:
+        data_cache.clear_cache()
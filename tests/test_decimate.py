@@ -0,0 +1,80 @@
+"""
+Tests for display-aware trace decimation.
+
+Covers:
+- min/max buckets keep every extremum, the endpoints and forced indices
+- a NaN inside a bucket survives, so gaps still break the line
+- LED on/off edges are located on both sides of each transition
+- bucket budget follows PlotConfig (width × dpi) and decimate_traces opts out
+- short or unsorted traces pass through untouched
+"""
+
+import numpy as np
+
+from src.plotting.shared.config import PlotConfig
+from src.plotting.shared.decimate import (
+    decimate_for_display,
+    decimate_minmax,
+    display_buckets,
+    led_edges,
+)
+
+
+def _its_trace(n: int = 200_000):
+    t = np.linspace(0.0, 3600.0, n)
+    vl = ((t // 120) % 2 == 1).astype(float) * 3.0  # LED toggles every 120 s
+    rng = np.random.default_rng(0)
+    y = 1e-6 * (1 + 0.2 * (vl > 0)) + 1e-9 * rng.standard_normal(n)
+    y[12_345] = 5e-6  # isolated spike
+    return t, y, vl
+
+
+def test_minmax_keeps_extrema_edges_and_endpoints():
+    t, y, vl = _its_trace()
+    edges = led_edges(vl)
+    td, yd = decimate_minmax(t, y, n_buckets=500, keep=edges)
+
+    assert len(td) <= 4 * 500 + len(edges)
+    assert np.all(np.diff(td) >= 0)
+    assert (td[0], td[-1]) == (t[0], t[-1])
+    assert yd.max() == y.max() and yd.min() == y.min()
+    assert set(t[edges]) <= set(td)
+
+
+def test_minmax_keeps_a_nan_inside_each_gap_bucket():
+    t = np.linspace(0.0, 100.0, 10_000)
+    y = np.sin(t)
+    y[5_003:5_006] = np.nan  # short gap well inside one bucket
+    td, yd = decimate_minmax(t, y, n_buckets=100)
+
+    assert len(td) < len(t)
+    gaps = np.flatnonzero(np.isnan(yd))
+    assert len(gaps) == 1 and td[gaps[0]] == t[5_003]
+    assert 0 < gaps[0] < len(yd) - 1
+
+
+def test_led_edges():
+    assert led_edges(np.array([0, 0, 3, 3, 0])).tolist() == [1, 2, 3, 4]
+    assert led_edges(np.zeros(5)).size == 0
+    # Residual VL below the threshold is not a transition
+    assert led_edges(np.array([0, 0.05, 0.05, 0])).size == 0
+    assert led_edges(np.array([0, 0.05, 0.5]), vl_threshold=0.01).tolist() == [0, 1]
+
+
+def test_config_drives_bucket_budget():
+    config = PlotConfig(dpi=100, figsize_timeseries=(10.0, 5.0))
+    assert display_buckets(config) == 1000
+    assert display_buckets(config, fraction=0.25) == 250
+    assert display_buckets(config.copy(decimation_oversample=2.0)) == 2000
+
+    t, y, _ = _its_trace()
+    assert len(decimate_for_display(t, y, config)[0]) <= 4000
+    full = decimate_for_display(t, y, config.copy(decimate_traces=False))
+    assert len(full[0]) == len(t)
+
+
+def test_short_or_unsorted_traces_pass_through():
+    t = np.arange(10.0)
+    assert decimate_minmax(t, t, n_buckets=5)[0] is t
+    shuffled = np.random.default_rng(1).permutation(10_000).astype(float)
+    assert decimate_minmax(shuffled, shuffled, n_buckets=10)[0] is shuffled
@@ -0,0 +1,91 @@
+"""
+Tests for the append-only staging event log.
+
+Covers:
+- one NDJSON segment per process, rotated after a merge
+- merge upserts only segments past the watermark, then archives them
+- legacy event-*.json files are merged once and archived
+- a torn last line from a crashed writer is skipped
+"""
+
+import json
+from pathlib import Path
+
+import polars as pl
+
+from src.core.event_log import EventLog, append_event, rotate_segment
+from src.core.stage_raw_measurements import merge_events_to_manifest
+
+
+def _event(run_id: str, rows: int, **extra) -> dict:
+    return {"run_id": run_id, "status": "ok", "proc": "IVg", "rows": rows, **extra}
+
+
+def _manifest(path: Path) -> dict:
+    return dict(pl.read_parquet(path).select("run_id", "rows").iter_rows())
+
+
+def test_append_uses_one_segment_per_process(tmp_path):
+    events = tmp_path / "events"
+    rotate_segment(events)
+    first = append_event(events, _event("a", 1))
+    assert append_event(events, _event("b", 2)) == first
+    assert len(first.read_text().splitlines()) == 2
+
+    rotate_segment(events)
+    assert append_event(events, _event("c", 3)) != first
+
+
+def test_merge_consumes_only_new_segments(tmp_path):
+    events = tmp_path / "events"
+    manifest = tmp_path / "manifest.parquet"
+    rotate_segment(events)
+
+    append_event(events, _event("a", 1))
+    append_event(events, _event("b", 2, vds_v=0.1))
+    merge_events_to_manifest(events, manifest)
+
+    log = EventLog(events)
+    assert _manifest(manifest) == {"a": 1, "b": 2}
+    assert log.watermark() is not None
+    assert log.pending_segments() == []
+    assert list(events.glob("seg-*.ndjson")) == []
+    assert len(list(log.archive_dir.glob("events-*.parquet"))) == 1
+
+    # Re-staged run "a" plus a new run: upserted, nothing else re-read
+    append_event(events, _event("a", 10))
+    append_event(events, _event("c", 3))
+    assert len(log.pending_segments()) == 1
+    merge_events_to_manifest(events, manifest)
+    assert _manifest(manifest) == {"a": 10, "b": 2, "c": 3}
+    assert pl.read_parquet(manifest)["vds_v"].to_list().count(0.1) == 1
+
+    # Nothing new: manifest untouched
+    mtime = manifest.stat().st_mtime_ns
+    merge_events_to_manifest(events, manifest)
+    assert manifest.stat().st_mtime_ns == mtime
+
+
+def test_legacy_event_files_are_migrated_once(tmp_path):
+    events = tmp_path / "events"
+    events.mkdir()
+    manifest = tmp_path / "manifest.parquet"
+    for run_id, rows in (("a", 1), ("b", 2)):
+        (events / f"event-{run_id}.json").write_text(json.dumps(_event(run_id, rows)))
+
+    merge_events_to_manifest(events, manifest)
+    assert _manifest(manifest) == {"a": 1, "b": 2}
+    assert list(events.glob("event-*.json")) == []
+    assert (events / "archive" / "events-legacy.parquet").exists()
+
+
+def test_torn_last_line_is_skipped(tmp_path):
+    events = tmp_path / "events"
+    manifest = tmp_path / "manifest.parquet"
+    rotate_segment(events)
+    segment = append_event(events, _event("a", 1))
+    with segment.open("a") as f:
+        f.write('{"run_id": "b", "sta')
+
+    merge_events_to_manifest(events, manifest)
+    assert _manifest(manifest) == {"a": 1}
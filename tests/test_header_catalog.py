@@ -0,0 +1,148 @@
+"""
+Tests for the persistent raw-CSV header catalog.
+
+Covers:
+- refresh parses new files (e.g. a new day folder) and only stats known ones
+- modified files are re-parsed, deleted files are dropped
+- query by procedure/chip/sample and the latest-IVg-per-sample fallback scan
+- the fallback scan persists to the catalog next to the manifest unless opted out
+- staging records worker-parsed headers and reuses them on --force reruns
+"""
+
+import os
+from pathlib import Path
+
+from src.core.header_catalog import HeaderCatalog
+from src.plotting.ivg_by_sample import scan_csvs_for_chip_samples
+
+PROCEDURES_YAML = Path(__file__).parent.parent / "config" / "procedures.yml"
+
+
+def _write_ivg(path: Path, chip: int = 67, sample: str = "A", start: float = 1726394856.2) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        "#Procedure: <laser_setup.procedures.IVg>",
+        "#Parameters:",
+        "#\tChip group name: Alisson",
+        f"#\tChip number: {chip}",
+        f"#\tSample: {sample.lower()}",
+        "#\tVDS: 0.1 V",
+        "#\tLaser voltage: 0 V",
+        "#Metadata:",
+        f"#\tStart time: {start}",
+        "#Data:",
+        "Vg (V),I (A)",
+        "-1,1e-6",
+        "1,2e-6",
+    ]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def test_refresh_is_incremental(tmp_path):
+    raw = tmp_path / "01_raw"
+    _write_ivg(raw / "2025-09-15" / "a.csv", chip=67)
+    _write_ivg(raw / "2025-09-15" / "b.csv", chip=68)
+    path = tmp_path / "_manifest" / "header_catalog.parquet"
+
+    catalog = HeaderCatalog.load(path)
+    assert catalog.refresh(raw).parsed == 2
+    catalog.save()
+
+    catalog = HeaderCatalog.load(path)
+    _write_ivg(raw / "2025-09-16" / "c.csv", chip=69)
+    report = catalog.refresh(raw)
+    assert (report.parsed, report.unchanged, report.removed) == (1, 2, 0)
+
+    b = raw / "2025-09-15" / "b.csv"
+    _write_ivg(b, chip=70)
+    os.utime(b, ns=(0, 0))
+    (raw / "2025-09-15" / "a.csv").unlink()
+    report = catalog.refresh(raw)
+    assert (report.parsed, report.unchanged, report.removed) == (1, 1, 1)
+    assert sorted(catalog.frame()["chip_number"].to_list()) == [69, 70]
+
+
+def test_query_and_latest_sample_scan(tmp_path):
+    raw = tmp_path / "01_raw"
+    _write_ivg(raw / "d1" / "a1.csv", sample="A", start=100.0)
+    latest_a = _write_ivg(raw / "d2" / "a2.csv", sample="A", start=200.0)
+    b = _write_ivg(raw / "d1" / "b.csv", sample="B", start=150.0)
+    _write_ivg(raw / "d1" / "other.csv", chip=1, sample="A", start=300.0)
+
+    catalog = HeaderCatalog()
+    catalog.refresh(raw)
+    rows = catalog.query(proc="IVg", chip_group="Alisson", chip_number=67, sample="A")
+    assert rows.height == 2
+    hb = catalog.header(latest_a)
+    assert hb.proc == "IVg" and hb.metadata["Start time"] == "200.0"
+
+    path = tmp_path / "header_catalog.parquet"
+    found = scan_csvs_for_chip_samples(raw, "Alisson", 67, catalog_path=path)
+    assert found == {"A": (latest_a.resolve(), 200.0), "B": (b.resolve(), 150.0)}
+    assert len(HeaderCatalog.load(path)) == 4
+
+
+def test_sample_scan_defaults_to_manifest_catalog(tmp_path):
+    raw = tmp_path / "01_raw"
+    _write_ivg(raw / "d1" / "a.csv")
+    manifest = tmp_path / "02_stage" / "raw_measurements" / "_manifest" / "manifest.parquet"
+
+    assert set(scan_csvs_for_chip_samples(raw, "Alisson", 67, manifest_path=manifest)) == {"A"}
+    assert len(HeaderCatalog.for_manifest(manifest)) == 1
+
+    opted_out = tmp_path / "other" / "manifest.parquet"
+    scan_csvs_for_chip_samples(raw, "Alisson", 67, catalog_path=None, manifest_path=opted_out)
+    assert not opted_out.parent.exists()
+
+
+def test_staging_fills_and_reuses_catalog(tmp_path, monkeypatch):
+    from src.core import stage_raw_measurements
+    from src.models.parameters import StagingParameters
+
+    raw = tmp_path / "01_raw"
+    src = _write_ivg(raw / "2025-09-15" / "a.csv")
+    params = StagingParameters(
+        raw_root=raw,
+        stage_root=tmp_path / "02_stage" / "raw_measurements",
+        procedures_yaml=PROCEDURES_YAML,
+        workers=1,
+    )
+    assert stage_raw_measurements.run_staging_pipeline(params).ok == 1
+
+    catalog = HeaderCatalog.for_manifest(params.manifest)
+    assert src in catalog
+    assert catalog.query(chip_number=67)["sample"].to_list() == ["A"]
+
+    # A forced rerun must not parse the header again (in-process check of
+    # the argument handed to the worker)
+    seen = []
+    real_task = stage_raw_measurements.ingest_file_task
+
+    def spy(*args):
+        seen.append(args[-1])
+        return real_task(*args)
+
+    monkeypatch.setattr(stage_raw_measurements, "ingest_file_task", spy)
+
+    class InlineExecutor:
+        def __init__(self, *a, **k):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def submit(self, fn, *args):
+            from concurrent.futures import Future
+
+            fut = Future()
+            fut.set_result(fn(*args))
+            return fut
+
+    monkeypatch.setattr(stage_raw_measurements, "ProcessPoolExecutor", InlineExecutor)
+    params = params.model_copy(update={"force": True})
+    assert stage_raw_measurements.run_staging_pipeline(params).ok == 1
+    assert seen and seen[0] is not None and seen[0].proc == "IVg"
@@ -0,0 +1,104 @@
+"""
+Tests for the batched chip history builder.
+
+Covers:
+- generate_all_chip_histories matches build_chip_history_from_manifest per chip
+- seq numbered per chip in time order; Information-only chips
+- only_changed rewrites just the chips whose rows changed
+"""
+
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.core.history_builder import (
+    build_chip_history_from_manifest,
+    generate_all_chip_histories,
+)
+from src.core.manifest_index import clear_manifest_index_cache
+
+T0 = datetime(2025, 9, 15, 12, tzinfo=timezone.utc)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_manifest_index_cache()
+    yield
+    clear_manifest_index_cache()
+
+
+def _row(i: int, chip, group, information=None, minutes: int = 0) -> dict:
+    return {
+        "run_id": f"{i:016x}",
+        "proc": "IVg" if i % 3 else "It",
+        "status": "ok",
+        "chip_number": chip,
+        "chip_group": group,
+        "information": information,
+        "start_time_utc": T0 + timedelta(minutes=minutes),
+        "date_local": "2025-09-15",
+        "source_file": f"raw/root/2025-09-15/file_{i}.csv",
+        "has_light": bool(i % 2),
+        "vds_v": 0.1,
+        "vg_start_v": -1.0,
+        "vg_end_v": 1.0,
+        "rows": 10,
+    }
+
+
+def _write_manifest(tmp_path: Path, rows: list) -> Path:
+    manifest_path = tmp_path / "raw_measurements" / "_manifest" / "manifest.parquet"
+    manifest_path.parent.mkdir(parents=True, exist_ok=True)
+    pl.DataFrame(rows).write_parquet(manifest_path)
+    clear_manifest_index_cache()
+    return manifest_path
+
+
+def _rows() -> list:
+    rows = [_row(i, 67 if i % 2 else 68, "Alisson", minutes=-i) for i in range(8)]
+    rows += [_row(100 + i, None, None, information="Test chip-A", minutes=i) for i in range(3)]
+    return rows
+
+
+def test_batched_histories_match_per_chip_builder(tmp_path):
+    manifest_path = _write_manifest(tmp_path, _rows())
+    histories = generate_all_chip_histories(manifest_path, tmp_path / "hist", min_experiments=1)
+
+    assert sorted(histories) == ["Alisson67", "Alisson68", "Test_chip_A"]
+    for chip_name, path in histories.items():
+        if chip_name == "Test_chip_A":
+            expected = build_chip_history_from_manifest(manifest_path, information="Test chip-A")
+        else:
+            expected = build_chip_history_from_manifest(
+                manifest_path, chip_number=int(chip_name[len("Alisson"):]), chip_group="Alisson"
+            )
+        assert pl.read_parquet(path).equals(expected)
+
+    alisson67 = pl.read_parquet(histories["Alisson67"])
+    assert alisson67["seq"].to_list() == [1, 2, 3, 4]
+    assert alisson67["start_time_utc"].is_sorted()
+    assert alisson67["day_folder"].unique().to_list() == ["2025-09-15"]
+
+
+def test_min_experiments_filters_chips(tmp_path):
+    manifest_path = _write_manifest(tmp_path, _rows())
+    histories = generate_all_chip_histories(manifest_path, tmp_path / "hist", min_experiments=4)
+    assert sorted(histories) == ["Alisson67", "Alisson68"]
+
+
+def test_only_changed_skips_unchanged_chips(tmp_path):
+    rows = _rows()
+    manifest_path = _write_manifest(tmp_path, rows)
+    out = tmp_path / "hist"
+    first = generate_all_chip_histories(manifest_path, out, min_experiments=1, only_changed=True)
+
+    # New measurement for chip 67 only
+    manifest_path = _write_manifest(tmp_path, rows + [_row(9, 67, "Alisson", minutes=30)])
+    mtimes = {name: path.stat().st_mtime_ns for name, path in first.items()}
+
+    second = generate_all_chip_histories(manifest_path, out, min_experiments=1, only_changed=True)
+    rewritten = {name for name, path in second.items() if path.stat().st_mtime_ns != mtimes[name]}
+    assert rewritten == {"Alisson67"}
+    assert pl.read_parquet(second["Alisson67"]).height == 5
@@ -0,0 +1,86 @@
+"""
+Tests for the process-wide manifest index used by read_measurement_parquet.
+
+Covers:
+- O(1) run_id metadata lookup (bookkeeping/null columns excluded)
+- one manifest read shared across calls
+- invalidation when the manifest file changes
+- metadata join in read_measurement_parquet
+"""
+
+import os
+from pathlib import Path
+
+import polars as pl
+import pytest
+
+from src.core.manifest_index import (
+    clear_manifest_index_cache,
+    get_manifest_index,
+    read_manifest,
+)
+from src.core.utils import read_measurement_parquet
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    clear_manifest_index_cache()
+    yield
+    clear_manifest_index_cache()
+
+
+def _stage(tmp_path: Path, wavelength: float = 455.0) -> tuple[Path, Path]:
+    stage_root = tmp_path / "raw_measurements"
+    manifest_path = stage_root / "_manifest" / "manifest.parquet"
+    manifest_path.parent.mkdir(parents=True)
+    pl.DataFrame({
+        "run_id": ["r1", "r2"],
+        "proc": ["It", "IVg"],
+        "path": ["a", "b"],
+        "chip_number": [67, 67],
+        "wavelength_nm": [wavelength, None],
+    }).write_parquet(manifest_path)
+
+    part = stage_root / "proc=It" / "date=2025-09-15" / "run_id=r1" / "part-000.parquet"
+    part.parent.mkdir(parents=True)
+    pl.DataFrame({"t (s)": [0.0, 1.0], "I (A)": [1e-6, 2e-6], "run_id": ["r1", "r1"]}).write_parquet(part)
+    return manifest_path, part
+
+
+def test_metadata_lookup_excludes_bookkeeping_and_nulls(tmp_path):
+    manifest_path, _ = _stage(tmp_path)
+    index = get_manifest_index(manifest_path)
+
+    assert "r1" in index and len(index) == 2
+    assert index.metadata("r1") == {"chip_number": 67, "wavelength_nm": 455.0}
+    assert index.metadata("r2") == {"chip_number": 67}
+    assert index.metadata("missing") == {}
+
+
+def test_index_is_shared_until_manifest_changes(tmp_path):
+    manifest_path, _ = _stage(tmp_path)
+    first = get_manifest_index(manifest_path)
+    assert get_manifest_index(manifest_path) is first
+    assert read_manifest(manifest_path) is first.frame
+
+    pl.DataFrame({"run_id": ["r1"], "wavelength_nm": [365.0]}).write_parquet(manifest_path)
+    st = manifest_path.stat()
+    os.utime(manifest_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    second = get_manifest_index(manifest_path)
+    assert second is not first
+    assert second.metadata("r1") == {"wavelength_nm": 365.0}
+
+
+def test_missing_manifest(tmp_path):
+    assert get_manifest_index(tmp_path / "nope.parquet") is None
+    with pytest.raises(FileNotFoundError):
+        read_manifest(tmp_path / "nope.parquet")
+
+
+def test_read_measurement_parquet_joins_metadata(tmp_path):
+    _, part = _stage(tmp_path)
+    df = read_measurement_parquet(part)
+    assert df["wavelength_nm"].to_list() == [455.0, 455.0]
+    assert df["chip_number"].to_list() == [67, 67]
+    assert "path" not in df.columns
@@ -0,0 +1,140 @@
+"""
+Tests for the packed staged-measurement layout.
+
+Covers:
+- pack-staged folds loose files into per-partition packs (one per schema)
+- read_measurement_parquet returns the same frame (metadata, projection)
+  from either layout, also through the shared cache
+- measurements staged after a pack run stay loose and are packed next time
+- a re-staged loose copy wins over its packed row group until re-packed
+- kept loose copies are not re-packed; unreferenced packs are pruned
+"""
+
+import os
+
+import polars as pl
+import pytest
+from polars.testing import assert_frame_equal
+
+from src.core.data_cache import read_measurement_cached
+from src.core.manifest_index import clear_manifest_index_cache
+from src.core.packed_store import (
+    clear_pack_index_cache,
+    get_pack_index,
+    measurement_exists,
+    pack_measurements,
+    prune_packs,
+    unreferenced_packs,
+)
+from src.core.utils import read_measurement_parquet
+
+
+@pytest.fixture(autouse=True)
+def _fresh_indexes():
+    clear_pack_index_cache()
+    clear_manifest_index_cache()
+    yield
+    clear_pack_index_cache()
+    clear_manifest_index_cache()
+
+
+def _write(stage_root, run_id, date="2025-09-15", scale=1.0, extra=False):
+    part = stage_root / "proc=It" / f"date={date}" / f"run_id={run_id}" / "part-000.parquet"
+    part.parent.mkdir(parents=True, exist_ok=True)
+    data = {"run_id": [run_id] * 3, "t (s)": [0.0, 1.0, 2.0], "I (A)": [scale, 2 * scale, 3 * scale]}
+    if extra:
+        data["T (K)"] = [300.0, 301.0, 302.0]
+    pl.DataFrame(data).write_parquet(part)
+    return part
+
+
+def _stage(tmp_path, run_ids):
+    stage_root = tmp_path / "raw_measurements"
+    manifest = stage_root / "_manifest" / "manifest.parquet"
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    pl.DataFrame({
+        "run_id": run_ids,
+        "proc": ["It"] * len(run_ids),
+        "wavelength_nm": [455.0] * len(run_ids),
+    }).write_parquet(manifest)
+    return stage_root
+
+
+def test_pack_and_read_both_layouts(tmp_path):
+    stage_root = _stage(tmp_path, ["a", "b", "c"])
+    parts = [_write(stage_root, "a"), _write(stage_root, "b", scale=2.0), _write(stage_root, "c", extra=True)]
+    before = [read_measurement_parquet(p) for p in parts]
+
+    preview = pack_measurements(stage_root, dry_run=True)
+    assert (preview.packed, preview.packs_written) == (3, 2)
+    assert all(p.exists() for p in parts)
+
+    report = pack_measurements(stage_root)
+    assert (report.packed, report.packs_written, report.loose_removed) == (3, 2, 3)
+    assert not any(p.exists() for p in parts)
+    assert sorted(f.name for f in (stage_root / "proc=It" / "date=2025-09-15").iterdir()) == [
+        "pack-000.parquet", "pack-001.parquet"
+    ]
+    assert len(get_pack_index(stage_root)) == 3
+
+    for part, expected in zip(parts, before):
+        assert measurement_exists(part)
+        assert_frame_equal(read_measurement_parquet(part), expected)
+        assert_frame_equal(read_measurement_cached(part), expected)
+
+    projected = read_measurement_parquet(parts[2], columns=["I (A)", "VL (V)"], with_metadata=False)
+    assert projected.columns == ["I (A)"]
+    assert read_measurement_parquet(parts[0], columns=["I (A)"])["wavelength_nm"][0] == 455.0
+    assert not measurement_exists(parts[0].with_name("missing") / "part-000.parquet")
+
+
+def test_incremental_pack_and_restaged_copy(tmp_path):
+    stage_root = _stage(tmp_path, ["a", "b"])
+    a = _write(stage_root, "a")
+    pack_measurements(stage_root)
+
+    # Staged after the pack run: read loose, packed by the next run
+    b = _write(stage_root, "b", date="2025-09-16")
+    assert read_measurement_parquet(b)["I (A)"].to_list() == [1.0, 2.0, 3.0]
+    report = pack_measurements(stage_root)
+    assert (report.packed, report.superseded) == (1, 0)
+
+    # Re-staged (--force): the loose copy wins until it is re-packed
+    _write(stage_root, "a", scale=5.0)
+    assert read_measurement_parquet(a)["I (A)"].to_list() == [5.0, 10.0, 15.0]
+    report = pack_measurements(stage_root)
+    assert (report.packed, report.superseded) == (1, 1)
+    assert not a.exists()
+    assert read_measurement_parquet(a)["I (A)"].to_list() == [5.0, 10.0, 15.0]
+    assert get_pack_index(stage_root).get("a").file.name == "pack-001.parquet"
+    assert len(get_pack_index(stage_root)) == 2
+
+
+def test_keep_loose_repack_and_prune(tmp_path):
+    stage_root = _stage(tmp_path, ["a", "b"])
+    a, b = _write(stage_root, "a"), _write(stage_root, "b")
+    pack_measurements(stage_root, keep_loose=True)
+    partition = stage_root / "proc=It" / "date=2025-09-15"
+
+    # Loose copies older than their pack are left alone
+    report = pack_measurements(stage_root, keep_loose=True)
+    assert (report.packed, report.packs_written, report.already_packed) == (0, 0, 2)
+    assert [p.name for p in partition.glob("pack-*.parquet")] == ["pack-000.parquet"]
+    assert unreferenced_packs(stage_root) == []
+
+    # Both re-staged: re-packed, and the first pack is left unreferenced
+    for part, scale in ((a, 3.0), (b, 4.0)):
+        _write(stage_root, part.parent.name[len("run_id="):], scale=scale)
+        future = (partition / "pack-000.parquet").stat().st_mtime + 10
+        os.utime(part, (future, future))
+    report = pack_measurements(stage_root)
+    assert (report.packed, report.superseded, report.already_packed) == (2, 2, 0)
+    assert unreferenced_packs(stage_root) == [partition / "pack-000.parquet"]
+
+    assert prune_packs(stage_root, dry_run=True)[0] == 1
+    assert (partition / "pack-000.parquet").exists()
+    removed, freed = prune_packs(stage_root)
+    assert removed == 1 and freed > 0
+    assert [p.name for p in partition.glob("pack-*.parquet")] == ["pack-001.parquet"]
+    assert read_measurement_parquet(a)["I (A)"].to_list() == [3.0, 6.0, 9.0]
+    assert read_measurement_parquet(b)["I (A)"].to_list() == [4.0, 8.0, 12.0]
@@ -10,25 +10,53 @@ tests pin down the properties that matter:
 - content-sensitivity (id changes when the data changes)
 - timestamp-sensitivity (id changes when the start time changes)
 - null-chip tolerance (LaserCalibration has no chip)
+- v2 data-block digest: streamed, chunk-size and line-ending independent,
+  blind to header edits; v1 ids reproducible for migration
 """
 
 import datetime as dt
+import hashlib
 
 import polars as pl
 
-from src.core.stage_utils import compute_run_id, content_hash, normalize_timestamp
+from src.core.stage_raw_measurements import parse_header
+from src.core.stage_utils import (
+    compute_run_id,
+    content_hash,
+    data_block_hash,
+    normalize_timestamp,
+    sha1_short,
+)
 
 
 def _df(values=(1.0, 2.0, 3.0)):
     return pl.DataFrame({"Vg (V)": [0.0, 1.0, 2.0], "I (A)": list(values)})
 
 
+def _digest(values=(1.0, 2.0, 3.0)):
+    return hashlib.blake2b(str(values).encode(), digest_size=20).hexdigest()
+
+
+def _csv(path, rows="0,1e-6\n1,2e-6\n", start="1746392641", newline="\n"):
+    text = (
+        "# Procedure: <laser_setup.procedures.IVg>\n"
+        "# Parameters:\n"
+        "#\tChip number: 80\n"
+        "# Metadata:\n"
+        f"#\tStart time: {start}\n"
+        "# Data:\n"
+        "Vg (V),I (A)\n" + rows
+    )
+    path.write_bytes(text.replace("\n", newline).encode())
+    return path
+
+
 START = dt.datetime(2026, 5, 4, 21, 4, 1, tzinfo=dt.timezone.utc)
 
 
 def test_deterministic():
-    a = compute_run_id("IVg", "Alisson", 80, START, _df())
-    b = compute_run_id("IVg", "Alisson", 80, START, _df())
+    a = compute_run_id("IVg", "Alisson", 80, START, _digest())
+    b = compute_run_id("IVg", "Alisson", 80, START, _digest())
     assert a == b
     assert len(a) == 16
 
@@ -36,32 +64,32 @@ def test_deterministic():
 def test_path_independent():
     # The source path is not an input at all -- identical measurement
     # contents must yield an identical id regardless of file location.
-    a = compute_run_id("IVg", "Alisson", 80, START, _df())
-    b = compute_run_id("IVg", "Alisson", 80, START, _df())
+    a = compute_run_id("IVg", "Alisson", 80, START, _digest())
+    b = compute_run_id("IVg", "Alisson", 80, START, _digest())
     assert a == b
 
 
 def test_content_sensitive():
-    base = compute_run_id("IVg", "Alisson", 80, START, _df())
-    perturbed = compute_run_id("IVg", "Alisson", 80, START, _df((1.0, 2.0, 3.5)))
+    base = compute_run_id("IVg", "Alisson", 80, START, _digest())
+    perturbed = compute_run_id("IVg", "Alisson", 80, START, _digest((1.0, 2.0, 3.5)))
     assert base != perturbed
 
 
 def test_timestamp_sensitive():
     later = START + dt.timedelta(seconds=1)
-    assert compute_run_id("IVg", "Alisson", 80, START, _df()) != compute_run_id(
-        "IVg", "Alisson", 80, later, _df()
+    assert compute_run_id("IVg", "Alisson", 80, START, _digest()) != compute_run_id(
+        "IVg", "Alisson", 80, later, _digest()
     )
 
 
 def test_chip_sensitive():
-    assert compute_run_id("IVg", "Alisson", 80, START, _df()) != compute_run_id(
-        "IVg", "Alisson", 81, START, _df()
+    assert compute_run_id("IVg", "Alisson", 80, START, _digest()) != compute_run_id(
+        "IVg", "Alisson", 81, START, _digest()
     )
 
 
 def test_null_chip_ok():
-    rid = compute_run_id("LaserCalibration", None, None, START, _df())
+    rid = compute_run_id("LaserCalibration", None, None, START, _digest())
     assert isinstance(rid, str) and len(rid) == 16
 
 
@@ -75,3 +103,24 @@ def test_normalize_timestamp_is_utc_and_stable():
 def test_content_hash_deterministic():
     assert content_hash(_df()) == content_hash(_df())
     assert content_hash(_df()) != content_hash(_df((9.0, 9.0, 9.0)))
+
+
+def test_v1_run_id_is_reproducible():
+    # v1 ids must come out exactly as the old scheme computed them
+    legacy = sha1_short(
+        "|".join(["IVg", "Alisson", "80", normalize_timestamp(START), content_hash(_df())]), 16
+    )
+    assert compute_run_id("IVg", "Alisson", 80, START, content_hash(_df()), version=1) == legacy
+    assert compute_run_id("IVg", "Alisson", 80, START, content_hash(_df())) != legacy
+
+
+def test_data_block_hash_streams_data_only(tmp_path):
+    a = _csv(tmp_path / "a.csv")
+    line = parse_header(a).data_header_line
+    digest = data_block_hash(a, line)
+
+    assert data_block_hash(a, line, chunk_bytes=3) == digest
+    assert data_block_hash(a) == digest
+    assert data_block_hash(_csv(tmp_path / "b.csv", newline="\r\n"), line) == digest
+    assert data_block_hash(_csv(tmp_path / "c.csv", start="1746392642"), line) == digest
+    assert data_block_hash(_csv(tmp_path / "d.csv", rows="0,1e-6\n1,3e-6\n"), line) != digest
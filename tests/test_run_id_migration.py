@@ -0,0 +1,167 @@
+"""
+Tests for migrating staged run_ids from the v1 to the v2 scheme.
+
+Covers:
+- build_run_id_map recognises v1 ids and flags rows it cannot verify
+- apply_run_id_map re-links staged files, manifest, metrics and ledger
+- a migrated tree verifies as current and re-applying is a no-op
+- packed measurements are re-keyed (pack row groups and pack index)
+- the tree comes from the staging pipeline, so start_time_utc has the
+  dtype real manifests have (a string read back from the event log)
+"""
+
+import json
+from pathlib import Path
+
+import polars as pl
+
+from src.core.run_id_migration import MAP_SCHEMA, apply_run_id_map, build_run_id_map
+from src.core.stage_raw_measurements import (
+    atomic_write_parquet,
+    parse_header,
+    read_numeric_table,
+    run_staging_pipeline,
+)
+from src.core.stage_utils import compute_run_id, content_hash, parse_datetime_any
+from src.derived.metrics_store import LEDGER_FILENAME, append_metrics, empty_metrics_frame, load_metrics
+from src.models.parameters import StagingParameters
+
+PROCEDURES_YAML = Path(__file__).parent.parent / "config" / "procedures.yml"
+START = "1746392641"  # 2025-05-04 21:04:01 UTC
+
+
+def _write_ivg(path: Path, chip: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("\n".join([
+        "#Procedure: <laser_setup.procedures.IVg>",
+        "#Parameters:",
+        "#\tChip group name: Alisson",
+        f"#\tChip number: {chip}",
+        "#\tVDS: 0.1 V",
+        "#\tVG start: 0 V",
+        "#\tVG end: 1 V",
+        "#\tLaser voltage: 0 V",
+        "#\tLaser wavelength: 455 nm",
+        "#Metadata:",
+        f"#\tStart time: {START}",
+        "#Data:",
+        "Vg (V),I (A)",
+        "0,1e-6",
+        "1,2e-6",
+    ]) + "\n")
+    return path
+
+
+def _v1_tree(tmp_path):
+    """
+    Stage two CSVs with the real pipeline, then re-key them to v1 ids.
+
+    The manifest keeps the dtypes staging writes (start_time_utc comes back
+    from the NDJSON event log as a string). The CSV of chip 81 is deleted
+    afterwards so its row cannot be verified.
+    """
+    src = _write_ivg(tmp_path / "raw" / "2025-05-04" / "IVg_80.csv", chip=80)
+    gone = _write_ivg(tmp_path / "raw" / "2025-05-04" / "IVg_81.csv", chip=81)
+    params = StagingParameters(
+        raw_root=tmp_path / "raw", stage_root=tmp_path / "stage",
+        procedures_yaml=PROCEDURES_YAML, workers=1,
+    )
+    assert run_staging_pipeline(params).ok == 2
+    manifest = params.manifest
+
+    start = parse_datetime_any(START)
+    downgrade = []
+    for row in pl.read_parquet(manifest).iter_rows(named=True):
+        csv = Path(row["source_file"])
+        table = read_numeric_table(csv, parse_header(csv).data_header_line)
+        v1 = compute_run_id(
+            row["proc"], row["chip_group"], row["chip_number"], start, content_hash(table), version=1
+        )
+        downgrade.append({
+            "old_run_id": row["run_id"], "new_run_id": v1, "source_file": row["source_file"],
+            "path": row["path"], "status": "migrate", "error": None,
+        })
+    apply_run_id_map(pl.DataFrame(downgrade, schema=MAP_SCHEMA), manifest)
+    gone.unlink()
+
+    old = _row(manifest, src)["run_id"]
+
+    metrics_dir = tmp_path / "_metrics"
+    metric = pl.concat([empty_metrics_frame(), pl.DataFrame({
+        "run_id": [old], "chip_number": [80], "chip_group": ["Alisson"], "procedure": ["IVg"],
+        "metric_name": ["cnp_voltage"], "value_float": [0.5],
+        "value_json": [json.dumps({"previous_run_id": old})],
+    })], how="diagonal_relaxed")
+    append_metrics(metrics_dir, metric)
+    atomic_write_parquet(pl.DataFrame({
+        "run_id": [old], "extractor": ["cnp_voltage"], "partner_run_id": [old],
+    }), metrics_dir / LEDGER_FILENAME)
+    return old, manifest, metrics_dir
+
+
+def _row(manifest, source_file):
+    rows = pl.read_parquet(manifest).filter(pl.col("source_file") == str(source_file))
+    return rows.row(0, named=True)
+
+
+def test_map_classifies_v1_and_unverifiable_rows(tmp_path):
+    old, manifest, _ = _v1_tree(tmp_path)
+    mapping = build_run_id_map(manifest)
+
+    by_old = {r["old_run_id"]: r for r in mapping.iter_rows(named=True)}
+    assert by_old[old]["status"] == "migrate", by_old[old]["error"]
+    assert by_old[old]["new_run_id"] not in (None, old)
+    assert sorted(r["status"] for r in by_old.values()) == ["migrate", "missing_source"]
+
+
+def test_apply_relinks_everything(tmp_path):
+    old, manifest, metrics_dir = _v1_tree(tmp_path)
+    mapping = build_run_id_map(manifest)
+    new = mapping.filter(pl.col("old_run_id") == old)["new_run_id"].item()
+
+    report = apply_run_id_map(mapping, manifest, metrics_dir=metrics_dir)
+    assert (report.runs_migrated, report.staged_files_moved, report.metric_files_rewritten) == (1, 1, 1)
+
+    row = _row(manifest, mapping.filter(pl.col("old_run_id") == old)["source_file"].item())
+    assert row["run_id"] == new and f"run_id={new}" in row["path"]
+    assert pl.read_parquet(row["path"])["run_id"].unique().to_list() == [new]
+    assert not list((tmp_path / "stage").rglob(f"run_id={old}"))
+
+    metrics = load_metrics(metrics_dir)
+    assert metrics["run_id"].to_list() == [new]
+    assert json.loads(metrics["value_json"].item()) == {"previous_run_id": new}
+    ledger = pl.read_parquet(metrics_dir / LEDGER_FILENAME)
+    assert ledger.select("run_id", "partner_run_id").row(0) == (new, new)
+
+    remap = build_run_id_map(manifest)
+    assert remap.filter(pl.col("old_run_id") == new)["status"].item() == "current"
+    assert apply_run_id_map(remap, manifest, metrics_dir=metrics_dir).runs_migrated == 0
+
+
+def test_apply_relinks_packed_measurements(tmp_path):
+    from src.core.packed_store import clear_pack_index_cache, get_pack_index, pack_measurements
+    from src.core.utils import read_measurement_parquet
+
+    old, manifest, _ = _v1_tree(tmp_path)
+    stage_root = tmp_path / "stage"
+    clear_pack_index_cache()
+    try:
+        assert pack_measurements(stage_root).loose_removed == 2
+        mapping = build_run_id_map(manifest)
+        migrated = mapping.filter(pl.col("old_run_id") == old).row(0, named=True)
+        new = migrated["new_run_id"]
+
+        report = apply_run_id_map(mapping, manifest)
+        assert (report.staged_files_moved, report.packed_runs_rekeyed) == (0, 1)
+
+        index = get_pack_index(stage_root)
+        assert old not in index and new in index
+        path = _row(manifest, migrated["source_file"])["path"]
+        assert f"run_id={new}" in path
+        df = read_measurement_parquet(path)
+        assert df["run_id"].unique().to_list() == [new]
+        assert df["I (A)"].to_list() == [1e-6, 2e-6]
+
+        assert apply_run_id_map(build_run_id_map(manifest), manifest).packed_runs_rekeyed == 0
+    finally:
+        clear_pack_index_cache()
@@ -0,0 +1,170 @@
+"""
+Tests for the staging source-file index.
+
+The index lets `run_staging_pipeline` drop already-staged CSVs before they
+reach the worker pool. These tests cover:
+- signature matching (size + mtime, staged file must still exist)
+- fingerprint fallback when only the mtime moved
+- persistence round-trip
+- end-to-end: a second staging run submits nothing
+- packed measurements still count as staged after pack-staged
+"""
+
+import os
+from pathlib import Path
+
+from src.core.source_index import (
+    SourceIndex,
+    SourceSignature,
+    fast_fingerprint,
+    stat_signature,
+)
+
+PROCEDURES_YAML = Path(__file__).parent.parent / "config" / "procedures.yml"
+
+
+def _write_ivg(path: Path, chip: int = 67, start: str = "1726394856.2", n: int = 5) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        "#Procedure: <laser_setup.procedures.IVg>",
+        "#Parameters:",
+        "#\tChip group name: Alisson",
+        f"#\tChip number: {chip}",
+        "#\tVDS: 0.1 V",
+        "#\tVG start: -1 V",
+        "#\tVG end: 1 V",
+        "#\tLaser voltage: 0 V",
+        "#\tLaser wavelength: 455 nm",
+        "#Metadata:",
+        f"#\tStart time: {start}",
+        "#Data:",
+        "Vg (V),I (A)",
+    ]
+    lines += [f"{-1 + 2 * i / (n - 1):.3f},{1e-6 * (i + 1):.3e}" for i in range(n)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+def _bump_mtime(path: Path, seconds: int = 10) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + seconds * 1_000_000_000))
+
+
+def test_unchanged_requires_matching_signature_and_staged_file(tmp_path):
+    src = _write_ivg(tmp_path / "raw" / "a.csv")
+    staged = tmp_path / "stage" / "part-000.parquet"
+    staged.parent.mkdir(parents=True)
+    staged.write_bytes(b"x")
+
+    index = SourceIndex(tmp_path / "idx.parquet")
+    sig = stat_signature(src)
+    assert not index.is_unchanged(src, sig)
+
+    index.record(src, sig, "rid", str(staged))
+    assert index.is_unchanged(src, stat_signature(src))
+
+    _bump_mtime(src)
+    assert not index.is_unchanged(src, stat_signature(src))
+
+    index.record(src, stat_signature(src), "rid", str(staged))
+    staged.unlink()
+    assert not index.is_unchanged(src, stat_signature(src))
+
+
+def test_fingerprint_tolerates_mtime_only_change(tmp_path):
+    src = _write_ivg(tmp_path / "a.csv")
+    staged = tmp_path / "part-000.parquet"
+    staged.write_bytes(b"x")
+
+    index = SourceIndex(tmp_path / "idx.parquet")
+    index.record(src, stat_signature(src), "rid", str(staged), use_fingerprint=True)
+    _bump_mtime(src)
+
+    assert not index.is_unchanged(src, stat_signature(src), use_fingerprint=False)
+    assert index.is_unchanged(src, stat_signature(src), use_fingerprint=True)
+    # Refreshed mtime means the next check no longer needs the fingerprint
+    assert index.is_unchanged(src, stat_signature(src), use_fingerprint=False)
+
+
+def test_fast_fingerprint_detects_tail_change(tmp_path):
+    a = _write_ivg(tmp_path / "a.csv", n=5000)
+    before = fast_fingerprint(a, block_bytes=1024)
+    text = a.read_text()
+    a.write_text(text[:-2] + "9\n")
+    assert fast_fingerprint(a, block_bytes=1024) != before
+
+
+def test_save_and_load_roundtrip(tmp_path):
+    src = _write_ivg(tmp_path / "a.csv")
+    path = tmp_path / "_manifest" / "source_index.parquet"
+    index = SourceIndex(path)
+    index.record(src, stat_signature(src), "abc", str(tmp_path / "out.parquet"))
+    index.save()
+
+    loaded = SourceIndex.load(path)
+    assert len(loaded) == 1
+    assert loaded.lookup(src)["run_id"] == "abc"
+
+
+def test_partition_unreadable_file_is_pending(tmp_path):
+    index = SourceIndex(tmp_path / "idx.parquet")
+    pending, unchanged = index.partition([tmp_path / "missing.csv"])
+    assert unchanged == []
+    assert pending[0][1] == SourceSignature(-1, -1)
+
+
+def test_second_staging_run_skips_without_submitting(tmp_path):
+    from src.core.stage_raw_measurements import run_staging_pipeline
+    from src.models.parameters import StagingParameters
+
+    raw = tmp_path / "01_raw"
+    _write_ivg(raw / "2025-09-15" / "a.csv", chip=67)
+    _write_ivg(raw / "2025-09-15" / "b.csv", chip=68)
+
+    params = StagingParameters(
+        raw_root=raw,
+        stage_root=tmp_path / "02_stage" / "raw_measurements",
+        procedures_yaml=PROCEDURES_YAML,
+        workers=1,
+    )
+
+    first = run_staging_pipeline(params)
+    assert first.ok == 2 and first.unchanged == 0
+    assert (params.manifest.parent / "source_index.parquet").exists()
+
+    second = run_staging_pipeline(params)
+    assert second.submitted == 0
+    assert second.unchanged == 2
+
+    _write_ivg(raw / "2025-09-16" / "c.csv", chip=69)
+    third = run_staging_pipeline(params)
+    assert third.submitted == 1
+    assert third.ok == 1
+    assert third.unchanged == 2
+
+
+def test_packed_measurements_stay_unchanged(tmp_path):
+    from src.core.packed_store import clear_pack_index_cache, pack_measurements
+    from src.core.stage_raw_measurements import run_staging_pipeline
+    from src.models.parameters import StagingParameters
+
+    raw = tmp_path / "01_raw"
+    _write_ivg(raw / "2025-09-15" / "a.csv", chip=67)
+    _write_ivg(raw / "2025-09-15" / "b.csv", chip=68)
+    stage_root = tmp_path / "02_stage" / "raw_measurements"
+    params = StagingParameters(
+        raw_root=raw, stage_root=stage_root, procedures_yaml=PROCEDURES_YAML, workers=1,
+    )
+
+    clear_pack_index_cache()
+    try:
+        assert run_staging_pipeline(params).ok == 2
+        report = pack_measurements(stage_root)
+        assert report.loose_removed == 2
+
+        for _ in range(2):
+            again = run_staging_pipeline(params)
+            assert (again.submitted, again.unchanged, again.skipped) == (0, 2, 0)
+        assert not list(stage_root.glob("proc=*/date=*/run_id=*"))
+    finally:
+        clear_pack_index_cache()
@@ -0,0 +1,96 @@
+"""
+Tests for the bounded, size-ordered staging submitter.
+
+Covers:
+- files are submitted largest first
+- no more than IN_FLIGHT_PER_WORKER * workers tasks are outstanding
+- the summary reports per-worker busy time, task percentiles and tail time
+"""
+
+from concurrent.futures import Future
+from pathlib import Path
+
+from src.core import stage_raw_measurements
+from src.models.parameters import StagingParameters
+
+PROCEDURES_YAML = Path(__file__).parent.parent / "config" / "procedures.yml"
+
+
+def _write_it(path: Path, chip: int, n: int) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    lines = [
+        "#Procedure: <laser_setup.procedures.It>",
+        "#Parameters:",
+        "#\tChip group name: Alisson",
+        f"#\tChip number: {chip}",
+        "#\tVDS: 0.1 V",
+        "#\tVG: 0 V",
+        "#\tLaser voltage: 0 V",
+        "#Metadata:",
+        f"#\tStart time: {1726394856 + chip}",
+        "#Data:",
+        "t (s),I (A),VL (V)",
+    ]
+    lines += [f"{i * 0.1:.1f},1e-6,0" for i in range(n)]
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class _LazyExecutor:
+    """Runs a task only when ``wait`` asks for a completion (oldest first)."""
+
+    def __init__(self, *a, **k):
+        self.pending = []
+        self.max_outstanding = 0
+        self.submitted = []
+        _LazyExecutor.last = self
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def submit(self, fn, *args):
+        fut = Future()
+        self.pending.append((fut, fn, args))
+        self.submitted.append(Path(args[0]).name)
+        self.max_outstanding = max(self.max_outstanding, len(self.pending))
+        return fut
+
+    def complete_one(self):
+        fut, fn, args = self.pending.pop(0)
+        fut.set_result(fn(*args))
+        return fut
+
+
+def _wait(fs, return_when=None):
+    done = {_LazyExecutor.last.complete_one()}
+    return done, set(fs) - done
+
+
+def test_bounded_largest_first_submission(tmp_path, monkeypatch):
+    raw = tmp_path / "01_raw"
+    sizes = [5, 400, 50, 2000, 10, 100]
+    for chip, n in enumerate(sizes, 1):
+        _write_it(raw / f"f{chip}.csv", chip, n)
+
+    monkeypatch.setattr(stage_raw_measurements, "ProcessPoolExecutor", _LazyExecutor)
+    monkeypatch.setattr(stage_raw_measurements, "wait", _wait)
+    params = StagingParameters(
+        raw_root=raw,
+        stage_root=tmp_path / "02_stage" / "raw_measurements",
+        procedures_yaml=PROCEDURES_YAML,
+        workers=1,
+    )
+    summary = stage_raw_measurements.run_staging_pipeline(params)
+
+    assert summary.ok == 6
+    ex = _LazyExecutor.last
+    assert ex.submitted == ["f4.csv", "f2.csv", "f6.csv", "f3.csv", "f5.csv", "f1.csv"]
+    assert ex.max_outstanding == stage_raw_measurements.IN_FLIGHT_PER_WORKER
+
+    assert len(summary.worker_busy_s) == 1
+    assert 0 < summary.task_p50_s <= summary.task_p95_s <= summary.task_max_s
+    assert 0 < summary.tail_s <= summary.wall_s
+    assert 0 < next(iter(summary.utilisation().values())) <= 1